@@ -6,23 +6,23 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.core.timing import TimedRoute
 from app.db.base import get_db
+from app.db.session import get_read_db
+from app.db.crud.sprints import get_sprint
 from app.services.availability import AvailabilityService
 from app.services.validation import ValidationService, ValidationError
 from app.schemas.schemas import (
     AvailabilityResponse, AvailabilityOverridePatch
 )
 
-router = APIRouter()
-
-
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 SPRINT_NOT_FOUND = "Sprint not found"
 
 
 @router.get("/{sprint_id}/availability", response_model=AvailabilityResponse)
-def get_sprint_availability(sprint_id: int, db: Session = Depends(get_db)):
+def get_sprint_availability(sprint_id: int, db: Session = Depends(get_read_db)):
     """Availability-Matrix für einen Sprint abrufen"""
     service = AvailabilityService(db)
     availability = service.get_sprint_availability(sprint_id)
@@ -98,37 +98,29 @@ def patch_sprint_availability_bulk(
     validator = ValidationService(db)
 
     try:
-        availability = service.get_sprint_availability(sprint_id)
-        if not availability:
+        sprint = get_sprint(db, sprint_id, include_stats=False)
+        if not sprint:
             raise HTTPException(status_code=404, detail=SPRINT_NOT_FOUND)
 
+        # Validierung für alle Einträge gegen einen Sprint-/Roster-Load
+        validation_errors = validator.validate_availability_overrides(sprint, overrides_data)
+        valid_indices = [i for i in range(len(overrides_data)) if i not in validation_errors]
+
+        # Overrides in einer Transaktion setzen
+        outcomes = service.apply_availability_overrides(
+            sprint_id, [overrides_data[i] for i in valid_indices]
+        )
+        outcome_by_index = dict(zip(valid_indices, outcomes))
+
         results = []
         errors = []
-
-        for i, override_data in enumerate(overrides_data):
-            try:
-                # Validierungen für jeden Eintrag
-                validator.validate_availability_override_date(sprint_id, override_data.day)
-                validator.validate_member_in_roster(sprint_id, override_data.member_id)
-
-                # Override setzen
-                success = service.set_availability_override(
-                    sprint_id=sprint_id,
-                    member_id=override_data.member_id,
-                    day=override_data.day,
-                    state=override_data.state,
-                    reason=override_data.reason
-                )
-
-                if success:
-                    results.append(f"Item {i}: Updated successfully")
-                else:
-                    errors.append(f"Item {i}: Failed to update")
-
-            except ValidationError as e:
-                errors.append(f"Item {i}: {e.message}")
-            except Exception as e:
-                errors.append(f"Item {i}: {str(e)}")
+        for i in range(len(overrides_data)):
+            if i in validation_errors:
+                errors.append(f"Item {i}: {validation_errors[i].message}")
+            elif outcome_by_index[i]:
+                results.append(f"Item {i}: Updated successfully")
+            else:
+                errors.append(f"Item {i}: Failed to update")
 
         return {
             "message": f"Processed {len(overrides_data)} items",
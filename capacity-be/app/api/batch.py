@@ -0,0 +1,150 @@
+"""
+Batch API Route - mehrere API-Operationen in einem Round Trip
+
+Die Sub-Operationen laufen nacheinander in-process durch den API-Router
+(gleiche Validierung, Response-Modelle und Fehlerbehandlung wie einzeln) und
+teilen sich eine DB-Session:
+- atomic=false: jede Operation committed wie gewohnt; Fehler brechen den
+  Batch nicht ab
+- atomic=true: alle Operationen in einer Transaktion; beim ersten Fehler
+  wird zurückgerollt und der Rest nicht mehr ausgeführt (Status 424).
+  Change Events werden erst nach dem Commit des Batches veröffentlicht.
+"""
+import json
+import logging
+from contextlib import AsyncExitStack
+from typing import Optional, Tuple
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.exceptions import ExceptionMiddleware
+
+from app.core.config import settings
+from app.core.events import DEFER_EVENTS_KEY, discard_pending, publish_pending
+from app.core.timing import TimedRoute
+from app.db.base import batch_session_scope, get_db
+from app.schemas.schemas import BatchOperation, BatchRequest, BatchResponse, BatchResult
+
+router = APIRouter(route_class=TimedRoute)
+logger = logging.getLogger(__name__)
+
+# Streams und verschachtelte Batches sind keine JSON-Operationen
+UNSUPPORTED_SEGMENTS = {"batch", "events", "export"}
+NOT_EXECUTED = BatchResult(status=424, body={"detail": "Not executed: atomic batch failed"})
+
+
+def _unsupported(path: str) -> bool:
+    return bool(UNSUPPORTED_SEGMENTS.intersection(urlsplit(path).path.split("/")))
+
+
+async def _dispatch(request: Request, app, operation: BatchOperation) -> Tuple[int, Optional[object]]:
+    """Sub-Request als ASGI-Aufruf gegen den Router ausführen"""
+    url = urlsplit(operation.path)
+    body = b"" if operation.body is None else json.dumps(operation.body).encode()
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": "1.1",
+        "method": operation.method.value,
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": settings.API_V1_STR + url.path,
+        "raw_path": (settings.API_V1_STR + url.path).encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+        "app": request.scope.get("app"),
+    }
+
+    sent_body = False
+
+    async def receive():
+        nonlocal sent_body
+        if sent_body:
+            return {"type": "http.disconnect"}
+        sent_body = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status, chunks = 500, []
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    # Dependencies mit yield (Sessions) je Sub-Request schließen - wie FastAPIs AsyncExitStackMiddleware
+    async with AsyncExitStack() as stack:
+        scope["fastapi_astack"] = stack
+        await app(scope, receive, send)
+    content = b"".join(chunks)
+    if not content:
+        return status, None
+    try:
+        return status, json.loads(content)
+    except ValueError:
+        return status, content.decode(errors="replace")
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def run_batch(request: Request, batch: BatchRequest, db: Session = Depends(get_db)):
+    """
+    Mehrere Operationen in einer Session (optional einer Transaktion) ausführen
+
+    committed: atomic - Transaktion wurde committed; sonst immer true (jede
+    erfolgreiche Operation ist einzeln committed).
+    """
+    if len(batch.operations) > settings.BATCH_MAX_OPERATIONS:
+        raise HTTPException(status_code=422, detail=f"At most {settings.BATCH_MAX_OPERATIONS} operations per batch")
+    for operation in batch.operations:
+        if _unsupported(operation.path):
+            raise HTTPException(status_code=422, detail=f"Operation not supported in batch: {operation.path}")
+
+    # Router inkl. HTTP-/Validierungs-Fehlerbehandlung der App, ohne die äußeren Middlewares
+    app = ExceptionMiddleware(request.app.router, handlers=request.app.exception_handlers)
+
+    connection = transaction = None
+    session = db
+    if batch.atomic:
+        # Äußere Transaktion; commit() der CRUD-Funktionen beendet sie nicht
+        connection = await run_in_threadpool(db.get_bind().connect)
+        transaction = await run_in_threadpool(connection.begin)
+        session = Session(bind=connection, autoflush=False, join_transaction_mode="rollback_only")
+        session.info[DEFER_EVENTS_KEY] = True
+
+    results, failed = [], False
+    try:
+        with batch_session_scope(session):
+            for operation in batch.operations:
+                if failed:
+                    results.append(NOT_EXECUTED.model_copy(update={"id": operation.id}))
+                    continue
+                try:
+                    status, body = await _dispatch(request, app, operation)
+                except Exception:
+                    logger.exception(f"Batch operation failed: {operation.method.value} {operation.path}")
+                    status, body = 500, {"detail": "Internal Server Error"}
+                    await run_in_threadpool(session.rollback)
+                results.append(BatchResult(id=operation.id, status=status, body=body))
+                failed = batch.atomic and status >= 400
+
+        committed = not failed
+        if batch.atomic:
+            if failed:
+                await run_in_threadpool(transaction.rollback)
+                discard_pending(session)
+            else:
+                await run_in_threadpool(transaction.commit)
+                session.info.pop(DEFER_EVENTS_KEY, None)
+                publish_pending(session)
+    finally:
+        if batch.atomic:
+            session.close()
+            await run_in_threadpool(connection.close)
+
+    return BatchResponse(results=results, committed=committed)
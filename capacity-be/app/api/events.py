@@ -0,0 +1,60 @@
+"""
+Change Events API (Server-Sent Events je Sprint)
+"""
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.events import EventBroker, get_broker, sprint_channel
+from app.core.timing import TimedRoute
+from app.db.models import Sprint
+from app.db.session import get_read_db
+
+router = APIRouter(route_class=TimedRoute)
+
+SPRINT_NOT_FOUND = "Sprint not found"
+
+
+def format_sse(event_type: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    """Ein SSE-Frame"""
+    frame = f"id: {event_id}\n" if event_id is not None else ""
+    return frame + f"event: {event_type}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def sprint_event_stream(request: Request, sprint_id: int, broker: EventBroker) -> AsyncIterator[str]:
+    """
+    Events des Sprints bis zum Disconnect
+
+    Erst nach `ready` ist das Abo aktiv - Clients laden die Matrix danach
+    (bzw. nach `resync`) und patchen sie mit den folgenden Events.
+    """
+    subscription = broker.subscribe(sprint_channel(sprint_id))
+    try:
+        yield format_sse("ready", {"sprint_id": sprint_id})
+        while not await request.is_disconnected():
+            message = await subscription.get(timeout=settings.EVENTS_HEARTBEAT_SECONDS)
+            if message is None:
+                yield ": heartbeat\n\n"
+            else:
+                yield format_sse(message["type"], message, message.get("id"))
+    finally:
+        subscription.close()
+
+
+@router.get("/{sprint_id}/events")
+def stream_sprint_events(sprint_id: int, request: Request, db: Session = Depends(get_read_db)):
+    """Änderungen am Sprint (Overrides, Roster, PTO) als Server-Sent Events"""
+    exists = db.query(Sprint.sprint_id).filter(Sprint.sprint_id == sprint_id).first()
+    # Verbindung nicht für die Dauer des Streams halten
+    db.close()
+    if not exists:
+        raise HTTPException(status_code=404, detail=SPRINT_NOT_FOUND)
+
+    return StreamingResponse(
+        sprint_event_stream(request, sprint_id, get_broker()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
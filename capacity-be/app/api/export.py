@@ -0,0 +1,107 @@
+"""
+Export API Routes (Availability-Matrix als CSV/XLSX, Tageskapazität als Parquet/Arrow)
+"""
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.timing import TimedRoute
+from app.db.session import get_read_db
+from app.services import fact_export
+from app.services.export import AvailabilityExportService
+from app.schemas.schemas import ExportFormat, FactExportFormat
+
+router = APIRouter(route_class=TimedRoute)
+
+SPRINT_NOT_FOUND = "Sprint not found"
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    FactExportFormat.PARQUET: "application/vnd.apache.parquet",
+    FactExportFormat.ARROW: "application/vnd.apache.arrow.stream",
+}
+
+FORMAT_QUERY = Query(ExportFormat.CSV, alias="format", description="csv oder xlsx")
+
+
+def _stream(service: AvailabilityExportService, sprints, dates, export_format: ExportFormat,
+            filename: str) -> StreamingResponse:
+    """Zeilen erst beim Senden berechnen - die Response hält nie das ganze Sheet"""
+    if export_format == ExportFormat.XLSX:
+        content = service.iter_xlsx(sprints, dates)
+    else:
+        content = service.iter_csv(sprints, dates)
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'},
+    )
+
+
+@router.get("/sprints/{sprint_id}/availability/export")
+def export_sprint_availability(
+    sprint_id: int,
+    export_format: ExportFormat = FORMAT_QUERY,
+    db: Session = Depends(get_read_db)
+):
+    """Availability-Matrix eines Sprints als CSV/XLSX"""
+    service = AvailabilityExportService(db)
+    sprints = service.resolve_sprints([sprint_id])
+    if not sprints:
+        raise HTTPException(status_code=404, detail=SPRINT_NOT_FOUND)
+
+    return _stream(service, sprints, service.export_dates(sprints), export_format, f"availability-sprint-{sprint_id}")
+
+
+@router.get("/availability/export")
+def export_availability(
+    sprint_ids: Optional[List[int]] = Query(None, description="Sprints (alternativ oder zusätzlich zum Zeitraum)"),
+    from_date: Optional[date] = Query(None, description="Tage ab (inklusive)"),
+    to_date: Optional[date] = Query(None, description="Tage bis (inklusive)"),
+    export_format: ExportFormat = FORMAT_QUERY,
+    db: Session = Depends(get_read_db)
+):
+    """Availability mehrerer Sprints bzw. eines Zeitraums als CSV/XLSX (eine Zeile je Sprint und Member)"""
+    if not sprint_ids and (from_date is None or to_date is None):
+        raise HTTPException(status_code=422, detail="sprint_ids or from_date and to_date required")
+    if from_date and to_date:
+        if to_date < from_date:
+            raise HTTPException(status_code=422, detail="to_date must be >= from_date")
+        if (to_date - from_date).days >= settings.EXPORT_MAX_DAYS:
+            raise HTTPException(status_code=422, detail=f"Export range exceeds {settings.EXPORT_MAX_DAYS} days")
+
+    service = AvailabilityExportService(db)
+    sprints = service.resolve_sprints(sprint_ids, from_date, to_date)
+    dates = service.export_dates(sprints, from_date, to_date)
+    if len(dates) > settings.EXPORT_MAX_DAYS:
+        raise HTTPException(status_code=422, detail=f"Export range exceeds {settings.EXPORT_MAX_DAYS} days")
+
+    suffix = f"{from_date}-{to_date}" if from_date and to_date else "sprints"
+    return _stream(service, sprints, dates, export_format, f"availability-{suffix}")
+
+
+@router.get("/export/capacity-facts")
+def export_capacity_facts(
+    from_date: Optional[date] = Query(None, description="Tage ab (inklusive), für inkrementelle Exporte"),
+    to_date: Optional[date] = Query(None, description="Tage bis (inklusive)"),
+    export_format: FactExportFormat = Query(FactExportFormat.PARQUET, alias="format", description="parquet oder arrow"),
+    db: Session = Depends(get_read_db)
+):
+    """Tageskapazität (member_day_capacity) spaltenbasiert als Parquet-Datei oder Arrow-IPC-Stream"""
+    if from_date and to_date and to_date < from_date:
+        raise HTTPException(status_code=422, detail="to_date must be >= from_date")
+
+    if export_format == FactExportFormat.ARROW:
+        content = fact_export.iter_arrow_stream(db, from_date, to_date)
+    else:
+        content = fact_export.iter_parquet(db, from_date, to_date)
+    suffix = f"-{from_date or 'start'}-{to_date or 'end'}" if from_date or to_date else ""
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="capacity-facts{suffix}.{export_format.value}"'},
+    )
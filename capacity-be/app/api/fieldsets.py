@@ -0,0 +1,47 @@
+"""
+Sparse Fieldsets für List- und Detail-Endpoints
+
+- fields=sprint_id,name lädt und liefert nur diese Felder (Spalten-Projektion
+  in der CRUD-Schicht, keine ORM-Objekte)
+- include=stats hängt berechnete Zusatzdaten an (Opt-in, z.B. Sprint-Statistik)
+"""
+from typing import Iterable, List, Optional, Set
+
+from fastapi import HTTPException, Query
+from fastapi.responses import JSONResponse
+from pydantic_core import to_jsonable_python
+
+FIELDS_QUERY = Query(None, description="Kommagetrennte Felder, z.B. sprint_id,name (Default: alle)")
+INCLUDE_QUERY = Query(None, description="Kommagetrennte Erweiterungen, z.B. stats")
+
+
+def _split(value: str) -> List[str]:
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """fields-Parameter prüfen; None = alle Felder"""
+    if fields is None:
+        return None
+    requested = _split(fields)
+    unknown = [field for field in requested if field not in allowed]
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown fields: {', '.join(unknown) or fields!r}; allowed: {', '.join(allowed)}"
+        )
+    return requested
+
+
+def parse_include(include: Optional[str], allowed: Iterable[str]) -> Set[str]:
+    """include-Parameter prüfen"""
+    requested = set(_split(include or ""))
+    unknown = sorted(requested - set(allowed))
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown include: {', '.join(unknown)}")
+    return requested
+
+
+def fields_response(content) -> JSONResponse:
+    """Teil-Objekte serialisieren wie die Response-Modelle (Enums als Wert, Decimal als String)"""
+    return JSONResponse(to_jsonable_python(content))
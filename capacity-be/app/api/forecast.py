@@ -0,0 +1,49 @@
+"""
+Forecast API Routes (Monte-Carlo-Kapazitätsprognose)
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.timing import TimedRoute
+from app.db.session import get_read_db
+from app.services.forecast import ForecastService
+from app.schemas.schemas import SprintForecastResponse, PortfolioForecastResponse
+
+router = APIRouter(route_class=TimedRoute)
+
+SPRINT_NOT_FOUND = "Sprint not found"
+
+SIMULATIONS_QUERY = Query(
+    None, ge=settings.FORECAST_MIN_SIMULATIONS, le=settings.FORECAST_MAX_SIMULATIONS,
+    description="Anzahl Simulationen (Default FORECAST_SIMULATIONS, ggf. durch das Latenz-Budget begrenzt)"
+)
+SEED_QUERY = Query(None, ge=0, description="Seed für reproduzierbare Ergebnisse")
+
+
+@router.get("/sprints/{sprint_id}/forecast", response_model=SprintForecastResponse)
+def get_sprint_forecast(
+    sprint_id: int,
+    simulations: Optional[int] = SIMULATIONS_QUERY,
+    seed: Optional[int] = SEED_QUERY,
+    db: Session = Depends(get_read_db)
+):
+    """Kapazitäts-Forecast (P10/P50/P90) für einen Sprint"""
+    forecast = ForecastService(db).forecast_sprint(sprint_id, simulations, seed)
+
+    if not forecast:
+        raise HTTPException(status_code=404, detail=SPRINT_NOT_FOUND)
+
+    return forecast
+
+
+@router.get("/forecast", response_model=PortfolioForecastResponse)
+def get_portfolio_forecast(
+    sprint_ids: Optional[List[int]] = Query(None, description="Sprints (Default: alle geplanten Sprints)"),
+    simulations: Optional[int] = SIMULATIONS_QUERY,
+    seed: Optional[int] = SEED_QUERY,
+    db: Session = Depends(get_read_db)
+):
+    """Kapazitäts-Forecast für mehrere Sprints inkl. Portfolio-Summe"""
+    return ForecastService(db).forecast_portfolio(sprint_ids, simulations, seed)
@@ -1,23 +1,40 @@
 """
 Members API Routes
 """
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.api.fieldsets import FIELDS_QUERY, fields_response, parse_fields
+from app.core.timing import TimedRoute
 from app.db.base import get_db
-from app.db.crud.members import get_members, get_all_members, get_member, create_member, update_member, delete_member
+from app.db.session import get_read_db
+from app.db.crud.members import (
+    MEMBER_FIELDS, get_members, get_all_members, get_member, get_member_fields, create_member, update_member,
+    delete_member
+)
 from app.schemas.schemas import MemberResponse, MemberCreate
 from app.services.validation import ValidationService, ValidationError
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 MEMBER_NOT_FOUND = "Member not found"
 
 
 @router.get("/", response_model=List[MemberResponse])
-def list_members(skip: int = 0, limit: int = 100, include_inactive: bool = False, db: Session = Depends(get_db)):
+def list_members(
+    skip: int = 0,
+    limit: int = 100,
+    include_inactive: bool = False,
+    fields: Optional[str] = FIELDS_QUERY,
+    db: Session = Depends(get_read_db)
+):
     """Alle Members abrufen (optional auch inaktive)"""
+    selected = parse_fields(fields, MEMBER_FIELDS)
+    if selected is not None:
+        return fields_response(
+            get_member_fields(db, selected, include_inactive=include_inactive, skip=skip, limit=limit)
+        )
     if include_inactive:
         members = get_all_members(db, skip=skip, limit=limit)
     else:
@@ -26,8 +43,15 @@ def list_members(skip: int = 0, limit: int = 100, include_inactive: bool = False
 
 
 @router.get("/{member_id}", response_model=MemberResponse)
-def get_member_by_id(member_id: int, db: Session = Depends(get_db)):
+def get_member_by_id(member_id: int, fields: Optional[str] = FIELDS_QUERY, db: Session = Depends(get_read_db)):
     """Ein Member by ID abrufen"""
+    selected = parse_fields(fields, MEMBER_FIELDS)
+    if selected is not None:
+        members = get_member_fields(db, selected, member_id=member_id)
+        if not members:
+            raise HTTPException(status_code=404, detail=MEMBER_NOT_FOUND)
+        return fields_response(members[0])
+
     member = get_member(db, member_id=member_id)
     if not member:
         raise HTTPException(status_code=404, detail=MEMBER_NOT_FOUND)
@@ -0,0 +1,38 @@
+"""
+Planning API Routes (Allocation-Vorschläge über parallele Sprints)
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.timing import TimedRoute
+from app.db.session import get_read_db
+from app.services.allocation_plan import AllocationPlanService
+from app.services.validation import ValidationError
+from app.schemas.schemas import AllocationPlanRequest, AllocationPlanResponse
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.post("/allocations", response_model=AllocationPlanResponse)
+def plan_allocations(
+    request: AllocationPlanRequest,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Allocations für parallele Sprints vorschlagen (ohne Schreibzugriff)
+
+    Body:
+    {
+        "sprints": [
+            {"sprint_id": 1, "target_hours": 320},
+            {"sprint_id": 2, "target_hours": 160, "allowed_member_ids": [3, 4, 5]}
+        ],
+        "fixed": [{"sprint_id": 1, "member_id": 3, "allocation": 0.5}],
+        "max_total_allocation": 1.0,
+        "step": 0.05
+    }
+    """
+    try:
+        return AllocationPlanService(db).plan(request)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.message)
@@ -4,13 +4,15 @@ PTO (Personal Time Off) API Endpoints
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from app.core.timing import TimedRoute
 from app.db.base import get_db
+from app.db.session import get_read_db
 from app.db.crud import pto as pto_crud
 from app.db.crud import members as member_crud
 from app.schemas.schemas import PTO, PTOCreate, PTOUpdate
 from app.services.validation import ValidationService, ValidationError
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 # Error Messages
 MEMBER_NOT_FOUND = "Member nicht gefunden"
@@ -24,14 +26,23 @@ def get_pto_list(
     sprint_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Alle PTO-Einträge abrufen mit optionalen Filtern"""
-    return pto_crud.get_pto_list(db, member_id=member_id, sprint_id=sprint_id, skip=skip, limit=limit)
+    entries = pto_crud.get_pto_list(db, member_id=member_id, sprint_id=sprint_id, skip=skip, limit=limit)
+
+    # Member-Namen aus dem gejointen Member übernehmen (kein Lazy Load je Eintrag)
+    result = []
+    for entry in entries:
+        data = PTO.model_validate(entry)
+        data.member_name = entry.member.name if entry.member else None
+        result.append(data)
+
+    return result
 
 
 @router.get("/{pto_id}", response_model=PTO)
-def get_pto(pto_id: int, db: Session = Depends(get_db)):
+def get_pto(pto_id: int, db: Session = Depends(get_read_db)):
     """Ein PTO-Eintrag by ID"""
     db_pto = pto_crud.get_pto(db, pto_id=pto_id)
     if db_pto is None:
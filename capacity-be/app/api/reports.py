@@ -0,0 +1,56 @@
+"""
+Reports API Routes
+"""
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.timing import TimedRoute
+from app.db.session import get_read_db
+from app.services.over_allocation import OverAllocationService
+from app.services.reports import ReportService
+from app.schemas.schemas import CapacityReportResponse, CapacityTrendResponse, OverAllocationResponse, ReportGroupBy
+
+router = APIRouter(route_class=TimedRoute)
+
+
+def _validate_period(from_date: Optional[date], to_date: Optional[date]):
+    if from_date and to_date and to_date < from_date:
+        raise HTTPException(status_code=422, detail="to_date must be >= from_date")
+
+
+@router.get("/capacity", response_model=CapacityReportResponse)
+def get_capacity_report(
+    group_by: ReportGroupBy = ReportGroupBy.REGION,
+    from_date: Optional[date] = Query(None, description="Sprints ab Startdatum (Default: heute - 365 Tage)"),
+    to_date: Optional[date] = Query(None, description="Sprints bis Startdatum (Default: heute)"),
+    db: Session = Depends(get_read_db)
+):
+    """Kapazität je Sprint nach Region, Member oder Team"""
+    _validate_period(from_date, to_date)
+    return ReportService(db).capacity_report(group_by, from_date, to_date)
+
+
+@router.get("/trend", response_model=CapacityTrendResponse)
+def get_capacity_trend(
+    from_date: Optional[date] = Query(None, description="Sprints ab Startdatum (Default: heute - 365 Tage)"),
+    to_date: Optional[date] = Query(None, description="Sprints bis Startdatum (Default: heute)"),
+    window: int = Query(3, ge=1, le=26, description="Sprints im gleitenden Durchschnitt"),
+    db: Session = Depends(get_read_db)
+):
+    """Geplante vs. verfügbare Stunden je Sprint"""
+    _validate_period(from_date, to_date)
+    return ReportService(db).capacity_trend(from_date, to_date, window)
+
+
+@router.get("/over-allocation", response_model=OverAllocationResponse)
+def get_over_allocation_report(
+    from_date: Optional[date] = Query(None, description="Tage ab (inklusive)"),
+    to_date: Optional[date] = Query(None, description="Tage bis (inklusive)"),
+    member_ids: Optional[List[int]] = Query(None, description="Nur diese Members (Default: alle)"),
+    db: Session = Depends(get_read_db)
+):
+    """Zeiträume, in denen Members über parallele Sprints mit mehr als 100% eingeplant sind"""
+    _validate_period(from_date, to_date)
+    return OverAllocationService(db).report(from_date, to_date, member_ids)
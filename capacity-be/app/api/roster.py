@@ -5,23 +5,91 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.core.timing import TimedRoute
 from app.db.base import get_db
+from app.db.session import get_read_db
+from app.db.crud.sprints import get_sprint
 from app.db.crud.sprint_roster import (
     get_sprint_roster, add_member_to_sprint,
-    update_roster_entry, remove_member_from_sprint
+    update_roster_entry, remove_member_from_sprint,
+    get_roster_windows, apply_roster_changes
 )
 from app.schemas.schemas import (
-    SprintRosterResponse, SprintRosterCreate, SprintRosterUpdate
+    SprintRosterResponse, SprintRosterCreate, SprintRosterUpdate,
+    RosterBulkAction, RosterBulkItem, RosterBulkResult, RosterBulkResponse
 )
 from app.services.validation import ValidationService, ValidationError
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 ROSTER_NOT_FOUND = "Roster entry not found"
+SPRINT_NOT_FOUND = "Sprint not found"
+
+
+def _apply_bulk(db: Session, sprint_id: int, items: List[RosterBulkItem], replace: bool = False) -> RosterBulkResponse:
+    """
+    Roster-Änderungen gegen einen Sprint-Load und eine Roster-Query validieren und gesammelt schreiben
+
+    Ungültige Einträge werden übersprungen und je Zeile gemeldet; replace
+    entfernt zusätzlich alle Members, die nicht in items vorkommen.
+    """
+    sprint = get_sprint(db, sprint_id, include_stats=False)
+    if not sprint:
+        raise HTTPException(status_code=404, detail=SPRINT_NOT_FOUND)
+
+    validator = ValidationService(db)
+    roster_windows = get_roster_windows(db, sprint_id)
+    roster_member_ids = set(roster_windows)
+    errors = validator.validate_roster_items(sprint, items, roster_windows)
+
+    additions, updates, removals, results = [], [], [], []
+    for i, item in enumerate(items):
+        if i in errors:
+            results.append(RosterBulkResult(member_id=item.member_id, status="error", error=errors[i].message))
+            continue
+
+        if item.action == RosterBulkAction.REMOVE:
+            removals.append(item.member_id)
+            status = "removed"
+        elif item.member_id in roster_member_ids:
+            # Nur explizit gesetzte Felder ändern
+            changed = item.model_dump(include=item.model_fields_set - {"member_id", "action"})
+            if changed:
+                updates.append({"member_id": item.member_id, **changed})
+            status = "updated" if changed else "unchanged"
+        else:
+            additions.append(item.model_dump(exclude={"action"}))
+            status = "added"
+        results.append(RosterBulkResult(member_id=item.member_id, status=status))
+
+    if replace:
+        listed = {item.member_id for item in items}
+        for member_id in sorted(roster_member_ids - listed):
+            removals.append(member_id)
+            results.append(RosterBulkResult(member_id=member_id, status="removed"))
+
+    # Gesamt-Allocation über parallele Sprints (nur mit ROSTER_ALLOCATION_CHECK)
+    limit_errors = validator.validate_allocation_limits(sprint, {
+        **{member_id: None for member_id in removals},
+        **{row["member_id"]: row for row in additions + updates},
+    })
+    if limit_errors:
+        additions = [row for row in additions if row["member_id"] not in limit_errors]
+        updates = [row for row in updates if row["member_id"] not in limit_errors]
+        results = [
+            RosterBulkResult(member_id=result.member_id, status="error", error=limit_errors[result.member_id].message)
+            if result.member_id in limit_errors and result.status in ("added", "updated") else result
+            for result in results
+        ]
+
+    apply_roster_changes(db, sprint_id, additions, updates, removals)
+
+    error_count = sum(1 for result in results if result.status == "error")
+    return RosterBulkResponse(success_count=len(results) - error_count, error_count=error_count, results=results)
 
 
 @router.get("/{sprint_id}/roster", response_model=List[SprintRosterResponse])
-def get_roster_for_sprint(sprint_id: int, db: Session = Depends(get_db)):
+def get_roster_for_sprint(sprint_id: int, db: Session = Depends(get_read_db)):
     """Roster für einen Sprint abrufen"""
     roster = get_sprint_roster(db, sprint_id=sprint_id)
 
@@ -49,6 +117,7 @@ def add_member_to_roster(
         validator.validate_roster_uniqueness(sprint_id, roster_data.member_id)
         validator.validate_assignment_window(sprint_id, roster_data.assignment_from, roster_data.assignment_to)
         validator.validate_allocation_range(float(roster_data.allocation))
+        validator.validate_member_allocation(sprint_id, roster_data.member_id, roster_data.model_dump(exclude={"member_id"}))
 
         entry = add_member_to_sprint(db, sprint_id=sprint_id, roster_data=roster_data)
         result = SprintRosterResponse.model_validate(entry)
@@ -61,6 +130,29 @@ def add_member_to_roster(
         raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+@router.post("/{sprint_id}/roster/bulk", response_model=RosterBulkResponse)
+def bulk_update_roster(sprint_id: int, items: List[RosterBulkItem], db: Session = Depends(get_db)):
+    """Mehrere Members hinzufügen/aktualisieren/entfernen (eine Transaktion, Ergebnis je Zeile)"""
+    try:
+        return _apply_bulk(db, sprint_id, items)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.put("/{sprint_id}/roster", response_model=RosterBulkResponse)
+def replace_roster(sprint_id: int, entries: List[SprintRosterCreate], db: Session = Depends(get_db)):
+    """Komplettes Roster ersetzen: gelistete Members anlegen/aktualisieren, alle anderen entfernen"""
+    items = [RosterBulkItem(action=RosterBulkAction.UPSERT, **entry.model_dump()) for entry in entries]
+    try:
+        return _apply_bulk(db, sprint_id, items, replace=True)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.put("/{sprint_id}/roster/{member_id}", response_model=SprintRosterResponse)
 def update_roster_member(
     sprint_id: int,
@@ -75,6 +167,7 @@ def update_roster_member(
         # Validierungen
         validator.validate_assignment_window(sprint_id, roster_update.assignment_from, roster_update.assignment_to)
         validator.validate_allocation_range(float(roster_update.allocation))
+        validator.validate_member_allocation(sprint_id, member_id, roster_update.model_dump(exclude_unset=True))
 
         entry = update_roster_entry(db, sprint_id=sprint_id, member_id=member_id, roster_update=roster_update)
         if not entry:
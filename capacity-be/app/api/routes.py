@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api import members, sprints, roster, availability, pto
+from app.api import members, sprints, roster, availability, pto, forecast, scenarios, teams, reports, export, events, batch, planning
 
 # Main API Router
 router = APIRouter()
@@ -13,7 +13,15 @@ router.include_router(members.router, prefix="/members", tags=["members"])
 router.include_router(sprints.router, prefix=SPRINTS_PREFIX, tags=["sprints"])
 router.include_router(roster.router, prefix=SPRINTS_PREFIX, tags=["roster"])  # /sprints/{id}/roster
 router.include_router(availability.router, prefix=SPRINTS_PREFIX, tags=["availability"])  # /sprints/{id}/availability
+router.include_router(scenarios.router, prefix=SPRINTS_PREFIX, tags=["scenarios"])  # /sprints/{id}/scenarios
+router.include_router(events.router, prefix=SPRINTS_PREFIX, tags=["events"])  # /sprints/{id}/events (SSE)
 router.include_router(pto.router, prefix="/pto", tags=["pto"])
+router.include_router(teams.router, prefix="/teams", tags=["teams"])
+router.include_router(reports.router, prefix="/reports", tags=["reports"])
+router.include_router(planning.router, prefix="/planning", tags=["planning"])  # /planning/allocations
+router.include_router(forecast.router, tags=["forecast"])  # /sprints/{id}/forecast, /forecast
+router.include_router(batch.router, tags=["batch"])  # /batch
+router.include_router(export.router, tags=["export"])  # /sprints/{id}/availability/export, /availability/export, /export/...
 
 # Status API Route
 @router.get("/status")
@@ -28,17 +36,37 @@ async def api_status():
             "GET /api/sprints - List all sprints",
             "POST /api/sprints - Create sprint",
             "PATCH /api/sprints/{id} - Update sprint",
+            "POST /api/sprints/series - Create recurring sprint series",
+            "POST /api/sprints/{id}/clone - Copy sprint with roster",
+            "POST /api/sprints/{id}/next - Create next sprint with roster",
             "GET /api/sprints/{id}/roster - Get sprint roster",
             "POST /api/sprints/{id}/roster - Add member to sprint",
+            "POST /api/sprints/{id}/roster/bulk - Add/update/remove many members",
+            "PUT /api/sprints/{id}/roster - Replace sprint roster",
             "PUT /api/sprints/{id}/roster/{member_id} - Update roster entry",
             "DELETE /api/sprints/{id}/roster/{member_id} - Remove member from sprint",
             "GET /api/sprints/{id}/availability - Get availability matrix",
             "PATCH /api/sprints/{id}/availability - Set single override",
             "PATCH /api/sprints/{id}/availability/bulk - Bulk update overrides",
+            "GET /api/sprints/{id}/availability/export - Availability as CSV/XLSX stream",
+            "GET /api/availability/export - Multi-sprint/date-range availability as CSV/XLSX stream",
+            "GET /api/export/capacity-facts - Member-day capacity facts as Parquet/Arrow",
+            "GET /api/sprints/{id}/events - Change events (SSE: overrides, roster, PTO)",
+            "POST /api/sprints/{id}/scenarios - Evaluate what-if scenarios (no writes)",
+            "GET /api/sprints/{id}/forecast - Capacity forecast (P10/P50/P90)",
+            "GET /api/forecast - Portfolio capacity forecast",
             "GET /api/pto - List all PTO entries",
             "POST /api/pto - Create PTO entry",
             "GET /api/pto/{id} - Get PTO entry",
             "PUT /api/pto/{id} - Update PTO entry",
-            "DELETE /api/pto/{id} - Delete PTO entry"
+            "DELETE /api/pto/{id} - Delete PTO entry",
+            "GET /api/teams - List teams (hierarchy via parent_team_id)",
+            "POST /api/teams/{id}/members - Assign member to team",
+            "GET /api/teams/{id}/rollup - Capacity rollup over team tree",
+            "POST /api/batch - Run multiple operations in one round trip (optionally atomic)",
+            "GET /api/reports/capacity - Capacity per sprint by region/member/team",
+            "GET /api/reports/trend - Planned vs. available hours per sprint",
+            "GET /api/reports/over-allocation - Members allocated above 100% across parallel sprints",
+            "POST /api/planning/allocations - Propose allocations across parallel sprints (no writes)"
         ]
     }
@@ -0,0 +1,43 @@
+"""
+What-if Scenario API Routes
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.timing import TimedRoute
+from app.db.session import get_read_db
+from app.services.scenario import ScenarioService
+from app.services.validation import ValidationError
+from app.schemas.schemas import ScenarioRequest, ScenarioResponse
+
+router = APIRouter(route_class=TimedRoute)
+
+SPRINT_NOT_FOUND = "Sprint not found"
+
+
+@router.post("/{sprint_id}/scenarios", response_model=ScenarioResponse)
+def evaluate_sprint_scenarios(
+    sprint_id: int,
+    request: ScenarioRequest,
+    db: Session = Depends(get_read_db)
+):
+    """
+    What-if-Szenarien auswerten (ohne Schreibzugriff)
+
+    Body:
+    {
+        "scenarios": [
+            {"name": "Alice 50%", "changes": [{"op": "set_allocation", "member_id": 1, "allocation": 0.5}]},
+            {"name": "Bob Urlaub", "changes": [{"op": "add_pto", "member_id": 2,
+                                                "from_date": "2025-11-03", "to_date": "2025-11-05"}]}
+        ]
+    }
+    """
+    try:
+        result = ScenarioService(db).evaluate(sprint_id, request.scenarios)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.message)
+
+    if result is None:
+        raise HTTPException(status_code=404, detail=SPRINT_NOT_FOUND)
+    return result
@@ -1,60 +1,193 @@
 """
 Sprints API Routes
 """
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.api.fieldsets import FIELDS_QUERY, INCLUDE_QUERY, fields_response, parse_fields, parse_include
+from app.core.timing import TimedRoute
 from app.db.base import get_db
-from app.db.crud.sprints import get_sprints, get_sprint, create_sprint, update_sprint, delete_sprint
-from app.schemas.schemas import SprintResponse, SprintCreate, SprintUpdate
+from app.db.session import get_read_db
+from app.db.crud.sprints import (
+    SPRINT_FIELDS, get_sprints, get_sprint, get_sprint_fields, create_sprint, update_sprint, delete_sprint,
+    clone_sprint, default_sprint_name, next_sprint_dates, attach_sprint_statistics,
+    sprint_series_dates, format_sprint_name, create_sprint_series, DEFAULT_SPRINT_NAME_PATTERN
+)
+from app.schemas.schemas import (
+    SprintResponse, SprintCreate, SprintUpdate, SprintClone, SprintNext, SprintSeriesCreate
+)
 from app.services.validation import ValidationService, ValidationError
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 SPRINT_NOT_FOUND = "Sprint not found"
+SPRINT_INCLUDES = ("stats",)
 
 
 @router.get("/", response_model=List[SprintResponse])
-def list_sprints(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Alle Sprints abrufen"""
-    sprints = get_sprints(db, skip=skip, limit=limit)
-    return sprints
+def list_sprints(
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[str] = FIELDS_QUERY,
+    include: Optional[str] = INCLUDE_QUERY,
+    db: Session = Depends(get_read_db)
+):
+    """Alle Sprints abrufen (Statistik nur mit include=stats)"""
+    selected = parse_fields(fields, SPRINT_FIELDS)
+    include_stats = "stats" in parse_include(include, SPRINT_INCLUDES)
+    if selected is not None:
+        return fields_response(get_sprint_fields(db, selected, include_stats, skip=skip, limit=limit))
+    return get_sprints(db, skip=skip, limit=limit, include_stats=include_stats)
 
 
 @router.get("/{sprint_id}", response_model=SprintResponse)
-def get_sprint_by_id(sprint_id: int, db: Session = Depends(get_db)):
-    """Ein Sprint by ID abrufen"""
-    sprint = get_sprint(db, sprint_id=sprint_id)
+def get_sprint_by_id(
+    sprint_id: int,
+    fields: Optional[str] = FIELDS_QUERY,
+    include: Optional[str] = INCLUDE_QUERY,
+    db: Session = Depends(get_read_db)
+):
+    """Ein Sprint by ID abrufen (Statistik nur mit include=stats)"""
+    selected = parse_fields(fields, SPRINT_FIELDS)
+    include_stats = "stats" in parse_include(include, SPRINT_INCLUDES)
+    if selected is not None:
+        sprints = get_sprint_fields(db, selected, include_stats, sprint_id=sprint_id)
+        if not sprints:
+            raise HTTPException(status_code=404, detail=SPRINT_NOT_FOUND)
+        return fields_response(sprints[0])
+
+    sprint = get_sprint(db, sprint_id=sprint_id, include_stats=include_stats)
     if not sprint:
         raise HTTPException(status_code=404, detail=SPRINT_NOT_FOUND)
     return sprint
 
 
 @router.post("/", response_model=SprintResponse)
-def create_new_sprint(sprint: SprintCreate, db: Session = Depends(get_db)):
-    """Neuen Sprint erstellen (Status: DRAFT)"""
+def create_new_sprint(
+    sprint: SprintCreate,
+    include: Optional[str] = INCLUDE_QUERY,
+    db: Session = Depends(get_db)
+):
+    """Neuen Sprint erstellen (Status: DRAFT, Statistik nur mit include=stats)"""
     validator = ValidationService(db)
+    include_stats = "stats" in parse_include(include, SPRINT_INCLUDES)
 
     try:
         # Erweiterte Validierung
         validator.validate_sprint_dates(sprint.start_date, sprint.end_date)
 
-        return create_sprint(db, sprint=sprint)
+        db_sprint = create_sprint(db, sprint=sprint)
+        if include_stats:
+            attach_sprint_statistics(db, [db_sprint])
+        return db_sprint
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+@router.post("/series", response_model=List[SprintResponse])
+def create_sprint_series_endpoint(series: SprintSeriesCreate, db: Session = Depends(get_db)):
+    """Sprint-Serie mit fester Kadenz anlegen (eine Transaktion, optional mit Roster-Template)"""
+    if series.roster_from_sprint_id is not None and series.roster:
+        raise HTTPException(status_code=422, detail="Use either roster_from_sprint_id or roster")
+    if series.roster_from_sprint_id is not None and not get_sprint(db, series.roster_from_sprint_id):
+        raise HTTPException(status_code=404, detail=SPRINT_NOT_FOUND)
+
+    member_ids = {entry.member_id for entry in series.roster}
+    if len(member_ids) != len(series.roster):
+        raise HTTPException(status_code=422, detail="Roster template contains a member more than once")
+
+    ranges = sprint_series_dates(series.start_date, series.count, series.length_workdays, series.cadence_weeks)
+    try:
+        names = [
+            format_sprint_name(series.name_pattern or DEFAULT_SPRINT_NAME_PATTERN, n, start, end)
+            for n, (start, end) in enumerate(ranges, start=1)
+        ]
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid name_pattern: {e}")
+    if any(len(name) > 255 for name in names):
+        raise HTTPException(status_code=422, detail="Sprint name longer than 255 characters")
+
+    validator = ValidationService(db)
+    try:
+        validator.validate_members_exist(member_ids)
+        validator.validate_sprint_series(ranges, series.allow_overlap)
+        sprints = create_sprint_series(
+            db, ranges, names,
+            roster_template_sprint_id=series.roster_from_sprint_id,
+            roster=[entry.model_dump() for entry in series.roster]
+        )
+        attach_sprint_statistics(db, sprints)
+        return sprints
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _clone(db: Session, sprint_id: int, name: Optional[str], start_date, end_date, options) -> SprintResponse:
+    source = get_sprint(db, sprint_id, include_stats=False)
+    if not source:
+        raise HTTPException(status_code=404, detail=SPRINT_NOT_FOUND)
+
+    ValidationService(db).validate_sprint_dates(start_date, end_date)
+    sprint = clone_sprint(
+        db, source,
+        name=name or default_sprint_name(start_date, end_date),
+        start_date=start_date,
+        end_date=end_date,
+        shift_assignment_windows=options.shift_assignment_windows,
+        copy_overrides=options.copy_overrides
+    )
+    return get_sprint(db, sprint.sprint_id, include_stats=True)
+
+
+@router.post("/{sprint_id}/clone", response_model=SprintResponse)
+def clone_sprint_by_id(sprint_id: int, clone: SprintClone, db: Session = Depends(get_db)):
+    """Sprint mit Roster (optional Overrides) in einen neuen Zeitraum kopieren"""
+    try:
+        return _clone(db, sprint_id, clone.name, clone.start_date, clone.end_date, clone)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.message)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/{sprint_id}/next", response_model=SprintResponse)
+def create_next_sprint(sprint_id: int, options: SprintNext, db: Session = Depends(get_db)):
+    """Folgesprint anlegen: gleiche Länge direkt im Anschluss, Roster übernommen"""
+    try:
+        source = get_sprint(db, sprint_id, include_stats=False)
+        if not source:
+            raise HTTPException(status_code=404, detail=SPRINT_NOT_FOUND)
+        start_date, end_date = next_sprint_dates(source)
+        return _clone(db, sprint_id, options.name, start_date, end_date, options)
     except ValidationError as e:
         raise HTTPException(status_code=422, detail=e.message)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.patch("/{sprint_id}", response_model=SprintResponse)
-def update_sprint_by_id(sprint_id: int, sprint_update: SprintUpdate, db: Session = Depends(get_db)):
-    """Sprint aktualisieren (inkl. Status-Wechsel)"""
+def update_sprint_by_id(
+    sprint_id: int,
+    sprint_update: SprintUpdate,
+    include: Optional[str] = INCLUDE_QUERY,
+    db: Session = Depends(get_db)
+):
+    """Sprint aktualisieren (inkl. Status-Wechsel, Statistik nur mit include=stats)"""
     validator = ValidationService(db)
+    include_stats = "stats" in parse_include(include, SPRINT_INCLUDES)
 
     try:
         # Validierung für Date-Updates
         if sprint_update.start_date or sprint_update.end_date:
             # Hole aktuelle Werte falls nur eine Seite geändert wird
-            current_sprint = get_sprint(db, sprint_id)
+            current_sprint = get_sprint(db, sprint_id, include_stats=False)
             if not current_sprint:
                 raise HTTPException(status_code=404, detail=SPRINT_NOT_FOUND)
 
@@ -66,6 +199,8 @@ def update_sprint_by_id(sprint_id: int, sprint_update: SprintUpdate, db: Session
         sprint = update_sprint(db, sprint_id=sprint_id, sprint_update=sprint_update)
         if not sprint:
             raise HTTPException(status_code=404, detail=SPRINT_NOT_FOUND)
+        if include_stats:
+            attach_sprint_statistics(db, [sprint])
         return sprint
 
     except ValidationError as e:
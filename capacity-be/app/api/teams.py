@@ -0,0 +1,121 @@
+"""
+Teams API Routes
+"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.timing import TimedRoute
+from app.db.base import get_db
+from app.db.session import get_read_db
+from app.db.crud.members import get_member
+from app.db.crud.teams import (
+    get_teams, get_team, create_team, update_team, delete_team,
+    get_team_members, set_member_team, remove_member_from_team
+)
+from app.schemas.schemas import (
+    TeamCreate, TeamResponse, TeamMemberCreate, TeamMemberResponse, TeamRollupResponse
+)
+from app.services.team_rollup import TeamRollupService
+from app.services.validation import ValidationService, ValidationError
+
+router = APIRouter(route_class=TimedRoute)
+
+TEAM_NOT_FOUND = "Team not found"
+
+
+def _member_response(membership) -> TeamMemberResponse:
+    result = TeamMemberResponse.model_validate(membership)
+    result.member_name = membership.member.name if membership.member else None
+    return result
+
+
+@router.get("/", response_model=List[TeamResponse])
+def list_teams(db: Session = Depends(get_read_db)):
+    """Alle Teams (flach, Hierarchie über parent_team_id)"""
+    return get_teams(db)
+
+
+@router.get("/{team_id}", response_model=TeamResponse)
+def get_team_by_id(team_id: int, db: Session = Depends(get_read_db)):
+    """Ein Team by ID abrufen"""
+    team = get_team(db, team_id=team_id)
+    if not team:
+        raise HTTPException(status_code=404, detail=TEAM_NOT_FOUND)
+    return team
+
+
+@router.post("/", response_model=TeamResponse)
+def create_new_team(team: TeamCreate, db: Session = Depends(get_db)):
+    """Neues Team erstellen (optional unter einem Parent-Team)"""
+    try:
+        ValidationService(db).validate_team_parent(None, team.parent_team_id)
+        return create_team(db, team=team)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.message)
+
+
+@router.put("/{team_id}", response_model=TeamResponse)
+def update_team_by_id(team_id: int, team_update: TeamCreate, db: Session = Depends(get_db)):
+    """Team umbenennen oder umhängen"""
+    try:
+        ValidationService(db).validate_team_parent(team_id, team_update.parent_team_id)
+        team = update_team(db, team_id=team_id, team_update=team_update.model_dump())
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.message)
+
+    if not team:
+        raise HTTPException(status_code=404, detail=TEAM_NOT_FOUND)
+    return team
+
+
+@router.delete("/{team_id}")
+def delete_team_by_id(team_id: int, db: Session = Depends(get_db)):
+    """Team löschen (nur ohne Sub-Teams)"""
+    try:
+        success = delete_team(db, team_id=team_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if not success:
+        raise HTTPException(status_code=404, detail=TEAM_NOT_FOUND)
+    return {"message": "Team deleted successfully"}
+
+
+@router.get("/{team_id}/members", response_model=List[TeamMemberResponse])
+def list_team_members(team_id: int, db: Session = Depends(get_read_db)):
+    """Direkte Members eines Teams"""
+    if not get_team(db, team_id=team_id):
+        raise HTTPException(status_code=404, detail=TEAM_NOT_FOUND)
+    return [_member_response(m) for m in get_team_members(db, team_id=team_id)]
+
+
+@router.post("/{team_id}/members", response_model=TeamMemberResponse)
+def add_team_member(team_id: int, membership: TeamMemberCreate, db: Session = Depends(get_db)):
+    """Member einem Team zuordnen (verschiebt eine bestehende Zugehörigkeit)"""
+    if not get_team(db, team_id=team_id):
+        raise HTTPException(status_code=404, detail=TEAM_NOT_FOUND)
+    if not get_member(db, membership.member_id):
+        raise HTTPException(status_code=422, detail=f"Member {membership.member_id} not found")
+    return _member_response(set_member_team(db, team_id=team_id, member_id=membership.member_id))
+
+
+@router.delete("/{team_id}/members/{member_id}")
+def delete_team_member(team_id: int, member_id: int, db: Session = Depends(get_db)):
+    """Member aus Team entfernen"""
+    if not remove_member_from_team(db, team_id=team_id, member_id=member_id):
+        raise HTTPException(status_code=404, detail="Team membership not found")
+    return {"message": "Member removed from team"}
+
+
+@router.get("/{team_id}/rollup", response_model=TeamRollupResponse)
+def get_team_rollup(
+    team_id: int,
+    sprint_ids: Optional[List[int]] = Query(None, description="Sprints (Default: laufende Sprints)"),
+    db: Session = Depends(get_read_db)
+):
+    """Kapazität je Tag und Sprint, bottom-up über alle Sub-Teams aggregiert"""
+    rollup = TeamRollupService(db).rollup(team_id, sprint_ids)
+    if rollup is None:
+        raise HTTPException(status_code=404, detail=TEAM_NOT_FOUND)
+    return rollup
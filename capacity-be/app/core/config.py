@@ -22,6 +22,60 @@ class Settings(BaseSettings):
     SQLALCHEMY_POOL_TIMEOUT: int = 30
     SQLALCHEMY_POOL_RECYCLE: int = 3600
 
+    # Startup: Schema-Check mit Retries, Migrationen nur im designierten Prozess
+    DB_MIGRATE_ON_STARTUP: bool = False
+    DB_STARTUP_RETRIES: int = 5
+    DB_STARTUP_BACKOFF_SECONDS: float = 0.5  # verdoppelt sich je Versuch (max. 8s)
+
+    # Read Replica (optional) - GET-Endpoints lesen vom Replica, Writes gehen an MYSQL_URL
+    MYSQL_REPLICA_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: int = 5  # Reads nach einem Write so lange vom Primary
+    REPLICA_RETRY_SECONDS: int = 30  # Pause nach Replica-Ausfall, bevor es erneut versucht wird
+
+    # Request Timing (Server-Timing Header + strukturierte Logs)
+    REQUEST_TIMING_ENABLED: bool = False
+    REQUEST_TIMING_SAMPLE_RATE: float = 1.0  # 0.0 - 1.0
+    REQUEST_TIMING_HEADER: bool = True
+    REQUEST_TIMING_LOG: bool = True
+
+    # Prometheus Metrics (GET /metrics, ohne Auth - nur hinter internem Netz/Proxy aktivieren)
+    METRICS_ENABLED: bool = False
+
+    # Materialisierte Tageskapazität (member_day_capacity) bei Schreibzugriffen pflegen
+    CAPACITY_FACTS_ENABLED: bool = True
+
+    # Monte-Carlo-Forecast
+    FORECAST_SIMULATIONS: int = 2000
+    FORECAST_MIN_SIMULATIONS: int = 200
+    FORECAST_MAX_SIMULATIONS: int = 20000
+    FORECAST_MAX_CELLS: int = 100_000_000  # Simulationen × Members × Tage je Request (Latenz-Budget)
+    FORECAST_HISTORY_DAYS: int = 365
+    FORECAST_ABSENCE_TYPES: str = "sick,personal"  # ungeplante PTO-Typen (kommagetrennt)
+    FORECAST_PRIOR_WEIGHT_DAYS: int = 60  # Glättung Member-Rate → Team-Rate
+    FORECAST_MIN_EPISODES: int = 3  # darunter Team-Längenverteilung
+    FORECAST_WORKERS: int = 0  # Process Pool, 0 = CPU-Anzahl
+    FORECAST_POOL_MIN_SPRINTS: int = 4  # ab so vielen Sprints Process Pool
+
+    # Export (CSV/XLSX-Streaming)
+    EXPORT_BATCH_MEMBERS: int = 250  # Members je Berechnungs-Batch (begrenzt den Speicher je Request)
+    EXPORT_MAX_DAYS: int = 366  # max. Zeitraum eines Multi-Sprint-Exports
+    FACT_EXPORT_BATCH_ROWS: int = 100_000  # Zeilen je Arrow-Batch / Parquet Row Group
+
+    # Change Events (SSE je Sprint)
+    EVENTS_ENABLED: bool = True
+    EVENTS_BROKER: str = "memory"  # oder "paket.modul:Klasse" (EventBroker) für mehrere Worker
+    EVENTS_QUEUE_SIZE: int = 100  # Events je Abonnent, danach `resync`
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    # Aufgelöste Feiertagskalender je Region und Jahr cachen (0 = aus)
+    HOLIDAY_CACHE_SECONDS: int = 300
+
+    # Roster-Writes ablehnen, die einen Member über parallele Sprints auf mehr als 100% bringen
+    ROSTER_ALLOCATION_CHECK: bool = False
+
+    # Batch-Requests (POST /batch)
+    BATCH_MAX_OPERATIONS: int = 50
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,203 @@
+"""
+Change Events (Push von Availability-Änderungen je Sprint)
+
+Schreibpfade melden kompakte Events (Override gesetzt/gelöscht, Roster
+geändert, PTO im Sprint) mit queue_event() an ihre Session. Veröffentlicht
+wird erst nach erfolgreichem Commit (SQLAlchemy after_commit); bei Rollback
+werden die Events verworfen.
+
+Fan-out über einen Broker:
+- InProcessBroker (Default): asyncio-Queues je Abonnent im selben Prozess
+- Für mehrere Worker EVENTS_BROKER auf eine eigene EventBroker-Klasse
+  setzen ("paket.modul:Klasse", z.B. Redis Pub/Sub), die publish() an alle
+  Worker verteilt und dort lokal an die Abonnenten ausliefert
+
+Läuft ein Abonnent voll (EVENTS_QUEUE_SIZE), erhält er statt weiterer
+Events ein `resync`-Event und sollte die Matrix einmal neu laden.
+"""
+import asyncio
+import importlib
+import itertools
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, List, Optional, Set
+
+from prometheus_client import Counter
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+PENDING_EVENTS_KEY = "pending_change_events"
+DEFER_EVENTS_KEY = "defer_change_events"
+RESYNC_EVENT = {"type": "resync"}
+
+EVENTS_PUBLISHED = Counter("change_events_published_total", "Published change events", ("type",), registry=registry)
+EVENTS_DROPPED = Counter(
+    "change_events_dropped_total", "Subscribers reset to resync (queue full)", registry=registry)
+
+_sequence = itertools.count(1)
+
+
+def sprint_channel(sprint_id: int) -> str:
+    return f"sprint:{sprint_id}"
+
+
+class Subscription:
+    """Ein Abonnent eines Channels (eine asyncio-Queue im Event Loop des Abonnenten)"""
+
+    def __init__(self, broker: "EventBroker", channel: str, queue_size: int):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def deliver(self, message: Dict[str, Any]) -> None:
+        """Thread-safe zustellen (Schreibpfade laufen im Threadpool)"""
+        try:
+            self.loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            # Event Loop des Abonnenten ist beendet - Abo entfernen, die übrigen beliefern
+            logger.warning(f"Dropping subscription on {self.channel}: event loop is closed")
+            self.close()
+
+    def _put(self, message: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Abonnent kommt nicht hinterher: Rückstand verwerfen, Client lädt neu
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+            EVENTS_DROPPED.inc()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Nächstes Event, None bei Timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class EventBroker(ABC):
+    """Schnittstelle für Event-Broker"""
+
+    @abstractmethod
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> Subscription:
+        ...
+
+    @abstractmethod
+    def unsubscribe(self, subscription: Subscription) -> None:
+        ...
+
+
+class InProcessBroker(EventBroker):
+    """Fan-out an alle Abonnenten im aktuellen Prozess"""
+
+    def __init__(self, queue_size: Optional[int] = None):
+        self.queue_size = queue_size or settings.EVENTS_QUEUE_SIZE
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.deliver(message)
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+
+_broker: Optional[EventBroker] = None
+
+
+def get_broker() -> EventBroker:
+    """Konfigurierten Broker liefern (EVENTS_BROKER: "memory" oder "paket.modul:Klasse")"""
+    global _broker
+    if _broker is None:
+        if settings.EVENTS_BROKER == "memory":
+            _broker = InProcessBroker()
+        else:
+            module_name, _, class_name = settings.EVENTS_BROKER.partition(":")
+            _broker = getattr(importlib.import_module(module_name), class_name)()
+    return _broker
+
+
+def set_broker(broker: Optional[EventBroker]) -> None:
+    """Broker ersetzen (Tests, eigene Deployments); None = beim nächsten Zugriff neu aus Settings"""
+    global _broker
+    _broker = broker
+
+
+def queue_event(
+    db: Session, sprint_id: int, event_type: str, dedupe_key: Optional[Hashable] = None, **payload: Any
+) -> None:
+    """
+    Event für den Sprint vormerken - veröffentlicht wird nach dem Commit der Session
+
+    dedupe_key: je (Sprint, Event-Typ, dedupe_key) wird nur das zuletzt vorgemerkte
+    Event veröffentlicht (z.B. alter und neuer Zeitraum eines PTO-Updates im selben Sprint)
+    """
+    if not settings.EVENTS_ENABLED:
+        return
+    key = (event_type, dedupe_key) if dedupe_key is not None else None
+    db.info.setdefault(PENDING_EVENTS_KEY, []).append(
+        (sprint_channel(sprint_id), key, {"type": event_type, "sprint_id": sprint_id, **payload})
+    )
+
+
+def publish_pending(session: Session) -> None:
+    """Vorgemerkte Events veröffentlichen (after_commit, außer die Session läuft in einer äußeren Transaktion)"""
+    if session.info.get(DEFER_EVENTS_KEY):
+        return
+    pending: List = session.info.pop(PENDING_EVENTS_KEY, None)
+    if not pending:
+        return
+    latest = {(channel, key): i for i, (channel, key, _) in enumerate(pending) if key is not None}
+    broker = get_broker()
+    for i, (channel, key, message) in enumerate(pending):
+        if key is not None and latest[(channel, key)] != i:
+            continue
+        message = {"id": next(_sequence), **message}
+        try:
+            broker.publish(channel, message)
+            EVENTS_PUBLISHED.labels(type=message["type"]).inc()
+        except Exception:
+            # Der Write ist bereits committed - Push-Fehler dürfen ihn nicht scheitern lassen
+            logger.exception("Publishing change event failed")
+
+
+def discard_pending(session: Session, *args) -> None:
+    """Vorgemerkte Events verwerfen (after_rollback)"""
+    session.info.pop(PENDING_EVENTS_KEY, None)
+
+
+event.listen(Session, "after_commit", publish_pending)
+event.listen(Session, "after_rollback", discard_pending)
@@ -0,0 +1,151 @@
+"""
+Import-Time Report
+
+Misst Importzeiten mit `python -X importtime` in einem frischen Prozess und
+prüft Budgets für App- und CLI-Einstiegspunkte:
+- Gesamtzeit (kumulativ) je Einstiegsmodul in ms
+- Module, die beim Import nicht geladen werden dürfen (Alembic, Export-Libs, ...)
+
+Aufruf (aus capacity-be/):
+    python -m app.core.importtime                  # Report für alle Einstiegspunkte
+    python -m app.core.importtime app.main --top 30
+    python -m app.core.importtime --check          # Exit-Code 1 bei Budget-Verletzung
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Kumulative Importzeit je Einstiegspunkt (ms, bester von mehreren Läufen)
+IMPORT_BUDGETS_MS: Dict[str, float] = {
+    "app.main": 2000,
+    "app.db.crud.sprints": 1200,
+    "app.db.synthetic": 1200,
+}
+
+# Schwere Abhängigkeiten, die nur bei Bedarf (lazy) geladen werden
+FORBIDDEN_IMPORTS: Dict[str, List[str]] = {
+    "app.main": ["alembic", "numpy", "pyarrow", "xlsxwriter"],
+    # CLI-Pfade (seed.py, update_sprint_status.py) brauchen kein Web-Framework
+    "app.db.crud.sprints": ["alembic", "fastapi", "starlette"],
+    "app.db.synthetic": ["alembic", "fastapi", "starlette"],
+}
+
+_LINE_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+@dataclass
+class ImportEntry:
+    """Eine Zeile aus -X importtime"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportReport:
+    """Importzeiten eines Einstiegsmoduls"""
+    module: str
+    entries: List[ImportEntry]
+
+    @property
+    def total_ms(self) -> float:
+        for entry in self.entries:
+            if entry.module == self.module and entry.depth == 0:
+                return entry.cumulative_us / 1000
+        return sum(entry.self_us for entry in self.entries) / 1000
+
+    @property
+    def loaded(self) -> set:
+        return {entry.module for entry in self.entries}
+
+    def loaded_packages(self, package: str) -> List[str]:
+        return sorted(m for m in self.loaded if m == package or m.startswith(package + "."))
+
+    def top(self, count: int, key: str = "cumulative_us") -> List[ImportEntry]:
+        return sorted(self.entries, key=lambda entry: getattr(entry, key), reverse=True)[:count]
+
+
+def parse_importtime(output: str) -> List[ImportEntry]:
+    """stderr von -X importtime parsen"""
+    entries = []
+    for line in output.splitlines():
+        match = _LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append(ImportEntry(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def measure_imports(module: str, repeat: int = 3) -> ImportReport:
+    """Modul `repeat` mal in frischen Prozessen importieren, schnellsten Lauf liefern"""
+    best: Optional[ImportReport] = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_ROOT,
+            env=dict(os.environ, PYTHONPATH=PROJECT_ROOT),
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Import von {module} fehlgeschlagen:\n{result.stderr[-2000:]}")
+        report = ImportReport(module, parse_importtime(result.stderr))
+        if best is None or report.total_ms < best.total_ms:
+            best = report
+    return best
+
+
+def check_budget(report: ImportReport) -> List[str]:
+    """Verletzungen von Zeit-Budget und verbotenen Imports"""
+    violations = []
+    budget = IMPORT_BUDGETS_MS.get(report.module)
+    if budget is not None and report.total_ms > budget:
+        violations.append(f"{report.module}: {report.total_ms:.0f}ms > Budget {budget:.0f}ms")
+    for package in FORBIDDEN_IMPORTS.get(report.module, []):
+        if report.loaded_packages(package):
+            violations.append(f"{report.module}: lädt {package} beim Import")
+    return violations
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import-Time Report (python -X importtime)")
+    parser.add_argument("modules", nargs="*", default=list(IMPORT_BUDGETS_MS))
+    parser.add_argument("--top", type=int, default=15, help="Anzahl langsamster Module je Einstiegspunkt")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check", action="store_true", help="Exit-Code 1 bei Budget-Verletzung")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    violations = []
+
+    for module in args.modules:
+        report = measure_imports(module, args.repeat)
+        budget = IMPORT_BUDGETS_MS.get(module)
+        budget_text = f" (Budget {budget:.0f}ms)" if budget is not None else ""
+        print(f"\n📦 {module}: {report.total_ms:.0f}ms, {len(report.loaded)} Module{budget_text}")
+        print(f"   {'kumulativ':>10} {'self':>8}  Modul")
+        for entry in report.top(args.top):
+            print(f"   {entry.cumulative_us / 1000:>8.1f}ms {entry.self_us / 1000:>6.1f}ms  {entry.module}")
+        violations.extend(check_budget(report))
+
+    if violations:
+        print("\n❌ Import-Budget verletzt:")
+        for violation in violations:
+            print(f"   - {violation}")
+        return 1 if args.check else 0
+
+    print("\n✅ Alle Import-Budgets eingehalten")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Prometheus Metrics
+
+Metriken auf Basis von `prometheus_client` in einer eigenen Registry,
+ausgeliefert über `GET /metrics` (nur mit METRICS_ENABLED):
+- HTTP: Latenz-Histogramm und Request-Zähler je Route-Template/Status
+- SQLAlchemy-Pool: checked out, overflow, size, checked in, Checkout-Wartezeit
+- Availability-Engine: Dauer je Phase (Roster, Feiertage, PTO, Overrides, Berechnung)
+- Caches: Hits/Misses je Cache inkl. Hit-Ratio (u.a. SQLAlchemy Statement-Cache)
+
+Hinweis: Werte gelten pro Prozess - bei mehreren uvicorn-Workern je Worker scrapen.
+"""
+import threading
+import time
+from typing import Set
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Prometheus-Standard-Buckets (Sekunden)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+# Feinere Buckets für Pool-Wartezeit und Engine-Phasen
+FAST_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+
+# Eigene Registry statt der globalen REGISTRY (keine Prozess-/GC-Collectors, isoliert testbar)
+registry = CollectorRegistry()
+
+
+def render() -> bytes:
+    """Alle Metriken im Prometheus-Textformat"""
+    return generate_latest(registry)
+
+
+def sample_value(name: str, **labels: str) -> float:
+    """Aktuellen Wert eines Samples (z.B. `http_requests_total`, `..._count`), 0.0 wenn unbekannt"""
+    return registry.get_sample_value(name, labels) or 0.0
+
+
+# HTTP
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template, method and status", ("method", "route", "status"),
+    registry=registry)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"),
+    buckets=DEFAULT_BUCKETS, registry=registry)
+
+# SQLAlchemy Connection Pool
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool", ("pool",), registry=registry)
+POOL_CHECKED_IN = Gauge(
+    "db_pool_checked_in", "Idle connections in the pool", ("pool",), registry=registry)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections opened beyond pool_size (max_overflow usage)", ("pool",), registry=registry)
+POOL_SIZE = Gauge(
+    "db_pool_size", "Configured pool_size", ("pool",), registry=registry)
+POOL_MAX_OVERFLOW = Gauge(
+    "db_pool_max_overflow", "Configured max_overflow", ("pool",), registry=registry)
+POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ("pool",),
+    buckets=FAST_BUCKETS, registry=registry)
+
+# Availability-Engine
+AVAILABILITY_PHASE = Histogram(
+    "availability_engine_phase_seconds", "Availability matrix computation time by phase", ("phase",),
+    buckets=FAST_BUCKETS, registry=registry)
+
+# Caches
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit/miss)", ("cache", "result"), registry=registry)
+CACHE_HIT_RATIO = Gauge(
+    "cache_hit_ratio", "Cache hit ratio since process start", ("cache",), registry=registry)
+
+_hit_ratio_caches: Set[str] = set()
+_hit_ratio_lock = threading.Lock()
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Cache-Lookup zählen und Hit-Ratio-Gauge registrieren"""
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+    if cache not in _hit_ratio_caches:
+        with _hit_ratio_lock:
+            if cache not in _hit_ratio_caches:
+                CACHE_HIT_RATIO.labels(cache=cache).set_function(lambda: cache_hit_ratio(cache))
+                _hit_ratio_caches.add(cache)
+
+
+def cache_hit_ratio(cache: str) -> float:
+    # Direkt aus dem Counter lesen: registry.get_sample_value() würde beim Scrape
+    # den Hit-Ratio-Gauge selbst erneut abfragen
+    counts = {"hit": 0.0, "miss": 0.0}
+    for metric in CACHE_REQUESTS.collect():
+        for sample in metric.samples:
+            if sample.name == "cache_requests_total" and sample.labels.get("cache") == cache:
+                counts[sample.labels["result"]] = sample.value
+    total = counts["hit"] + counts["miss"]
+    return counts["hit"] / total if total else 0.0
+
+
+def instrument_pool(engine: Engine, name: str = "primary") -> None:
+    """
+    Pool-Gauges und Checkout-Wartezeit für eine Engine erfassen (idempotent)
+
+    Nur für Pools mit Größenangaben (QueuePool); SQLite-Static/Null-Pools
+    liefern nur die Wartezeit.
+    """
+    pool = engine.pool
+    if getattr(pool, "_metrics_instrumented", False):
+        return
+
+    if hasattr(pool, "checkedout"):
+        # Immer den aktuellen Pool lesen - engine.dispose() ersetzt ihn
+        POOL_CHECKED_OUT.labels(pool=name).set_function(lambda: engine.pool.checkedout())
+        POOL_CHECKED_IN.labels(pool=name).set_function(lambda: engine.pool.checkedin())
+        POOL_OVERFLOW.labels(pool=name).set_function(lambda: max(0, engine.pool.overflow()))
+        POOL_SIZE.labels(pool=name).set_function(lambda: engine.pool.size())
+        POOL_MAX_OVERFLOW.labels(pool=name).set(getattr(pool, "_max_overflow", 0))
+
+    original_connect = pool.connect
+    wait = POOL_WAIT.labels(pool=name)
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return original_connect()
+        finally:
+            wait.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+    pool._metrics_instrumented = True
+
+
+def instrument_statement_cache(engine: Engine) -> None:
+    """Treffer des SQLAlchemy Compiled-Statement-Caches zählen (idempotent)"""
+    if event.contains(engine, "after_cursor_execute", _record_statement_cache):
+        return
+    event.listen(engine, "after_cursor_execute", _record_statement_cache)
+
+
+def _record_statement_cache(conn, cursor, statement, parameters, context, executemany):
+    cache_hit = getattr(context, "cache_hit", None)
+    if cache_hit in (CacheStats.CACHE_HIT, CacheStats.CACHE_MISS):
+        record_cache_lookup("sqlalchemy_statement", cache_hit == CacheStats.CACHE_HIT)
+
+
+class MetricsMiddleware:
+    """
+    Latenz und Status je Route-Template (nicht je Pfad, um Label-Kardinalität zu begrenzen)
+
+    Reine ASGI-Middleware: kein Starlette-Import beim Laden des Moduls
+    (Services importieren die Metriken auch in CLI-Skripten) und kein
+    Overhead von BaseHTTPMiddleware.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Der Router trägt die gematchte Route in den Scope ein
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_LATENCY.labels(method=scope["method"], route=route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method=scope["method"], route=route, status=str(status)).inc()
@@ -0,0 +1,182 @@
+"""
+Request Timing
+
+Misst pro Request:
+- Wall-Time des gesamten Requests
+- Anzahl und Gesamtdauer der SQL-Statements (SQLAlchemy Engine-Events)
+- Zeit im Endpoint (Python-Berechnung inkl. SQL)
+- Serialisierung (Response-Validierung + JSON-Encoding, plus Request-Parsing)
+
+Ausgabe als `Server-Timing`-Header und als strukturierte JSON-Logzeile.
+Aktivierung und Sampling über Settings (REQUEST_TIMING_*).
+"""
+import asyncio
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+logger = logging.getLogger("app.timing")
+
+
+@dataclass
+class RequestTiming:
+    """Messwerte eines einzelnen Requests"""
+    sql_count: int = 0
+    sql_ms: float = 0.0
+    endpoint_ms: float = 0.0
+    endpoint_sql_ms: float = 0.0  # SQL-Anteil innerhalb des Endpoints
+    handler_ms: float = 0.0
+
+    def record_endpoint(self, started: float, sql_ms_before: float) -> None:
+        self.endpoint_ms += (time.perf_counter() - started) * 1000
+        self.endpoint_sql_ms += self.sql_ms - sql_ms_before
+
+
+# Timing des aktuellen Requests - None wenn nicht gesampelt
+_current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def current_timing() -> Optional[RequestTiming]:
+    """Timing des laufenden Requests (falls gesampelt)"""
+    return _current_timing.get()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """SQL-Statements einer Engine dem laufenden Request zurechnen (idempotent)"""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.sql_count += 1
+        timing.sql_ms += (time.perf_counter() - started) * 1000
+
+
+def _timed_endpoint(call: Callable) -> Callable:
+    """Endpoint-Funktion wrappen - sync bleibt sync, async bleibt async"""
+    if asyncio.iscoroutinefunction(call):
+        @wraps(call)
+        async def async_wrapper(*args, **kwargs):
+            timing = _current_timing.get()
+            if timing is None:
+                return await call(*args, **kwargs)
+            started, sql_ms_before = time.perf_counter(), timing.sql_ms
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                timing.record_endpoint(started, sql_ms_before)
+        return async_wrapper
+
+    @wraps(call)
+    def sync_wrapper(*args, **kwargs):
+        timing = _current_timing.get()
+        if timing is None:
+            return call(*args, **kwargs)
+        started, sql_ms_before = time.perf_counter(), timing.sql_ms
+        try:
+            return call(*args, **kwargs)
+        finally:
+            timing.record_endpoint(started, sql_ms_before)
+    return sync_wrapper
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute mit Zeitmessung für Endpoint und Route-Handler
+
+    Die Differenz Handler - Endpoint ist die Zeit für Request-Parsing,
+    Dependencies, Response-Validierung und Serialisierung.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Der Handler liest dependant.call erst beim Aufruf
+        self.dependant.call = _timed_endpoint(self.dependant.call)
+
+    def get_route_handler(self) -> Callable:
+        original_handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            started = time.perf_counter()
+            try:
+                return await original_handler(request)
+            finally:
+                timing = _current_timing.get()
+                if timing is not None:
+                    timing.handler_ms += (time.perf_counter() - started) * 1000
+
+        return timed_handler
+
+
+class RequestTimingMiddleware(BaseHTTPMiddleware):
+    """Server-Timing-Header und strukturierte Logzeile für gesampelte Requests"""
+
+    def __init__(self, app, sample_rate: float = 1.0, emit_header: bool = True, emit_log: bool = True):
+        super().__init__(app)
+        self.sample_rate = sample_rate
+        self.emit_header = emit_header
+        self.emit_log = emit_log
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return await call_next(request)
+
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            _current_timing.reset(token)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        # SQL außerhalb des Endpoints (z.B. Lazy Loads beim Serialisieren) zählt nur als SQL
+        outside_sql_ms = timing.sql_ms - timing.endpoint_sql_ms
+        serialize_ms = max(0.0, timing.handler_ms - timing.endpoint_ms - outside_sql_ms)
+        app_ms = max(0.0, timing.endpoint_ms - timing.endpoint_sql_ms)
+
+        if self.emit_header:
+            response.headers["Server-Timing"] = ", ".join([
+                f"total;dur={total_ms:.1f}",
+                f'sql;dur={timing.sql_ms:.1f};desc="{timing.sql_count} queries"',
+                f"app;dur={app_ms:.1f}",
+                f"serialize;dur={serialize_ms:.1f}",
+            ])
+
+        if self.emit_log:
+            route = request.scope.get("route")
+            logger.info(json.dumps({
+                "event": "request_timing",
+                "method": request.method,
+                "path": request.url.path,
+                "route": getattr(route, "path", None),
+                "status": response.status_code,
+                "total_ms": round(total_ms, 2),
+                "sql_count": timing.sql_count,
+                "sql_ms": round(timing.sql_ms, 2),
+                "app_ms": round(app_ms, 2),
+                "serialize_ms": round(serialize_ms, 2),
+            }))
+
+        return response
@@ -1,29 +1,79 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
-# SQLAlchemy Engine erstellen
-engine = create_engine(
-    settings.MYSQL_URL,
-    pool_size=settings.SQLALCHEMY_POOL_SIZE,
-    max_overflow=settings.SQLALCHEMY_MAX_OVERFLOW,
-    pool_timeout=settings.SQLALCHEMY_POOL_TIMEOUT,
-    pool_recycle=settings.SQLALCHEMY_POOL_RECYCLE,
-    echo=settings.DEBUG,  # SQL Queries loggen wenn DEBUG=True
-)
-
-# Session Factory
+
+def _create_engine(url: str, **kwargs):
+    # SQLite (lokale Lasttests/Benchmarks) braucht Connections über Threadgrenzen hinweg
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    return create_engine(
+        url,
+        pool_size=settings.SQLALCHEMY_POOL_SIZE,
+        max_overflow=settings.SQLALCHEMY_MAX_OVERFLOW,
+        pool_timeout=settings.SQLALCHEMY_POOL_TIMEOUT,
+        pool_recycle=settings.SQLALCHEMY_POOL_RECYCLE,
+        connect_args=connect_args,
+        echo=settings.DEBUG,  # SQL Queries loggen wenn DEBUG=True
+        **kwargs
+    )
+
+
+# SQLAlchemy Engine erstellen (Primary - alle Writes)
+engine = _create_engine(settings.MYSQL_URL)
+
+# Optionaler Read Replica; pre_ping erkennt tote Connections, bevor ein Read darauf läuft
+replica_engine = _create_engine(settings.MYSQL_REPLICA_URL, pool_pre_ping=True) if settings.MYSQL_REPLICA_URL else None
+
+# Session Factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine else None
 
 # Declarative Base für Models
 Base = declarative_base()
 
 
+def mark_read_only(db):
+    """Session als read-only markieren (keine Writes in CRUD-Funktionen)"""
+    db.info["read_only"] = True
+    return db
+
+
+def is_read_only(db) -> bool:
+    return db.info.get("read_only", False)
+
+
+# Gemeinsame Session der Sub-Requests eines Batch-Requests (POST /batch)
+_batch_session: ContextVar[Optional[Session]] = ContextVar("batch_session", default=None)
+
+
+def current_batch_session() -> Optional[Session]:
+    """Session des laufenden Batch-Requests, sonst None"""
+    return _batch_session.get()
+
+
+@contextmanager
+def batch_session_scope(db: Session):
+    """Alle DB-Dependencies im Block liefern diese Session (Schließen übernimmt der Batch)"""
+    token = _batch_session.set(db)
+    try:
+        yield db
+    finally:
+        _batch_session.reset(token)
+
+
 # Dependency für FastAPI
 def get_db():
     """Database Session Dependency für FastAPI"""
+    batch = current_batch_session()
+    if batch is not None:
+        yield batch
+        return
     db = SessionLocal()
     try:
         yield db
@@ -0,0 +1,62 @@
+"""
+CRUD Operations für Feiertage
+"""
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.db.models.holidays import Holiday
+from app.schemas.schemas import HolidayCreate
+from app.services.capacity_facts import refresh_region_capacity_facts
+
+
+def get_holidays(db: Session, region_code: Optional[str] = None) -> List[Holiday]:
+    """Feiertage abrufen (optional je Region)"""
+    query = db.query(Holiday)
+    if region_code:
+        query = query.filter(Holiday.region_code == region_code)
+    return query.order_by(Holiday.date).all()
+
+
+def get_holiday(db: Session, holiday_id: int) -> Optional[Holiday]:
+    """Ein Feiertag by ID"""
+    return db.query(Holiday).filter(Holiday.holiday_id == holiday_id).first()
+
+
+def create_holiday(db: Session, holiday: HolidayCreate) -> Holiday:
+    """Neuen Feiertag erstellen"""
+    db_holiday = Holiday(**holiday.model_dump())
+    db.add(db_holiday)
+    refresh_region_capacity_facts(db, db_holiday.region_code, db_holiday.date, db_holiday.is_company_day)
+    db.commit()
+    db.refresh(db_holiday)
+    return db_holiday
+
+
+def update_holiday(db: Session, holiday_id: int, holiday_update: dict) -> Optional[Holiday]:
+    """Feiertag aktualisieren (Datum-/Region-/Company-Day-Wechsel: alter und neuer Slice)"""
+    db_holiday = get_holiday(db, holiday_id)
+    if not db_holiday:
+        return None
+
+    old_slice = (db_holiday.region_code, db_holiday.date, db_holiday.is_company_day)
+    for field, value in holiday_update.items():
+        if hasattr(db_holiday, field):
+            setattr(db_holiday, field, value)
+
+    new_slice = (db_holiday.region_code, db_holiday.date, db_holiday.is_company_day)
+    for region_code, day, company_wide in {old_slice, new_slice}:
+        refresh_region_capacity_facts(db, region_code, day, company_wide)
+    db.commit()
+    db.refresh(db_holiday)
+    return db_holiday
+
+
+def delete_holiday(db: Session, holiday_id: int) -> bool:
+    """Feiertag löschen"""
+    db_holiday = get_holiday(db, holiday_id)
+    if not db_holiday:
+        return False
+
+    db.delete(db_holiday)
+    refresh_region_capacity_facts(db, db_holiday.region_code, db_holiday.date, db_holiday.is_company_day)
+    db.commit()
+    return True
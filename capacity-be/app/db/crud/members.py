@@ -1,10 +1,16 @@
 """
 CRUD Operations für Members
 """
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from sqlalchemy.orm import Session
 from app.db.models.members import Member
 from app.schemas.schemas import MemberCreate
+from app.services.capacity_facts import refresh_capacity_facts
+
+# Felder, die die Tageskapazität beeinflussen (Stunden bzw. regionale Feiertage)
+CAPACITY_FIELDS = ("employment_ratio", "region_code")
+# Felder für Sparse Fieldsets
+MEMBER_FIELDS = ("member_id", "name", "employment_ratio", "region_code", "active")
 
 
 def get_members(db: Session, skip: int = 0, limit: int = 100) -> List[Member]:
@@ -22,6 +28,24 @@ def get_member(db: Session, member_id: int) -> Optional[Member]:
     return db.query(Member).filter(Member.member_id == member_id).first()
 
 
+def get_member_fields(
+    db: Session,
+    fields: Sequence[str],
+    member_id: Optional[int] = None,
+    include_inactive: bool = False,
+    skip: int = 0,
+    limit: int = 100
+) -> List[dict]:
+    """Members als Dicts mit nur den angefragten Feldern (lädt nur diese Spalten)"""
+    columns = [getattr(Member, field) for field in MEMBER_FIELDS if field in fields]
+    query = db.query(*columns)
+    if member_id is not None:
+        query = query.filter(Member.member_id == member_id)
+    elif not include_inactive:
+        query = query.filter(Member.active == True)
+    return [dict(row._mapping) for row in query.offset(skip).limit(limit).all()]
+
+
 def create_member(db: Session, member: MemberCreate) -> Member:
     """Neuen Member erstellen"""
     db_member = Member(**member.model_dump())
@@ -37,10 +61,13 @@ def update_member(db: Session, member_id: int, member_update: dict) -> Optional[
     if not db_member:
         return None
 
+    before = {field: getattr(db_member, field) for field in CAPACITY_FIELDS}
     for field, value in member_update.items():
         if hasattr(db_member, field):
             setattr(db_member, field, value)
 
+    if any(getattr(db_member, field) != before[field] for field in CAPACITY_FIELDS):
+        refresh_capacity_facts(db, member_ids=[member_id])
     db.commit()
     db.refresh(db_member)
     return db_member
@@ -1,11 +1,16 @@
 """
 CRUD Operations für PTO (Personal Time Off)
 """
+from datetime import date
 from typing import List, Optional
 from sqlalchemy.orm import Session, joinedload
+from app.core.events import queue_event
 from app.db.models.pto import PTO
 from app.db.models.members import Member
+from app.db.models.sprints import Sprint
+from app.db.models.sprint_roster import SprintRoster
 from app.schemas.schemas import PTOCreate
+from app.services.capacity_facts import refresh_capacity_facts
 
 
 def get_pto_list(db: Session, member_id: Optional[int] = None, sprint_id: Optional[int] = None, skip: int = 0, limit: int = 100) -> List[PTO]:
@@ -18,7 +23,7 @@ def get_pto_list(db: Session, member_id: Optional[int] = None, sprint_id: Option
     if sprint_id:
         # Filter PTO die einen Sprint überlappen - dafür Sprint-Daten holen
         from app.db.crud.sprints import get_sprint
-        sprint = get_sprint(db, sprint_id)
+        sprint = get_sprint(db, sprint_id, include_stats=False)
         if sprint:
             query = query.filter(
                 PTO.from_date <= sprint.end_date,
@@ -28,6 +33,21 @@ def get_pto_list(db: Session, member_id: Optional[int] = None, sprint_id: Option
     return query.offset(skip).limit(limit).all()
 
 
+def _queue_pto_events(db: Session, action: str, db_pto: PTO, member_id: int, from_date: date, to_date: date):
+    """Change Event an alle Sprints, in deren Roster der Member im Zeitraum ist"""
+    db.flush()  # pto_id neuer Einträge
+    sprint_ids = db.query(Sprint.sprint_id).join(
+        SprintRoster, SprintRoster.sprint_id == Sprint.sprint_id
+    ).filter(
+        SprintRoster.member_id == member_id,
+        Sprint.start_date <= to_date,
+        Sprint.end_date >= from_date
+    ).all()
+    for (sprint_id,) in sprint_ids:
+        queue_event(db, sprint_id, "pto", dedupe_key=(db_pto.pto_id, action), action=action, pto_id=db_pto.pto_id,
+                    member_id=member_id, from_date=from_date.isoformat(), to_date=to_date.isoformat())
+
+
 def get_pto(db: Session, pto_id: int) -> Optional[PTO]:
     """Ein PTO-Eintrag by ID"""
     return db.query(PTO).options(joinedload(PTO.member)).filter(PTO.pto_id == pto_id).first()
@@ -35,8 +55,13 @@ def get_pto(db: Session, pto_id: int) -> Optional[PTO]:
 
 def create_pto(db: Session, pto: PTOCreate) -> PTO:
     """Neuen PTO-Eintrag erstellen"""
-    db_pto = PTO(**pto.model_dump())
+    data = pto.model_dump()
+    # Schema-Feld `description` entspricht der Spalte `notes`
+    data["notes"] = data.pop("description", None)
+    db_pto = PTO(**data)
     db.add(db_pto)
+    refresh_capacity_facts(db, member_ids=[db_pto.member_id], date_from=db_pto.from_date, date_to=db_pto.to_date)
+    _queue_pto_events(db, "created", db_pto, db_pto.member_id, db_pto.from_date, db_pto.to_date)
     db.commit()
     db.refresh(db_pto)
     return db_pto
@@ -48,10 +73,16 @@ def update_pto(db: Session, pto_id: int, pto_update: dict) -> Optional[PTO]:
     if not db_pto:
         return None
 
+    old_slice = (db_pto.member_id, db_pto.from_date, db_pto.to_date)
     for field, value in pto_update.items():
         if hasattr(db_pto, field):
             setattr(db_pto, field, value)
 
+    # Alten und neuen Zeitraum neu berechnen (neuer zuletzt: Sprints in beiden erhalten ein Event mit dem neuen)
+    new_slice = (db_pto.member_id, db_pto.from_date, db_pto.to_date)
+    for member_id, from_date, to_date in dict.fromkeys((old_slice, new_slice)):
+        refresh_capacity_facts(db, member_ids=[member_id], date_from=from_date, date_to=to_date)
+        _queue_pto_events(db, "updated", db_pto, member_id, from_date, to_date)
     db.commit()
     db.refresh(db_pto)
     return db_pto
@@ -64,5 +95,7 @@ def delete_pto(db: Session, pto_id: int) -> bool:
         return False
 
     db.delete(db_pto)
+    refresh_capacity_facts(db, member_ids=[db_pto.member_id], date_from=db_pto.from_date, date_to=db_pto.to_date)
+    _queue_pto_events(db, "deleted", db_pto, db_pto.member_id, db_pto.from_date, db_pto.to_date)
     db.commit()
     return True
@@ -1,11 +1,15 @@
 """
 CRUD Operations für Sprint Roster
 """
-from typing import List, Optional
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import delete, insert, update
 from sqlalchemy.orm import Session, joinedload
+from app.core.events import queue_event
 from app.db.models.sprint_roster import SprintRoster
 from app.db.models.members import Member
 from app.schemas.schemas import SprintRosterCreate, SprintRosterUpdate
+from app.services.capacity_facts import refresh_capacity_facts
 
 
 def get_sprint_roster(db: Session, sprint_id: int) -> List[SprintRoster]:
@@ -35,6 +39,9 @@ def add_member_to_sprint(db: Session, sprint_id: int, roster_data: SprintRosterC
         **roster_data.model_dump()
     )
     db.add(db_roster)
+    refresh_capacity_facts(db, member_ids=[roster_data.member_id], sprint_ids=[sprint_id])
+    queue_event(db, sprint_id, "roster", action="added", member_id=roster_data.member_id,
+                allocation=float(db_roster.allocation))
     db.commit()
     db.refresh(db_roster)
     return db_roster
@@ -51,6 +58,8 @@ def update_roster_entry(db: Session, sprint_id: int, member_id: int, roster_upda
         if hasattr(db_roster, field):
             setattr(db_roster, field, value)
 
+    refresh_capacity_facts(db, member_ids=[member_id], sprint_ids=[sprint_id])
+    queue_event(db, sprint_id, "roster", action="updated", member_id=member_id, allocation=float(db_roster.allocation))
     db.commit()
     db.refresh(db_roster)
     return db_roster
@@ -63,5 +72,56 @@ def remove_member_from_sprint(db: Session, sprint_id: int, member_id: int) -> bo
         return False
 
     db.delete(db_roster)
+    refresh_capacity_facts(db, member_ids=[member_id], sprint_ids=[sprint_id])
+    queue_event(db, sprint_id, "roster", action="removed", member_id=member_id)
     db.commit()
     return True
+
+
+def get_roster_windows(db: Session, sprint_id: int) -> Dict[int, Tuple[Optional[date], Optional[date]]]:
+    """member_id -> gespeichertes Assignment-Fenster für alle Members im Roster (eine Query, keine ORM-Objekte)"""
+    return {
+        member_id: (assignment_from, assignment_to)
+        for member_id, assignment_from, assignment_to in db.query(
+            SprintRoster.member_id, SprintRoster.assignment_from, SprintRoster.assignment_to
+        ).filter(SprintRoster.sprint_id == sprint_id)
+    }
+
+
+def _roster_change(action: str, row: Dict) -> Dict:
+    change = {"action": action, "member_id": row["member_id"]}
+    if row.get("allocation") is not None:
+        change["allocation"] = float(row["allocation"])
+    return change
+
+
+def apply_roster_changes(
+    db: Session,
+    sprint_id: int,
+    additions: Sequence[Dict],
+    updates: Sequence[Dict],
+    removals: Sequence[int]
+) -> None:
+    """
+    Mehrere Roster-Änderungen in einer Transaktion schreiben
+
+    additions/updates sind Spalten-Dicts je Member (updates nur mit den zu
+    ändernden Feldern); geschrieben wird per executemany bzw. einem DELETE,
+    danach ein Refresh der Tageskapazität für alle betroffenen Members.
+    """
+    if additions:
+        db.execute(insert(SprintRoster), [{"sprint_id": sprint_id, **row} for row in additions])
+    if updates:
+        db.execute(update(SprintRoster), [{"sprint_id": sprint_id, **row} for row in updates])
+    if removals:
+        db.execute(delete(SprintRoster).where(
+            SprintRoster.sprint_id == sprint_id,
+            SprintRoster.member_id.in_(removals)
+        ).execution_options(synchronize_session=False))
+
+    changes = [_roster_change("added", row) for row in additions] + [_roster_change("updated", row) for row in updates]
+    changes += [{"action": "removed", "member_id": member_id} for member_id in removals]
+    if changes:
+        refresh_capacity_facts(db, member_ids=[change["member_id"] for change in changes], sprint_ids=[sprint_id])
+        queue_event(db, sprint_id, "roster", action="bulk", changes=changes)
+    db.commit()
@@ -1,11 +1,27 @@
 """CRUD Operations für Sprints"""
-from typing import List, Optional
+import re
+from string import Formatter
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import func, case, literal, update, insert, select, true
+from app.db.base import is_read_only
+from app.db.functions import date_add
 from app.db.models.sprints import Sprint, SprintStatus
 from app.db.models.sprint_roster import SprintRoster
+from app.db.models.availability_overrides import AvailabilityOverride
 from app.schemas.schemas import SprintCreate, SprintUpdate
+from app.services.capacity_facts import refresh_capacity_facts
+
+# Felder für Sparse Fieldsets (Spalten des Sprints bzw. berechnete Statistik)
+SPRINT_FIELDS = ("sprint_id", "name", "start_date", "end_date", "status")
+STATISTICS_FIELDS = ("member_count", "total_capacity_hours", "working_days")
+DEFAULT_SPRINT_NAME_PATTERN = "Sprint {weeks} {year}"
+# Platzhalter in Namensmustern: Zahlen mit optionaler Breite/Nullen (max. 2 Stellen), Texte ohne Format
+SPRINT_NAME_NUMBER_FIELDS = ("n", "start_week", "end_week", "year")
+SPRINT_NAME_TEXT_FIELDS = ("weeks", "start", "end")
+_NUMBER_FORMAT_SPEC = re.compile(r"^(0?[1-9])?d?$")
 
 
 def calculate_status_from_dates(start_date: date, end_date: date) -> SprintStatus:
@@ -34,6 +50,27 @@ def calculate_working_days(start_date: date, end_date: date) -> int:
     return working_days
 
 
+def _statistics_from_aggregates(sprint: Sprint, member_count: Optional[int], total_allocation) -> dict:
+    """Statistik-Dict aus Roster-Aggregaten (Anzahl, Summe Allocation) berechnen"""
+    # Calculate working days
+    working_days = calculate_working_days(sprint.start_date, sprint.end_date)
+
+    # Calculate total capacity hours (assuming 8 hours per day)
+    total_capacity_hours = float(total_allocation or 0) * working_days * 8
+
+    return {
+        'member_count': member_count or 0,
+        'total_capacity_hours': total_capacity_hours,
+        'working_days': working_days
+    }
+
+
+def _apply_statistics(sprint: Sprint, stats: dict) -> None:
+    sprint.member_count = stats['member_count']
+    sprint.total_capacity_hours = stats['total_capacity_hours']
+    sprint.working_days = stats['working_days']
+
+
 def get_sprint_statistics(db: Session, sprint: Sprint) -> dict:
     """Get statistics for a sprint including member count and capacity"""
     # Get roster count and total allocation
@@ -42,63 +79,146 @@ def get_sprint_statistics(db: Session, sprint: Sprint) -> dict:
         func.sum(SprintRoster.allocation).label('total_allocation')
     ).filter(SprintRoster.sprint_id == sprint.sprint_id).first()
 
-    member_count = roster_stats.member_count or 0
-    total_allocation = float(roster_stats.total_allocation or 0)
+    return _statistics_from_aggregates(sprint, roster_stats.member_count, roster_stats.total_allocation)
 
-    # Calculate working days
-    working_days = calculate_working_days(sprint.start_date, sprint.end_date)
 
-    # Calculate total capacity hours (assuming 8 hours per day)
-    total_capacity_hours = total_allocation * working_days * 8
+def _roster_aggregates(db: Session, sprint_ids: Sequence[int]) -> Dict[int, object]:
+    """Roster-Anzahl und Summe Allocation je Sprint (eine gruppierte Query)"""
+    if not sprint_ids:
+        return {}
+    rows = db.query(
+        SprintRoster.sprint_id,
+        func.count(SprintRoster.member_id).label('member_count'),
+        func.sum(SprintRoster.allocation).label('total_allocation')
+    ).filter(
+        SprintRoster.sprint_id.in_(sprint_ids)
+    ).group_by(SprintRoster.sprint_id).all()
+    return {row.sprint_id: row for row in rows}
+
+
+def _statistics_for(sprint, aggregates: Dict[int, object]) -> dict:
+    row = aggregates.get(sprint.sprint_id)
+    return _statistics_from_aggregates(
+        sprint,
+        row.member_count if row else 0,
+        row.total_allocation if row else 0
+    )
 
-    return {
-        'member_count': member_count,
-        'total_capacity_hours': total_capacity_hours,
-        'working_days': working_days
-    }
+
+def attach_sprint_statistics(db: Session, sprints: List[Sprint]) -> None:
+    """Statistiken für mehrere Sprints mit einer gruppierten Query anhängen"""
+    aggregates = _roster_aggregates(db, [sprint.sprint_id for sprint in sprints])
+    for sprint in sprints:
+        _apply_statistics(sprint, _statistics_for(sprint, aggregates))
+
+
+def sync_sprint_statuses(db: Session) -> int:
+    """
+    Status aller Sprints mit einem einzigen UPDATE an das aktuelle Datum angleichen
+
+    Ändert nur Zeilen, deren gespeicherter Status abweicht; committet.
+    """
+    today = date.today()
+    status_type = Sprint.__table__.c.status.type
+    calculated_status = case(
+        (Sprint.start_date > today, literal(SprintStatus.PLANNED, status_type)),
+        (Sprint.end_date < today, literal(SprintStatus.FINISHED, status_type)),
+        else_=literal(SprintStatus.ACTIVE, status_type)
+    )
+
+    result = db.execute(
+        update(Sprint)
+        .where(Sprint.status != calculated_status)
+        .values(status=calculated_status)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def _set_status_in_memory(sprint: Sprint) -> None:
+    """Status nur im geladenen Objekt aktualisieren (read-only Sessions, z.B. Replica)"""
+    set_committed_value(sprint, 'status', calculate_status_from_dates(sprint.start_date, sprint.end_date))
 
 
-def get_sprints(db: Session, skip: int = 0, limit: int = 100, include_stats: bool = True) -> List[Sprint]:
+def get_sprints(db: Session, skip: int = 0, limit: int = 100, include_stats: bool = False) -> List[Sprint]:
     """Alle Sprints abrufen mit automatischer Status-Aktualisierung und optionalen Statistiken"""
+    read_only = is_read_only(db)
+    if not read_only:
+        # Status set-basiert aktualisieren, bevor geladen wird (kein Commit/Expire danach)
+        sync_sprint_statuses(db)
+
     sprints = db.query(Sprint).offset(skip).limit(limit).all()
 
-    # Update status for all sprints based on current date
-    for sprint in sprints:
-        calculated_status = calculate_status_from_dates(sprint.start_date, sprint.end_date)
-        if sprint.status != calculated_status:
-            sprint.status = calculated_status
+    if read_only:
+        for sprint in sprints:
+            _set_status_in_memory(sprint)
 
-        # Add statistics if requested
-        if include_stats:
-            stats = get_sprint_statistics(db, sprint)
-            sprint.member_count = stats['member_count']
-            sprint.total_capacity_hours = stats['total_capacity_hours']
-            sprint.working_days = stats['working_days']
+    # Add statistics if requested
+    if include_stats:
+        attach_sprint_statistics(db, sprints)
 
-    db.commit()
     return sprints
 
 
-def get_sprint(db: Session, sprint_id: int, include_stats: bool = True) -> Optional[Sprint]:
+def get_sprint(db: Session, sprint_id: int, include_stats: bool = False) -> Optional[Sprint]:
     """Ein Sprint by ID mit automatischer Status-Aktualisierung und optionalen Statistiken"""
     sprint = db.query(Sprint).filter(Sprint.sprint_id == sprint_id).first()
 
     if sprint:
         calculated_status = calculate_status_from_dates(sprint.start_date, sprint.end_date)
-        if sprint.status != calculated_status:
+        if is_read_only(db):
+            _set_status_in_memory(sprint)
+        elif sprint.status != calculated_status:
             sprint.status = calculated_status
             db.commit()
 
         # Add statistics if requested
         if include_stats:
-            stats = get_sprint_statistics(db, sprint)
-            sprint.member_count = stats['member_count']
-            sprint.total_capacity_hours = stats['total_capacity_hours']
-            sprint.working_days = stats['working_days']
+            _apply_statistics(sprint, get_sprint_statistics(db, sprint))
 
     return sprint
 
 
+def get_sprint_fields(
+    db: Session,
+    fields: Sequence[str],
+    include_stats: bool = False,
+    sprint_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> List[dict]:
+    """
+    Sprints als Dicts mit nur den angefragten Feldern (Sparse Fieldsets)
+
+    Lädt nur die benötigten Spalten (keine ORM-Objekte, kein Status-UPDATE);
+    der Status wird aus den Daten berechnet. Statistiken nur mit include_stats.
+    """
+    needed = set(fields) | {"sprint_id"}
+    if "status" in needed or include_stats:
+        needed |= {"start_date", "end_date"}
+    columns = [getattr(Sprint, field) for field in SPRINT_FIELDS if field in needed and field != "status"]
+
+    query = db.query(*columns)
+    if sprint_id is not None:
+        query = query.filter(Sprint.sprint_id == sprint_id)
+    rows = query.offset(skip).limit(limit).all()
+
+    aggregates = _roster_aggregates(db, [row.sprint_id for row in rows]) if include_stats else {}
+    result = []
+    for row in rows:
+        item = {}
+        for field in SPRINT_FIELDS:
+            if field == "status" and field in fields:
+                item[field] = calculate_status_from_dates(row.start_date, row.end_date)
+            elif field in fields:
+                item[field] = getattr(row, field)
+        if include_stats:
+            item.update(_statistics_for(row, aggregates))
+        result.append(item)
+    return result
+
+
 def create_sprint(db: Session, sprint: SprintCreate) -> Sprint:
     """Neuen Sprint erstellen mit automatischer Status-Berechnung"""
     # Calculate initial status based on dates
@@ -114,9 +234,207 @@ def create_sprint(db: Session, sprint: SprintCreate) -> Sprint:
     return db_sprint
 
 
+def next_sprint_dates(sprint: Sprint) -> Tuple[date, date]:
+    """Zeitraum des Folgesprints: gleiche Länge, um volle Wochen verschoben (gleiche Wochentage)"""
+    length = (sprint.end_date - sprint.start_date).days + 1
+    shift = timedelta(days=-(-length // 7) * 7)
+    return sprint.start_date + shift, sprint.end_date + shift
+
+
+def format_sprint_name(pattern: str, n: int, start_date: date, end_date: date) -> str:
+    """
+    Sprint-Namen aus einem Muster bilden
+
+    Platzhalter: {n} (laufende Nummer), {weeks} (W45 bzw. W45-46), {start_week},
+    {end_week}, {year} (ISO-Jahr des Starts), {start}, {end} (ISO-Datum).
+    Zahlen erlauben eine Breite bis 9 (z.B. {n:02d}); Attribut-/Index-Zugriffe,
+    Konvertierungen und andere Format-Specs werfen ValueError.
+    """
+    check_sprint_name_pattern(pattern)
+    start_year, start_week, _ = start_date.isocalendar()
+    end_week = end_date.isocalendar()[1]
+    weeks = f"W{start_week:02d}" if start_week == end_week else f"W{start_week:02d}-{end_week:02d}"
+    return pattern.format(
+        n=n, weeks=weeks, start_week=start_week, end_week=end_week, year=start_year,
+        start=start_date.isoformat(), end=end_date.isoformat()
+    )
+
+
+def check_sprint_name_pattern(pattern: str) -> None:
+    """Namensmuster gegen die erlaubten Platzhalter prüfen (ValueError bei Verstößen)"""
+    for _, field_name, format_spec, conversion in Formatter().parse(pattern):
+        if field_name is None:
+            continue
+        if conversion is not None:
+            raise ValueError(f"conversion !{conversion} is not allowed")
+        if field_name in SPRINT_NAME_NUMBER_FIELDS:
+            if not _NUMBER_FORMAT_SPEC.match(format_spec):
+                raise ValueError(f"format '{format_spec}' is not allowed for {{{field_name}}}")
+        elif field_name in SPRINT_NAME_TEXT_FIELDS:
+            if format_spec:
+                raise ValueError(f"format '{format_spec}' is not allowed for {{{field_name}}}")
+        else:
+            raise ValueError(f"unknown placeholder {{{field_name}}}")
+
+
+def default_sprint_name(start_date: date, end_date: date) -> str:
+    """Name nach Kalenderwochen wie in seed.py, z.B. Sprint W45-46 2025"""
+    return format_sprint_name(DEFAULT_SPRINT_NAME_PATTERN, 1, start_date, end_date)
+
+
+def next_workday(day: date) -> date:
+    """Gleicher Tag, falls Werktag (Mo-Fr), sonst der nächste Montag"""
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+def add_workdays(day: date, workdays: int) -> date:
+    """Datum `workdays` Werktage nach day (day selbst muss ein Werktag sein)"""
+    while workdays > 0:
+        day += timedelta(days=1)
+        if day.weekday() < 5:
+            workdays -= 1
+    return day
+
+
+def sprint_series_dates(
+    start_date: date, count: int, length_workdays: int, cadence_weeks: Optional[int] = None
+) -> List[Tuple[date, date]]:
+    """
+    Zeiträume einer Sprint-Serie im Werktagskalender (Mo-Fr)
+
+    Jeder Sprint beginnt an einem Werktag und endet nach length_workdays
+    Werktagen. Mit cadence_weeks beginnt Sprint i i*cadence_weeks Wochen nach
+    dem ersten (auf den nächsten Werktag verschoben), sonst am ersten Werktag
+    nach dem Vorgänger.
+    """
+    first_start = start = next_workday(start_date)
+    ranges = []
+    for i in range(1, count + 1):
+        end = add_workdays(start, length_workdays - 1)
+        ranges.append((start, end))
+        if cadence_weeks:
+            start = next_workday(first_start + timedelta(weeks=cadence_weeks * i))
+        else:
+            start = next_workday(end + timedelta(days=1))
+    return ranges
+
+
+def create_sprint_series(
+    db: Session,
+    ranges: Sequence[Tuple[date, date]],
+    names: Sequence[str],
+    roster_template_sprint_id: Optional[int] = None,
+    roster: Sequence[Dict] = ()
+) -> List[Sprint]:
+    """
+    Mehrere Sprints in einer Transaktion anlegen (Status wie calculate_status_from_dates)
+
+    Das Roster-Template (Roster eines bestehenden Sprints per INSERT ... SELECT
+    oder eine Liste {member_id, allocation}) wird in alle Sprints übernommen.
+    """
+    sprints = [
+        Sprint(name=name, start_date=start, end_date=end, status=calculate_status_from_dates(start, end))
+        for name, (start, end) in zip(names, ranges)
+    ]
+    db.add_all(sprints)
+    db.flush()
+    sprint_ids = [sprint.sprint_id for sprint in sprints]
+
+    if roster_template_sprint_id is not None:
+        db.execute(insert(SprintRoster).from_select(
+            ["sprint_id", "member_id", "allocation"],
+            # Jeder neue Sprint x jeder Template-Eintrag
+            select(Sprint.sprint_id, SprintRoster.member_id, SprintRoster.allocation).join(
+                SprintRoster, true()
+            ).where(
+                Sprint.sprint_id.in_(sprint_ids),
+                SprintRoster.sprint_id == roster_template_sprint_id
+            )
+        ))
+    elif roster:
+        db.execute(insert(SprintRoster), [
+            {"sprint_id": sprint_id, "member_id": entry["member_id"], "allocation": entry["allocation"]}
+            for sprint_id in sprint_ids for entry in roster
+        ])
+
+    if roster_template_sprint_id is not None or roster:
+        refresh_capacity_facts(db, sprint_ids=sprint_ids)
+    db.commit()
+    # Nach dem Commit alle Sprints mit einer Query neu laden statt einzeln zu refreshen
+    return db.query(Sprint).filter(Sprint.sprint_id.in_(sprint_ids)).order_by(Sprint.start_date).all()
+
+
+def _clamp(day, start_date: date, end_date: date):
+    """Datum auf den Sprint-Zeitraum begrenzen (NULL bleibt NULL)"""
+    return case((day < start_date, start_date), (day > end_date, end_date), else_=day)
+
+
+def clone_sprint(
+    db: Session,
+    source: Sprint,
+    name: str,
+    start_date: date,
+    end_date: date,
+    shift_assignment_windows: bool = True,
+    copy_overrides: bool = False
+) -> Sprint:
+    """
+    Sprint mit Roster (und optional Overrides) kopieren - eine Transaktion
+
+    Roster und Overrides werden per INSERT ... SELECT in der Datenbank kopiert
+    (keine ORM-Objekte je Zeile). Assignment-Fenster und Override-Tage werden um
+    den Abstand der Startdaten verschoben und auf den neuen Sprint begrenzt;
+    ohne shift_assignment_windows gilt der ganze Sprint. Overrides außerhalb
+    des neuen Zeitraums entfallen.
+    """
+    offset = (start_date - source.start_date).days
+    db_sprint = Sprint(
+        name=name,
+        start_date=start_date,
+        end_date=end_date,
+        status=calculate_status_from_dates(start_date, end_date)
+    )
+    db.add(db_sprint)
+    db.flush()
+
+    if shift_assignment_windows:
+        assignment_from = _clamp(date_add(SprintRoster.assignment_from, offset), start_date, end_date)
+        assignment_to = _clamp(date_add(SprintRoster.assignment_to, offset), start_date, end_date)
+    else:
+        assignment_from = assignment_to = literal(None, SprintRoster.assignment_from.type)
+    db.execute(insert(SprintRoster).from_select(
+        ["sprint_id", "member_id", "allocation", "assignment_from", "assignment_to"],
+        select(
+            literal(db_sprint.sprint_id), SprintRoster.member_id, SprintRoster.allocation,
+            assignment_from, assignment_to
+        ).where(SprintRoster.sprint_id == source.sprint_id)
+    ))
+
+    if copy_overrides:
+        day = date_add(AvailabilityOverride.day, offset)
+        db.execute(insert(AvailabilityOverride).from_select(
+            ["sprint_id", "member_id", "day", "state", "reason"],
+            select(
+                literal(db_sprint.sprint_id), AvailabilityOverride.member_id, day,
+                AvailabilityOverride.state, AvailabilityOverride.reason
+            ).where(
+                AvailabilityOverride.sprint_id == source.sprint_id,
+                day >= start_date,
+                day <= end_date
+            )
+        ))
+
+    refresh_capacity_facts(db, sprint_ids=[db_sprint.sprint_id])
+    db.commit()
+    db.refresh(db_sprint)
+    return db_sprint
+
+
 def update_sprint(db: Session, sprint_id: int, sprint_update: SprintUpdate) -> Optional[Sprint]:
     """Sprint aktualisieren mit automatischer Status-Berechnung"""
-    db_sprint = get_sprint(db, sprint_id)
+    db_sprint = get_sprint(db, sprint_id, include_stats=False)
     if not db_sprint:
         return None
 
@@ -129,6 +447,9 @@ def update_sprint(db: Session, sprint_id: int, sprint_update: SprintUpdate) -> O
     if 'start_date' in update_data or 'end_date' in update_data or 'status' in update_data:
         db_sprint.status = calculate_status_from_dates(db_sprint.start_date, db_sprint.end_date)
 
+    # Geänderter Zeitraum: alle Tage des Sprints neu berechnen
+    if 'start_date' in update_data or 'end_date' in update_data:
+        refresh_capacity_facts(db, sprint_ids=[sprint_id])
     db.commit()
     db.refresh(db_sprint)
     return db_sprint
@@ -136,27 +457,16 @@ def update_sprint(db: Session, sprint_id: int, sprint_update: SprintUpdate) -> O
 
 def update_all_sprint_statuses(db: Session) -> int:
     """Update all sprint statuses based on current date"""
-    sprints = db.query(Sprint).all()
-    updated_count = 0
-
-    for sprint in sprints:
-        new_status = calculate_status_from_dates(sprint.start_date, sprint.end_date)
-        if sprint.status != new_status:
-            sprint.status = new_status
-            updated_count += 1
-
-    if updated_count > 0:
-        db.commit()
-
-    return updated_count
+    return sync_sprint_statuses(db)
 
 
 def delete_sprint(db: Session, sprint_id: int) -> bool:
     """Sprint löschen"""
-    db_sprint = get_sprint(db, sprint_id)
+    db_sprint = get_sprint(db, sprint_id, include_stats=False)
     if not db_sprint:
         return False
 
     db.delete(db_sprint)
+    refresh_capacity_facts(db, sprint_ids=[sprint_id])
     db.commit()
     return True
@@ -0,0 +1,100 @@
+"""
+CRUD Operations für Teams und Team-Zugehörigkeit
+"""
+from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from app.db.models.teams import Team, TeamMember
+from app.schemas.schemas import TeamCreate
+
+
+def get_teams(db: Session) -> List[Team]:
+    """Alle Teams (flach, mit parent_team_id) inkl. Anzahl direkter Members"""
+    counts = dict(
+        db.query(TeamMember.team_id, func.count(TeamMember.member_id)).group_by(TeamMember.team_id).all()
+    )
+    teams = db.query(Team).order_by(Team.team_id).all()
+    for team in teams:
+        team.member_count = counts.get(team.team_id, 0)
+    return teams
+
+
+def get_team(db: Session, team_id: int) -> Optional[Team]:
+    """Ein Team by ID"""
+    return db.query(Team).filter(Team.team_id == team_id).first()
+
+
+def create_team(db: Session, team: TeamCreate) -> Team:
+    """Neues Team erstellen"""
+    db_team = Team(**team.model_dump())
+    db.add(db_team)
+    db.commit()
+    db.refresh(db_team)
+    return db_team
+
+
+def update_team(db: Session, team_id: int, team_update: dict) -> Optional[Team]:
+    """Team aktualisieren (Name, Parent)"""
+    db_team = get_team(db, team_id)
+    if not db_team:
+        return None
+
+    for field, value in team_update.items():
+        if hasattr(db_team, field):
+            setattr(db_team, field, value)
+
+    db.commit()
+    db.refresh(db_team)
+    return db_team
+
+
+def delete_team(db: Session, team_id: int) -> bool:
+    """Team löschen (nur ohne Sub-Teams), Zugehörigkeiten werden entfernt"""
+    db_team = get_team(db, team_id)
+    if not db_team:
+        return False
+
+    if db.query(Team.team_id).filter(Team.parent_team_id == team_id).first():
+        raise ValueError(f"Team {team_id} has sub-teams")
+
+    db.query(TeamMember).filter(TeamMember.team_id == team_id).delete(synchronize_session=False)
+    db.delete(db_team)
+    db.commit()
+    return True
+
+
+def get_team_members(db: Session, team_id: int) -> List[TeamMember]:
+    """Direkte Members eines Teams"""
+    return db.query(TeamMember).options(
+        joinedload(TeamMember.member)
+    ).filter(TeamMember.team_id == team_id).all()
+
+
+def set_member_team(db: Session, team_id: int, member_id: int) -> TeamMember:
+    """Member einem Team zuordnen - eine bestehende Zugehörigkeit wird verschoben"""
+    membership = db.query(TeamMember).filter(TeamMember.member_id == member_id).first()
+    if membership and membership.team_id != team_id:
+        db.delete(membership)
+        db.flush()
+        membership = None
+    if membership is None:
+        membership = TeamMember(team_id=team_id, member_id=member_id)
+        db.add(membership)
+
+    db.commit()
+    db.refresh(membership)
+    return membership
+
+
+def remove_member_from_team(db: Session, team_id: int, member_id: int) -> bool:
+    """Member aus Team entfernen"""
+    membership = db.query(TeamMember).filter(
+        TeamMember.team_id == team_id,
+        TeamMember.member_id == member_id
+    ).first()
+    if not membership:
+        return False
+
+    db.delete(membership)
+    db.commit()
+    return True
@@ -0,0 +1,27 @@
+"""
+Dialektabhängige SQL-Funktionen
+
+date_add(spalte, tage): Datum um eine Anzahl Tage verschieben - für
+set-basierte Kopien (INSERT ... SELECT) ohne Zeilen nach Python zu laden.
+MySQL: DATE_ADD(x, INTERVAL n DAY), SQLite (Tests/Benchmarks): date(x, 'n days').
+"""
+from sqlalchemy import Date
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import GenericFunction
+
+
+class date_add(GenericFunction):
+    type = Date()
+    inherit_cache = True
+
+
+@compiles(date_add)
+def _date_add_default(element, compiler, **kw):
+    day, days = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"DATE_ADD({day}, INTERVAL {days} DAY)"
+
+
+@compiles(date_add, "sqlite")
+def _date_add_sqlite(element, compiler, **kw):
+    day, days = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"date({day}, ({days}) || ' days')"
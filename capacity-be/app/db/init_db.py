@@ -1,13 +1,28 @@
 """
 Database initialization module
-Handles automatic database schema creation and migration on startup
+Handles schema revision checks on startup and Alembic migrations
+
+Startup (jeder Worker):
+- eine Query auf `alembic_version`, Vergleich mit dem Head der Migrations-Skripte
+- Retries mit asynchronem Exponential Backoff (blockiert den Event Loop nicht)
+- Migrationen nur, wenn DB_MIGRATE_ON_STARTUP=True (ein designierter Prozess)
+
+Migrationen als eigener Deploy-Schritt:
+    python -m app.db.init_db upgrade
+    python -m app.db.init_db check     # Exit-Code 1, wenn Schema nicht aktuell
 """
 
+import asyncio
 import logging
-from typing import Optional
+import os
+import re
+import sys
+import time
+from functools import lru_cache
+from typing import Optional, Set
+
 import sqlalchemy as sa
-from alembic import command
-from alembic.config import Config
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import OperationalError, ProgrammingError
 
 from app.core.config import settings
@@ -15,70 +30,103 @@ from app.db.base import engine
 
 logger = logging.getLogger(__name__)
 
+# capacity-be/ (alembic.ini, db/versions)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+ALEMBIC_INI_PATH = os.path.join(PROJECT_ROOT, 'alembic.ini')
+VERSIONS_DIR = os.path.join(PROJECT_ROOT, 'db', 'versions')
 
-def check_database_exists() -> bool:
-    """Check if the database exists and is accessible"""
-    try:
-        with engine.connect() as connection:
-            # Try a simple query to verify database connection
-            connection.execute(sa.text("SELECT 1"))
-            return True
-    except (OperationalError, ProgrammingError) as e:
-        logger.warning(f"Database connection failed: {e}")
-        return False
+# Schema-Status
+SCHEMA_CURRENT = "current"
+SCHEMA_BEHIND = "behind"
+SCHEMA_UNINITIALIZED = "uninitialized"
 
+MIGRATION_LOCK_NAME = "capacity_planner_migrations"
+MIGRATION_LOCK_TIMEOUT = 300
 
-def check_tables_exist() -> bool:
-    """Check if required tables exist in the database"""
-    try:
-        from app.db.base import Base
+_REVISION_PATTERN = re.compile(r"^revision(?:\s*:\s*[^=]+)?\s*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+_DOWN_REVISION_PATTERN = re.compile(r"^down_revision(?:\s*:\s*[^=]+)?\s*=\s*(.+)$", re.MULTILINE)
 
-        # Check if at least the alembic_version table exists
-        inspector = sa.inspect(engine)
-        existing_tables = inspector.get_table_names()
 
-        if 'alembic_version' not in existing_tables:
-            logger.info("Alembic version table not found - database appears to be uninitialized")
-            return False
+@lru_cache(maxsize=1)
+def get_head_revisions() -> Set[str]:
+    """
+    Head-Revision(en) der Migrations-Skripte
 
-        # Check if our main tables exist
-        required_tables = ['members', 'sprints', 'pto', 'holidays']
-        missing_tables = [table for table in required_tables if table not in existing_tables]
+    Liest `revision`/`down_revision` direkt aus db/versions/*.py statt Alembic
+    zu importieren und alle Skripte zu laden - der Startup bleibt damit billig.
+    """
+    revisions, referenced = set(), set()
+    for filename in os.listdir(VERSIONS_DIR):
+        if not filename.endswith('.py'):
+            continue
+        with open(os.path.join(VERSIONS_DIR, filename)) as f:
+            source = f.read()
+        revision = _REVISION_PATTERN.search(source)
+        if not revision:
+            continue
+        revisions.add(revision.group(1))
+        down_revision = _DOWN_REVISION_PATTERN.search(source)
+        if down_revision:
+            referenced.update(re.findall(r"['\"]([^'\"]+)['\"]", down_revision.group(1)))
+    return revisions - referenced
 
-        if missing_tables:
-            logger.info(f"Missing tables detected: {missing_tables}")
-            return False
 
-        logger.info("All required tables found in database")
-        return True
+def get_current_revisions(connection: sa.engine.Connection) -> Optional[Set[str]]:
+    """Gespeicherte Revision(en) aus alembic_version - None wenn die Tabelle fehlt"""
+    try:
+        rows = connection.execute(sa.text("SELECT version_num FROM alembic_version")).all()
+    except (OperationalError, ProgrammingError):
+        connection.rollback()
+        return None
+    return {row[0] for row in rows}
 
-    except Exception as e:
-        logger.error(f"Error checking tables: {e}")
-        return False
+
+def check_schema_revision(db_engine: Engine = None) -> str:
+    """
+    Schema-Status mit einer Query bestimmen
+
+    Wirft OperationalError, wenn die Datenbank nicht erreichbar ist.
+    """
+    with (db_engine or engine).connect() as connection:
+        current = get_current_revisions(connection)
+
+    if not current:
+        return SCHEMA_UNINITIALIZED
+    if current == get_head_revisions():
+        return SCHEMA_CURRENT
+    return SCHEMA_BEHIND
 
 
-def run_alembic_upgrade() -> bool:
-    """Run Alembic upgrade to head"""
+def run_alembic_upgrade(connection: sa.engine.Connection = None) -> bool:
+    """
+    Run Alembic upgrade to head
+
+    Mit `connection` migriert Alembic über diese Verbindung (db/env.py liest
+    config.attributes["connection"]), sonst über settings.MYSQL_URL.
+    """
     try:
-        # Get the alembic.ini path
-        import os
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        # Go up to capacity-be directory where alembic.ini is located
-        alembic_ini_path = os.path.join(current_dir, '..', '..', 'alembic.ini')
-
-        if not os.path.exists(alembic_ini_path):
-            logger.error(f"Alembic config file not found at: {alembic_ini_path}")
+        # Alembic erst hier laden - der normale Startup braucht es nicht
+        from alembic import command
+        from alembic.config import Config
+
+        if not os.path.exists(ALEMBIC_INI_PATH):
+            logger.error(f"Alembic config file not found at: {ALEMBIC_INI_PATH}")
             return False
 
         # Create alembic config
-        alembic_cfg = Config(alembic_ini_path)
+        alembic_cfg = Config(ALEMBIC_INI_PATH)
 
-        # Override the sqlalchemy.url with our current setting
-        alembic_cfg.set_main_option("sqlalchemy.url", settings.MYSQL_URL)
+        if connection is not None:
+            alembic_cfg.attributes["connection"] = connection
+        else:
+            # Override the sqlalchemy.url with our current setting
+            alembic_cfg.set_main_option("sqlalchemy.url", settings.MYSQL_URL)
 
         # Run the upgrade
         logger.info("Running Alembic upgrade to head...")
         command.upgrade(alembic_cfg, "head")
+        if connection is not None and connection.in_transaction():
+            connection.commit()
         logger.info("Alembic upgrade completed successfully")
         return True
 
@@ -87,56 +135,135 @@ def run_alembic_upgrade() -> bool:
         return False
 
 
-def init_database() -> bool:
+def migrate_database(db_engine: Engine = None) -> bool:
     """
-    Initialize the database by running migrations if needed
-    Returns True if initialization was successful, False otherwise
+    Schema auf Head bringen, falls nötig
+
+    Auf MySQL serialisiert ein Advisory-Lock (GET_LOCK) parallel gestartete
+    Migrations-Prozesse; nach dem Lock wird der Status erneut geprüft.
     """
-    logger.info("Starting database initialization...")
+    db_engine = db_engine or engine
+    if check_schema_revision(db_engine) == SCHEMA_CURRENT:
+        logger.info("Database schema is up to date - no migration needed")
+        return True
 
-    # Check if database is accessible
-    if not check_database_exists():
-        logger.error("Cannot connect to database - initialization failed")
-        return False
+    with db_engine.connect() as connection:
+        if db_engine.dialect.name != "mysql":
+            return run_alembic_upgrade(connection)
 
-    # Check if tables exist
-    if check_tables_exist():
-        logger.info("Database tables already exist - skipping initialization")
-        return True
+        acquired = connection.execute(
+            sa.text("SELECT GET_LOCK(:name, :timeout)"),
+            {"name": MIGRATION_LOCK_NAME, "timeout": MIGRATION_LOCK_TIMEOUT}
+        ).scalar()
+        if not acquired:
+            logger.error("Could not acquire migration lock")
+            return False
+        try:
+            if check_schema_revision(db_engine) == SCHEMA_CURRENT:
+                logger.info("Database schema migrated by another process")
+                return True
+            # Migration über die Verbindung, die den Lock hält
+            return run_alembic_upgrade(connection)
+        finally:
+            connection.execute(sa.text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_LOCK_NAME})
 
-    # Run migrations
-    logger.info("Database tables missing - running Alembic migrations...")
-    if run_alembic_upgrade():
-        logger.info("Database initialization completed successfully")
-        return True
-    else:
-        logger.error("Database initialization failed")
-        return False
 
+async def ensure_database_ready_async(
+    retries: int = None,
+    backoff_seconds: float = None,
+    max_backoff_seconds: float = 8.0,
+    migrate: bool = None,
+) -> str:
+    """
+    Ensure database is ready for use (Startup-Pfad)
+
+    Prüft die Schema-Revision im Threadpool; Verbindungsfehler werden mit
+    Exponential Backoff (asyncio.sleep) wiederholt. Ist das Schema nicht
+    aktuell, migriert nur ein designierter Prozess (DB_MIGRATE_ON_STARTUP),
+    alle anderen loggen eine Warnung und starten trotzdem.
+    """
+    retries = settings.DB_STARTUP_RETRIES if retries is None else retries
+    delay = settings.DB_STARTUP_BACKOFF_SECONDS if backoff_seconds is None else backoff_seconds
+    migrate = settings.DB_MIGRATE_ON_STARTUP if migrate is None else migrate
+
+    for attempt in range(1, retries + 1):
+        try:
+            status = await asyncio.to_thread(check_schema_revision)
+            break
+        except OperationalError as e:
+            if attempt == retries:
+                logger.error(f"Database not reachable after {retries} attempts: {e}")
+                raise RuntimeError("Database initialization failed - cannot start application") from e
+            logger.warning(f"Database not reachable (attempt {attempt}/{retries}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_backoff_seconds)
+
+    if status == SCHEMA_CURRENT:
+        logger.info("Database schema is up to date")
+        return status
 
-def ensure_database_ready() -> None:
+    if migrate:
+        logger.info(f"Database schema {status} - running migrations (designated process)")
+        if not await asyncio.to_thread(migrate_database):
+            raise RuntimeError("Database migration failed - cannot start application")
+        return SCHEMA_CURRENT
+
+    logger.warning(
+        f"Database schema {status} (head: {', '.join(sorted(get_head_revisions()))}) - "
+        "run `python -m app.db.init_db upgrade` or start one process with DB_MIGRATE_ON_STARTUP=True"
+    )
+    return status
+
+
+def ensure_database_ready(
+    retries: int = None,
+    backoff_seconds: float = None,
+    max_backoff_seconds: float = 8.0,
+    db_engine: Engine = None,
+) -> str:
     """
-    Ensure database is ready for use
-    This function should be called during application startup
+    Ensure database is ready for use (synchron, z.B. für Skripte)
+
+    Gleiche Retries wie der Startup-Pfad, aber mit time.sleep und ohne eigenen
+    Event Loop - auch aus laufenden Loops aufrufbar. Migriert bei Bedarf auf Head.
     """
     logger.info("Ensuring database is ready...")
+    retries = settings.DB_STARTUP_RETRIES if retries is None else retries
+    delay = settings.DB_STARTUP_BACKOFF_SECONDS if backoff_seconds is None else backoff_seconds
 
-    max_retries = 3
-    for attempt in range(max_retries):
+    for attempt in range(1, retries + 1):
         try:
-            if init_database():
-                logger.info("Database is ready for use")
-                return
-            else:
-                logger.warning(f"Database initialization attempt {attempt + 1} failed")
-
-        except Exception as e:
-            logger.error(f"Database initialization attempt {attempt + 1} failed with error: {e}")
-
-        if attempt < max_retries - 1:
-            import time
-            logger.info(f"Retrying in 2 seconds... (attempt {attempt + 2}/{max_retries})")
-            time.sleep(2)
-
-    logger.error("Failed to initialize database after all attempts")
-    raise RuntimeError("Database initialization failed - cannot start application")
+            status = check_schema_revision(db_engine)
+            break
+        except OperationalError as e:
+            if attempt == retries:
+                logger.error(f"Database not reachable after {retries} attempts: {e}")
+                raise RuntimeError("Database initialization failed") from e
+            logger.warning(f"Database not reachable (attempt {attempt}/{retries}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            delay = min(delay * 2, max_backoff_seconds)
+
+    if status != SCHEMA_CURRENT and not migrate_database(db_engine):
+        raise RuntimeError("Database migration failed")
+    return SCHEMA_CURRENT
+
+
+def main(argv=None) -> int:
+    """CLI: `upgrade` (Migration als Deploy-Schritt) oder `check`"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Capacity Planner Datenbank-Schema")
+    parser.add_argument("action", choices=["upgrade", "check"])
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.action == "upgrade":
+        return 0 if migrate_database() else 1
+
+    status = check_schema_revision()
+    print(f"Schema: {status} (head: {', '.join(sorted(get_head_revisions()))})")
+    return 0 if status == SCHEMA_CURRENT else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,8 @@ from .sprint_roster import SprintRoster
 from .pto import PTO
 from .holidays import Holiday
 from .availability_overrides import AvailabilityOverride, AvailabilityState
+from .teams import Team, TeamMember
+from .member_day_capacity import MemberDayCapacity
 
 __all__ = [
     "Member",
@@ -16,6 +18,9 @@ __all__ = [
     "PTO",
     "Holiday",
     "AvailabilityOverride",
-    "AvailabilityState"
+    "AvailabilityState",
+    "Team",
+    "TeamMember",
+    "MemberDayCapacity"
 ]
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Boolean
+from sqlalchemy import Column, Integer, String, Date, Boolean, Index, false
 
 from app.db.base import Base
 
@@ -9,9 +9,13 @@ class Holiday(Base):
 
     holiday_id = Column(Integer, primary_key=True, autoincrement=True)
     date = Column(Date, nullable=False)
-    region_code = Column(String(10), nullable=False)  # e.g., "DE-NW", "UA"
+    region_code = Column(String(10), nullable=False)  # e.g., "DE-NW", "UA" - gilt auch für Unterregionen ("DE" → "DE-NW")
     name = Column(String(255), nullable=False)
-    is_company_day = Column(Boolean, nullable=False, default=True)  # Company-weiter Feiertag oder nur regional
+    is_company_day = Column(Boolean, nullable=False, default=False, server_default=false())  # Company-weiter Feiertag (alle Regionen) oder nur regional
+
+    __table_args__ = (
+        Index("idx_holidays_date_region", "date", "region_code"),
+    )
 
     def __repr__(self):
         return f"<Holiday(id={self.holiday_id}, date={self.date}, region='{self.region_code}', name='{self.name}')>"
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Date, Enum, Index
+from sqlalchemy.types import Numeric
+
+from app.db.base import Base
+from app.db.models.availability_overrides import AvailabilityState
+
+
+class MemberDayCapacity(Base):
+    """
+    Materialisierte Tageskapazität je Sprint/Member/Tag (abgeleitet aus der Availability-Engine)
+
+    Wird von den Schreibpfaden inkrementell gepflegt (app/services/capacity_facts.py);
+    keine Foreign Keys, da jederzeit per Rebuild neu erzeugbar.
+    """
+    __tablename__ = "member_day_capacity"
+
+    # Composite Primary Key
+    sprint_id = Column(Integer, primary_key=True)
+    member_id = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    auto_state = Column(String(20), nullable=False)  # available|weekend|holiday|pto|out_of_assignment
+    final_state = Column(Enum(AvailabilityState), nullable=False)
+    days = Column(Numeric(2, 1), nullable=False)  # 1.0 / 0.5 / 0.0 Personentage
+    hours = Column(Numeric(7, 4), nullable=False)  # days * 8h * employment_ratio * allocation (exakt)
+
+    __table_args__ = (
+        Index("idx_member_day_capacity_member_day", "member_id", "day"),
+        Index("idx_member_day_capacity_day", "day"),
+    )
+
+    def __repr__(self):
+        return f"<MemberDayCapacity(sprint_id={self.sprint_id}, member_id={self.member_id}, day={self.day}, hours={self.hours})>"
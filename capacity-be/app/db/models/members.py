@@ -19,6 +19,7 @@ class Member(Base):
     sprint_rosters = relationship("SprintRoster", back_populates="member")
     ptos = relationship("PTO", back_populates="member")
     availability_overrides = relationship("AvailabilityOverride", back_populates="member")
+    team_membership = relationship("TeamMember", back_populates="member", uselist=False)
 
     def __repr__(self):
         return f"<Member(id={self.member_id}, name='{self.name}', region='{self.region_code}')>"
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from sqlalchemy.orm import relationship
+
+from app.db.base import Base
+
+
+class Team(Base):
+    """Team Model - Teams können beliebig verschachtelt werden (parent_team_id)"""
+    __tablename__ = "teams"
+
+    team_id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(255), nullable=False)
+    parent_team_id = Column(Integer, ForeignKey("teams.team_id"), nullable=True)
+
+    # Relationships
+    parent = relationship("Team", remote_side=[team_id], back_populates="children")
+    children = relationship("Team", back_populates="parent")
+    team_members = relationship("TeamMember", back_populates="team")
+
+    __table_args__ = (
+        Index("idx_teams_parent", "parent_team_id"),
+    )
+
+    def __repr__(self):
+        return f"<Team(id={self.team_id}, name='{self.name}', parent={self.parent_team_id})>"
+
+
+class TeamMember(Base):
+    """Team-Zugehörigkeit - ein Member gehört genau einem Team an (Rollups ohne Doppelzählung)"""
+    __tablename__ = "team_members"
+
+    # Composite Primary Key
+    team_id = Column(Integer, ForeignKey("teams.team_id"), primary_key=True)
+    member_id = Column(Integer, ForeignKey("members.member_id"), primary_key=True)
+
+    # Relationships
+    team = relationship("Team", back_populates="team_members")
+    member = relationship("Member", back_populates="team_membership")
+
+    __table_args__ = (
+        Index("idx_team_members_member", "member_id", unique=True),
+    )
+
+    def __repr__(self):
+        return f"<TeamMember(team_id={self.team_id}, member_id={self.member_id})>"
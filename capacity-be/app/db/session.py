@@ -1,13 +1,167 @@
-from typing import Generator
-from sqlalchemy.orm import Session
+"""
+Database Sessions mit Read/Write-Routing
 
-from app.db.base import SessionLocal
+- Writes: immer Primary (`get_db`)
+- Reads (GET-Listen, Availability-Matrix, Reports): Replica, falls konfiguriert
+  (`get_read_db`)
+- Read-your-writes: nach einem erfolgreichen Write setzt die Middleware den
+  Header X-Primary-Until (und ein Cookie für Same-Origin-Clients); bis er
+  abläuft, lesen Requests, die ihn zurückschicken, vom Primary. Der Header
+  funktioniert auch cross-origin ohne Credentials (CORS: expose_headers)
+- Fallback: ist der Replica nicht erreichbar, wird für REPLICA_RETRY_SECONDS
+  vom Primary gelesen
+
+Read-Sessions sind als read-only markiert (`is_read_only`) - CRUD-Funktionen
+schreiben dann nichts (z.B. keine Sprint-Status-Synchronisierung).
+"""
+import logging
+import time
+from typing import Callable, Generator, Optional
+
+from fastapi import Request
+from prometheus_client import Counter
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.core.metrics import registry
+from app.db.base import (  # noqa: F401
+    SessionLocal, ReplicaSessionLocal, mark_read_only, is_read_only, current_batch_session
+)
+
+logger = logging.getLogger(__name__)
+
+READ_YOUR_WRITES_COOKIE = "cp_primary_until"
+READ_YOUR_WRITES_HEADER = "X-Primary-Until"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+DB_READ_ROUTES = Counter(
+    "db_read_routes_total", "Read sessions by target database and reason", ("target", "reason"), registry=registry)
+
+
+class DatabaseRouter:
+    """Entscheidet pro Read-Request zwischen Replica und Primary"""
+
+    def __init__(
+        self,
+        primary: sessionmaker,
+        replica: Optional[sessionmaker] = None,
+        read_your_writes_seconds: float = 5,
+        replica_retry_seconds: float = 30,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.primary = primary
+        self.replica = replica
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.replica_retry_seconds = replica_retry_seconds
+        self.clock = clock
+        self._replica_down_until = 0.0
+
+    def replica_available(self) -> bool:
+        return self.replica is not None and self.clock() >= self._replica_down_until
+
+    def mark_replica_down(self) -> None:
+        self._replica_down_until = self.clock() + self.replica_retry_seconds
+
+    def pinned_to_primary(self, request: Optional[Request]) -> bool:
+        """True, solange das Read-your-writes-Fenster des Clients offen ist (Header oder Cookie)"""
+        if request is None:
+            return False
+        now = self.clock()
+        for value in (request.headers.get(READ_YOUR_WRITES_HEADER), request.cookies.get(READ_YOUR_WRITES_COOKIE)):
+            try:
+                primary_until = float(value or 0)
+            except ValueError:
+                continue
+            # Werte weiter in der Zukunft als ein Fenster (+1s Rundung) stammen nicht von uns
+            if now < primary_until <= now + self.read_your_writes_seconds + 1:
+                return True
+        return False
+
+    def read_session(self, request: Optional[Request] = None) -> Session:
+        """Read-only Session vom Replica, sonst vom Primary"""
+        if self.replica is None:
+            reason = "no_replica"
+        elif self.pinned_to_primary(request):
+            reason = "read_your_writes"
+        elif not self.replica_available():
+            reason = "replica_down"
+        else:
+            db = self.replica()
+            try:
+                # Connection auschecken (inkl. pre_ping) - Ausfall hier statt mitten im Endpoint
+                db.connection()
+            except DBAPIError as e:
+                db.close()
+                self.mark_replica_down()
+                logger.warning(f"Read replica unavailable, falling back to primary for {self.replica_retry_seconds}s: {e}")
+                reason = "replica_error"
+            else:
+                DB_READ_ROUTES.labels(target="replica", reason="read").inc()
+                return mark_read_only(db)
+
+        DB_READ_ROUTES.labels(target="primary", reason=reason).inc()
+        return mark_read_only(self.primary())
+
+    def primary_until(self) -> float:
+        """Ablaufzeitpunkt des Read-your-writes-Fensters für einen Write jetzt"""
+        return self.clock() + self.read_your_writes_seconds
+
+
+db_router = DatabaseRouter(
+    SessionLocal,
+    ReplicaSessionLocal,
+    read_your_writes_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    replica_retry_seconds=settings.REPLICA_RETRY_SECONDS,
+)
 
 
 def get_db() -> Generator[Session, None, None]:
     """Dependency für FastAPI um DB Sessions zu verwalten"""
+    batch = current_batch_session()
+    if batch is not None:
+        yield batch
+        return
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """Read-only Session Dependency (Replica mit Fallback auf Primary)"""
+    batch = current_batch_session()
+    if batch is not None:
+        # Reads im Batch sehen die vorherigen Writes (Primary, gleiche Transaktion)
+        yield batch
+        return
+    db = db_router.read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """Nach erfolgreichen Writes Reads des Clients für ein Zeitfenster an den Primary binden"""
+
+    def __init__(self, app, router: Optional[DatabaseRouter] = None):
+        super().__init__(app)
+        self.router = router or db_router
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        response = await call_next(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            primary_until = f"{self.router.primary_until():.3f}"
+            response.headers[READ_YOUR_WRITES_HEADER] = primary_until
+            response.set_cookie(
+                READ_YOUR_WRITES_COOKIE,
+                primary_until,
+                max_age=max(1, int(self.router.read_your_writes_seconds)),
+                httponly=True,
+                samesite="lax",
+            )
+        return response
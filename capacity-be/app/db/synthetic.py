@@ -0,0 +1,318 @@
+"""
+Synthetic Dataset Generator
+
+Erzeugt deterministische (seed-basierte) Testdaten in beliebiger Größe:
+N Members über R Regionen, S Sprints mit Roster und Assignment-Fenstern,
+realistische PTO-Verteilungen, mehrjährige Feiertagskalender und
+vereinzelte Availability-Overrides.
+
+Alle Tabellen werden über Bulk-Inserts (executemany) befüllt, damit auch
+10k Members x 200 Sprints in wenigen Sekunden geladen sind.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.db.crud.sprints import calculate_status_from_dates
+from app.db.models import (
+    Member, Sprint, SprintRoster, PTO, Holiday,
+    AvailabilityOverride, AvailabilityState
+)
+from app.services.holiday_calendar import clear_holiday_calendars, region_chain
+
+# Chunk-Größe für executemany - hält Statements für MySQL unter max_allowed_packet
+BULK_CHUNK_SIZE = 5000
+
+FIRST_NAMES = [
+    "Alice", "Bogdan", "Carol", "David", "Elena", "Felix", "Greta", "Hannah",
+    "Igor", "Julia", "Karl", "Lena", "Mykola", "Nina", "Oskar", "Paula",
+    "Quentin", "Rosa", "Stefan", "Tetiana", "Uwe", "Vera", "Wojciech", "Yana",
+]
+LAST_NAMES = [
+    "Mueller", "Ivanov", "Smith", "Schmidt", "Kowalski", "Petrov", "Weber",
+    "Shevchenko", "Fischer", "Nowak", "Becker", "Bondarenko", "Hoffmann",
+    "Wagner", "Kravets", "Schulz", "Zielinski", "Koch", "Melnyk", "Richter",
+]
+
+# Feste Feiertage je Region als (Monat, Tag, Name)
+_DE_NATIONAL = [
+    (1, 1, "Neujahr"), (5, 1, "Tag der Arbeit"), (10, 3, "Tag der Deutschen Einheit"),
+    (12, 25, "1. Weihnachtstag"), (12, 26, "2. Weihnachtstag"),
+]
+REGION_HOLIDAYS: Dict[str, List[Tuple[int, int, str]]] = {
+    "DE-NW": [(11, 1, "Allerheiligen")],
+    "DE-BY": [(1, 6, "Heilige Drei Könige"), (8, 15, "Mariä Himmelfahrt"), (11, 1, "Allerheiligen")],
+    "DE-BE": [(3, 8, "Internationaler Frauentag")],
+    "DE-SN": [(10, 31, "Reformationstag")],
+    "UA": [(1, 1, "New Year"), (3, 8, "Women's Day"), (6, 28, "Constitution Day"),
+           (8, 24, "Independence Day"), (12, 25, "Christmas")],
+    "PL": [(1, 1, "Nowy Rok"), (5, 1, "Święto Pracy"), (5, 3, "Święto Konstytucji"),
+           (11, 11, "Święto Niepodległości"), (12, 25, "Boże Narodzenie")],
+    "AT": [(1, 1, "Neujahr"), (5, 1, "Staatsfeiertag"), (10, 26, "Nationalfeiertag"),
+           (12, 8, "Mariä Empfängnis"), (12, 25, "Christtag")],
+    "NL": [(1, 1, "Nieuwjaarsdag"), (4, 27, "Koningsdag"), (12, 25, "Eerste Kerstdag"),
+           (12, 26, "Tweede Kerstdag")],
+}
+# Oberregionen (keine Member-Regionen) - Unterregionen erben deren Feiertage
+PARENT_HOLIDAYS: Dict[str, List[Tuple[int, int, str]]] = {
+    "DE": _DE_NATIONAL,
+}
+
+EMPLOYMENT_RATIOS = [Decimal("1.00"), Decimal("0.80"), Decimal("0.75"), Decimal("0.50")]
+EMPLOYMENT_WEIGHTS = [70, 12, 10, 8]
+
+ALLOCATIONS = [Decimal("1.00"), Decimal("0.80"), Decimal("0.50"), Decimal("0.25")]
+ALLOCATION_WEIGHTS = [70, 10, 15, 5]
+
+VACATION_BLOCKS = [1, 2, 3, 5, 10]
+VACATION_BLOCK_CUM_WEIGHTS = [25, 45, 65, 90, 100]
+SICK_SPELLS = [1, 1, 2, 3, 5]
+
+OVERRIDE_STATES = [AvailabilityState.HALF, AvailabilityState.UNAVAILABLE, AvailabilityState.AVAILABLE]
+OVERRIDE_STATE_WEIGHTS = [50, 35, 15]
+
+
+def region_codes(count: int) -> List[str]:
+    """Die ersten `count` Regionen - bekannte Regionen zuerst, danach synthetische Codes"""
+    known = list(REGION_HOLIDAYS)
+    if count <= len(known):
+        return known[:count]
+    return known + [f"X-{i:02d}" for i in range(count - len(known))]
+
+
+def _bulk_insert(db: Session, model, rows: List[dict]) -> None:
+    """Zeilen chunkweise per Core-executemany einfügen (ohne ORM-Unit-of-Work)"""
+    connection = db.connection()
+    statement = insert(model.__table__)
+    for offset in range(0, len(rows), BULK_CHUNK_SIZE):
+        connection.execute(statement, rows[offset:offset + BULK_CHUNK_SIZE])
+
+
+def _next_id(db: Session, column) -> int:
+    """Nächste freie ID - erlaubt explizite IDs auch in nicht leeren Datenbanken"""
+    return (db.query(func.max(column)).scalar() or 0) + 1
+
+
+def _workdays(start: date, end: date) -> List[date]:
+    """Alle Werktage (Mo-Fr) im Zeitraum"""
+    days = []
+    current = start
+    while current <= end:
+        if current.weekday() < 5:
+            days.append(current)
+        current += timedelta(days=1)
+    return days
+
+
+def _holiday_rows(rng: random.Random, regions: List[str], years: Iterable[int], start_id: int) -> List[dict]:
+    """Feiertagskalender je Region und Jahr (nationale Feiertage einmal je Oberregion)"""
+    parents = [p for p in PARENT_HOLIDAYS if any(p in region_chain(region)[1:] for region in regions)]
+    rows = []
+    for region in parents + list(regions):
+        fixed = PARENT_HOLIDAYS.get(region) or REGION_HOLIDAYS.get(region)
+        if fixed is None:
+            # Synthetische Region: feste, aber zufällige Feiertage
+            fixed = [(rng.randint(1, 12), rng.randint(1, 28), f"Feiertag {n + 1}") for n in range(6)]
+        for year in years:
+            for month, day, name in fixed:
+                rows.append({
+                    "holiday_id": start_id + len(rows),
+                    "date": date(year, month, day),
+                    "region_code": region,
+                    "name": name,
+                    "is_company_day": False,
+                })
+    return rows
+
+
+def _pto_rows(
+    rng: random.Random,
+    member_id: int,
+    period_start: date,
+    period_end: date,
+    vacation_days_per_year: int,
+    sick_days_per_year: int,
+    start_id: int,
+) -> List[dict]:
+    """Nicht überlappende PTO-Einträge (Urlaub in Blöcken, kurze Krankheiten, persönliche Tage)"""
+    total_days = (period_end - period_start).days + 1
+    years = total_days / 365.0
+    taken = bytearray(total_days)  # Belegte Tage je Offset
+    entries = []
+
+    def place(length: int, pto_type: str) -> None:
+        # Einige Versuche für eine überlappungsfreie Position
+        span = max(1, total_days - length)
+        for _ in range(5):
+            offset = int(rng.random() * span)
+            if taken.find(1, offset, offset + length) == -1:
+                taken[offset:offset + length] = b"\x01" * length
+                entries.append((offset, length, pto_type))
+                return
+
+    vacation_budget = int(vacation_days_per_year * years)
+    while vacation_budget > 0:
+        length = min(rng.choices(VACATION_BLOCKS, cum_weights=VACATION_BLOCK_CUM_WEIGHTS)[0], vacation_budget)
+        place(length, "vacation")
+        vacation_budget -= length
+
+    sick_budget = int(sick_days_per_year * years * rng.uniform(0.3, 1.7))
+    while sick_budget > 0:
+        length = min(rng.choice(SICK_SPELLS), sick_budget)
+        place(length, "sick")
+        sick_budget -= length
+
+    for _ in range(int(years * rng.uniform(0, 3))):
+        place(1, "personal")
+
+    entries.sort()
+    ordinal = period_start.toordinal()
+    return [
+        {
+            "pto_id": start_id + i,
+            "member_id": member_id,
+            "from_date": date.fromordinal(ordinal + offset),
+            "to_date": date.fromordinal(ordinal + offset + length - 1),
+            "type": pto_type,
+            "notes": None,
+        }
+        for i, (offset, length, pto_type) in enumerate(entries)
+    ]
+
+
+def generate_dataset(
+    db: Session,
+    members: int = 100,
+    regions: int = 4,
+    sprints: int = 10,
+    roster_size: Optional[int] = None,
+    parallel_sprints: int = 1,
+    sprint_days: int = 14,
+    start_date: date = date(2025, 1, 6),
+    vacation_days_per_year: int = 28,
+    sick_days_per_year: int = 8,
+    pto_history_days: int = 365,
+    assignment_window_rate: float = 0.1,
+    override_rate: float = 0.01,
+    seed: int = 42,
+) -> Dict[str, int]:
+    """
+    Synthetischen Datensatz erzeugen und per Bulk-Insert schreiben
+
+    - Sprints laufen in `parallel_sprints` Streams mit fester Kadenz (`sprint_days`);
+      jeder Stream hat ein festes Team aus `roster_size` Members
+    - PTO wird ab `pto_history_days` vor dem ersten Sprint generiert (Historie für Prognosen)
+    - Gleicher `seed` -> identische Daten
+
+    Gibt die Anzahl der erzeugten Zeilen je Tabelle zurück. Committet am Ende.
+    """
+    rng = random.Random(seed)
+    roster_size = min(members, roster_size if roster_size is not None else 50)
+    region_list = region_codes(regions)
+
+    # === Members ===
+    first_member_id = _next_id(db, Member.member_id)
+    member_rows = []
+    for i in range(members):
+        member_rows.append({
+            "member_id": first_member_id + i,
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i + 1}",
+            "employment_ratio": rng.choices(EMPLOYMENT_RATIOS, EMPLOYMENT_WEIGHTS)[0],
+            "region_code": region_list[i % len(region_list)] if region_list else None,
+            "active": rng.random() > 0.03,
+        })
+    member_ids = [row["member_id"] for row in member_rows]
+
+    # === Sprints ===
+    first_sprint_id = _next_id(db, Sprint.sprint_id)
+    sprint_rows = []
+    for i in range(sprints):
+        period, stream = divmod(i, parallel_sprints)
+        sprint_start = start_date + timedelta(days=period * sprint_days)
+        sprint_end = sprint_start + timedelta(days=sprint_days - 1)
+        while sprint_end.weekday() >= 5 and sprint_end > sprint_start:
+            sprint_end -= timedelta(days=1)
+        sprint_rows.append({
+            "sprint_id": first_sprint_id + i,
+            "name": f"Sprint {period + 1}" + (f" / Stream {stream + 1}" if parallel_sprints > 1 else ""),
+            "start_date": sprint_start,
+            "end_date": sprint_end,
+            "status": calculate_status_from_dates(sprint_start, sprint_end),
+        })
+
+    # === Roster + Overrides ===
+    roster_rows = []
+    override_rows = []
+    for i, sprint in enumerate(sprint_rows):
+        stream = i % parallel_sprints
+        offset = (stream * roster_size) % max(1, members)
+        team = [member_ids[(offset + k) % members] for k in range(roster_size)]
+        workdays = _workdays(sprint["start_date"], sprint["end_date"])
+
+        for member_id in team:
+            assignment_from = assignment_to = None
+            if workdays and rng.random() < assignment_window_rate:
+                # Späterer Einstieg oder früherer Ausstieg
+                cut = workdays[rng.randrange(len(workdays))]
+                if rng.random() < 0.5:
+                    assignment_from = cut
+                else:
+                    assignment_to = cut
+
+            roster_rows.append({
+                "sprint_id": sprint["sprint_id"],
+                "member_id": member_id,
+                "allocation": rng.choices(ALLOCATIONS, ALLOCATION_WEIGHTS)[0],
+                "assignment_from": assignment_from,
+                "assignment_to": assignment_to,
+            })
+
+            if override_rate > 0:
+                for day in workdays:
+                    if rng.random() < override_rate:
+                        override_rows.append({
+                            "sprint_id": sprint["sprint_id"],
+                            "member_id": member_id,
+                            "day": day,
+                            "state": rng.choices(OVERRIDE_STATES, OVERRIDE_STATE_WEIGHTS)[0],
+                            "reason": None,
+                        })
+
+    # === PTO ===
+    timeline_start = start_date - timedelta(days=pto_history_days)
+    timeline_end = sprint_rows[-1]["end_date"] if sprint_rows else start_date
+    next_pto_id = _next_id(db, PTO.pto_id)
+    pto_rows = []
+    for member_id in member_ids:
+        rows = _pto_rows(
+            rng, member_id, timeline_start, timeline_end,
+            vacation_days_per_year, sick_days_per_year, next_pto_id + len(pto_rows)
+        )
+        pto_rows.extend(rows)
+
+    # === Feiertage ===
+    years = range(timeline_start.year, timeline_end.year + 1)
+    holiday_rows = _holiday_rows(rng, region_list, years, _next_id(db, Holiday.holiday_id))
+
+    # Reihenfolge wegen Foreign Keys
+    _bulk_insert(db, Member, member_rows)
+    _bulk_insert(db, Sprint, sprint_rows)
+    _bulk_insert(db, SprintRoster, roster_rows)
+    _bulk_insert(db, PTO, pto_rows)
+    _bulk_insert(db, Holiday, holiday_rows)
+    _bulk_insert(db, AvailabilityOverride, override_rows)
+    db.commit()
+    clear_holiday_calendars()
+
+    return {
+        "members": len(member_rows),
+        "sprints": len(sprint_rows),
+        "sprint_roster": len(roster_rows),
+        "pto": len(pto_rows),
+        "holidays": len(holiday_rows),
+        "availability_overrides": len(override_rows),
+    }
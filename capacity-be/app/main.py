@@ -1,10 +1,16 @@
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
 from app.api.routes import router as api_router
 from app.core.config import settings
-from app.db.init_db import ensure_database_ready
+from app.core import metrics
+from app.core.timing import RequestTimingMiddleware, instrument_engine
+from app.db.base import engine, replica_engine
+from app.db.session import READ_YOUR_WRITES_HEADER, ReadYourWritesMiddleware
+from app.services.forecast import shutdown_forecast_pool
+from app.db.init_db import ensure_database_ready_async
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -25,21 +31,54 @@ async def startup_event():
     """Application startup event handler"""
     logger.info("Starting Capacity Planner API...")
     try:
-        ensure_database_ready()
+        # Eine Revision-Query (async Backoff); Migration nur im designierten Prozess
+        await ensure_database_ready_async()
         logger.info("Database initialization completed successfully")
     except Exception as e:
         logger.error(f"Failed to initialize database during startup: {e}")
         # In production, you might want to exit here
         # For development, we'll continue and let the user handle it manually
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """Application shutdown event handler"""
+    shutdown_forecast_pool()
+
 # CORS Middleware hinzufügen
-app.add_middleware(
-    CORSMiddleware,
+CORS_OPTIONS = dict(
     allow_origins=["*"],  # In Produktion spezifische Origins setzen
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Read-your-writes: Cross-Origin-Clients lesen den Header und schicken ihn zurück
+    expose_headers=[READ_YOUR_WRITES_HEADER],
 )
+app.add_middleware(CORSMiddleware, **CORS_OPTIONS)
+
+# Request Timing (Server-Timing Header + Logzeilen), per Environment schaltbar
+if settings.REQUEST_TIMING_ENABLED:
+    instrument_engine(engine)
+    if replica_engine is not None:
+        instrument_engine(replica_engine)
+    app.add_middleware(
+        RequestTimingMiddleware,
+        sample_rate=settings.REQUEST_TIMING_SAMPLE_RATE,
+        emit_header=settings.REQUEST_TIMING_HEADER,
+        emit_log=settings.REQUEST_TIMING_LOG,
+    )
+
+# Prometheus Metrics (Route-Latenzen, Pool-Auslastung, Engine-Phasen, Caches)
+if settings.METRICS_ENABLED:
+    metrics.instrument_pool(engine)
+    metrics.instrument_statement_cache(engine)
+    if replica_engine is not None:
+        metrics.instrument_pool(replica_engine, name="replica")
+        metrics.instrument_statement_cache(replica_engine)
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# Read Replica: Reads eines Clients nach eigenen Writes kurz vom Primary
+if replica_engine is not None:
+    app.add_middleware(ReadYourWritesMiddleware)
 
 # API Router einbinden
 app.include_router(api_router, prefix="/api/v1")
@@ -50,6 +89,13 @@ async def health_check():
     """Health Check Endpoint"""
     return {"status": "ok"}
 
+# Metrics Route
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        """Prometheus Scrape Endpoint"""
+        return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 # Root Route
 @app.get("/")
 async def root():
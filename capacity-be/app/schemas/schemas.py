@@ -1,9 +1,9 @@
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Optional, List
+from typing import Any, Optional, List
 from enum import Enum
 
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
 
 from app.db.models import SprintStatus, AvailabilityState
 
@@ -54,6 +54,38 @@ class SprintUpdate(BaseModel):
     status: Optional[SprintStatus] = None
 
 
+class SprintCopyOptions(BaseModel):
+    """Optionen beim Kopieren des Rosters in einen neuen Sprint"""
+    shift_assignment_windows: bool = True  # False: Assignment-Fenster zurücksetzen (ganzer Sprint)
+    copy_overrides: bool = False  # Overrides um den Abstand der Sprints verschieben und übernehmen
+
+
+class SprintClone(SprintBase, SprintCopyOptions):
+    pass
+
+
+class SprintNext(SprintCopyOptions):
+    name: Optional[str] = Field(None, min_length=1, max_length=255)  # Default: nach Kalenderwochen
+
+
+class SprintSeriesRosterEntry(BaseModel):
+    member_id: int
+    allocation: Decimal = Field(..., gt=0.0, le=1.0)
+
+
+class SprintSeriesCreate(BaseModel):
+    """Sprint-Serie mit fester Kadenz im Werktagskalender (Mo-Fr)"""
+    start_date: date  # erster Sprint (Wochenende: nächster Montag)
+    count: int = Field(..., ge=1, le=104)
+    length_workdays: int = Field(10, ge=1, le=65)
+    cadence_weeks: Optional[int] = Field(None, ge=1, le=26)  # None: direkt im Anschluss
+    # Platzhalter: {n}, {weeks} (W45-46), {start_week}, {end_week}, {year}, {start}, {end}
+    name_pattern: Optional[str] = Field(None, min_length=1, max_length=255)
+    roster_from_sprint_id: Optional[int] = None  # Roster eines bestehenden Sprints als Template
+    roster: List[SprintSeriesRosterEntry] = Field(default_factory=list)
+    allow_overlap: bool = False
+
+
 class SprintResponse(SprintBase):
     sprint_id: int
     status: SprintStatus
@@ -98,6 +130,34 @@ class SprintRosterResponse(SprintRosterBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class RosterBulkAction(str, Enum):
+    ADD = "add"
+    UPDATE = "update"
+    UPSERT = "upsert"
+    REMOVE = "remove"
+
+
+class RosterBulkItem(BaseModel):
+    """Eine Roster-Änderung im Bulk-Request (update: nur gesetzte Felder werden geändert)"""
+    member_id: int
+    action: RosterBulkAction = RosterBulkAction.UPSERT
+    allocation: Optional[Decimal] = Field(None, gt=0.0, le=1.0)
+    assignment_from: Optional[date] = None
+    assignment_to: Optional[date] = None
+
+
+class RosterBulkResult(BaseModel):
+    member_id: int
+    status: str  # added, updated, removed, error
+    error: Optional[str] = None
+
+
+class RosterBulkResponse(BaseModel):
+    success_count: int
+    error_count: int
+    results: List[RosterBulkResult]
+
+
 # === PTO Schemas ===
 
 class PTOBase(BaseModel):
@@ -133,7 +193,7 @@ class HolidayBase(BaseModel):
     date: date
     region_code: str = Field(..., max_length=10)
     name: str = Field(..., min_length=1, max_length=255)
-    is_company_day: bool = True
+    is_company_day: bool = False  # True: gilt für alle Members unabhängig von der Region
 
 
 class HolidayCreate(HolidayBase):
@@ -215,10 +275,18 @@ class AvailabilityOverrideResponse(AvailabilityOverrideBase):
 
 # === PTO (Personal Time Off) Schemas ===
 
+class PTOType(str, Enum):
+    """PTO-Typen (sick/personal fließen als ungeplante Abwesenheit in den Forecast)"""
+    VACATION = "vacation"
+    SICK = "sick"
+    PERSONAL = "personal"
+
+
 class PTOBase(BaseModel):
     member_id: int
     from_date: date
     to_date: date
+    type: PTOType = PTOType.VACATION
     description: Optional[str] = Field(None, max_length=500)
 
     @field_validator('to_date')
@@ -237,6 +305,7 @@ class PTOCreate(PTOBase):
 class PTOUpdate(BaseModel):
     from_date: Optional[date] = None
     to_date: Optional[date] = None
+    type: Optional[PTOType] = None
     description: Optional[str] = Field(None, max_length=500)
 
 
@@ -245,3 +314,361 @@ class PTO(PTOBase):
     member_name: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# === Forecast Schemas ===
+
+class ForecastPercentiles(BaseModel):
+    """Kapazitäts-Perzentile aus der Simulation (P10 = pessimistisch)"""
+    p10: float
+    p50: float
+    p90: float
+
+
+class ForecastMember(BaseModel):
+    """Forecast für ein Member"""
+    member_id: int
+    name: str
+    planned_days: float
+    planned_hours: float
+    days: ForecastPercentiles
+    hours: ForecastPercentiles
+    expected_absence_days: float
+
+
+class SprintForecastResponse(BaseModel):
+    """Monte-Carlo-Forecast für einen Sprint"""
+    sprint: SprintResponse
+    simulations: int
+    planned_days_team: float
+    planned_hours_team: float
+    days_team: ForecastPercentiles
+    hours_team: ForecastPercentiles
+    members: List[ForecastMember]
+
+
+class PortfolioForecastResponse(BaseModel):
+    """Forecast für mehrere Sprints inkl. Summe über alle Sprints"""
+    sprints: List[SprintForecastResponse]
+    simulations: int
+    hours_total: ForecastPercentiles
+    elapsed_ms: float
+
+
+# === Scenario (What-if) Schemas ===
+
+class ScenarioOperation(str, Enum):
+    ADD_MEMBER = "add_member"
+    REMOVE_MEMBER = "remove_member"
+    SET_ALLOCATION = "set_allocation"
+    ADD_PTO = "add_pto"
+    SET_OVERRIDE = "set_override"
+
+
+# Pflichtfelder je Operation (zusätzlich zu member_id)
+SCENARIO_REQUIRED_FIELDS = {
+    ScenarioOperation.ADD_MEMBER: ("allocation",),
+    ScenarioOperation.REMOVE_MEMBER: (),
+    ScenarioOperation.SET_ALLOCATION: ("allocation",),
+    ScenarioOperation.ADD_PTO: ("from_date", "to_date"),
+    ScenarioOperation.SET_OVERRIDE: ("day",),
+}
+
+
+class ScenarioChange(BaseModel):
+    """Hypothetische Änderung - wird nie in die Datenbank geschrieben"""
+    op: ScenarioOperation
+    member_id: int
+    allocation: Optional[Decimal] = Field(None, gt=0.0, le=1.0)
+    assignment_from: Optional[date] = None
+    assignment_to: Optional[date] = None
+    from_date: Optional[date] = None
+    to_date: Optional[date] = None
+    day: Optional[date] = None
+    state: Optional[AvailabilityState] = None  # set_override: None = Override entfernen
+
+    @model_validator(mode='after')
+    def validate_required_fields(self):
+        """Validate fields required by op"""
+        missing = [f for f in SCENARIO_REQUIRED_FIELDS[self.op] if getattr(self, f) is None]
+        if missing:
+            raise ValueError(f"{self.op.value} requires {', '.join(missing)}")
+        if self.from_date and self.to_date and self.to_date < self.from_date:
+            raise ValueError('to_date must be >= from_date')
+        return self
+
+
+class Scenario(BaseModel):
+    name: str = Field(..., min_length=1, max_length=255)
+    changes: List[ScenarioChange] = Field(default_factory=list)
+
+
+class ScenarioRequest(BaseModel):
+    """POST /sprints/{id}/scenarios Body - alle Szenarien gegen denselben Basis-Load"""
+    scenarios: List[Scenario] = Field(..., min_length=1, max_length=50)
+
+
+class ScenarioMemberDelta(BaseModel):
+    """Abweichung eines Members gegenüber dem Ist-Stand"""
+    member_id: int
+    name: str
+    status: str  # added|removed|changed|unchanged
+    base_sum_days: float
+    sum_days: float
+    delta_days: float
+    base_sum_hours: float
+    sum_hours: float
+    delta_hours: float
+    changed_days: List[date] = []
+
+
+class ScenarioResult(BaseModel):
+    name: str
+    availability: AvailabilityResponse
+    delta_days_team: float
+    delta_hours_team: float
+    members: List[ScenarioMemberDelta]
+
+
+class ScenarioResponse(BaseModel):
+    """Ergebnisse aller Szenarien plus Ist-Summen"""
+    sprint_id: int
+    base_sum_days_team: float
+    base_sum_hours_team: float
+    scenarios: List[ScenarioResult]
+
+
+# === Team Schemas ===
+
+class TeamBase(BaseModel):
+    name: str = Field(..., min_length=1, max_length=255)
+    parent_team_id: Optional[int] = None
+
+
+class TeamCreate(TeamBase):
+    pass
+
+
+class TeamResponse(TeamBase):
+    team_id: int
+    member_count: Optional[int] = None  # direkte Members (nur in Listen befüllt)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TeamMemberCreate(BaseModel):
+    member_id: int
+
+
+class TeamMemberResponse(BaseModel):
+    team_id: int
+    member_id: int
+    member_name: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TeamSprintRollup(BaseModel):
+    """Kapazität eines Teams (inkl. Sub-Teams) in einem Sprint"""
+    sprint_id: int
+    sum_days: float
+    sum_hours: float
+
+
+class TeamRollupNode(BaseModel):
+    """Ein Team im Rollup-Baum - Werte enthalten alle Sub-Teams"""
+    team_id: int
+    name: str
+    member_count: int  # Members im Teilbaum
+    sum_days: float
+    sum_hours: float
+    sprints: List[TeamSprintRollup]
+    days: List[float]  # Personentage je Datum (parallel zu TeamRollupResponse.dates)
+    hours: List[float]  # Stunden je Datum
+    children: List["TeamRollupNode"] = []
+
+
+class TeamRollupResponse(BaseModel):
+    """Bottom-up aggregierte Kapazität eines Team-Baums"""
+    sprints: List[SprintResponse]
+    dates: List[date]
+    root: TeamRollupNode
+
+
+# === Report Schemas ===
+
+class ReportGroupBy(str, Enum):
+    REGION = "region"
+    MEMBER = "member"
+    TEAM = "team"
+
+
+class ReportSprint(BaseModel):
+    """Sprint als Zeitachse eines Reports"""
+    sprint_id: int
+    name: str
+    start_date: date
+    end_date: date
+
+
+class CapacitySeries(BaseModel):
+    """Zeitreihe einer Gruppe (Werte parallel zu `sprints`)"""
+    key: Optional[str] = None  # region_code / member_id / team_id, None = ohne Zuordnung
+    label: str
+    days: List[float]
+    hours: List[float]
+
+
+class CapacityReportResponse(BaseModel):
+    """Kapazität je Sprint, gruppiert nach Region, Member oder Team"""
+    group_by: ReportGroupBy
+    sprints: List[ReportSprint]
+    series: List[CapacitySeries]
+    total_days: List[float]
+    total_hours: List[float]
+
+
+class CapacityTrendResponse(BaseModel):
+    """Geplante vs. verfügbare Stunden je Sprint"""
+    sprints: List[ReportSprint]
+    planned_hours: List[float]  # Werktage * 8h * employment_ratio * allocation
+    available_hours: List[float]  # nach Feiertagen, PTO, Assignment-Fenster und Overrides
+    availability_ratio: List[Optional[float]]
+    available_hours_avg: List[Optional[float]]  # gleitender Durchschnitt über `window` Sprints (ohne Sprints ohne Fakten)
+    window: int
+
+
+class OverAllocationSprint(BaseModel):
+    sprint_id: int
+    name: str
+    allocation: float
+
+
+class OverAllocationPeriod(BaseModel):
+    """Zeitraum, in dem die Allocations eines Members über parallele Sprints 1.0 übersteigen"""
+    member_id: int
+    member_name: Optional[str] = None
+    from_date: date
+    to_date: date
+    total_allocation: float
+    sprints: List[OverAllocationSprint]
+
+
+class OverAllocationResponse(BaseModel):
+    periods: List[OverAllocationPeriod]
+    member_count: int
+    checked_intervals: int
+
+
+# === Allocation Plan Schemas ===
+
+class AllocationPlanSprint(BaseModel):
+    """Zielkapazität eines Sprints"""
+    sprint_id: int
+    target_hours: float = Field(..., ge=0)
+    allowed_member_ids: Optional[List[int]] = None  # None: alle Kandidaten
+
+
+class AllocationPlanFixed(BaseModel):
+    """Feste Zuweisung - wird übernommen und auf das Ziel angerechnet"""
+    sprint_id: int
+    member_id: int
+    allocation: Decimal = Field(..., gt=0.0, le=1.0)
+
+
+class AllocationPlanRequest(BaseModel):
+    """POST /planning/allocations Body - nur Vorschlag, es wird nichts geschrieben"""
+    sprints: List[AllocationPlanSprint] = Field(..., min_length=1, max_length=100)
+    member_ids: Optional[List[int]] = Field(None, description="Kandidaten (Default: alle aktiven Members)")
+    fixed: List[AllocationPlanFixed] = Field(default_factory=list)
+    max_total_allocation: Decimal = Field(Decimal("1.00"), gt=0.0, le=1.0)
+    step: Decimal = Field(Decimal("0.05"), ge=Decimal("0.01"), le=1.0)
+    include_other_sprints: bool = True  # Allocations in Sprints außerhalb des Plans belegen Kapazität
+
+    @model_validator(mode='after')
+    def validate_references(self):
+        """Validate unique sprints and fixed assignments within planned sprints"""
+        sprint_ids = [s.sprint_id for s in self.sprints]
+        if len(set(sprint_ids)) != len(sprint_ids):
+            raise ValueError('sprint_id must be unique')
+        pairs = [(f.sprint_id, f.member_id) for f in self.fixed]
+        if len(set(pairs)) != len(pairs):
+            raise ValueError('fixed assignments must be unique per sprint and member')
+        if any(sprint_id not in sprint_ids for sprint_id, _ in pairs):
+            raise ValueError('fixed assignments must reference a planned sprint')
+        return self
+
+
+class AllocationPlanEntry(BaseModel):
+    member_id: int
+    name: str
+    allocation: float
+    hours: float
+    fixed: bool = False
+
+
+class AllocationPlanSprintResult(BaseModel):
+    sprint_id: int
+    name: str
+    start_date: date
+    end_date: date
+    target_hours: float
+    planned_hours: float
+    missing_hours: float
+    members: List[AllocationPlanEntry]
+
+
+class AllocationPlanResponse(BaseModel):
+    sprints: List[AllocationPlanSprintResult]
+    feasible: bool  # alle Ziele erreicht
+    missing_hours: float
+    candidate_count: int
+    elapsed_ms: float
+
+
+# === Export Schemas ===
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    XLSX = "xlsx"
+
+
+class FactExportFormat(str, Enum):
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+# === Batch Schemas ===
+
+class BatchMethod(str, Enum):
+    GET = "GET"
+    POST = "POST"
+    PUT = "PUT"
+    PATCH = "PATCH"
+    DELETE = "DELETE"
+
+
+class BatchOperation(BaseModel):
+    """Eine Sub-Operation: Request gegen eine bestehende Route (Pfad relativ zu /api/v1)"""
+    id: Optional[str] = Field(None, max_length=100, description="Frei wählbar, wird im Ergebnis zurückgegeben")
+    method: BatchMethod
+    path: str = Field(..., pattern=r"^/", max_length=500, description="z.B. /sprints/1/roster?active=true")
+    body: Optional[Any] = None
+
+
+class BatchRequest(BaseModel):
+    """POST /batch Body - Operationen werden in Reihenfolge ausgeführt"""
+    operations: List[BatchOperation] = Field(..., min_length=1)
+    atomic: bool = Field(False, description="Alle Operationen in einer Transaktion, Rollback beim ersten Fehler")
+
+
+class BatchResult(BaseModel):
+    """Ergebnis einer Sub-Operation (Status und JSON-Body wie beim Einzel-Request)"""
+    id: Optional[str] = None
+    status: int
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    results: List[BatchResult]
+    committed: bool
@@ -0,0 +1,234 @@
+"""
+Allocation-Plan Service - Allocations für parallele Sprints vorschlagen
+
+Aus Zielstunden je Sprint, festen Zuweisungen und erlaubten Members wird ein
+Vorschlag für SprintRoster.allocation berechnet (es wird nichts geschrieben):
+
+- Stunden bei Allocation 1.0 je Member und Sprint wie in der Availability-
+  Berechnung: Werktage ohne Feiertage der Region und PTO, Sprint-Overrides,
+  * 8h * employment_ratio
+- Freie Allocation je Member und Tag: max_total_allocation minus Allocations in
+  Sprints außerhalb des Plans (Assignment-Fenster wie im Over-Allocation-Report)
+  minus feste Zuweisungen
+- Bestehende Roster-Einträge der geplanten Sprints werden durch den Vorschlag ersetzt
+
+Gelöst wird greedy (app/services/allocation_solver.py): einige Queries für
+die Eingaben, danach NumPy über (Members × Sprints × Tage).
+"""
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Set
+
+from sqlalchemy.orm import Session
+
+from app.db.models import AvailabilityOverride, Member, Sprint
+from app.schemas.schemas import (
+    AllocationPlanEntry, AllocationPlanRequest, AllocationPlanResponse, AllocationPlanSprintResult
+)
+from app.services.availability import DAY_VALUES, AvailabilityService
+from app.services.over_allocation import OverAllocationService
+from app.services.validation import ValidationError
+
+HOURS_PER_DAY = 8
+
+
+class AllocationPlanService:
+    """Service für Allocation-Vorschläge über mehrere Sprints"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.availability = AvailabilityService(db)
+
+    def plan(self, request: AllocationPlanRequest) -> AllocationPlanResponse:
+        """
+        Allocations für alle Sprints des Requests vorschlagen
+
+        Raises: ValidationError bei unbekannten Sprints/Members oder festen
+        Zuweisungen über max_total_allocation
+        """
+        import numpy as np
+        from app.services import allocation_solver as solver
+
+        started = time.perf_counter()
+        sprints = self._load_sprints([s.sprint_id for s in request.sprints])
+        members, candidate_ids = self._load_members(request)
+
+        member_index = {member.member_id: i for i, member in enumerate(members)}
+        sprint_index = {sprint.sprint_id: i for i, sprint in enumerate(sprints)}
+        first_day = min(sprint.start_date for sprint in sprints)
+        days = self.availability.generate_sprint_days(first_day, max(sprint.end_date for sprint in sprints))
+        spans = [
+            ((sprint.start_date - first_day).days, (sprint.end_date - first_day).days + 1)
+            for sprint in sprints
+        ]
+
+        hours = self._hours_matrix(members, days, spans, member_index, sprint_index)
+
+        max_total = float(request.max_total_allocation)
+        capacity = np.full((len(members), len(days)), max_total)
+        if request.include_other_sprints:
+            self._subtract_other_sprints(capacity, days, member_index, sprint_index)
+
+        # Feste Zuweisungen belegen Kapazität und zählen auf das Ziel
+        fixed = np.zeros((len(members), len(sprints)))
+        for entry in request.fixed:
+            m, s = member_index[entry.member_id], sprint_index[entry.sprint_id]
+            fixed[m, s] = float(entry.allocation)
+            start, stop = spans[s]
+            capacity[m, start:stop] -= float(entry.allocation)
+        overbooked = [
+            members[m].member_id
+            for m in np.nonzero((capacity < -solver.EPSILON).any(axis=1) & fixed.any(axis=1))[0]
+        ]
+        if overbooked:
+            raise ValidationError(
+                f"Fixed allocations exceed max_total_allocation for members: {', '.join(map(str, overbooked))}",
+                "fixed"
+            )
+
+        allowed = np.zeros((len(members), len(sprints)), dtype=bool)
+        for target in request.sprints:
+            ids = candidate_ids if target.allowed_member_ids is None else set(target.allowed_member_ids)
+            allowed[[member_index[i] for i in ids], sprint_index[target.sprint_id]] = True
+        allowed &= fixed == 0
+
+        target_hours = {target.sprint_id: target.target_hours for target in request.sprints}
+        targets = np.array([target_hours[sprint.sprint_id] for sprint in sprints])
+        fixed_hours = (fixed * hours).sum(axis=0)
+
+        solution = solver.solve(solver.AllocationProblem(
+            hours=hours,
+            capacity=capacity,
+            spans=spans,
+            targets=np.maximum(targets - fixed_hours, 0.0),
+            allowed=allowed,
+            step=float(request.step),
+        ))
+
+        results = [
+            self._sprint_result(sprint, s, members, hours, fixed, solution.allocation, targets[s])
+            for s, sprint in enumerate(sprints)
+        ]
+        missing = sum(result.missing_hours for result in results)
+        return AllocationPlanResponse(
+            sprints=results,
+            feasible=missing == 0,
+            missing_hours=round(missing, 2),
+            candidate_count=len(candidate_ids),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+
+    def _load_sprints(self, sprint_ids: List[int]) -> List[Sprint]:
+        sprints = self.db.query(Sprint).filter(Sprint.sprint_id.in_(sprint_ids)).order_by(
+            Sprint.start_date, Sprint.sprint_id
+        ).all()
+        missing = sorted(set(sprint_ids) - {sprint.sprint_id for sprint in sprints})
+        if missing:
+            raise ValidationError(f"Sprints not found: {', '.join(map(str, missing))}", "sprint_id")
+        return sprints
+
+    def _load_members(self, request: AllocationPlanRequest):
+        """Kandidaten plus alle in allowed_member_ids/fixed genannten Members (eine Query)"""
+        referenced: Set[int] = {entry.member_id for entry in request.fixed}
+        for target in request.sprints:
+            referenced.update(target.allowed_member_ids or ())
+        explicit = referenced | set(request.member_ids or ())
+
+        query = self.db.query(Member)
+        if request.member_ids is None:
+            query = query.filter(Member.active.is_(True) | Member.member_id.in_(explicit))
+        else:
+            query = query.filter(Member.member_id.in_(explicit))
+        members = query.order_by(Member.member_id).all()
+
+        known = {member.member_id for member in members}
+        missing = sorted(explicit - known)
+        if missing:
+            raise ValidationError(f"Members not found: {', '.join(map(str, missing))}", "member_id")
+
+        if request.member_ids is None:
+            candidate_ids = {member.member_id for member in members if member.active}
+        else:
+            candidate_ids = set(request.member_ids)
+        return members, candidate_ids
+
+    def _hours_matrix(self, members: List[Member], days: List[date], spans,
+                      member_index: Dict[int, int], sprint_index: Dict[int, int]):
+        """(M, S) Stunden bei Allocation 1.0 - Auto-Status je Tag plus Overrides der Sprints"""
+        import numpy as np
+
+        member_ids = list(member_index)
+        day_index = {day: i for i, day in enumerate(days)}
+
+        # (M, D) Personentage: Werktage ohne Feiertage (effektiver Kalender der Region) und PTO
+        day_values = np.ones((len(members), len(days)))
+        day_values[:, [i for i, day in enumerate(days) if day.weekday() >= 5]] = 0.0
+        rows_by_region = defaultdict(list)
+        for i, member in enumerate(members):
+            rows_by_region[member.region_code].append(i)
+        holidays = self.availability.load_holidays(days, set(rows_by_region))
+        for holiday_day, region_code in holidays:
+            day_values[rows_by_region[region_code], day_index[holiday_day]] = 0.0
+        for member_id, pto_day in self.availability.load_pto(days, member_ids):
+            day_values[member_index[member_id], day_index[pto_day]] = 0.0
+
+        sprint_days = np.stack([
+            np.pad(np.ones(stop - start), (start, len(days) - stop)) for start, stop in spans
+        ], axis=1)
+        person_days = day_values @ sprint_days
+
+        # Overrides gelten nur im jeweiligen Sprint
+        overrides = self.db.query(
+            AvailabilityOverride.sprint_id, AvailabilityOverride.member_id,
+            AvailabilityOverride.day, AvailabilityOverride.state
+        ).filter(
+            AvailabilityOverride.sprint_id.in_(list(sprint_index)),
+            AvailabilityOverride.member_id.in_(member_ids)
+        ).all()
+        for sprint_id, member_id, day, state in overrides:
+            if day not in day_index:
+                continue
+            m = member_index[member_id]
+            person_days[m, sprint_index[sprint_id]] += DAY_VALUES.get(state, 0.0) - day_values[m, day_index[day]]
+
+        ratios = np.array([float(member.employment_ratio) for member in members])
+        return person_days * HOURS_PER_DAY * ratios[:, None]
+
+    def _subtract_other_sprints(self, capacity, days: List[date], member_index: Dict[int, int],
+                                sprint_index: Dict[int, int]) -> None:
+        """Allocations in Sprints außerhalb des Plans von der freien Allocation abziehen"""
+        first_day, last_day = days[0], days[-1]
+        intervals = OverAllocationService(self.db).load_intervals(list(member_index), first_day, last_day)
+        for interval in intervals:
+            if interval.sprint_id in sprint_index:
+                continue
+            start = (max(interval.start, first_day) - first_day).days
+            stop = (min(interval.end, last_day) - first_day).days + 1
+            if stop > start:
+                capacity[member_index[interval.member_id], start:stop] -= float(interval.allocation)
+
+    def _sprint_result(self, sprint: Sprint, s: int, members: List[Member], hours, fixed, allocation,
+                       target: float) -> AllocationPlanSprintResult:
+        entries = []
+        for m in (fixed[:, s] + allocation[:, s]).nonzero()[0]:
+            value = fixed[m, s] or allocation[m, s]
+            entries.append(AllocationPlanEntry(
+                member_id=members[m].member_id,
+                name=members[m].name,
+                allocation=round(float(value), 2),
+                hours=round(float(value * hours[m, s]), 2),
+                fixed=bool(fixed[m, s]),
+            ))
+        entries.sort(key=lambda e: (not e.fixed, -e.hours, e.name))
+        planned = sum(entry.hours for entry in entries)
+        return AllocationPlanSprintResult(
+            sprint_id=sprint.sprint_id,
+            name=sprint.name,
+            start_date=sprint.start_date,
+            end_date=sprint.end_date,
+            target_hours=target,
+            planned_hours=round(planned, 2),
+            missing_hours=round(max(target - planned, 0.0), 2),
+            members=entries,
+        )
@@ -0,0 +1,98 @@
+"""
+Greedy-Solver für Allocations über parallele Sprints (NumPy, ohne DB-Zugriff)
+
+Eingaben je Member (M), Sprint (S) und Kalendertag (D) im Planungszeitraum:
+- hours: verfügbare Stunden bei Allocation 1.0 (nach Wochenenden, Feiertagen, PTO)
+- capacity: freie Allocation je Member und Tag (Maximum minus Last anderer Sprints)
+- spans: Sprint als Tagesbereich [start, stop) - die Allocation gilt an allen Tagen
+- targets: fehlende Stunden je Sprint
+- allowed: welche Member für welchen Sprint vorgeschlagen werden dürfen
+
+Vorgehen: Der Sprint mit dem größten Defizit bekommt den Member, der es am
+besten deckt (größter Beitrag, dann wenigste überschüssige Stunden, dann
+wenigste Alternativen unter den offenen Sprints). Die Allocation wird auf
+`step` gerundet und ist durch die freie Allocation an allen Sprinttagen
+begrenzt. Jedes Paar (Member, Sprint) wird höchstens einmal vergeben, die
+Schleife läuft also höchstens M × S Mal mit Vektoroperationen über M.
+"""
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+EPSILON = 1e-9
+
+
+@dataclass
+class AllocationProblem:
+    hours: np.ndarray  # (M, S) Stunden bei Allocation 1.0
+    capacity: np.ndarray  # (M, D) freie Allocation je Tag
+    spans: List[Tuple[int, int]]  # je Sprint [start, stop) in D
+    targets: np.ndarray  # (S,) fehlende Stunden
+    allowed: np.ndarray  # (M, S) bool
+    step: float = 0.05
+
+
+@dataclass
+class AllocationSolution:
+    allocation: np.ndarray  # (M, S) vorgeschlagene Allocation (Vielfache von step)
+    planned_hours: np.ndarray  # (S,) vorgeschlagene Stunden
+    remaining: np.ndarray  # (S,) nicht gedeckte Stunden
+    iterations: int
+
+
+def solve(problem: AllocationProblem) -> AllocationSolution:
+    """Greedy-Zuweisung nach größtem Defizit (siehe Moduldoku)"""
+    hours = np.asarray(problem.hours, dtype=float)
+    capacity = np.array(problem.capacity, dtype=float)
+    deficit = np.array(problem.targets, dtype=float)
+    step = problem.step
+    member_count, sprint_count = hours.shape
+
+    allocation = np.zeros((member_count, sprint_count))
+    open_pairs = np.asarray(problem.allowed, dtype=bool) & (hours > EPSILON)
+    active = deficit > EPSILON
+    iterations = 0
+
+    while active.any():
+        iterations += 1
+        sprint = int(np.argmax(np.where(active, deficit, -np.inf)))
+        start, stop = problem.spans[sprint]
+
+        # Freie Allocation über alle Sprinttage, in ganzen Schritten
+        free = capacity[:, start:stop].min(axis=1) if stop > start else np.zeros(member_count)
+        units = np.floor(free / step + EPSILON)
+        units[~open_pairs[:, sprint]] = 0
+        if units.max(initial=0) <= 0:
+            active[sprint] = False
+            continue
+
+        hours_per_unit = hours[:, sprint] * step
+        with np.errstate(divide="ignore", invalid="ignore"):
+            needed = np.ceil(deficit[sprint] / hours_per_unit - EPSILON)
+        units = np.minimum(units, np.nan_to_num(needed, posinf=0.0))
+        contribution = units * hours_per_unit
+        covered = np.minimum(contribution, deficit[sprint])
+        overshoot = contribution - covered
+        alternatives = (open_pairs & active).sum(axis=1)
+
+        member = int(np.lexsort((alternatives, overshoot, -np.round(covered, 6)))[0])
+        if covered[member] <= EPSILON:
+            active[sprint] = False
+            continue
+
+        value = units[member] * step
+        allocation[member, sprint] = value
+        capacity[member, start:stop] -= value
+        deficit[sprint] -= contribution[member]
+        open_pairs[member, sprint] = False
+        if deficit[sprint] <= EPSILON:
+            active[sprint] = False
+
+    planned = (allocation * hours).sum(axis=0)
+    return AllocationSolution(
+        allocation=allocation,
+        planned_hours=planned,
+        remaining=np.maximum(deficit, 0.0),
+        iterations=iterations,
+    )
@@ -4,20 +4,44 @@ Availability Business Logic Service
 Berechnet für einen Sprint die Verfügbarkeit aller Roster-Members
 tag-genau mit Auto-Status + Overrides + Kapazitätssummen.
 """
+from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Dict, List, Optional
+from typing import Collection, Dict, List, Optional, Sequence
 from decimal import Decimal
 
 from sqlalchemy.orm import Session, joinedload
 
+from app.core.events import queue_event
+from app.core.metrics import AVAILABILITY_PHASE
+from app.services.capacity_facts import refresh_capacity_facts
+from app.services.holiday_calendar import ResolvedHoliday, resolve_holidays
 from app.db.models import (
-    Sprint, SprintRoster, Member, Holiday, PTO,
+    Sprint, SprintRoster, Member, PTO,
     AvailabilityOverride, AvailabilityState
 )
 from app.schemas.schemas import (
     AvailabilityResponse, AvailabilityMember, AvailabilityDay, SprintResponse
 )
 
+# Personentage je Final State
+DAY_VALUES = {AvailabilityState.AVAILABLE: 1.0, AvailabilityState.HALF: 0.5}
+
+
+def _override_change(member_id: int, day: date, state: Optional[AvailabilityState]) -> dict:
+    """Kompakter Eintrag für Change Events (state=None → Override gelöscht, Auto-Status gilt)"""
+    return {"member_id": member_id, "day": day.isoformat(), "state": state.value if state else None}
+
+
+@dataclass
+class SprintAvailabilityData:
+    """Geladene Eingaben für die Availability-Berechnung eines Sprints"""
+    sprint: Sprint
+    roster_entries: List[SprintRoster]
+    sprint_days: List[date]
+    holidays_map: Dict[tuple, ResolvedHoliday]
+    pto_map: Dict[tuple, PTO]
+    overrides_map: Dict[tuple, AvailabilityOverride]
+
 
 class AvailabilityService:
     """Service für Availability-Berechnungen"""
@@ -29,60 +53,93 @@ class AvailabilityService:
         """
         Hauptmethode: Berechnet komplette Availability-Matrix für Sprint
         """
+        data = self.load_sprint_data(sprint_id)
+        if data is None:
+            return None
+        return self.build_availability(data)
+
+    def load_sprint_data(
+        self, sprint_id: int, member_ids: Optional[Collection[int]] = None
+    ) -> Optional[SprintAvailabilityData]:
+        """
+        Alle Eingaben der Berechnung laden (Sprint, Roster, Feiertage, PTO, Overrides)
+
+        member_ids: optional nur diese Members des Rosters (z.B. Team-Rollups)
+        """
         # Sprint laden
         sprint = self.db.query(Sprint).filter(Sprint.sprint_id == sprint_id).first()
         if not sprint:
             return None
 
         # Sprint Roster mit Members laden
-        roster_entries = self.db.query(SprintRoster).options(
-            joinedload(SprintRoster.member)
-        ).filter(SprintRoster.sprint_id == sprint_id).all()
+        with AVAILABILITY_PHASE.labels(phase="load_roster").time():
+            query = self.db.query(SprintRoster).options(
+                joinedload(SprintRoster.member)
+            ).filter(SprintRoster.sprint_id == sprint_id)
+            if member_ids is not None:
+                query = query.filter(SprintRoster.member_id.in_(list(member_ids)))
+            roster_entries = query.all()
 
         if not roster_entries:
             # Leerer Sprint
-            return AvailabilityResponse(
-                sprint=SprintResponse.model_validate(sprint),
-                members=[],
-                sum_days_team=0.0,
-                sum_hours_team=0.0
-            )
+            return SprintAvailabilityData(sprint, [], [], {}, {}, {})
 
         # Alle Tage im Sprint
-        sprint_days = self._generate_sprint_days(sprint.start_date, sprint.end_date)
+        sprint_days = self.generate_sprint_days(sprint.start_date, sprint.end_date)
 
-        # Feiertage laden (alle Regionen im Roster)
-        region_codes = {entry.member.region_code for entry in roster_entries if entry.member.region_code}
-        holidays_map = self._load_holidays(sprint_days, region_codes)
+        # Feiertage laden (aufgelöste Kalender aller Regionen im Roster)
+        region_codes = {entry.member.region_code for entry in roster_entries}
+        with AVAILABILITY_PHASE.labels(phase="load_holidays").time():
+            holidays_map = self.load_holidays(sprint_days, region_codes)
 
         # PTO laden
         member_ids = [entry.member_id for entry in roster_entries]
-        pto_map = self._load_pto(sprint_days, member_ids)
+        with AVAILABILITY_PHASE.labels(phase="load_pto").time():
+            pto_map = self.load_pto(sprint_days, member_ids)
 
         # Overrides laden
-        overrides_map = self._load_overrides(sprint_id, member_ids, sprint_days)
+        with AVAILABILITY_PHASE.labels(phase="load_overrides").time():
+            overrides_map = self.load_overrides(sprint_id, member_ids, sprint_days)
+
+        return SprintAvailabilityData(sprint, roster_entries, sprint_days, holidays_map, pto_map, overrides_map)
 
+    def build_availability(self, data: SprintAvailabilityData) -> AvailabilityResponse:
+        """Availability-Matrix aus geladenen Daten berechnen"""
         # Für jeden Member Availability berechnen
         members_data = []
         total_team_days = 0.0
         total_team_hours = 0.0
 
-        for roster_entry in roster_entries:
-            member_data = self._calculate_member_availability(
-                roster_entry, sprint_days, holidays_map, pto_map, overrides_map
-            )
-            members_data.append(member_data)
-            total_team_days += member_data.sum_days
-            total_team_hours += member_data.sum_hours
+        with AVAILABILITY_PHASE.labels(phase="compute").time():
+            for roster_entry in data.roster_entries:
+                member_data = self.calculate_member_availability(
+                    roster_entry, data.sprint_days, data.holidays_map, data.pto_map, data.overrides_map
+                )
+                members_data.append(member_data)
+                total_team_days += member_data.sum_days
+                total_team_hours += member_data.sum_hours
 
         return AvailabilityResponse(
-            sprint=SprintResponse.model_validate(sprint),
+            sprint=SprintResponse.model_validate(data.sprint),
             members=members_data,
             sum_days_team=total_team_days,
             sum_hours_team=total_team_hours
         )
 
-    def _generate_sprint_days(self, start_date: date, end_date: date) -> List[date]:
+    def final_states(self, data: SprintAvailabilityData) -> List[List[AvailabilityState]]:
+        """Nur Final States je Roster-Eintrag und Tag (ohne Response-Objekte, z.B. für Forecasts)"""
+        with AVAILABILITY_PHASE.labels(phase="compute").time():
+            return [
+                [
+                    self.day_state(
+                        roster_entry.member, roster_entry, day, data.holidays_map, data.pto_map, data.overrides_map
+                    )[2]
+                    for day in data.sprint_days
+                ]
+                for roster_entry in data.roster_entries
+            ]
+
+    def generate_sprint_days(self, start_date: date, end_date: date) -> List[date]:
         """Alle Tage im Sprint generieren"""
         days = []
         current = start_date
@@ -91,19 +148,16 @@ class AvailabilityService:
             current += timedelta(days=1)
         return days
 
-    def _load_holidays(self, sprint_days: List[date], region_codes: set) -> Dict[tuple, Holiday]:
-        """Feiertage laden: (date, region_code) -> Holiday"""
-        if not region_codes:
-            return {}
-
-        holidays = self.db.query(Holiday).filter(
-            Holiday.date.in_(sprint_days),
-            Holiday.region_code.in_(region_codes)
-        ).all()
+    def load_holidays(self, sprint_days: List[date], region_codes: set) -> Dict[tuple, ResolvedHoliday]:
+        """
+        Feiertage laden: (date, region_code) -> Feiertag des effektiven Kalenders
 
-        return {(h.date, h.region_code): h for h in holidays}
+        Inkl. Oberregionen ("DE" für "DE-NW") und Company Days (auch region_code None),
+        aus dem Kalender-Cache (siehe holiday_calendar).
+        """
+        return resolve_holidays(self.db, sprint_days, region_codes)
 
-    def _load_pto(self, sprint_days: List[date], member_ids: List[int]) -> Dict[tuple, PTO]:
+    def load_pto(self, sprint_days: List[date], member_ids: List[int]) -> Dict[tuple, PTO]:
         """PTO laden: (member_id, date) -> PTO"""
         if not member_ids:
             return {}
@@ -130,7 +184,7 @@ class AvailabilityService:
 
         return pto_map
 
-    def _load_overrides(self, sprint_id: int, member_ids: List[int], sprint_days: List[date]) -> Dict[tuple, AvailabilityOverride]:
+    def load_overrides(self, sprint_id: int, member_ids: List[int], sprint_days: List[date]) -> Dict[tuple, AvailabilityOverride]:
         """Overrides laden: (member_id, date) -> AvailabilityOverride"""
         if not member_ids:
             return {}
@@ -143,11 +197,11 @@ class AvailabilityService:
 
         return {(o.member_id, o.day): o for o in overrides}
 
-    def _calculate_member_availability(
+    def calculate_member_availability(
         self,
         roster_entry: SprintRoster,
         sprint_days: List[date],
-        holidays_map: Dict[tuple, Holiday],
+        holidays_map: Dict[tuple, ResolvedHoliday],
         pto_map: Dict[tuple, PTO],
         overrides_map: Dict[tuple, AvailabilityOverride]
     ) -> AvailabilityMember:
@@ -187,15 +241,44 @@ class AvailabilityService:
         member: Member,
         roster_entry: SprintRoster,
         day: date,
-        holidays_map: Dict[tuple, Holiday],
+        holidays_map: Dict[tuple, ResolvedHoliday],
         pto_map: Dict[tuple, PTO],
         overrides_map: Dict[tuple, AvailabilityOverride]
     ) -> AvailabilityDay:
         """Availability für einen einzelnen Tag berechnen"""
+        (auto_state, override_state, final_state,
+         is_weekend, is_holiday, is_pto, in_assignment) = self.day_state(
+            member, roster_entry, day, holidays_map, pto_map, overrides_map
+        )
+
+        return AvailabilityDay(
+            date=day,
+            auto_state=auto_state,
+            override_state=override_state,
+            final_state=final_state,
+            is_weekend=is_weekend,
+            is_holiday=is_holiday,
+            is_pto=is_pto,
+            in_assignment=in_assignment
+        )
 
+    def day_state(
+        self,
+        member: Member,
+        roster_entry: SprintRoster,
+        day: date,
+        holidays_map: Dict[tuple, ResolvedHoliday],
+        pto_map: Dict[tuple, PTO],
+        overrides_map: Dict[tuple, AvailabilityOverride]
+    ) -> tuple:
+        """
+        Auto-Status und Final State eines Tages
+
+        Returns: (auto_state, override_state, final_state, is_weekend, is_holiday, is_pto, in_assignment)
+        """
         # Basiswerte
         is_weekend = day.weekday() >= 5
-        is_holiday = (day, member.region_code) in holidays_map if member.region_code else False
+        is_holiday = (day, member.region_code) in holidays_map
         is_pto = (member.member_id, day) in pto_map
 
         # Assignment-Fenster prüfen
@@ -229,16 +312,7 @@ class AvailabilityService:
         else:
             final_state = AvailabilityState.AVAILABLE
 
-        return AvailabilityDay(
-            date=day,
-            auto_state=auto_state,
-            override_state=override_state,
-            final_state=final_state,
-            is_weekend=is_weekend,
-            is_holiday=is_holiday,
-            is_pto=is_pto,
-            in_assignment=in_assignment
-        )
+        return auto_state, override_state, final_state, is_weekend, is_holiday, is_pto, in_assignment
 
     def set_availability_override(
         self,
@@ -263,6 +337,8 @@ class AvailabilityService:
             # Override löschen
             if existing:
                 self.db.delete(existing)
+                refresh_capacity_facts(self.db, [member_id], [sprint_id], day, day)
+                queue_event(self.db, sprint_id, "overrides", changes=[_override_change(member_id, day, None)])
                 self.db.commit()
                 return True
             return False  # Nichts zu löschen
@@ -281,5 +357,67 @@ class AvailabilityService:
                 )
                 self.db.add(override)
 
+            refresh_capacity_facts(self.db, [member_id], [sprint_id], day, day)
+            queue_event(self.db, sprint_id, "overrides", changes=[_override_change(member_id, day, state)])
             self.db.commit()
             return True
+
+    def apply_availability_overrides(self, sprint_id: int, items: Sequence) -> List[bool]:
+        """
+        Mehrere Overrides setzen/löschen mit einer Lade-Query und einem Commit
+
+        Semantik je Item wie set_availability_override (state=None → löschen);
+        liefert je Item True/False (False = nichts zu löschen).
+        """
+        if not items:
+            return []
+
+        member_ids = {item.member_id for item in items}
+        days = {item.day for item in items}
+        existing_overrides = self.db.query(AvailabilityOverride).filter(
+            AvailabilityOverride.sprint_id == sprint_id,
+            AvailabilityOverride.member_id.in_(member_ids),
+            AvailabilityOverride.day.in_(days)
+        ).all()
+        existing_map = {(o.member_id, o.day): o for o in existing_overrides}
+
+        results = []
+        for item in items:
+            key = (item.member_id, item.day)
+            existing = existing_map.get(key)
+
+            if item.state is None:
+                # Override löschen
+                if existing:
+                    self.db.delete(existing)
+                    del existing_map[key]
+                    results.append(True)
+                else:
+                    results.append(False)  # Nichts zu löschen
+            else:
+                # Override setzen/updaten
+                if existing:
+                    existing.state = item.state
+                    existing.reason = item.reason
+                else:
+                    override = AvailabilityOverride(
+                        sprint_id=sprint_id,
+                        member_id=item.member_id,
+                        day=item.day,
+                        state=item.state,
+                        reason=item.reason
+                    )
+                    self.db.add(override)
+                    existing_map[key] = override
+                results.append(True)
+
+        if any(results):
+            refresh_capacity_facts(
+                self.db, member_ids=member_ids, sprint_ids=[sprint_id], date_from=min(days), date_to=max(days)
+            )
+            queue_event(self.db, sprint_id, "overrides", changes=[
+                _override_change(item.member_id, item.day, item.state)
+                for item, changed in zip(items, results) if changed
+            ])
+        self.db.commit()
+        return results
@@ -0,0 +1,239 @@
+"""
+Materialisierte Tageskapazität (member_day_capacity)
+
+Faktentabelle je (Sprint, Member, Tag) mit Auto-/Final-State, Personentagen
+und Stunden - Reports lesen daraus, statt die Availability-Engine je Request
+neu zu rechnen.
+
+- Inkrementell: die Schreibpfade (PTO, Roster, Members, Overrides, Feiertage,
+  Sprints) rufen refresh_capacity_facts() für die betroffenen
+  (Member, Zeitraum)-Slices auf - in derselben Transaktion, vor dem Commit
+- Berechnet wird mit derselben Logik wie die Availability-Matrix
+  (AvailabilityService.load_sprint_data + day_state)
+- Voll-Rebuild und Konsistenz-Check gegen die Live-Engine (aus capacity-be/):
+    python -m app.services.capacity_facts rebuild
+    python -m app.services.capacity_facts check [--sprint-id N ...]
+"""
+import sys
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Collection, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import Member, Sprint, SprintRoster, MemberDayCapacity, AvailabilityState
+
+DAY_DECIMALS = {AvailabilityState.AVAILABLE: Decimal("1.0"), AvailabilityState.HALF: Decimal("0.5")}
+ZERO = Decimal("0")
+
+
+@dataclass
+class CapacityFactMismatch:
+    """Abweichung zwischen Faktentabelle und Live-Engine"""
+    sprint_id: int
+    member_id: int
+    day: date
+    expected: Optional[Tuple]  # (auto_state, final_state, days, hours) - None = Zeile zu viel
+    actual: Optional[Tuple]  # None = Zeile fehlt
+
+
+def compute_capacity_rows(
+    db: Session,
+    sprint_id: int,
+    member_ids: Optional[Collection[int]] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+) -> List[Dict]:
+    """Faktenzeilen eines Sprints mit der Availability-Engine berechnen (optional nur Members/Zeitraum)"""
+    from app.services.availability import AvailabilityService
+
+    service = AvailabilityService(db)
+    data = service.load_sprint_data(sprint_id, member_ids=member_ids)
+    if data is None or not data.roster_entries:
+        return []
+
+    days = [d for d in data.sprint_days if (date_from is None or d >= date_from) and (date_to is None or d <= date_to)]
+    rows = []
+    for entry in data.roster_entries:
+        member = entry.member
+        hours_per_day = 8 * Decimal(str(member.employment_ratio)) * Decimal(str(entry.allocation))
+        for day in days:
+            auto_state, _, final_state, *_ = service.day_state(
+                member, entry, day, data.holidays_map, data.pto_map, data.overrides_map
+            )
+            value = DAY_DECIMALS.get(final_state, ZERO)
+            rows.append({
+                "sprint_id": sprint_id,
+                "member_id": entry.member_id,
+                "day": day,
+                "auto_state": auto_state,
+                "final_state": final_state,
+                "days": value,
+                "hours": value * hours_per_day,
+            })
+    return rows
+
+
+def refresh_capacity_facts(
+    db: Session,
+    member_ids: Optional[Collection[int]] = None,
+    sprint_ids: Optional[Collection[int]] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+) -> int:
+    """
+    Betroffene Slices neu berechnen (ohne Commit - läuft in der Transaktion des Aufrufers)
+
+    Löscht alle Zeilen im Slice (auch von Members, die nicht mehr im Roster sind)
+    und schreibt sie für die aktuellen Roster-Einträge neu. Ohne member_ids werden
+    alle Members der angegebenen Sprints neu berechnet.
+    Liefert die Anzahl geschriebener Zeilen.
+    """
+    if not settings.CAPACITY_FACTS_ENABLED:
+        return 0
+    if member_ids is None and sprint_ids is None:
+        raise ValueError("refresh_capacity_facts requires member_ids or sprint_ids")
+
+    member_ids = None if member_ids is None else list(member_ids)
+    sprint_ids = None if sprint_ids is None else list(sprint_ids)
+    if member_ids == [] or sprint_ids == []:
+        return 0
+
+    # Pending Änderungen des Aufrufers für die Neuberechnung sichtbar machen
+    db.flush()
+
+    statement = delete(MemberDayCapacity)
+    if member_ids is not None:
+        statement = statement.where(MemberDayCapacity.member_id.in_(member_ids))
+    if sprint_ids is not None:
+        statement = statement.where(MemberDayCapacity.sprint_id.in_(sprint_ids))
+    if date_from is not None:
+        statement = statement.where(MemberDayCapacity.day >= date_from)
+    if date_to is not None:
+        statement = statement.where(MemberDayCapacity.day <= date_to)
+    db.execute(statement)
+
+    query = db.query(Sprint.sprint_id)
+    if sprint_ids is not None:
+        query = query.filter(Sprint.sprint_id.in_(sprint_ids))
+    if member_ids is not None:
+        query = query.filter(Sprint.sprint_id.in_(
+            select(SprintRoster.sprint_id).where(SprintRoster.member_id.in_(member_ids))
+        ))
+    if date_from is not None:
+        query = query.filter(Sprint.end_date >= date_from)
+    if date_to is not None:
+        query = query.filter(Sprint.start_date <= date_to)
+
+    written = 0
+    for (sprint_id,) in query.all():
+        rows = compute_capacity_rows(db, sprint_id, member_ids, date_from, date_to)
+        if rows:
+            db.execute(insert(MemberDayCapacity), rows)
+            written += len(rows)
+    return written
+
+
+def refresh_region_capacity_facts(
+    db: Session, region_code: Optional[str], day: date, company_wide: bool = False
+) -> int:
+    """
+    Feiertags-Änderung: betroffene Members an diesem Tag neu berechnen
+
+    Region inkl. Unterregionen ("DE" → DE, DE-NW, ...); Company Days betreffen alle Members.
+    """
+    from app.services.holiday_calendar import member_region_filter
+
+    if not settings.CAPACITY_FACTS_ENABLED or not (region_code or company_wide):
+        return 0
+    query = db.query(Member.member_id)
+    if not company_wide:
+        query = query.filter(member_region_filter(Member.region_code, region_code))
+    member_ids = [m for (m,) in query.all()]
+    return refresh_capacity_facts(db, member_ids=member_ids, date_from=day, date_to=day)
+
+
+def rebuild_capacity_facts(db: Session) -> int:
+    """Faktentabelle komplett neu aufbauen (ein Sprint nach dem anderen, ein Commit)"""
+    db.execute(delete(MemberDayCapacity))
+    written = 0
+    for (sprint_id,) in db.query(Sprint.sprint_id).order_by(Sprint.sprint_id).all():
+        rows = compute_capacity_rows(db, sprint_id)
+        if rows:
+            db.execute(insert(MemberDayCapacity), rows)
+            written += len(rows)
+    db.commit()
+    return written
+
+
+def check_capacity_facts(db: Session, sprint_ids: Optional[Collection[int]] = None) -> List[CapacityFactMismatch]:
+    """Faktentabelle gegen die Live-Engine prüfen (fehlende, überzählige und abweichende Zeilen)"""
+    query = db.query(Sprint.sprint_id).order_by(Sprint.sprint_id)
+    if sprint_ids:
+        query = query.filter(Sprint.sprint_id.in_(sprint_ids))
+    checked = [sprint_id for (sprint_id,) in query.all()]
+
+    mismatches = []
+    for sprint_id in checked:
+        expected = {
+            (row["member_id"], row["day"]): (row["auto_state"], row["final_state"], row["days"], row["hours"])
+            for row in compute_capacity_rows(db, sprint_id)
+        }
+        actual = {
+            (f.member_id, f.day): (f.auto_state, f.final_state, Decimal(str(f.days)), Decimal(str(f.hours)))
+            for f in db.query(MemberDayCapacity).filter(MemberDayCapacity.sprint_id == sprint_id).all()
+        }
+        for key in sorted(expected.keys() | actual.keys()):
+            if expected.get(key) != actual.get(key):
+                mismatches.append(CapacityFactMismatch(sprint_id, key[0], key[1], expected.get(key), actual.get(key)))
+
+    # Zeilen von Sprints, die es nicht mehr gibt
+    orphans = db.query(MemberDayCapacity).filter(MemberDayCapacity.sprint_id.notin_(select(Sprint.sprint_id)))
+    if sprint_ids:
+        orphans = orphans.filter(MemberDayCapacity.sprint_id.in_(sprint_ids))
+    for f in orphans.all():
+        mismatches.append(CapacityFactMismatch(
+            f.sprint_id, f.member_id, f.day, None, (f.auto_state, f.final_state, f.days, f.hours)
+        ))
+    return mismatches
+
+
+def main(argv=None) -> int:
+    """CLI: `rebuild` oder `check` (Exit-Code 1 bei Abweichungen)"""
+    import argparse
+    import time
+
+    from app.db.base import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Materialisierte Tageskapazität (member_day_capacity)")
+    parser.add_argument("action", choices=["rebuild", "check"])
+    parser.add_argument("--sprint-id", type=int, action="append", help="Nur diese Sprints prüfen (mehrfach)")
+    parser.add_argument("--limit", type=int, default=20, help="Max. ausgegebene Abweichungen")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        if args.action == "rebuild":
+            written = rebuild_capacity_facts(db)
+            print(f"✅ {written} Zeilen in {time.perf_counter() - started:.1f}s neu aufgebaut")
+            return 0
+
+        mismatches = check_capacity_facts(db, args.sprint_id)
+        if not mismatches:
+            print(f"✅ member_day_capacity konsistent ({time.perf_counter() - started:.1f}s)")
+            return 0
+        print(f"❌ {len(mismatches)} Abweichungen:")
+        for mismatch in mismatches[:args.limit]:
+            print(f"   - Sprint {mismatch.sprint_id}, Member {mismatch.member_id}, {mismatch.day}: "
+                  f"erwartet {mismatch.expected}, gespeichert {mismatch.actual}")
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Export Service - Availability-Matrix als CSV/XLSX
+
+Streamt die Matrix Zeile für Zeile, statt das komplette Sheet im Speicher
+aufzubauen:
+- Zeilen werden je Sprint in Member-Batches (EXPORT_BATCH_MEMBERS) mit der
+  Availability-Engine berechnet und sofort ausgegeben
+- CSV: jeder Batch wird direkt als Chunk der Response geschrieben
+- XLSX: XlsxWriter im constant_memory-Modus schreibt zeilenweise in eine
+  temporäre Datei, die anschließend in Chunks gestreamt und gelöscht wird
+
+Layout: eine Zeile je (Sprint, Member), eine Spalte je Tag (Personentage
+1 / 0.5 / 0, leer außerhalb des Sprints), dazu Summen je Zeile.
+"""
+import csv
+import io
+import os
+import tempfile
+from datetime import date, datetime
+from typing import Iterator, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import Member, Sprint, SprintRoster
+from app.services.availability import DAY_VALUES, AvailabilityService
+
+FIXED_COLUMNS = ["Sprint", "Member", "Region", "Allocation"]
+SUM_COLUMNS = ["Tage", "Stunden"]
+XLSX_CHUNK_BYTES = 64 * 1024
+
+
+class AvailabilityExportService:
+    """Service für den Export von Availability-Matrizen"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.availability = AvailabilityService(db)
+
+    def resolve_sprints(
+        self,
+        sprint_ids: Optional[Sequence[int]] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> List[Sprint]:
+        """Sprints nach IDs und/oder Überschneidung mit dem Zeitraum (nach Startdatum sortiert)"""
+        query = self.db.query(Sprint)
+        if sprint_ids:
+            query = query.filter(Sprint.sprint_id.in_(sprint_ids))
+        if from_date is not None:
+            query = query.filter(Sprint.end_date >= from_date)
+        if to_date is not None:
+            query = query.filter(Sprint.start_date <= to_date)
+        return query.order_by(Sprint.start_date, Sprint.sprint_id).all()
+
+    def export_dates(
+        self, sprints: Sequence[Sprint], from_date: Optional[date] = None, to_date: Optional[date] = None
+    ) -> List[date]:
+        """Tages-Spalten: alle Sprinttage, auf den Zeitraum beschnitten"""
+        days = {
+            day
+            for sprint in sprints
+            for day in self.availability.generate_sprint_days(sprint.start_date, sprint.end_date)
+            if (from_date is None or day >= from_date) and (to_date is None or day <= to_date)
+        }
+        return sorted(days)
+
+    def header(self, dates: Sequence[date]) -> List[str]:
+        return FIXED_COLUMNS + [day.isoformat() for day in dates] + SUM_COLUMNS
+
+    def iter_rows(self, sprints: Sequence[Sprint], dates: Sequence[date]) -> Iterator[List[List]]:
+        """
+        Matrix-Zeilen in Batches (eine Liste von Zeilen je Member-Batch)
+
+        Je Batch werden nur die Eingaben der Members des Batches geladen.
+        """
+        column = {day: i for i, day in enumerate(dates, start=len(FIXED_COLUMNS))}
+        width = len(FIXED_COLUMNS) + len(dates) + len(SUM_COLUMNS)
+        batch_size = max(1, settings.EXPORT_BATCH_MEMBERS)
+
+        for sprint in sprints:
+            sprint_name = sprint.name
+            member_ids = [member_id for (member_id,) in self.db.query(SprintRoster.member_id).join(
+                Member, Member.member_id == SprintRoster.member_id
+            ).filter(
+                SprintRoster.sprint_id == sprint.sprint_id
+            ).order_by(Member.name, Member.member_id).all()]
+
+            for start in range(0, len(member_ids), batch_size):
+                batch = member_ids[start:start + batch_size]
+                data = self.availability.load_sprint_data(sprint.sprint_id, member_ids=batch)
+                position = {member_id: i for i, member_id in enumerate(batch)}
+                entries_states = sorted(
+                    zip(data.roster_entries, self.availability.final_states(data)),
+                    key=lambda pair: position[pair[0].member_id]
+                )
+
+                rows = []
+                for entry, states in entries_states:
+                    member = entry.member
+                    hours_per_day = 8 * float(member.employment_ratio) * float(entry.allocation)
+                    row = [None] * width
+                    row[0:len(FIXED_COLUMNS)] = [sprint_name, member.name, member.region_code, float(entry.allocation)]
+                    sum_days = 0.0
+                    for day, state in zip(data.sprint_days, states):
+                        index = column.get(day)
+                        if index is not None:
+                            value = DAY_VALUES.get(state, 0.0)
+                            row[index] = value
+                            sum_days += value
+                    row[-2] = sum_days
+                    row[-1] = round(sum_days * hours_per_day, 2)
+                    rows.append(row)
+                yield rows
+
+    def iter_csv(self, sprints: Sequence[Sprint], dates: Sequence[date]) -> Iterator[str]:
+        """CSV-Chunks (UTF-8 mit BOM für Excel): Header, dann ein Chunk je Member-Batch"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(self.header(dates))
+        yield "\ufeff" + buffer.getvalue()
+
+        for rows in self.iter_rows(sprints, dates):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(rows)
+            yield buffer.getvalue()
+
+    def write_xlsx(self, path: str, sprints: Sequence[Sprint], dates: Sequence[date]) -> None:
+        """XLSX zeilenweise schreiben (constant_memory: bereits geschriebene Zeilen liegen nur auf Platte)"""
+        import xlsxwriter
+
+        workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+        try:
+            sheet = workbook.add_worksheet("Availability")
+            bold = workbook.add_format({"bold": True})
+            date_format = workbook.add_format({"bold": True, "num_format": "dd.mm."})
+            sheet.freeze_panes(1, len(FIXED_COLUMNS))
+
+            sheet.write_row(0, 0, FIXED_COLUMNS, bold)
+            for i, day in enumerate(dates, start=len(FIXED_COLUMNS)):
+                sheet.write_datetime(0, i, datetime.combine(day, datetime.min.time()), date_format)
+            sheet.write_row(0, len(FIXED_COLUMNS) + len(dates), SUM_COLUMNS, bold)
+
+            row_number = 1
+            for rows in self.iter_rows(sprints, dates):
+                for row in rows:
+                    sheet.write_row(row_number, 0, row)
+                    row_number += 1
+        finally:
+            workbook.close()
+
+    def iter_xlsx(self, sprints: Sequence[Sprint], dates: Sequence[date]) -> Iterator[bytes]:
+        """XLSX in temporäre Datei schreiben und in Chunks ausliefern (Datei wird danach gelöscht)"""
+        handle, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(handle)
+        try:
+            self.write_xlsx(path, sprints, dates)
+            with open(path, "rb") as file:
+                while chunk := file.read(XLSX_CHUNK_BYTES):
+                    yield chunk
+        finally:
+            os.unlink(path)
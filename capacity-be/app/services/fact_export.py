@@ -0,0 +1,210 @@
+"""
+Spaltenbasierter Export der Tageskapazität (Parquet / Arrow IPC)
+
+Exportiert member_day_capacity (Member, Region, Sprint, Tag, Auto-/Final-State,
+Personentage, Stunden) für Analysen in Notebooks:
+- Die Faktentabelle wird in Batches (FACT_EXPORT_BATCH_ROWS) gelesen und je
+  Batch in Arrow-Arrays übertragen - keine ORM-Objekte, keine Dicts je Zeile;
+  States und Regionen sind dictionary-encoded
+- Bewusste Anpassung: Die DB-Treiber (PyMySQL, sqlite3) liefern nur Zeilen-
+  Tupel, ein spaltenweiser Fetch (z.B. ADBC) stünde hier nicht zur Verfügung.
+  Die Zeilen eines Batches werden deshalb mit zip(*rows) in Spalten
+  transponiert; der Speicherbedarf bleibt auf einen Batch begrenzt
+- Parquet: ein Row Group je Batch; Arrow: IPC-Stream, ein Chunk je Batch
+- Inkrementell über den Zeitraum der Tage (from_date/to_date)
+
+CLI (aus capacity-be/):
+    python -m app.services.fact_export -o facts.parquet --from 2025-01-01 --to 2025-03-31
+    python -m app.services.fact_export -o facts.arrow --format arrow
+"""
+import io
+import os
+import sys
+import tempfile
+from datetime import date
+from typing import Iterator, Optional
+
+from sqlalchemy import Float, String, cast, select, type_coerce
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import Member, MemberDayCapacity, AvailabilityState
+
+FILE_CHUNK_BYTES = 64 * 1024
+
+# Gespeichert werden die Enum-Namen, exportiert die Werte (wie in der API)
+FINAL_STATE_VALUES = {state.name: state.value for state in AvailabilityState}
+
+
+def fact_schema():
+    """Arrow-Schema des Exports"""
+    import pyarrow as pa
+
+    states = pa.dictionary(pa.int8(), pa.string())
+    return pa.schema([
+        ("member_id", pa.int32()),
+        ("member_name", pa.string()),
+        ("region_code", pa.dictionary(pa.int16(), pa.string())),
+        ("sprint_id", pa.int32()),
+        ("day", pa.date32()),
+        ("auto_state", states),
+        ("final_state", states),
+        ("days", pa.float32()),
+        ("hours", pa.float64()),
+    ])
+
+
+def _fact_query(from_date: Optional[date], to_date: Optional[date]):
+    statement = select(
+        MemberDayCapacity.member_id,
+        Member.name,
+        Member.region_code,
+        MemberDayCapacity.sprint_id,
+        MemberDayCapacity.day,
+        MemberDayCapacity.auto_state,
+        type_coerce(MemberDayCapacity.final_state, String),
+        cast(MemberDayCapacity.days, Float),
+        cast(MemberDayCapacity.hours, Float),
+    ).join(
+        Member, Member.member_id == MemberDayCapacity.member_id
+    )
+    if from_date is not None:
+        statement = statement.where(MemberDayCapacity.day >= from_date)
+    if to_date is not None:
+        statement = statement.where(MemberDayCapacity.day <= to_date)
+    return statement.order_by(MemberDayCapacity.sprint_id, MemberDayCapacity.member_id, MemberDayCapacity.day)
+
+
+def iter_fact_batches(
+    db: Session,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    batch_rows: Optional[int] = None
+) -> Iterator:
+    """pyarrow.RecordBatch je gelesenem Batch der Faktentabelle"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    schema = fact_schema()
+    batch_rows = batch_rows or settings.FACT_EXPORT_BATCH_ROWS
+    result = db.execute(_fact_query(from_date, to_date).execution_options(yield_per=batch_rows))
+
+    for rows in result.partitions(batch_rows):
+        # Zeilen-Tupel des Treibers -> Spalten (siehe Modul-Docstring)
+        columns = list(zip(*rows))
+        final_states = pc.dictionary_encode(pa.array(columns[6], pa.string()))
+        final_states = pa.DictionaryArray.from_arrays(
+            final_states.indices.cast(pa.int8()),
+            pa.array([FINAL_STATE_VALUES[name] for name in final_states.dictionary.to_pylist()], pa.string()),
+        )
+        yield pa.record_batch([
+            pa.array(columns[0], pa.int32()),
+            pa.array(columns[1], pa.string()),
+            pa.array(columns[2], pa.string()).dictionary_encode().cast(schema.field("region_code").type),
+            pa.array(columns[3], pa.int32()),
+            pa.array(columns[4], pa.date32()),
+            pa.array(columns[5], pa.string()).dictionary_encode().cast(schema.field("auto_state").type),
+            final_states,
+            pa.array(columns[7], pa.float32()),
+            pa.array(columns[8], pa.float64()),
+        ], schema=schema)
+
+
+def write_parquet(
+    db: Session, path: str, from_date: Optional[date] = None, to_date: Optional[date] = None,
+    batch_rows: Optional[int] = None
+) -> int:
+    """Parquet-Datei schreiben (ein Row Group je Batch), liefert die Anzahl Zeilen"""
+    import pyarrow.parquet as pq
+
+    written = 0
+    with pq.ParquetWriter(path, fact_schema(), compression="zstd") as writer:
+        for batch in iter_fact_batches(db, from_date, to_date, batch_rows):
+            writer.write_batch(batch)
+            written += batch.num_rows
+    return written
+
+
+def write_arrow(
+    db: Session, sink, from_date: Optional[date] = None, to_date: Optional[date] = None,
+    batch_rows: Optional[int] = None
+) -> int:
+    """Arrow-IPC-Stream in einen Pfad oder ein File-Objekt schreiben, liefert die Anzahl Zeilen"""
+    import pyarrow as pa
+
+    written = 0
+    with pa.ipc.new_stream(sink, fact_schema()) as writer:
+        for batch in iter_fact_batches(db, from_date, to_date, batch_rows):
+            writer.write_batch(batch)
+            written += batch.num_rows
+    return written
+
+
+def iter_arrow_stream(
+    db: Session, from_date: Optional[date] = None, to_date: Optional[date] = None
+) -> Iterator[bytes]:
+    """Arrow-IPC-Stream als Byte-Chunks (Schema, dann ein Chunk je Batch) - für HTTP-Streaming"""
+    import pyarrow as pa
+
+    sink = io.BytesIO()
+
+    def take() -> bytes:
+        chunk = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return chunk
+
+    writer = pa.ipc.new_stream(sink, fact_schema())
+    yield take()
+    for batch in iter_fact_batches(db, from_date, to_date):
+        writer.write_batch(batch)
+        yield take()
+    writer.close()
+    yield take()
+
+
+def iter_parquet(
+    db: Session, from_date: Optional[date] = None, to_date: Optional[date] = None
+) -> Iterator[bytes]:
+    """Parquet in temporäre Datei schreiben (Footer am Ende) und in Chunks ausliefern"""
+    handle, path = tempfile.mkstemp(suffix=".parquet")
+    os.close(handle)
+    try:
+        write_parquet(db, path, from_date, to_date)
+        with open(path, "rb") as file:
+            while chunk := file.read(FILE_CHUNK_BYTES):
+                yield chunk
+    finally:
+        os.unlink(path)
+
+
+def main(argv=None) -> int:
+    """CLI: Faktentabelle als Parquet- oder Arrow-Datei exportieren"""
+    import argparse
+    import time
+
+    from app.db.base import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Export member_day_capacity als Parquet/Arrow")
+    parser.add_argument("-o", "--output", required=True, help="Zieldatei")
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--from", dest="from_date", type=date.fromisoformat, help="Tage ab (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="to_date", type=date.fromisoformat, help="Tage bis (YYYY-MM-DD)")
+    parser.add_argument("--batch-rows", type=int, default=None, help="Zeilen je Batch")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        if args.format == "parquet":
+            written = write_parquet(db, args.output, args.from_date, args.to_date, args.batch_rows)
+        else:
+            written = write_arrow(db, args.output, args.from_date, args.to_date, args.batch_rows)
+        print(f"✅ {written} Zeilen nach {args.output} exportiert ({time.perf_counter() - started:.1f}s)")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+Capacity Forecast Service
+
+Monte-Carlo-Forecast für (geplante) Sprints: ausgehend von der
+deterministischen Availability-Matrix werden ungeplante Abwesenheiten
+(Krankheit, kurzfristige PTO) aus der PTO-Historie je Member und Typ
+simuliert. Ergebnis sind P10/P50/P90 je Member, Team und Portfolio.
+
+- Raten: Episoden je Arbeitstag der letzten FORECAST_HISTORY_DAYS, je Member
+  zur Team-Rate hin geglättet (Gewicht FORECAST_PRIOR_WEIGHT_DAYS)
+- Längen: empirische Verteilung des Members, bei zu wenig Episoden die des Teams
+- Latenz-Budget: die Anzahl Simulationen wird begrenzt, sodass
+  Simulationen × Members × Tage FORECAST_MAX_CELLS nicht überschreitet
+- Große Portfolios laufen in einem Process Pool (FORECAST_WORKERS)
+
+NumPy und die Simulation werden erst beim ersten Forecast geladen.
+"""
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import Sprint, PTO
+from app.schemas.schemas import (
+    SprintResponse, ForecastPercentiles, ForecastMember, SprintForecastResponse, PortfolioForecastResponse
+)
+from app.services.availability import DAY_VALUES, AvailabilityService, SprintAvailabilityData
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Process Pool lazy anlegen und wiederverwenden (spawn - sicher neben Threads)"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=forecast_workers(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def forecast_workers() -> int:
+    return settings.FORECAST_WORKERS or os.cpu_count() or 1
+
+
+def shutdown_forecast_pool() -> None:
+    """Process Pool beenden (App-Shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _percentiles(values) -> ForecastPercentiles:
+    p10, p50, p90 = (round(float(value), 2) for value in values)
+    return ForecastPercentiles(p10=p10, p50=p50, p90=p90)
+
+
+def _working_days(start: date, end: date) -> int:
+    """Mo-Fr zwischen start und end (inklusive)"""
+    days = (end - start).days + 1
+    if days <= 0:
+        return 0
+    full_weeks, rest = divmod(days, 7)
+    return full_weeks * 5 + sum(1 for offset in range(rest) if (start.weekday() + offset) % 7 < 5)
+
+
+class ForecastService:
+    """Service für Monte-Carlo-Kapazitäts-Forecasts"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def forecast_sprint(self, sprint_id: int, simulations: Optional[int] = None,
+                        seed: Optional[int] = None) -> Optional[SprintForecastResponse]:
+        """Forecast für einen Sprint - None wenn der Sprint nicht existiert"""
+        sprint = self.db.query(Sprint).filter(Sprint.sprint_id == sprint_id).first()
+        if not sprint:
+            return None
+        return self.forecast_sprints([sprint], simulations, seed).sprints[0]
+
+    def forecast_portfolio(self, sprint_ids: Optional[Sequence[int]] = None, simulations: Optional[int] = None,
+                           seed: Optional[int] = None) -> PortfolioForecastResponse:
+        """Forecast für mehrere Sprints (Default: alle geplanten Sprints)"""
+        query = self.db.query(Sprint)
+        if sprint_ids:
+            query = query.filter(Sprint.sprint_id.in_(sprint_ids))
+        else:
+            query = query.filter(Sprint.start_date > date.today())
+        sprints = query.order_by(Sprint.start_date, Sprint.sprint_id).all()
+        return self.forecast_sprints(sprints, simulations, seed)
+
+    def forecast_sprints(self, sprints: List[Sprint], simulations: Optional[int] = None,
+                         seed: Optional[int] = None) -> PortfolioForecastResponse:
+        import numpy as np
+        from app.services import forecast_simulation as simulation
+
+        started = time.perf_counter()
+        # Nur Eingaben + Final States - die Response-Matrix wird für den Forecast nicht gebraucht
+        availability_service = AvailabilityService(self.db)
+        sprint_data = [availability_service.load_sprint_data(s.sprint_id) for s in sprints]
+        member_ids = sorted({entry.member_id for data in sprint_data for entry in data.roster_entries})
+        history = self._load_history(member_ids)
+
+        simulations = self._simulation_count(sprint_data, simulations)
+        inputs = [
+            self._simulation_input(simulation, availability_service, data, history, simulations, seed)
+            for data in sprint_data
+        ]
+        results = self._run(simulation, inputs)
+
+        forecasts = [self._to_response(d, i, r) for d, i, r in zip(sprint_data, inputs, results)]
+        total_samples = sum(result.team_hours_samples for result in results) if results else [0.0, 0.0, 0.0]
+        return PortfolioForecastResponse(
+            sprints=forecasts,
+            simulations=simulations,
+            hours_total=_percentiles(np.percentile(total_samples, simulation.PERCENTILES)),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+
+    def _simulation_count(self, sprint_data: List[SprintAvailabilityData], requested: Optional[int]) -> int:
+        """Simulationen so begrenzen, dass das Latenz-Budget (FORECAST_MAX_CELLS) hält"""
+        simulations = requested or settings.FORECAST_SIMULATIONS
+        cells_per_simulation = sum(len(data.roster_entries) * len(data.sprint_days) for data in sprint_data)
+        if cells_per_simulation and simulations * cells_per_simulation > settings.FORECAST_MAX_CELLS:
+            simulations = max(settings.FORECAST_MIN_SIMULATIONS, settings.FORECAST_MAX_CELLS // cells_per_simulation)
+        return simulations
+
+    def _load_history(self, member_ids: List[int]) -> Dict:
+        """
+        PTO-Historie der ungeplanten Typen mit einer Query laden
+
+        Liefert je Typ: Episoden und Längen je Member, Arbeitstage im Fenster.
+        """
+        history_end = date.today() - timedelta(days=1)
+        history_start = history_end - timedelta(days=settings.FORECAST_HISTORY_DAYS - 1)
+        types = [t.strip() for t in settings.FORECAST_ABSENCE_TYPES.split(",") if t.strip()]
+
+        episodes = {t: defaultdict(list) for t in types}
+        if member_ids and types:
+            entries = self.db.query(PTO.member_id, PTO.type, PTO.from_date, PTO.to_date).filter(
+                PTO.member_id.in_(member_ids),
+                PTO.type.in_(types),
+                PTO.from_date <= history_end,
+                PTO.to_date >= history_start
+            ).all()
+            for member_id, pto_type, from_date, to_date in entries:
+                episodes[pto_type][member_id].append((to_date - from_date).days + 1)
+
+        return {
+            "types": types,
+            "episodes": episodes,
+            "working_days": _working_days(history_start, history_end),
+            "member_count": len(member_ids),
+        }
+
+    def _absence_models(self, simulation, member_ids: List[int], history: Dict) -> List:
+        import numpy as np
+
+        working_days = history["working_days"]
+        prior_weight = settings.FORECAST_PRIOR_WEIGHT_DAYS
+        models = []
+
+        for pto_type in history["types"]:
+            by_member = history["episodes"][pto_type]
+            pooled = [length for lengths in by_member.values() for length in lengths]
+            if not pooled or not working_days:
+                continue
+
+            # Team-Rate als Prior, Member-Rate dazu hin geglättet (wenig Historie → Team-Wert)
+            team_rate = len(pooled) / (working_days * max(1, history["member_count"]))
+            counts = np.array([len(by_member.get(m, ())) for m in member_ids], dtype=float)
+            start_probability = (counts + prior_weight * team_rate) / (working_days + prior_weight)
+
+            pooled_table = simulation.length_table(pooled)
+            length_tables = np.stack([
+                simulation.length_table(by_member[m])
+                if len(by_member.get(m, ())) >= settings.FORECAST_MIN_EPISODES else pooled_table
+                for m in member_ids
+            ])
+            models.append(simulation.AbsenceModel(pto_type, start_probability, length_tables))
+        return models
+
+    def _simulation_input(self, simulation, availability_service: AvailabilityService,
+                          data: SprintAvailabilityData, history: Dict, simulations: int, seed: Optional[int]):
+        import numpy as np
+
+        entries = data.roster_entries
+        final_states = availability_service.final_states(data)
+        day_capacity = np.array(
+            [[DAY_VALUES.get(state, 0.0) for state in states] for states in final_states], dtype=float
+        ).reshape(len(entries), len(data.sprint_days))
+        # Stunden = Tage * 8h * employment_ratio * allocation (wie AvailabilityService)
+        hours_per_day = np.array(
+            [8 * float(e.member.employment_ratio) * float(e.allocation) for e in entries], dtype=float
+        )
+        return simulation.SprintSimulationInput(
+            sprint_id=data.sprint.sprint_id,
+            day_capacity=day_capacity,
+            hours_per_day=hours_per_day,
+            workdays=np.array([d.weekday() < 5 for d in data.sprint_days], dtype=bool),
+            absence_models=self._absence_models(simulation, [e.member_id for e in entries], history),
+            simulations=simulations,
+            seed=seed,
+        )
+
+    def _run(self, simulation, inputs: List) -> List:
+        """Inline simulieren oder - bei großen Portfolios - über den Process Pool verteilen"""
+        workers = forecast_workers()
+        if len(inputs) < settings.FORECAST_POOL_MIN_SPRINTS or workers < 2:
+            return simulation.simulate_many(inputs)
+
+        batches = [inputs[i::workers] for i in range(workers) if inputs[i::workers]]
+        results_by_sprint = {}
+        for batch_results in _get_executor().map(simulation.simulate_many, batches):
+            results_by_sprint.update({r.sprint_id: r for r in batch_results})
+        return [results_by_sprint[data.sprint_id] for data in inputs]
+
+    def _to_response(self, data: SprintAvailabilityData, simulation_input, result) -> SprintForecastResponse:
+        planned_days = simulation_input.day_capacity.sum(axis=1)
+        planned_hours = planned_days * simulation_input.hours_per_day
+        members = [
+            ForecastMember(
+                member_id=entry.member_id,
+                name=entry.member.name,
+                planned_days=float(planned_days[index]),
+                planned_hours=round(float(planned_hours[index]), 2),
+                days=_percentiles(result.member_days[index]),
+                hours=_percentiles(result.member_hours[index]),
+                expected_absence_days=round(float(result.member_expected_absence_days[index]), 2),
+            )
+            for index, entry in enumerate(data.roster_entries)
+        ]
+        return SprintForecastResponse(
+            sprint=SprintResponse.model_validate(data.sprint),
+            simulations=result.simulations,
+            planned_days_team=float(planned_days.sum()),
+            planned_hours_team=round(float(planned_hours.sum()), 2),
+            days_team=_percentiles(result.team_days),
+            hours_team=_percentiles(result.team_hours),
+            members=members,
+        )
@@ -0,0 +1,135 @@
+"""
+Monte-Carlo-Simulation ungeplanter Abwesenheiten (NumPy, ohne DB-Zugriff)
+
+Läuft im Request-Prozess oder in einem Worker des Process Pools - Ein- und
+Ausgaben sind deshalb reine, picklebare Daten.
+
+Modell je Member und PTO-Typ:
+- an jedem Arbeitstag beginnt mit Wahrscheinlichkeit p eine Abwesenheits-Episode
+  (Episoden, die vor Sprintbeginn starten, werden nicht berücksichtigt)
+- die Episodenlänge (Kalendertage) wird aus einer Quantil-Tabelle der Historie gezogen
+- abwesende Tage verlieren ihre geplante Kapazität (1.0 bzw. 0.5 Tage)
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+PERCENTILES = (10, 50, 90)
+LENGTH_TABLE_SIZE = 32
+
+
+@dataclass
+class AbsenceModel:
+    """Ungeplante Abwesenheit eines PTO-Typs für alle Members eines Sprints"""
+    type: str
+    start_probability: np.ndarray  # (M,) Episoden-Start je Arbeitstag
+    length_table: np.ndarray  # (M, K) Episodenlängen in Kalendertagen
+
+
+@dataclass
+class SprintSimulationInput:
+    """Deterministische Sprint-Kapazität plus Abwesenheitsmodelle"""
+    sprint_id: int
+    day_capacity: np.ndarray  # (M, D) geplante Tageskapazität 1.0 / 0.5 / 0.0
+    hours_per_day: np.ndarray  # (M,) 8h * employment_ratio * allocation
+    workdays: np.ndarray  # (D,) bool, Mo-Fr
+    absence_models: List[AbsenceModel]
+    simulations: int
+    seed: Optional[int] = None
+
+
+@dataclass
+class SprintSimulationResult:
+    """Perzentile (P10/P50/P90) je Member und Team"""
+    sprint_id: int
+    simulations: int
+    member_days: np.ndarray  # (M, 3)
+    member_hours: np.ndarray  # (M, 3)
+    member_expected_absence_days: np.ndarray  # (M,)
+    team_days: np.ndarray  # (3,)
+    team_hours: np.ndarray  # (3,)
+    team_hours_samples: np.ndarray  # (N,) für Portfolio-Summen
+
+
+def length_table(lengths, size: int = LENGTH_TABLE_SIZE) -> np.ndarray:
+    """Empirische Episodenlängen als Quantil-Tabelle fester Größe (Inverse-CDF-Sampling)"""
+    probabilities = (np.arange(size) + 0.5) / size
+    table = np.quantile(np.asarray(lengths, dtype=float), probabilities, method="inverted_cdf")
+    return np.maximum(1, np.rint(table)).astype(np.int32)
+
+
+def simulate_sprint(data: SprintSimulationInput) -> SprintSimulationResult:
+    """
+    Alle Simulationen eines Sprints vektorisiert ausführen
+
+    Statt einer Zufallszahl je Zelle (Simulation × Member × Tag) wird je
+    Simulation und Member die Anzahl Episoden binomial gezogen und nur für
+    diese Episoden Starttag und Länge - Aufwand und Speicher skalieren mit
+    der Zahl abwesender Tage, nicht mit der Matrixgröße.
+    """
+    rng = np.random.default_rng(None if data.seed is None else [data.seed, data.sprint_id])
+    members, days = data.day_capacity.shape
+    simulations = data.simulations
+    rows = simulations * members
+    lost_days = np.zeros(rows)
+
+    workday_index = np.flatnonzero(data.workdays)
+    if members and len(workday_index) and data.absence_models:
+        absent_cells = []
+        for model in data.absence_models:
+            # Episoden je (Simulation, Member): Binomial über die Arbeitstage des Sprints
+            counts = rng.binomial(len(workday_index), model.start_probability, size=(simulations, members)).ravel()
+            total = int(counts.sum())
+            if not total:
+                continue
+
+            episode_rows = np.repeat(np.arange(rows), counts)
+            starts = workday_index[rng.integers(0, len(workday_index), size=total)]
+            picks = rng.integers(0, model.length_table.shape[1], size=total)
+            lengths = np.minimum(model.length_table[episode_rows % members, picks], days - starts)
+
+            # Episoden in einzelne Tage expandieren: Zelle = Zeile * days + Tag
+            episode = np.repeat(np.arange(total), lengths)
+            offsets = np.arange(len(episode)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            absent_cells.append(episode_rows[episode] * days + starts[episode] + offsets)
+
+        if absent_cells:
+            # Überlappende Episoden (auch verschiedener Typen) zählen je Tag nur einmal -
+            # Bitmaske statt np.unique (kein Sortieren, 1 Byte je Zelle)
+            absent = np.zeros(rows * days, dtype=bool)
+            for chunk in absent_cells:
+                absent[chunk] = True
+            cells = np.flatnonzero(absent)
+            cell_rows, cell_days = np.divmod(cells, days)
+            lost_days = np.bincount(
+                cell_rows, weights=data.day_capacity[cell_rows % members, cell_days], minlength=rows
+            )
+
+    planned_days = data.day_capacity.sum(axis=1)
+    member_days = planned_days[None, :] - lost_days.reshape(simulations, members)
+    member_hours = member_days * data.hours_per_day[None, :]
+    team_days = member_days.sum(axis=1)
+    team_hours = member_hours.sum(axis=1)
+
+    return SprintSimulationResult(
+        sprint_id=data.sprint_id,
+        simulations=simulations,
+        member_days=_percentiles(member_days, members),
+        member_hours=_percentiles(member_hours, members),
+        member_expected_absence_days=planned_days - member_days.mean(axis=0),
+        team_days=np.percentile(team_days, PERCENTILES),
+        team_hours=np.percentile(team_hours, PERCENTILES),
+        team_hours_samples=team_hours,
+    )
+
+
+def _percentiles(samples: np.ndarray, members: int) -> np.ndarray:
+    if not members:
+        return np.zeros((0, len(PERCENTILES)))
+    return np.percentile(samples, PERCENTILES, axis=0).T
+
+
+def simulate_many(inputs: List[SprintSimulationInput]) -> List[SprintSimulationResult]:
+    """Mehrere Sprints nacheinander (Einheit für einen Pool-Worker)"""
+    return [simulate_sprint(data) for data in inputs]
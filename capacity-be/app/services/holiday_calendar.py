@@ -0,0 +1,170 @@
+"""
+Aufgelöste Feiertagskalender je Region (Vererbung + Company Days)
+
+- Regionen erben von ihren Präfixen: "DE-NW" → "DE-NW", "DE" - nationale
+  Feiertage stehen einmal unter "DE" statt je Bundesland
+- Feiertage mit is_company_day gelten für alle Members, auch ohne region_code
+- Der effektive Kalender je (Region, Jahr) wird einmal aufgelöst und im Prozess
+  gecacht (HOLIDAY_CACHE_SECONDS, 0 = aus). Die Availability-Engine prüft danach
+  je Member-Tag nur einen Key (Tag, region_code).
+
+Invalidierung: Sessions, die Feiertage über das ORM schreiben, lesen bis zum
+Commit am Cache vorbei und leeren ihn danach; Core-Bulk-Writes (synthetische
+Daten) rufen clear_holiday_calendars() selbst auf. Bei mehreren Workern laufen
+Einträge spätestens nach HOLIDAY_CACHE_SECONDS ab.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from itertools import chain
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+from app.db.models import Holiday
+
+REGION_SEPARATOR = "-"
+CACHE_NAME = "holiday_calendar"
+HOLIDAYS_CHANGED_KEY = "holidays_changed"
+
+CalendarKey = Tuple[Optional[str], int]  # (region_code, Jahr) - None: nur Company Days
+
+
+@dataclass(frozen=True)
+class ResolvedHoliday:
+    """Feiertag im effektiven Kalender (region_code = Region des Eintrags, z.B. "DE" für DE-NW)"""
+    date: date
+    region_code: str
+    name: str
+    is_company_day: bool
+
+
+_calendars: Dict[CalendarKey, Tuple[float, Dict[date, ResolvedHoliday]]] = {}
+_generation = 0
+_lock = threading.Lock()
+
+
+def region_chain(region_code: Optional[str]) -> Tuple[str, ...]:
+    """Region und ihre Vorfahren, spezifischste zuerst: "DE-NW" → ("DE-NW", "DE")"""
+    if not region_code:
+        return ()
+    parts = region_code.split(REGION_SEPARATOR)
+    return tuple(REGION_SEPARATOR.join(parts[:n]) for n in range(len(parts), 0, -1))
+
+
+def member_region_filter(column, region_code: str):
+    """SQL-Filter für Members, deren Kalender die Region enthält (Region selbst und Unterregionen)"""
+    return or_(column == region_code, column.like(f"{region_code}{REGION_SEPARATOR}%"))
+
+
+def clear_holiday_calendars() -> None:
+    """Cache leeren (nach Feiertags-Writes und zwischen Tests)"""
+    global _generation
+    with _lock:
+        _calendars.clear()
+        _generation += 1
+
+
+def resolve_holidays(
+    db: Session, days: Collection[date], region_codes: Iterable[Optional[str]]
+) -> Dict[tuple, ResolvedHoliday]:
+    """
+    (Tag, region_code) -> Feiertag für die angefragten Tage und Regionen
+
+    Enthält immer auch region_code None (nur Company Days) für Members ohne Region.
+    Fehlende Kalender werden mit einer Query nachgeladen.
+    """
+    if not days:
+        return {}
+    regions = set(region_codes) | {None}
+    years = {day.year for day in days}
+    use_cache = settings.HOLIDAY_CACHE_SECONDS > 0 and not db.info.get(HOLIDAYS_CHANGED_KEY)
+
+    calendars: Dict[CalendarKey, Dict[date, ResolvedHoliday]] = {}
+    missing: List[CalendarKey] = []
+    now = time.monotonic()
+    with _lock:
+        generation = _generation
+        for key in ((region, year) for region in regions for year in years):
+            cached = _calendars.get(key) if use_cache else None
+            hit = cached is not None and cached[0] > now
+            if use_cache:
+                record_cache_lookup(CACHE_NAME, hit)
+            if hit:
+                calendars[key] = cached[1]
+            else:
+                missing.append(key)
+
+    if missing:
+        loaded = _load_calendars(db, missing)
+        calendars.update(loaded)
+        if use_cache:
+            with _lock:
+                # Zwischenzeitlich invalidiert: Ergebnis nur für diesen Aufruf verwenden
+                if generation == _generation:
+                    expires = now + settings.HOLIDAY_CACHE_SECONDS
+                    _calendars.update((key, (expires, calendar)) for key, calendar in loaded.items())
+
+    result = {}
+    for region in regions:
+        for day in days:
+            holiday = calendars[(region, day.year)].get(day)
+            if holiday is not None:
+                result[(day, region)] = holiday
+    return result
+
+
+def _load_calendars(db: Session, keys: List[CalendarKey]) -> Dict[CalendarKey, Dict[date, ResolvedHoliday]]:
+    """Kalender für (Region, Jahr)-Keys auflösen - eine Query über alle Vorfahren und Company Days"""
+    codes = set(chain.from_iterable(region_chain(region) for region, _ in keys))
+    years = {year for _, year in keys}
+    applies = Holiday.is_company_day.is_(True)
+    if codes:
+        applies = or_(applies, Holiday.region_code.in_(codes))
+    rows = db.query(Holiday.date, Holiday.region_code, Holiday.name, Holiday.is_company_day).filter(
+        Holiday.date >= date(min(years), 1, 1),
+        Holiday.date <= date(max(years), 12, 31),
+        applies
+    ).all()
+
+    by_source: Dict[Tuple[Optional[str], int], List[ResolvedHoliday]] = {}
+    for day, region_code, name, is_company_day in rows:
+        holiday = ResolvedHoliday(day, region_code, name, bool(is_company_day))
+        by_source.setdefault((region_code, day.year), []).append(holiday)
+        if is_company_day:
+            by_source.setdefault((None, day.year), []).append(holiday)
+
+    calendars = {}
+    for region, year in keys:
+        # Allgemeinste Quelle zuerst, spezifischere überschreiben (Name der Unterregion gewinnt)
+        sources = (None,) + region_chain(region)[::-1]
+        calendar = {}
+        for source in sources:
+            for holiday in by_source.get((source, year), ()):
+                calendar[holiday.date] = holiday
+        calendars[(region, year)] = calendar
+    return calendars
+
+
+def _track_holiday_writes(session: Session, flush_context, instances) -> None:
+    """Feiertags-Writes der Session merken: bis zum Commit am Cache vorbei lesen"""
+    if any(isinstance(obj, Holiday) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info[HOLIDAYS_CHANGED_KEY] = True
+
+
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop(HOLIDAYS_CHANGED_KEY, None):
+        clear_holiday_calendars()
+
+
+def _discard_after_rollback(session: Session, *args) -> None:
+    session.info.pop(HOLIDAYS_CHANGED_KEY, None)
+
+
+event.listen(Session, "before_flush", _track_holiday_writes)
+event.listen(Session, "after_commit", _invalidate_after_commit)
+event.listen(Session, "after_rollback", _discard_after_rollback)
@@ -0,0 +1,163 @@
+"""
+Over-Allocation - Summe der Allocations eines Members über parallele Sprints
+
+Ein Member kann in mehreren Sprints gleichzeitig eingeplant sein; je Roster-
+Eintrag gilt die Allocation im Assignment-Fenster (ohne Fenster: ganzer
+Sprint). Gesucht sind die Zeiträume, in denen die Summe über MAX_TOTAL_ALLOCATION
+liegt.
+
+Statt Sprints paarweise zu vergleichen, werden Start- und End-Ereignisse aller
+Intervalle einmal sortiert und je Member durchlaufen (Sweep Line):
+O(n log n) für die ganze Organisation.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import groupby
+from typing import Collection, Dict, List, Optional, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models import Member, Sprint, SprintRoster
+from app.schemas.schemas import OverAllocationPeriod, OverAllocationResponse, OverAllocationSprint
+
+MAX_TOTAL_ALLOCATION = Decimal("1.00")
+
+
+@dataclass(frozen=True)
+class AllocationInterval:
+    """Allocation eines Members in einem Sprint über das effektive Assignment-Fenster"""
+    member_id: int
+    sprint_id: int
+    sprint_name: str
+    start: date
+    end: date
+    allocation: Decimal
+
+
+@dataclass
+class OverAllocation:
+    """Zusammenhängender Zeitraum mit gleicher Summe und gleichen Sprints"""
+    member_id: int
+    start: date
+    end: date
+    total: Decimal
+    intervals: List[AllocationInterval]
+
+
+def find_over_allocations(
+    intervals: Sequence[AllocationInterval], limit: Decimal = MAX_TOTAL_ALLOCATION
+) -> List[OverAllocation]:
+    """
+    Sweep über sortierte Intervall-Endpunkte
+
+    Je Intervall ein +Allocation-Ereignis am Start und ein -Allocation-Ereignis
+    am Tag nach dem Ende; Ereignisse desselben Tages werden gemeinsam
+    angewendet. Zwischen zwei Ereignistagen ist die Summe konstant.
+    """
+    events = []
+    for index, interval in enumerate(intervals):
+        if interval.end < interval.start:
+            continue
+        events.append((interval.member_id, interval.start, 1, index))
+        events.append((interval.member_id, interval.end + timedelta(days=1), -1, index))
+    events.sort()
+
+    result: List[OverAllocation] = []
+    for member_id, member_events in groupby(events, key=lambda event: event[0]):
+        active: Dict[int, AllocationInterval] = {}
+        total = Decimal("0")
+        member_events = list(member_events)
+        for position, (_, day, direction, index) in enumerate(member_events):
+            interval = intervals[index]
+            if direction > 0:
+                active[index] = interval
+                total += interval.allocation
+            else:
+                del active[index]
+                total -= interval.allocation
+
+            # Letztes Ereignis des Tages: Summe gilt bis zum nächsten Ereignistag
+            following = member_events[position + 1][1] if position + 1 < len(member_events) else None
+            if following == day or total <= limit:
+                continue
+            result.append(OverAllocation(
+                member_id=member_id,
+                start=day,
+                end=following - timedelta(days=1),
+                total=total,
+                intervals=sorted(active.values(), key=lambda i: (i.start, i.sprint_id)),
+            ))
+    return result
+
+
+class OverAllocationService:
+    """Service für die Prüfung der Gesamt-Allocation je Member"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load_intervals(
+        self,
+        member_ids: Optional[Collection[int]] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> List[AllocationInterval]:
+        """Alle Roster-Einträge als Intervalle (eine Query, effektives Fenster in SQL)"""
+        start = func.coalesce(SprintRoster.assignment_from, Sprint.start_date)
+        end = func.coalesce(SprintRoster.assignment_to, Sprint.end_date)
+        query = self.db.query(
+            SprintRoster.member_id, SprintRoster.sprint_id, Sprint.name,
+            start.label("start"), end.label("end"), SprintRoster.allocation
+        ).join(Sprint, Sprint.sprint_id == SprintRoster.sprint_id)
+        if member_ids is not None:
+            query = query.filter(SprintRoster.member_id.in_(member_ids))
+        if from_date is not None:
+            query = query.filter(end >= from_date)
+        if to_date is not None:
+            query = query.filter(start <= to_date)
+
+        return [
+            AllocationInterval(member_id, sprint_id, name, start, end, Decimal(allocation))
+            for member_id, sprint_id, name, start, end, allocation in query.all()
+        ]
+
+    def report(
+        self,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        member_ids: Optional[Collection[int]] = None
+    ) -> OverAllocationResponse:
+        """Über-Allokationen aller (bzw. der angegebenen) Members, auf den Zeitraum beschnitten (2 Queries)"""
+        intervals = self.load_intervals(member_ids, from_date, to_date)
+        conflicts = find_over_allocations(intervals)
+
+        names = dict(self.db.query(Member.member_id, Member.name).filter(
+            Member.member_id.in_({conflict.member_id for conflict in conflicts})
+        ).all()) if conflicts else {}
+
+        periods = []
+        for conflict in conflicts:
+            start = max(conflict.start, from_date) if from_date else conflict.start
+            end = min(conflict.end, to_date) if to_date else conflict.end
+            if start > end:
+                continue
+            periods.append(OverAllocationPeriod(
+                member_id=conflict.member_id,
+                member_name=names.get(conflict.member_id),
+                from_date=start,
+                to_date=end,
+                total_allocation=float(conflict.total),
+                sprints=[
+                    OverAllocationSprint(sprint_id=i.sprint_id, name=i.sprint_name, allocation=float(i.allocation))
+                    for i in conflict.intervals
+                ],
+            ))
+
+        periods.sort(key=lambda p: (p.member_name or "", p.member_id, p.from_date))
+        return OverAllocationResponse(
+            periods=periods,
+            member_count=len({p.member_id for p in periods}),
+            checked_intervals=len(intervals),
+        )
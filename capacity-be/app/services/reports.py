@@ -0,0 +1,197 @@
+"""
+Report Service - Kapazitäts-Reports direkt in SQL
+
+Liest aus der materialisierten Tageskapazität (member_day_capacity) statt die
+Availability-Engine je Sprint aufzurufen. Jeder Report braucht eine feste
+Anzahl Queries (Sprint-Achse + ein gruppiertes Aggregat), unabhängig von der
+Anzahl Sprints, Members oder Tage.
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, case, func, select
+from sqlalchemy.orm import Session
+
+from app.db.models import Member, Sprint, SprintRoster, MemberDayCapacity, Team, TeamMember
+from app.schemas.schemas import (
+    CapacityReportResponse, CapacitySeries, CapacityTrendResponse, ReportGroupBy, ReportSprint
+)
+
+DEFAULT_REPORT_DAYS = 365
+NO_GROUP_LABEL = "Ohne Zuordnung"
+
+
+def _float(value) -> float:
+    return round(float(value or 0), 2)
+
+
+class ReportService:
+    """Service für aggregierte Kapazitäts-Reports"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _period(self, from_date: Optional[date], to_date: Optional[date]) -> Tuple[date, date]:
+        """Default: die letzten 365 Tage (Sprints nach Startdatum)"""
+        to_date = to_date or date.today()
+        return from_date or to_date - timedelta(days=DEFAULT_REPORT_DAYS), to_date
+
+    def _sprints(self, from_date: date, to_date: date) -> List[ReportSprint]:
+        rows = self.db.query(Sprint.sprint_id, Sprint.name, Sprint.start_date, Sprint.end_date).filter(
+            Sprint.start_date >= from_date,
+            Sprint.start_date <= to_date
+        ).order_by(Sprint.start_date, Sprint.sprint_id).all()
+        return [ReportSprint(sprint_id=r.sprint_id, name=r.name, start_date=r.start_date, end_date=r.end_date)
+                for r in rows]
+
+    def _member_totals(self, from_date: date, to_date: date):
+        """
+        Subquery: Summen je (Sprint, Member) aus der Faktentabelle
+
+        Vorab je Sprint und Member verdichten (folgt dem Primärschlüssel, ohne
+        Joins je Tageszeile); erst danach auf Members/Teams/Roster joinen.
+        """
+        sprint_ids = select(Sprint.sprint_id).where(Sprint.start_date >= from_date, Sprint.start_date <= to_date)
+        return self.db.query(
+            MemberDayCapacity.sprint_id.label("sprint_id"),
+            MemberDayCapacity.member_id.label("member_id"),
+            func.sum(MemberDayCapacity.days).label("days"),
+            func.sum(MemberDayCapacity.hours).label("hours"),
+            func.sum(case((MemberDayCapacity.auto_state != "weekend", 1), else_=0)).label("workdays"),
+        ).filter(
+            MemberDayCapacity.sprint_id.in_(sprint_ids)
+        ).group_by(MemberDayCapacity.sprint_id, MemberDayCapacity.member_id).subquery()
+
+    def capacity_report(
+        self,
+        group_by: ReportGroupBy = ReportGroupBy.REGION,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> CapacityReportResponse:
+        """
+        Personentage und Stunden je Sprint und Gruppe (2 Queries)
+
+        Gruppen: Region des Members, Member oder direktes Team.
+        """
+        from_date, to_date = self._period(from_date, to_date)
+        sprints = self._sprints(from_date, to_date)
+        index = {s.sprint_id: i for i, s in enumerate(sprints)}
+
+        facts = self._member_totals(from_date, to_date)
+        if group_by == ReportGroupBy.MEMBER:
+            key, label = Member.member_id, Member.name
+        elif group_by == ReportGroupBy.TEAM:
+            key, label = TeamMember.team_id, Team.name
+        else:
+            key, label = Member.region_code, Member.region_code
+
+        query = self.db.query(
+            facts.c.sprint_id,
+            key.label("key"),
+            label.label("label"),
+            func.sum(facts.c.days, type_=Float).label("days"),
+            func.sum(facts.c.hours, type_=Float).label("hours"),
+        ).join(Member, Member.member_id == facts.c.member_id)
+        if group_by == ReportGroupBy.TEAM:
+            query = query.outerjoin(
+                TeamMember, TeamMember.member_id == facts.c.member_id
+            ).outerjoin(Team, Team.team_id == TeamMember.team_id)
+        rows = query.group_by(facts.c.sprint_id, key, label).all()
+
+        # Reihen als einfache Listen füllen, Pydantic-Modelle erst am Ende bauen
+        width = len(sprints)
+        labels: Dict[Optional[str], str] = {}
+        days: Dict[Optional[str], List[float]] = {}
+        hours: Dict[Optional[str], List[float]] = {}
+        total_days, total_hours = [0.0] * width, [0.0] * width
+        for sprint_id, group_key, group_label, day_sum, hour_sum in rows:
+            if group_key is not None:
+                group_key = str(group_key)
+            if group_key not in labels:
+                labels[group_key] = group_label or NO_GROUP_LABEL
+                days[group_key], hours[group_key] = [0.0] * width, [0.0] * width
+            i = index[sprint_id]
+            day_sum, hour_sum = float(day_sum or 0), float(hour_sum or 0)
+            days[group_key][i] = round(day_sum, 2)
+            hours[group_key][i] = round(hour_sum, 2)
+            total_days[i] += day_sum
+            total_hours[i] += hour_sum
+
+        series = [
+            CapacitySeries(key=key, label=labels[key], days=days[key], hours=hours[key])
+            for key in sorted(labels, key=lambda k: (k is None, labels[k]))
+        ]
+        return CapacityReportResponse(
+            group_by=group_by,
+            sprints=sprints,
+            series=series,
+            total_days=[round(v, 2) for v in total_days],
+            total_hours=[round(v, 2) for v in total_hours],
+        )
+
+    def capacity_trend(
+        self,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        window: int = 3
+    ) -> CapacityTrendResponse:
+        """
+        Geplante vs. verfügbare Stunden je Sprint mit gleitendem Durchschnitt (2 Queries)
+
+        Geplant = Werktage * 8h * employment_ratio * allocation; verfügbar = Summe der
+        materialisierten Stunden. Der gleitende Durchschnitt ist eine Window-Function
+        über alle Sprints des Zeitraums; Sprints ohne Fakten gehen nicht in ihn ein.
+        """
+        from_date, to_date = self._period(from_date, to_date)
+        sprints = self._sprints(from_date, to_date)
+
+        facts = self._member_totals(from_date, to_date)
+        per_sprint = self.db.query(
+            facts.c.sprint_id.label("sprint_id"),
+            Sprint.start_date.label("start_date"),
+            func.sum(facts.c.workdays * 8 * Member.employment_ratio * SprintRoster.allocation).label("planned_hours"),
+            func.sum(facts.c.hours).label("available_hours"),
+        ).join(
+            Sprint, Sprint.sprint_id == facts.c.sprint_id
+        ).join(
+            Member, Member.member_id == facts.c.member_id
+        ).join(
+            SprintRoster,
+            (SprintRoster.sprint_id == facts.c.sprint_id) & (SprintRoster.member_id == facts.c.member_id)
+        ).group_by(facts.c.sprint_id, Sprint.start_date).subquery()
+
+        # Alle Sprints des Zeitraums als Fensterbasis; Sprints ohne Fakten (NULL) zählen
+        # nicht in den Durchschnitt, verschieben das Fenster aber wie jeder andere Sprint
+        rows = self.db.query(
+            Sprint.sprint_id,
+            per_sprint.c.planned_hours,
+            per_sprint.c.available_hours,
+            func.avg(per_sprint.c.available_hours).over(
+                order_by=(Sprint.start_date, Sprint.sprint_id), rows=(-(window - 1), 0)
+            ).label("available_hours_avg"),
+        ).outerjoin(
+            per_sprint, per_sprint.c.sprint_id == Sprint.sprint_id
+        ).filter(
+            Sprint.start_date >= from_date,
+            Sprint.start_date <= to_date
+        ).all()
+        by_sprint = {row.sprint_id: row for row in rows}
+
+        planned, available, ratio, average = [], [], [], []
+        for sprint in sprints:
+            row = by_sprint[sprint.sprint_id]
+            planned_hours = _float(row.planned_hours)
+            available_hours = _float(row.available_hours)
+            planned.append(planned_hours)
+            available.append(available_hours)
+            ratio.append(round(available_hours / planned_hours, 4) if planned_hours else None)
+            average.append(_float(row.available_hours_avg) if row.available_hours_avg is not None else None)
+
+        return CapacityTrendResponse(
+            sprints=sprints,
+            planned_hours=planned,
+            available_hours=available,
+            availability_ratio=ratio,
+            available_hours_avg=average,
+            window=window,
+        )
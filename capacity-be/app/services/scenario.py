@@ -0,0 +1,263 @@
+"""
+What-if Scenario Service
+
+Wertet hypothetische Roster-/PTO-/Override-Änderungen gegen einen Sprint aus,
+ohne in die Datenbank zu schreiben. Die Basisdaten (Roster, Feiertage, PTO,
+Overrides) werden einmal über den AvailabilityService geladen und von allen
+Szenarien geteilt; jedes Szenario legt nur ein Copy-on-Write-Overlay darüber:
+
+- Maps: ChainMap(Szenario-Änderungen, Nachlade-Daten, Basis) - Basis bleibt unverändert
+- Roster: unveränderte Einträge werden geteilt, geänderte durch leichte Kopien ersetzt
+- Ergebnis: nur betroffene Members werden neu berechnet, der Rest aus der Basis übernommen
+"""
+from collections import ChainMap
+from dataclasses import dataclass, replace
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.db.models import Member
+from app.schemas.schemas import (
+    AvailabilityMember, AvailabilityResponse, Scenario, ScenarioChange, ScenarioMemberDelta,
+    ScenarioOperation, ScenarioResponse, ScenarioResult
+)
+from app.services.availability import AvailabilityService, SprintAvailabilityData
+from app.services.validation import ValidationError, ValidationService
+
+
+@dataclass
+class ScenarioRosterEntry:
+    """Roster-Eintrag im Overlay (gleiche Attribute wie SprintRoster, nicht persistiert)"""
+    member: Member
+    member_id: int
+    allocation: Decimal
+    assignment_from: Optional[date] = None
+    assignment_to: Optional[date] = None
+
+
+class ScenarioService:
+    """Service für What-if-Szenarien auf Basis der Availability-Berechnung"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.availability = AvailabilityService(db)
+        self.validator = ValidationService(db)
+
+    def evaluate(self, sprint_id: int, scenarios: List[Scenario]) -> Optional[ScenarioResponse]:
+        """
+        Alle Szenarien gegen einen Basis-Load auswerten - None wenn der Sprint nicht existiert
+
+        Raises: ValidationError bei ungültigen Änderungen (unbekannter Member, Tag außerhalb des Sprints, ...)
+        """
+        data = self.availability.load_sprint_data(sprint_id)
+        if data is None:
+            return None
+        if not data.sprint_days:
+            # Leerer Basis-Roster: Tage trotzdem für hinzugefügte Members
+            data = replace(data, sprint_days=self.availability.generate_sprint_days(
+                data.sprint.start_date, data.sprint.end_date
+            ))
+
+        base = self.availability.build_availability(data)
+        supplement = self._load_added_members(data, scenarios)
+
+        return ScenarioResponse(
+            sprint_id=sprint_id,
+            base_sum_days_team=base.sum_days_team,
+            base_sum_hours_team=base.sum_hours_team,
+            scenarios=[self._evaluate_scenario(data, base, supplement, scenario) for scenario in scenarios],
+        )
+
+    def _load_added_members(self, data: SprintAvailabilityData, scenarios: List[Scenario]) -> SprintAvailabilityData:
+        """
+        Members, die in Szenarien hinzukommen, samt PTO/Overrides/Feiertagen nachladen
+
+        Ein Load für alle Szenarien; liefert nur die zusätzlichen Einträge (Roster = neue Members).
+        """
+        roster_ids = {entry.member_id for entry in data.roster_entries}
+        added_ids = {
+            change.member_id
+            for scenario in scenarios for change in scenario.changes
+            if change.op == ScenarioOperation.ADD_MEMBER and change.member_id not in roster_ids
+        }
+        if not added_ids:
+            return SprintAvailabilityData(data.sprint, [], data.sprint_days, {}, {}, {})
+
+        members = self.db.query(Member).filter(Member.member_id.in_(added_ids)).all()
+        member_ids = [m.member_id for m in members]
+        sprint_days = data.sprint_days
+
+        # Nur Regionen nachladen, die im Basis-Roster nicht vorkommen
+        base_regions = {entry.member.region_code for entry in data.roster_entries}
+        new_regions = {m.region_code for m in members if m.region_code and m.region_code not in base_regions}
+
+        return SprintAvailabilityData(
+            sprint=data.sprint,
+            roster_entries=members,
+            sprint_days=sprint_days,
+            holidays_map=self.availability.load_holidays(sprint_days, new_regions),
+            pto_map=self.availability.load_pto(sprint_days, member_ids),
+            overrides_map=self.availability.load_overrides(data.sprint.sprint_id, member_ids, sprint_days),
+        )
+
+    def _evaluate_scenario(
+        self,
+        data: SprintAvailabilityData,
+        base: AvailabilityResponse,
+        supplement: SprintAvailabilityData,
+        scenario: Scenario
+    ) -> ScenarioResult:
+        """Overlay aufbauen, betroffene Members neu berechnen, Deltas bilden"""
+        overlay, touched = self._apply_changes(data, supplement, scenario)
+
+        base_members = {m.member_id: m for m in base.members}
+        members: List[AvailabilityMember] = []
+        for entry in overlay.roster_entries:
+            if entry.member_id in touched or entry.member_id not in base_members:
+                members.append(self.availability.calculate_member_availability(
+                    entry, overlay.sprint_days, overlay.holidays_map, overlay.pto_map, overlay.overrides_map
+                ))
+            else:
+                members.append(base_members[entry.member_id])
+
+        availability = AvailabilityResponse(
+            sprint=base.sprint,
+            members=members,
+            sum_days_team=sum(m.sum_days for m in members),
+            sum_hours_team=sum(m.sum_hours for m in members),
+        )
+        return ScenarioResult(
+            name=scenario.name,
+            availability=availability,
+            delta_days_team=availability.sum_days_team - base.sum_days_team,
+            delta_hours_team=availability.sum_hours_team - base.sum_hours_team,
+            members=self._member_deltas(base.members, members),
+        )
+
+    def _apply_changes(self, data: SprintAvailabilityData, supplement: SprintAvailabilityData,
+                       scenario: Scenario) -> tuple:
+        """
+        Änderungen der Reihe nach auf ein Copy-on-Write-Overlay anwenden
+
+        Returns: (Overlay-Daten, IDs der betroffenen Members)
+        """
+        sprint = data.sprint
+        roster: Dict[int, object] = {entry.member_id: entry for entry in data.roster_entries}
+        added_members = {member.member_id: member for member in supplement.roster_entries}
+        pto_overlay: Dict[tuple, ScenarioChange] = {}
+        override_overlay: Dict[tuple, ScenarioChange] = {}
+        touched: Set[int] = set()
+
+        for index, change in enumerate(scenario.changes):
+            prefix = f"Scenario '{scenario.name}', change {index}"
+            member_id = change.member_id
+
+            if change.op == ScenarioOperation.ADD_MEMBER:
+                if member_id in roster:
+                    raise ValidationError(f"{prefix}: member {member_id} is already in sprint roster", "member_id")
+                member = added_members.get(member_id) or self._base_member(data, member_id)
+                if member is None:
+                    raise ValidationError(f"{prefix}: member {member_id} not found", "member_id")
+                self._check_window(sprint, prefix, change.assignment_from, change.assignment_to)
+                roster[member_id] = ScenarioRosterEntry(
+                    member, member_id, change.allocation, change.assignment_from, change.assignment_to
+                )
+            elif member_id not in roster:
+                raise ValidationError(f"{prefix}: member {member_id} is not in sprint roster", "member_id")
+            elif change.op == ScenarioOperation.REMOVE_MEMBER:
+                del roster[member_id]
+            elif change.op == ScenarioOperation.SET_ALLOCATION:
+                entry = roster[member_id]
+                # Nicht angegebene Felder bleiben, explizites null entfernt das Fenster
+                given = change.model_fields_set
+                assignment_from = change.assignment_from if "assignment_from" in given else entry.assignment_from
+                assignment_to = change.assignment_to if "assignment_to" in given else entry.assignment_to
+                self._check_window(sprint, prefix, assignment_from, assignment_to)
+                roster[member_id] = ScenarioRosterEntry(
+                    entry.member, member_id, change.allocation, assignment_from, assignment_to
+                )
+            elif change.op == ScenarioOperation.ADD_PTO:
+                current = max(change.from_date, sprint.start_date)
+                while current <= min(change.to_date, sprint.end_date):
+                    pto_overlay[(member_id, current)] = change
+                    current += timedelta(days=1)
+            elif change.op == ScenarioOperation.SET_OVERRIDE:
+                if not (sprint.start_date <= change.day <= sprint.end_date):
+                    raise ValidationError(f"{prefix}: day {change.day} is not within sprint range", "day")
+                # state=None überdeckt einen bestehenden Override (Tombstone)
+                override_overlay[(member_id, change.day)] = change
+
+            touched.add(member_id)
+
+        overlay = SprintAvailabilityData(
+            sprint=sprint,
+            roster_entries=list(roster.values()),
+            sprint_days=data.sprint_days,
+            holidays_map=ChainMap(supplement.holidays_map, data.holidays_map),
+            pto_map=ChainMap(pto_overlay, supplement.pto_map, data.pto_map),
+            overrides_map=ChainMap(override_overlay, supplement.overrides_map, data.overrides_map),
+        )
+        return overlay, touched
+
+    def _check_window(self, sprint, prefix: str, assignment_from: Optional[date],
+                      assignment_to: Optional[date]) -> None:
+        """Assignment-Fenster wie bei den Roster-Endpoints prüfen"""
+        try:
+            self.validator.check_assignment_window(sprint, assignment_from, assignment_to)
+        except ValidationError as e:
+            raise ValidationError(f"{prefix}: {e.message}", e.field) from e
+
+    def _base_member(self, data: SprintAvailabilityData, member_id: int) -> Optional[Member]:
+        """Member aus dem Basis-Roster (remove + add im selben Szenario)"""
+        for entry in data.roster_entries:
+            if entry.member_id == member_id:
+                return entry.member
+        return None
+
+    def _member_deltas(self, base_members: List[AvailabilityMember],
+                       members: List[AvailabilityMember]) -> List[ScenarioMemberDelta]:
+        """Abweichungen je Member (inkl. entfernter Members)"""
+        base_by_id = {m.member_id: m for m in base_members}
+        scenario_ids = {m.member_id for m in members}
+        deltas = []
+
+        for member in members:
+            base_member = base_by_id.get(member.member_id)
+            if base_member is None:
+                deltas.append(self._delta(member, "added", 0.0, 0.0, member.sum_days, member.sum_hours, []))
+                continue
+            changed_days = [
+                new.date for old, new in zip(base_member.days, member.days) if old.final_state != new.final_state
+            ]
+            unchanged = (
+                member is base_member
+                or (not changed_days and member.sum_hours == base_member.sum_hours)
+            )
+            deltas.append(self._delta(
+                member, "unchanged" if unchanged else "changed",
+                base_member.sum_days, base_member.sum_hours, member.sum_days, member.sum_hours, changed_days
+            ))
+
+        for base_member in base_members:
+            if base_member.member_id not in scenario_ids:
+                deltas.append(self._delta(
+                    base_member, "removed", base_member.sum_days, base_member.sum_hours, 0.0, 0.0, []
+                ))
+        return deltas
+
+    def _delta(self, member: AvailabilityMember, status: str, base_days: float, base_hours: float,
+               days: float, hours: float, changed_days: List[date]) -> ScenarioMemberDelta:
+        return ScenarioMemberDelta(
+            member_id=member.member_id,
+            name=member.name,
+            status=status,
+            base_sum_days=base_days,
+            sum_days=days,
+            delta_days=days - base_days,
+            base_sum_hours=base_hours,
+            sum_hours=hours,
+            delta_hours=hours - base_hours,
+            changed_days=changed_days,
+        )
@@ -0,0 +1,158 @@
+"""
+Team Rollup Service
+
+Aggregiert die Kapazität (Personentage und Stunden, je Tag und je Sprint)
+entlang der Team-Hierarchie. Berechnet wird bottom-up in einem Durchlauf:
+
+1. Team-Baum mit einer Query laden, Teilbaum in Pre-Order ablegen
+2. Je Sprint die Final States aller Members im Teilbaum berechnen und auf
+   das direkte Team summieren
+3. Teams in umgekehrter Pre-Order (Kinder vor Eltern) auf den Parent addieren
+
+Jeder Member und jedes Team wird genau einmal angefasst - kein Neuberechnen
+einzelner Teilbäume.
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.db.models import Sprint, Team, TeamMember
+from app.schemas.schemas import SprintResponse, TeamRollupNode, TeamRollupResponse, TeamSprintRollup
+from app.services.availability import DAY_VALUES, AvailabilityService
+
+
+class _RollupAccumulator:
+    """Summen eines Teams während der Aggregation"""
+    __slots__ = ("team_id", "name", "member_count", "days", "hours", "sprints")
+
+    def __init__(self, team_id: int, name: str, day_count: int):
+        self.team_id = team_id
+        self.name = name
+        self.member_count = 0
+        self.days = [0.0] * day_count
+        self.hours = [0.0] * day_count
+        self.sprints: Dict[int, List[float]] = defaultdict(lambda: [0.0, 0.0])
+
+    def add(self, other: "_RollupAccumulator"):
+        self.member_count += other.member_count
+        self.days = [a + b for a, b in zip(self.days, other.days)]
+        self.hours = [a + b for a, b in zip(self.hours, other.hours)]
+        for sprint_id, (days, hours) in other.sprints.items():
+            totals = self.sprints[sprint_id]
+            totals[0] += days
+            totals[1] += hours
+
+
+class TeamRollupService:
+    """Service für hierarchische Kapazitäts-Rollups"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def rollup(self, team_id: int, sprint_ids: Optional[Sequence[int]] = None) -> Optional[TeamRollupResponse]:
+        """
+        Kapazität des Teams und aller Sub-Teams für die angegebenen Sprints
+
+        Default: Sprints, die heute laufen. None wenn das Team nicht existiert.
+        """
+        teams = self.db.query(Team.team_id, Team.name, Team.parent_team_id).all()
+        names = {t.team_id: t.name for t in teams}
+        if team_id not in names:
+            return None
+
+        children: Dict[int, List[int]] = defaultdict(list)
+        for team in teams:
+            if team.parent_team_id is not None:
+                children[team.parent_team_id].append(team.team_id)
+        order = self._subtree_order(team_id, children)
+
+        team_of_member = dict(
+            self.db.query(TeamMember.member_id, TeamMember.team_id).filter(TeamMember.team_id.in_(order)).all()
+        )
+
+        availability = AvailabilityService(self.db)
+        sprints = self._load_sprints(sprint_ids)
+        dates = sorted({d for s in sprints for d in availability.generate_sprint_days(s.start_date, s.end_date)})
+        day_index = {d: i for i, d in enumerate(dates)}
+
+        nodes = {tid: _RollupAccumulator(tid, names[tid], len(dates)) for tid in order}
+        for tid in team_of_member.values():
+            nodes[tid].member_count += 1
+
+        # Per-Member-Ergebnisse direkt auf das eigene Team summieren
+        for sprint in sprints if team_of_member else []:
+            data = availability.load_sprint_data(sprint.sprint_id, member_ids=team_of_member.keys())
+            indices = [day_index[d] for d in data.sprint_days]
+            for entry, states in zip(data.roster_entries, availability.final_states(data)):
+                node = nodes[team_of_member[entry.member_id]]
+                hours_per_day = 8 * float(entry.member.employment_ratio) * float(entry.allocation)
+                sprint_days = 0.0
+                for index, state in zip(indices, states):
+                    value = DAY_VALUES.get(state)
+                    if value:
+                        node.days[index] += value
+                        node.hours[index] += value * hours_per_day
+                        sprint_days += value
+                totals = node.sprints[sprint.sprint_id]
+                totals[0] += sprint_days
+                totals[1] += sprint_days * hours_per_day
+
+        # Bottom-up: Kinder vor Eltern, jedes Team einmal auf seinen Parent addieren
+        built: Dict[int, TeamRollupNode] = {}
+        for tid in reversed(order):
+            node = nodes[tid]
+            for child_id in children.get(tid, ()):
+                if child_id in nodes:
+                    node.add(nodes[child_id])
+            built[tid] = self._to_node(node, sprints, [built[c] for c in children.get(tid, ()) if c in built])
+
+        return TeamRollupResponse(
+            sprints=[SprintResponse.model_validate(s) for s in sprints],
+            dates=dates,
+            root=built[team_id],
+        )
+
+    def _subtree_order(self, team_id: int, children: Dict[int, List[int]]) -> List[int]:
+        """Teilbaum in Pre-Order (iterativ, robust gegen Zyklen in Altdaten)"""
+        order, seen, stack = [], set(), [team_id]
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            order.append(current)
+            stack.extend(reversed(children.get(current, ())))
+        return order
+
+    def _load_sprints(self, sprint_ids: Optional[Sequence[int]]) -> List[Sprint]:
+        query = self.db.query(Sprint)
+        if sprint_ids:
+            query = query.filter(Sprint.sprint_id.in_(sprint_ids))
+        else:
+            today = date.today()
+            query = query.filter(Sprint.start_date <= today, Sprint.end_date >= today)
+        return query.order_by(Sprint.start_date, Sprint.sprint_id).all()
+
+    def _to_node(self, node: _RollupAccumulator, sprints: List[Sprint],
+                 children: List[TeamRollupNode]) -> TeamRollupNode:
+        sprint_totals = [
+            TeamSprintRollup(
+                sprint_id=s.sprint_id,
+                sum_days=node.sprints[s.sprint_id][0] if s.sprint_id in node.sprints else 0.0,
+                sum_hours=round(node.sprints[s.sprint_id][1], 2) if s.sprint_id in node.sprints else 0.0,
+            )
+            for s in sprints
+        ]
+        return TeamRollupNode(
+            team_id=node.team_id,
+            name=node.name,
+            member_count=node.member_count,
+            sum_days=sum(node.days),
+            sum_hours=round(sum(node.hours), 2),
+            sprints=sprint_totals,
+            days=node.days,
+            hours=[round(hours, 2) for hours in node.hours],
+            children=children,
+        )
@@ -4,13 +4,17 @@ Validation Service für Business Logic Validierungen
 Erweiterte Validierungen die über einfache Pydantic Schema-Validierung hinausgehen.
 """
 from datetime import date
-from typing import Optional
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 from sqlalchemy.orm import Session
 
-from app.db.models import Sprint, Member, SprintRoster, PTO
+from app.core.config import settings
+from app.db.models import Sprint, Member, SprintRoster, PTO, Team
 from app.db.crud.sprints import get_sprint
 from app.db.crud.members import get_member
 from app.db.crud.sprint_roster import get_roster_entry
+from app.schemas.schemas import RosterBulkAction
+from app.services.over_allocation import AllocationInterval, OverAllocationService, find_over_allocations
 
 
 class ValidationError(Exception):
@@ -48,6 +52,49 @@ class ValidationService:
         if not has_workday:
             raise ValidationError("Sprint must contain at least one workday (Monday-Friday)", "start_date")
 
+    def validate_sprint_series(self, ranges: Sequence[Tuple[date, date]], allow_overlap: bool = False):
+        """
+        Validate the date ranges of a sprint series in one go
+        - every range contains a workday
+        - no overlap within the series or (unless allowed) with existing sprints (one query)
+        """
+        for start_date, end_date in ranges:
+            self.validate_sprint_dates(start_date, end_date)
+        if allow_overlap or not ranges:
+            return
+
+        ordered = sorted(enumerate(ranges, start=1), key=lambda item: item[1][0])
+        for (_, (_, previous_end)), (n, (start_date, end_date)) in zip(ordered, ordered[1:]):
+            if start_date <= previous_end:
+                raise ValidationError(f"Sprint {n} of the series ({start_date} to {end_date}) overlaps the previous one",
+                                      "cadence_weeks")
+
+        existing = self.db.query(Sprint.name, Sprint.start_date, Sprint.end_date).filter(
+            Sprint.start_date <= max(end for _, end in ranges),
+            Sprint.end_date >= min(start for start, _ in ranges)
+        ).order_by(Sprint.start_date).all()
+        for n, (start_date, end_date) in ordered:
+            for sprint in existing:
+                if sprint.start_date > end_date:
+                    break
+                if sprint.end_date >= start_date:
+                    raise ValidationError(
+                        f"Sprint {n} of the series ({start_date} to {end_date}) overlaps '{sprint.name}' "
+                        f"({sprint.start_date} to {sprint.end_date})",
+                        "start_date"
+                    )
+
+    def validate_members_exist(self, member_ids: Set[int]):
+        """
+        Validate that all members exist (one query)
+        """
+        if not member_ids:
+            return
+        known = {member_id for (member_id,) in self.db.query(Member.member_id).filter(Member.member_id.in_(member_ids))}
+        missing = sorted(member_ids - known)
+        if missing:
+            raise ValidationError(f"Members not found: {', '.join(map(str, missing))}", "member_id")
+
     def validate_roster_uniqueness(self, sprint_id: int, member_id: int, exclude_existing: bool = False):
         """
         Validate that member is not already in sprint roster
@@ -55,7 +102,7 @@ class ValidationService:
         existing = get_roster_entry(self.db, sprint_id, member_id)
 
         if existing and not exclude_existing:
-            sprint = get_sprint(self.db, sprint_id)
+            sprint = get_sprint(self.db, sprint_id, include_stats=False)
             member = get_member(self.db, member_id)
             sprint_name = sprint.name if sprint else f"Sprint {sprint_id}"
             member_name = member.name if member else f"Member {member_id}"
@@ -72,10 +119,14 @@ class ValidationService:
         if assignment_from is None and assignment_to is None:
             return  # No assignment window = full sprint
 
-        sprint = get_sprint(self.db, sprint_id)
+        sprint = get_sprint(self.db, sprint_id, include_stats=False)
         if not sprint:
             raise ValidationError(f"Sprint {sprint_id} not found", "sprint_id")
 
+        self.check_assignment_window(sprint, assignment_from, assignment_to)
+
+    def check_assignment_window(self, sprint: Sprint, assignment_from: Optional[date], assignment_to: Optional[date]):
+        """Assignment window within the bounds of an already loaded sprint"""
         if assignment_from and assignment_from < sprint.start_date:
             raise ValidationError(
                 f"Assignment start ({assignment_from}) cannot be before sprint start ({sprint.start_date})",
@@ -103,8 +154,11 @@ class ValidationService:
         if to_date < from_date:
             raise ValidationError("PTO end date must be >= start date", "to_date")
 
-        # Prüfe auf überlappende PTO-Einträge
-        overlapping_pto = self.db.query(PTO).filter(
+        # Prüfe auf überlappende PTO-Einträge (nur Datumsspalten plus Member-Name
+        # in einer Abfrage, statt ganzer PTO-Entity und separatem Member-Lookup)
+        overlapping_pto = self.db.query(PTO.from_date, PTO.to_date, Member.name).outerjoin(
+            Member, Member.member_id == PTO.member_id
+        ).filter(
             PTO.member_id == member_id,
             PTO.from_date <= to_date,
             PTO.to_date >= from_date
@@ -115,11 +169,11 @@ class ValidationService:
 
         existing = overlapping_pto.first()
         if existing:
-            member = get_member(self.db, member_id)
-            member_name = member.name if member else f"Member {member_id}"
+            existing_from, existing_to, member_name = existing
+            member_name = member_name or f"Member {member_id}"
 
             raise ValidationError(
-                f"PTO period overlaps with existing PTO for {member_name} ({existing.from_date} to {existing.to_date})",
+                f"PTO period overlaps with existing PTO for {member_name} ({existing_from} to {existing_to})",
                 "from_date"
             )
 
@@ -127,7 +181,7 @@ class ValidationService:
         """
         Validate that override date is within sprint bounds
         """
-        sprint = get_sprint(self.db, sprint_id)
+        sprint = get_sprint(self.db, sprint_id, include_stats=False)
         if not sprint:
             raise ValidationError(f"Sprint {sprint_id} not found", "sprint_id")
 
@@ -137,13 +191,157 @@ class ValidationService:
                 "day"
             )
 
+    def validate_availability_overrides(self, sprint: Sprint, items: List) -> Dict[int, ValidationError]:
+        """
+        Validate a batch of overrides (day within sprint, member in roster)
+
+        Uses one roster query for the whole batch (plus one name lookup if
+        errors occurred) instead of per-item lookups. Returns index -> error.
+        """
+        roster_member_ids = {
+            member_id for (member_id,) in self.db.query(SprintRoster.member_id).filter(
+                SprintRoster.sprint_id == sprint.sprint_id
+            )
+        }
+
+        errors: Dict[int, ValidationError] = {}
+        missing_member_ids = set()
+        for i, item in enumerate(items):
+            if not (sprint.start_date <= item.day <= sprint.end_date):
+                errors[i] = ValidationError(
+                    f"Override date {item.day} is not within sprint range ({sprint.start_date} to {sprint.end_date})",
+                    "day"
+                )
+            elif item.member_id not in roster_member_ids:
+                missing_member_ids.add(item.member_id)
+
+        if missing_member_ids:
+            names = dict(self.db.query(Member.member_id, Member.name).filter(
+                Member.member_id.in_(missing_member_ids)
+            ).all())
+            for i, item in enumerate(items):
+                if i not in errors and item.member_id in missing_member_ids:
+                    member_name = names.get(item.member_id, f"Member {item.member_id}")
+                    errors[i] = ValidationError(
+                        f"Member '{member_name}' is not assigned to '{sprint.name}'",
+                        "member_id"
+                    )
+
+        return errors
+
+    def validate_roster_items(
+        self, sprint: Sprint, items: List, roster_windows: Dict[int, Tuple[Optional[date], Optional[date]]]
+    ) -> Dict[int, ValidationError]:
+        """
+        Validate a batch of roster changes against the loaded sprint and roster
+
+        Checks member existence (one query for the whole batch), roster
+        membership per action, duplicates, required (non-null) allocation and
+        the assignment window - for existing entries merged with the stored
+        window (member_id -> (assignment_from, assignment_to)). Returns index -> error.
+        """
+        names = dict(self.db.query(Member.member_id, Member.name).filter(
+            Member.member_id.in_({item.member_id for item in items})
+        ).all()) if items else {}
+
+        errors: Dict[int, ValidationError] = {}
+        seen = set()
+        for i, item in enumerate(items):
+            member_name = names.get(item.member_id)
+            in_roster = item.member_id in roster_windows
+            try:
+                if member_name is None:
+                    raise ValidationError(f"Member {item.member_id} not found", "member_id")
+                if item.member_id in seen:
+                    raise ValidationError(f"Member '{member_name}' appears more than once", "member_id")
+                if item.action == RosterBulkAction.ADD and in_roster:
+                    raise ValidationError(f"Member '{member_name}' is already assigned to '{sprint.name}'", "member_id")
+                if item.action in (RosterBulkAction.UPDATE, RosterBulkAction.REMOVE) and not in_roster:
+                    raise ValidationError(f"Member '{member_name}' is not assigned to '{sprint.name}'", "member_id")
+                if item.action != RosterBulkAction.REMOVE:
+                    given = item.model_fields_set
+                    if item.allocation is None and (not in_roster or "allocation" in given):
+                        raise ValidationError("Allocation is required", "allocation")
+                    # Nicht gesetzte Felder behalten den gespeicherten Wert
+                    stored_from, stored_to = roster_windows.get(item.member_id, (None, None))
+                    self.check_assignment_window(
+                        sprint,
+                        item.assignment_from if "assignment_from" in given else stored_from,
+                        item.assignment_to if "assignment_to" in given else stored_to,
+                    )
+            except ValidationError as e:
+                errors[i] = e
+            seen.add(item.member_id)
+
+        return errors
+
+    def validate_allocation_limits(self, sprint: Sprint, changes: Dict[int, Optional[Dict]]) -> Dict[int, ValidationError]:
+        """
+        Validate that roster changes keep every member at <= 100% across parallel sprints
+
+        changes: member_id -> changed fields (allocation/assignment_from/assignment_to,
+        missing fields keep their current value) or None for a removal. Only
+        conflicts involving this sprint are reported (one query for all members).
+        Disabled unless ROSTER_ALLOCATION_CHECK is set. Returns member_id -> error.
+        """
+        if not settings.ROSTER_ALLOCATION_CHECK or not changes:
+            return {}
+
+        intervals = OverAllocationService(self.db).load_intervals(member_ids=set(changes))
+        current = {i.member_id: i for i in intervals if i.sprint_id == sprint.sprint_id}
+        proposed = [i for i in intervals if i.sprint_id != sprint.sprint_id or i.member_id not in changes]
+        for member_id, change in changes.items():
+            if change is None:
+                continue
+            base = current.get(member_id)
+            allocation = change.get("allocation", base.allocation if base else None)
+            start = change["assignment_from"] if "assignment_from" in change else (base.start if base else None)
+            end = change["assignment_to"] if "assignment_to" in change else (base.end if base else None)
+            if allocation is None:
+                continue
+            proposed.append(AllocationInterval(
+                member_id, sprint.sprint_id, sprint.name,
+                start or sprint.start_date, end or sprint.end_date, Decimal(str(allocation))
+            ))
+
+        conflicts = {}
+        for conflict in find_over_allocations(proposed):
+            if conflict.member_id not in conflicts and any(i.sprint_id == sprint.sprint_id for i in conflict.intervals):
+                conflicts[conflict.member_id] = conflict
+        if not conflicts:
+            return {}
+
+        names = dict(self.db.query(Member.member_id, Member.name).filter(Member.member_id.in_(conflicts)).all())
+        errors: Dict[int, ValidationError] = {}
+        for member_id, conflict in conflicts.items():
+            others = ", ".join(f"'{i.sprint_name}'" for i in conflict.intervals if i.sprint_id != sprint.sprint_id)
+            errors[member_id] = ValidationError(
+                f"Member '{names.get(member_id, member_id)}' would be allocated {conflict.total * 100:.0f}% "
+                f"from {conflict.start} to {conflict.end} (together with {others})",
+                "allocation"
+            )
+        return errors
+
+    def validate_member_allocation(self, sprint_id: int, member_id: int, change: Dict):
+        """
+        Validate a single roster write against the member's other sprints (see validate_allocation_limits)
+        """
+        if not settings.ROSTER_ALLOCATION_CHECK:
+            return
+        sprint = get_sprint(self.db, sprint_id, include_stats=False)
+        if not sprint:
+            return
+        errors = self.validate_allocation_limits(sprint, {member_id: change})
+        if member_id in errors:
+            raise errors[member_id]
+
     def validate_member_in_roster(self, sprint_id: int, member_id: int):
         """
         Validate that member is in sprint roster
         """
         roster_entry = get_roster_entry(self.db, sprint_id, member_id)
         if not roster_entry:
-            sprint = get_sprint(self.db, sprint_id)
+            sprint = get_sprint(self.db, sprint_id, include_stats=False)
             member = get_member(self.db, member_id)
             sprint_name = sprint.name if sprint else f"Sprint {sprint_id}"
             member_name = member.name if member else f"Member {member_id}"
@@ -172,3 +370,27 @@ class ValidationService:
 
         if employment_ratio > 1:
             raise ValidationError("Employment ratio cannot be greater than 1.0 (100%)", "employment_ratio")
+
+    def validate_team_parent(self, team_id: Optional[int], parent_team_id: Optional[int]):
+        """
+        Validate team parent
+        - Parent muss existieren
+        - Keine Zyklen (Team darf nicht unter sich selbst oder einem Sub-Team hängen)
+        """
+        if parent_team_id is None:
+            return
+
+        parents = dict(self.db.query(Team.team_id, Team.parent_team_id).all())
+        if parent_team_id not in parents:
+            raise ValidationError(f"Parent team {parent_team_id} not found", "parent_team_id")
+
+        # Kette nach oben laufen; `seen` schützt vor Zyklen in bestehenden Daten
+        # (z.B. aus zwei gleichzeitigen PATCHes), die sonst endlos laufen würden
+        current, seen = parent_team_id, set()
+        while current is not None:
+            if current == team_id:
+                raise ValidationError("Team cannot be nested below itself or one of its sub-teams", "parent_team_id")
+            if current in seen:
+                raise ValidationError(f"Team hierarchy above team {parent_team_id} contains a cycle", "parent_team_id")
+            seen.add(current)
+            current = parents.get(current)
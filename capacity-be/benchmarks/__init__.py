@@ -0,0 +1,2 @@
+# Benchmarks Package
+# Performance-Messungen für Availability-Engine und CRUD-Hot-Paths
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+HTTP-Lasttest für die FastAPI-App
+
+Startet `app.main:app` per uvicorn gegen einen generierten Datensatz
+(SQLite-Datei, alternativ --database-url) und spielt einen gewichteten
+Request-Mix ab:
+- Matrix-Ansicht      GET   /api/v1/sprints/{id}/availability
+- Zellen-PATCH        PATCH /api/v1/sprints/{id}/availability
+- Roster-Bearbeitung  PUT   /api/v1/sprints/{id}/roster/{member_id}
+- Sprint-Liste        GET   /api/v1/sprints/
+
+Für jede Concurrency-Stufe werden Durchsatz und p50/p95/p99-Latenzen
+berichtet. Pool-Größe und Worker-Anzahl sind variierbar.
+
+Aufruf (aus capacity-be/):
+    python -m benchmarks.load
+    python -m benchmarks.load --concurrency 1 8 32 --duration 15
+    python -m benchmarks.load --workers 4 --pool-size 10 --max-overflow 20
+    python -m benchmarks.load --database-url mysql+pymysql://... --no-generate
+    python -m benchmarks.load --output load.json
+
+Hinweis: SQLite serialisiert Schreibzugriffe - für realistische Zahlen mit
+mehreren Workern gegen MySQL messen.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+# Add the project root to Python path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import httpx
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models import Sprint, SprintRoster
+from app.db.synthetic import generate_dataset
+
+API = "/api/v1"
+
+# Gewichteter Request-Mix (Summe beliebig)
+DEFAULT_MIX = {
+    "matrix_view": 40,
+    "cell_patch": 25,
+    "roster_edit": 10,
+    "sprint_list": 25,
+}
+
+
+def prepare_database(url: str, args: argparse.Namespace) -> None:
+    """Schema anlegen, synthetische Daten laden und Alembic-Revision stempeln"""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+
+    # Revision stempeln, damit der Startup keine Migration versucht
+    head = ScriptDirectory.from_config(Config(os.path.join(PROJECT_ROOT, "alembic.ini"))).get_current_head()
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)"))
+        connection.execute(text("DELETE FROM alembic_version"))
+        connection.execute(text("INSERT INTO alembic_version (version_num) VALUES (:v)"), {"v": head})
+
+    with sessionmaker(bind=engine)() as db:
+        counts = generate_dataset(
+            db,
+            members=args.members,
+            sprints=args.sprints,
+            roster_size=args.roster_size,
+            seed=args.seed,
+        )
+    engine.dispose()
+    print(f"🌱 Datensatz geladen: {counts}")
+
+
+def load_targets(url: str) -> List[Dict]:
+    """Sprint-IDs, Roster-Members und Sprint-Tage für den Request-Mix"""
+    engine = create_engine(url)
+    with sessionmaker(bind=engine)() as db:
+        sprints = db.query(Sprint).all()
+        roster = defaultdict(list)
+        for sprint_id, member_id in db.query(SprintRoster.sprint_id, SprintRoster.member_id):
+            roster[sprint_id].append(member_id)
+        targets = [
+            {
+                "sprint_id": s.sprint_id,
+                "days": [(s.start_date + timedelta(days=i)).isoformat() for i in range((s.end_date - s.start_date).days + 1)],
+                "member_ids": roster[s.sprint_id],
+            }
+            for s in sprints if roster[s.sprint_id]
+        ]
+    engine.dispose()
+    return targets
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(url: str, port: int, args: argparse.Namespace) -> subprocess.Popen:
+    """uvicorn mit gewünschter Pool-Größe und Worker-Anzahl starten"""
+    env = dict(
+        os.environ,
+        MYSQL_URL=url,
+        SQLALCHEMY_POOL_SIZE=str(args.pool_size),
+        SQLALCHEMY_MAX_OVERFLOW=str(args.max_overflow),
+        SQLALCHEMY_POOL_TIMEOUT=str(args.pool_timeout),
+        PYTHONPATH=PROJECT_ROOT,
+    )
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(args.workers), "--log-level", "warning",
+    ]
+    return subprocess.Popen(command, cwd=PROJECT_ROOT, env=env)
+
+
+def wait_until_healthy(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server unter {base_url} nicht rechtzeitig erreichbar")
+
+
+def build_request(rng: random.Random, operation: str, targets: List[Dict]) -> Dict:
+    """Konkreten Request für eine Operation aus dem Mix erzeugen"""
+    target = rng.choice(targets)
+    sprint_id = target["sprint_id"]
+
+    if operation == "matrix_view":
+        return {"method": "GET", "url": f"{API}/sprints/{sprint_id}/availability"}
+    if operation == "cell_patch":
+        return {
+            "method": "PATCH",
+            "url": f"{API}/sprints/{sprint_id}/availability",
+            "json": {
+                "member_id": rng.choice(target["member_ids"]),
+                "day": rng.choice(target["days"]),
+                "state": rng.choice(["available", "half", "unavailable", None]),
+            },
+        }
+    if operation == "roster_edit":
+        member_id = rng.choice(target["member_ids"])
+        return {
+            "method": "PUT",
+            "url": f"{API}/sprints/{sprint_id}/roster/{member_id}",
+            "json": {"allocation": rng.choice([0.5, 0.8, 1.0])},
+        }
+    return {"method": "GET", "url": f"{API}/sprints/"}
+
+
+async def run_level(base_url: str, concurrency: int, duration: float, targets: List[Dict],
+                    mix: Dict[str, int], seed: int) -> Dict:
+    """Eine Concurrency-Stufe für `duration` Sekunden fahren"""
+    operations = list(mix)
+    weights = [mix[op] for op in operations]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        deadline = time.monotonic() + duration
+
+        async def user(index: int):
+            rng = random.Random(seed * 1000 + index)
+            while time.monotonic() < deadline:
+                operation = rng.choices(operations, weights)[0]
+                request = build_request(rng, operation, targets)
+                started = time.perf_counter()
+                try:
+                    response = await client.request(**request)
+                    failed = response.status_code >= 500
+                except httpx.HTTPError:
+                    failed = True
+                latencies[operation].append((time.perf_counter() - started) * 1000)
+                if failed:
+                    errors[operation] += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(user(i) for i in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "concurrency": concurrency,
+        "requests": len(all_latencies),
+        "errors": sum(errors.values()),
+        "throughput_rps": round(len(all_latencies) / elapsed, 1),
+        **percentiles(all_latencies),
+        "operations": {
+            op: {"requests": len(values), "errors": errors[op], **percentiles(values)}
+            for op, values in sorted(latencies.items())
+        },
+    }
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99 in ms"""
+    if len(values) < 2:
+        value = round(values[0], 2) if values else None
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50_ms": round(cuts[49], 2), "p95_ms": round(cuts[94], 2), "p99_ms": round(cuts[98], 2)}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="HTTP-Lasttest für die Capacity Planner API")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--duration", type=float, default=10.0, help="Sekunden pro Concurrency-Stufe")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn Worker-Prozesse")
+    parser.add_argument("--pool-size", type=int, default=5, help="SQLALCHEMY_POOL_SIZE")
+    parser.add_argument("--max-overflow", type=int, default=10, help="SQLALCHEMY_MAX_OVERFLOW")
+    parser.add_argument("--pool-timeout", type=int, default=30, help="SQLALCHEMY_POOL_TIMEOUT")
+    parser.add_argument("--members", type=int, default=500)
+    parser.add_argument("--sprints", type=int, default=26)
+    parser.add_argument("--roster-size", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mix", type=json.loads, default=DEFAULT_MIX,
+                        help='Gewichte als JSON, z.B. \'{"matrix_view": 80, "sprint_list": 20}\'')
+    parser.add_argument("--database-url", help="Bestehende Datenbank statt temporärer SQLite-Datei")
+    parser.add_argument("--no-generate", action="store_true", help="Keine Daten generieren (mit --database-url)")
+    parser.add_argument("--output", help="Ergebnis als JSON schreiben")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='capacity-load-'), 'load.db')}"
+
+    if not args.no_generate:
+        prepare_database(url, args)
+    targets = load_targets(url)
+    if not targets:
+        print("❌ Keine Sprints mit Roster gefunden")
+        return 1
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(url, port, args)
+    levels = []
+    try:
+        wait_until_healthy(base_url)
+        print(f"🚀 Server läuft ({args.workers} Worker, pool_size={args.pool_size}, max_overflow={args.max_overflow})")
+        print(f"\n{'Conc.':>5} {'Req':>7} {'Err':>5} {'RPS':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for concurrency in args.concurrency:
+            level = asyncio.run(run_level(base_url, concurrency, args.duration, targets, args.mix, args.seed))
+            levels.append(level)
+            print(f"{concurrency:>5} {level['requests']:>7} {level['errors']:>5} {level['throughput_rps']:>8} "
+                  f"{level['p50_ms']:>7}ms {level['p95_ms']:>7}ms {level['p99_ms']:>7}ms")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    if args.output:
+        report = {
+            "config": {
+                "workers": args.workers,
+                "pool_size": args.pool_size,
+                "max_overflow": args.max_overflow,
+                "duration_s": args.duration,
+                "mix": args.mix,
+                "database": "sqlite" if url.startswith("sqlite") else url.split("://")[0],
+            },
+            "levels": levels,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Report geschrieben: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
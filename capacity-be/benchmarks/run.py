@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite für Availability-Engine und CRUD-Hot-Paths
+
+Misst über ein Raster aus Roster-Größen und Sprint-Längen:
+- AvailabilityService.get_sprint_availability
+- Bulk-Override-Pfad (PATCH /sprints/{id}/availability/bulk)
+- get_sprints inkl. Statistiken
+- PTO-Überlappungsvalidierung (ValidationService.validate_pto_dates)
+
+Jeder Rasterpunkt läuft gegen eine eigene SQLite-Datei mit synthetischen
+Daten (app/db/synthetic.py) - keine externen Services nötig.
+
+Aufruf (aus capacity-be/):
+    python -m benchmarks.run                       # volle Suite, Vergleich mit baseline.json
+    python -m benchmarks.run --quick               # kleines Raster
+    python -m benchmarks.run --output report.json  # maschinenlesbarer Report
+    python -m benchmarks.run --update-baseline     # Baseline neu schreiben
+    python -m benchmarks.run --threshold 0.5       # Regression erst ab +50%
+
+Exit-Code 1, wenn ein Benchmark die Baseline um mehr als den Threshold überschreitet.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sqlalchemy
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.availability import patch_sprint_availability_bulk
+from app.db.base import Base
+from app.db.crud.sprints import get_sprints
+from app.db.models import Sprint, SprintRoster, Member, AvailabilityState
+from app.db.synthetic import generate_dataset
+from app.schemas.schemas import AvailabilityOverridePatch
+from app.services.availability import AvailabilityService
+from app.services.validation import ValidationService, ValidationError
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+ROSTER_SIZES = [10, 50, 200]
+SPRINT_DAYS = [14, 28]
+QUICK_ROSTER_SIZES = [10, 50]
+QUICK_SPRINT_DAYS = [14]
+
+SPRINT_COUNT = 20
+DEFAULT_REPEAT = 7
+DEFAULT_THRESHOLD = 0.25
+
+
+def measure(func: Callable[[], None], repeat: int) -> Dict[str, float]:
+    """Funktion `repeat` mal ausführen (plus Warmup) und Laufzeiten in ms zurückgeben"""
+    func()  # Warmup
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def run_grid_point(roster_size: int, sprint_days: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Alle Benchmarks für einen Rasterpunkt gegen eine frische SQLite-Datenbank"""
+    with tempfile.TemporaryDirectory(prefix="capacity-bench-") as workdir:
+        engine = create_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+        try:
+            return _run_benchmarks(engine, roster_size, sprint_days, repeat)
+        finally:
+            # Verbindungen schließen, bevor das Verzeichnis entfernt wird
+            engine.dispose()
+
+
+def _run_benchmarks(engine: Engine, roster_size: int, sprint_days: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Datensatz erzeugen und die Benchmarks gegen `engine` messen"""
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    with session_factory() as db:
+        generate_dataset(
+            db,
+            members=roster_size * 2,
+            sprints=SPRINT_COUNT,
+            roster_size=roster_size,
+            sprint_days=sprint_days,
+            seed=roster_size * 1000 + sprint_days,
+        )
+        sprint = db.query(Sprint).order_by(Sprint.sprint_id).first()
+        sprint_id, sprint_start = sprint.sprint_id, sprint.start_date
+        member_ids = [m for (m,) in db.query(SprintRoster.member_id).filter(SprintRoster.sprint_id == sprint_id)]
+        all_member_ids = [m for (m,) in db.query(Member.member_id)]
+
+    override_days = [sprint_start + timedelta(days=offset) for offset in range(5)]
+    toggle = {"state": AvailabilityState.HALF}
+
+    def availability():
+        with session_factory() as db:
+            AvailabilityService(db).get_sprint_availability(sprint_id)
+
+    def bulk_override():
+        # Zwischen zwei Zuständen wechseln, damit jeder Durchlauf echte Updates schreibt
+        state = toggle["state"]
+        toggle["state"] = AvailabilityState.UNAVAILABLE if state == AvailabilityState.HALF else AvailabilityState.HALF
+        items = [
+            AvailabilityOverridePatch(member_id=member_id, day=day, state=state)
+            for member_id in member_ids for day in override_days
+        ]
+        with session_factory() as db:
+            patch_sprint_availability_bulk(sprint_id, items, db)
+
+    def sprints_with_stats():
+        with session_factory() as db:
+            get_sprints(db, limit=1000, include_stats=True)
+
+    def pto_overlap():
+        probe_from = sprint_start
+        probe_to = sprint_start + timedelta(days=sprint_days - 1)
+        with session_factory() as db:
+            validator = ValidationService(db)
+            for member_id in all_member_ids:
+                try:
+                    validator.validate_pto_dates(member_id, probe_from, probe_to)
+                except ValidationError:
+                    pass
+
+    suffix = f"[roster={roster_size},days={sprint_days}]"
+    return {
+        f"availability{suffix}": measure(availability, repeat),
+        f"bulk_override{suffix}": measure(bulk_override, repeat),
+        f"sprints_with_stats{suffix}": measure(sprints_with_stats, repeat),
+        f"pto_overlap{suffix}": measure(pto_overlap, repeat),
+    }
+
+
+def run_suite(roster_sizes: List[int], sprint_days: List[int], repeat: int) -> Dict:
+    """Komplettes Raster ausführen und Report erzeugen"""
+    results = {}
+    for roster_size in roster_sizes:
+        for days in sprint_days:
+            print(f"⏱️  roster={roster_size} days={days} ...", flush=True)
+            results.update(run_grid_point(roster_size, days, repeat))
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "sprint_count": SPRINT_COUNT,
+        },
+        "results": results,
+    }
+
+
+def compare_to_baseline(report: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """
+    Report mit Baseline vergleichen
+
+    Liefert je gemeinsamen Benchmark ein Dict mit Ratio; `regression` ist True,
+    wenn der Median mehr als `threshold` (relativ) über der Baseline liegt.
+    """
+    comparisons = []
+    for name, current in sorted(report["results"].items()):
+        reference = baseline.get("results", {}).get(name)
+        if not reference or not reference.get("median_ms"):
+            continue
+        ratio = current["median_ms"] / reference["median_ms"]
+        comparisons.append({
+            "name": name,
+            "baseline_ms": reference["median_ms"],
+            "current_ms": current["median_ms"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1 + threshold,
+        })
+    return comparisons
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark Suite für den Capacity Planner")
+    parser.add_argument("--quick", action="store_true", help="Kleines Raster (für schnelle lokale Checks)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--output", help="Report als JSON schreiben")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Pfad zur Baseline (JSON)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Erlaubte relative Verschlechterung des Medians (0.25 = +25%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Report als neue Baseline speichern")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    roster_sizes = QUICK_ROSTER_SIZES if args.quick else ROSTER_SIZES
+    sprint_days = QUICK_SPRINT_DAYS if args.quick else SPRINT_DAYS
+
+    report = run_suite(roster_sizes, sprint_days, args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report geschrieben: {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📌 Baseline aktualisiert: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("⚠️  Keine Baseline gefunden - Vergleich übersprungen")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    comparisons = compare_to_baseline(report, baseline, args.threshold)
+    print(f"\n{'Benchmark':<45} {'Baseline':>10} {'Aktuell':>10} {'Ratio':>7}")
+    for row in comparisons:
+        marker = "  ❌" if row["regression"] else ""
+        print(f"{row['name']:<45} {row['baseline_ms']:>9.2f}ms {row['current_ms']:>9.2f}ms {row['ratio']:>7.2f}{marker}")
+
+    regressions = [row for row in comparisons if row["regression"]]
+    if regressions:
+        print(f"\n❌ {len(regressions)} Regression(en) über Threshold {args.threshold:.0%}")
+        return 1
+
+    print(f"\n✅ Keine Regression über Threshold {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
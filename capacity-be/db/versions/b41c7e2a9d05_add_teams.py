@@ -0,0 +1,46 @@
+"""Add teams and team membership
+
+Revision ID: b41c7e2a9d05
+Revises: sfnpwf_dmptf
+Create Date: 2026-10-19 09:12:31.418204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b41c7e2a9d05'
+down_revision: Union[str, Sequence[str], None] = 'sfnpwf_dmptf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('teams',
+    sa.Column('team_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('parent_team_id', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['parent_team_id'], ['teams.team_id'], ),
+    sa.PrimaryKeyConstraint('team_id')
+    )
+    op.create_index('idx_teams_parent', 'teams', ['parent_team_id'], unique=False)
+    op.create_table('team_members',
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('member_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['member_id'], ['members.member_id'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.team_id'], ),
+    sa.PrimaryKeyConstraint('team_id', 'member_id')
+    )
+    op.create_index('idx_team_members_member', 'team_members', ['member_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_team_members_member', table_name='team_members')
+    op.drop_table('team_members')
+    op.drop_index('idx_teams_parent', table_name='teams')
+    op.drop_table('teams')
@@ -0,0 +1,42 @@
+"""Add materialized member_day_capacity table
+
+Revision ID: c83f1d6e4a27
+Revises: b41c7e2a9d05
+Create Date: 2026-10-19 10:41:07.552913
+
+Nach dem Upgrade befüllen: python -m app.services.capacity_facts rebuild
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c83f1d6e4a27'
+down_revision: Union[str, Sequence[str], None] = 'b41c7e2a9d05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('member_day_capacity',
+    sa.Column('sprint_id', sa.Integer(), nullable=False),
+    sa.Column('member_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('auto_state', sa.String(length=20), nullable=False),
+    sa.Column('final_state', sa.Enum('AVAILABLE', 'UNAVAILABLE', 'HALF', name='availabilitystate'), nullable=False),
+    sa.Column('days', sa.Numeric(precision=2, scale=1), nullable=False),
+    sa.Column('hours', sa.Numeric(precision=7, scale=4), nullable=False),
+    sa.PrimaryKeyConstraint('sprint_id', 'member_id', 'day')
+    )
+    op.create_index('idx_member_day_capacity_member_day', 'member_day_capacity', ['member_id', 'day'], unique=False)
+    op.create_index('idx_member_day_capacity_day', 'member_day_capacity', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_member_day_capacity_day', table_name='member_day_capacity')
+    op.drop_index('idx_member_day_capacity_member_day', table_name='member_day_capacity')
+    op.drop_table('member_day_capacity')
@@ -0,0 +1,42 @@
+"""Holiday region hierarchy: is_company_day defaults to regional
+
+Revision ID: d5e2a8f3c914
+Revises: c83f1d6e4a27
+Create Date: 2026-10-19 15:02:44.318027
+
+is_company_day wird ab jetzt ausgewertet (Feiertag für alle Members). Bisher
+stand es für alle Einträge auf True, ohne Wirkung - bestehende Einträge werden
+deshalb auf regional (False) gesetzt, damit sich keine Availability ändert.
+Company Days danach gezielt wieder auf True setzen.
+
+Nationale Feiertage, die je Unterregion dupliziert sind (DE-NW, DE-BY, ...),
+können durch einen Eintrag der Oberregion ("DE") ersetzt werden.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e2a8f3c914'
+down_revision: Union[str, Sequence[str], None] = 'c83f1d6e4a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.text("UPDATE holidays SET is_company_day = :regional").bindparams(regional=False))
+    with op.batch_alter_table('holidays') as batch_op:
+        batch_op.alter_column('is_company_day', existing_type=sa.Boolean(), server_default=sa.false(),
+                              existing_nullable=False)
+    op.create_index('idx_holidays_date_region', 'holidays', ['date', 'region_code'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_holidays_date_region', table_name='holidays')
+    with op.batch_alter_table('holidays') as batch_op:
+        batch_op.alter_column('is_company_day', existing_type=sa.Boolean(), server_default=None,
+                              existing_nullable=False)
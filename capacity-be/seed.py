@@ -8,10 +8,18 @@ Erstellt:
 - Feiertage: DE-NW (Reformationstag), UA
 - PTO: 1 Tag für Alice
 - Roster: beide mit allocation 1.0
+
+Mit --synthetic wird stattdessen ein skalierbarer, deterministischer Datensatz
+erzeugt (siehe app/db/synthetic.py), z.B.:
+
+    python seed.py --synthetic --members 10000 --sprints 200 --seed 42
+    python seed.py --synthetic --database-url sqlite:///./perf.db --create-schema
 """
 
+import argparse
 import sys
 import os
+import time
 from datetime import date, timedelta
 from decimal import Decimal
 
@@ -99,7 +107,7 @@ def create_seed_data():
             date=date(2025, 10, 31),
             region_code="DE-NW",
             name="Reformationstag",
-            is_company_day=True
+            is_company_day=False
         )
         holidays.append(reformationstag)
 
@@ -109,7 +117,7 @@ def create_seed_data():
             date=date(2025, 10, 25),
             region_code="UA",
             name="Tag der Befreiung Kiews",
-            is_company_day=True
+            is_company_day=False
         )
         holidays.append(ua_holiday)
 
@@ -148,6 +156,10 @@ def create_seed_data():
         # Commit all changes
         db.commit()
 
+        # Seed schreibt direkt - Tageskapazität einmal komplett aufbauen
+        from app.services.capacity_facts import rebuild_capacity_facts
+        rebuild_capacity_facts(db)
+
         print("\n🎉 Seed-Daten erfolgreich erstellt!")
         print("\n📊 Zusammenfassung:")
         print(f"   - {db.query(Member).count()} Members")
@@ -165,5 +177,73 @@ def create_seed_data():
         db.close()
 
 
+def create_synthetic_data(args: argparse.Namespace):
+    """Erstelle synthetischen Datensatz gemäß CLI-Parametern"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.db.base import Base
+    from app.db.synthetic import generate_dataset
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    else:
+        from app.db.base import engine
+        session_factory = SessionLocal
+
+    if args.create_schema:
+        Base.metadata.create_all(bind=engine)
+
+    db: Session = session_factory()
+    try:
+        print(f"🌱 Erstelle synthetische Daten (seed={args.seed})...")
+        started = time.perf_counter()
+        counts = generate_dataset(
+            db,
+            members=args.members,
+            regions=args.regions,
+            sprints=args.sprints,
+            roster_size=args.roster_size,
+            parallel_sprints=args.parallel_sprints,
+            sprint_days=args.sprint_days,
+            start_date=date.fromisoformat(args.start_date),
+            override_rate=args.override_rate,
+            seed=args.seed,
+        )
+        elapsed = time.perf_counter() - started
+
+        print(f"\n🎉 Synthetische Daten in {elapsed:.1f}s erstellt:")
+        for table, count in counts.items():
+            print(f"   - {count} {table}")
+        print("   (Tageskapazität aufbauen: python -m app.services.capacity_facts rebuild)")
+    except Exception as e:
+        print(f"❌ Fehler beim Erstellen der synthetischen Daten: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Seed-Daten für den Capacity Planner laden")
+    parser.add_argument("--synthetic", action="store_true", help="Skalierbaren synthetischen Datensatz erzeugen")
+    parser.add_argument("--members", type=int, default=100)
+    parser.add_argument("--regions", type=int, default=4)
+    parser.add_argument("--sprints", type=int, default=10)
+    parser.add_argument("--roster-size", type=int, default=None, help="Members pro Sprint (Default: min(members, 50))")
+    parser.add_argument("--parallel-sprints", type=int, default=1, help="Anzahl paralleler Sprint-Streams")
+    parser.add_argument("--sprint-days", type=int, default=14)
+    parser.add_argument("--start-date", default="2025-01-06", help="Start des ersten Sprints (YYYY-MM-DD)")
+    parser.add_argument("--override-rate", type=float, default=0.01, help="Anteil Member-Tage mit Override")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", default=None, help="Abweichende DB-URL (Default: MYSQL_URL)")
+    parser.add_argument("--create-schema", action="store_true", help="Tabellen vorher per create_all anlegen")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    create_seed_data()
+    cli_args = parse_args()
+    if cli_args.synthetic:
+        create_synthetic_data(cli_args)
+    else:
+        create_seed_data()
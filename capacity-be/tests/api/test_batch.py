@@ -0,0 +1,110 @@
+"""
+Tests für Batch-Requests (POST /batch)
+
+- Sub-Operationen laufen in Reihenfolge mit einer Session; Reads sehen vorherige Writes
+- Fehler einzelner Operationen liefern deren Status, der Rest läuft weiter
+- atomic: Rollback beim ersten Fehler, übrige Operationen nicht ausgeführt
+- Change Events eines atomaren Batches erst nach dessen Commit
+"""
+import asyncio
+
+import pytest
+
+from app.core.events import InProcessBroker, set_broker, sprint_channel
+from app.db.models import SprintRoster
+
+
+def _batch(client, operations, atomic=False):
+    response = client.post("/api/v1/batch", json={"operations": operations, "atomic": atomic})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestBatch:
+    """Test Ausführung, Fehler und Transaktionen"""
+
+    def test_write_then_reads_in_one_round_trip(self, client, db_session, sample_sprint, sample_members):
+        """Test: Roster hinzufügen, dann Roster und Availability lesen"""
+        sprint_id, alice = sample_sprint.sprint_id, sample_members[0].member_id
+        data = _batch(client, [
+            {"id": "add", "method": "POST", "path": f"/sprints/{sprint_id}/roster",
+             "body": {"member_id": alice, "allocation": 1.0}},
+            {"id": "roster", "method": "GET", "path": f"/sprints/{sprint_id}/roster"},
+            {"id": "availability", "method": "GET", "path": f"/sprints/{sprint_id}/availability"},
+            {"id": "sprints", "method": "GET", "path": "/sprints/?limit=10"},
+        ])
+
+        assert data["committed"] is True
+        assert [r["id"] for r in data["results"]] == ["add", "roster", "availability", "sprints"]
+        assert [r["status"] for r in data["results"]] == [200] * 4
+        assert [m["member_id"] for m in data["results"][1]["body"]] == [alice]
+        assert len(data["results"][2]["body"]["members"]) == 1
+
+    def test_failures_are_reported_per_operation(self, client, db_session, sample_sprint, sample_members):
+        """Test: 404/422 einzelner Operationen, nachfolgende Writes laufen trotzdem"""
+        sprint_id, bogdan = sample_sprint.sprint_id, sample_members[1].member_id
+        data = _batch(client, [
+            {"method": "GET", "path": "/sprints/999"},
+            {"method": "POST", "path": f"/sprints/{sprint_id}/roster", "body": {"member_id": bogdan}},
+            {"method": "POST", "path": f"/sprints/{sprint_id}/roster", "body": {"member_id": bogdan, "allocation": 0.5}},
+        ])
+
+        assert [r["status"] for r in data["results"]] == [404, 422, 200]
+        assert data["results"][0]["body"] == {"detail": "Sprint not found"}
+        assert db_session.query(SprintRoster).count() == 1
+
+    def test_atomic_rolls_back_on_failure(self, client, db_session, sample_sprint, sample_members):
+        """Test: atomic - Fehler rollt vorherige Writes zurück, Rest wird übersprungen"""
+        sprint_id = sample_sprint.sprint_id
+        alice, bogdan = sample_members[0].member_id, sample_members[1].member_id
+        data = _batch(client, [
+            {"method": "POST", "path": f"/sprints/{sprint_id}/roster", "body": {"member_id": alice, "allocation": 1.0}},
+            {"method": "GET", "path": "/members/999"},
+            {"id": "late", "method": "POST", "path": f"/sprints/{sprint_id}/roster",
+             "body": {"member_id": bogdan, "allocation": 1.0}},
+        ], atomic=True)
+
+        assert data["committed"] is False
+        assert [r["status"] for r in data["results"]] == [200, 404, 424]
+        assert data["results"][2]["id"] == "late"
+        assert db_session.query(SprintRoster).count() == 0
+
+    def test_atomic_commits_and_publishes_after_commit(self, client, db_session, sample_sprint, sample_members):
+        """Test: atomic - alle Writes committed, Events nach dem Commit des Batches"""
+        sprint_id = sample_sprint.sprint_id
+        broker = InProcessBroker()
+        set_broker(broker)
+        operations = [
+            {"method": "POST", "path": f"/sprints/{sprint_id}/roster", "body": {"member_id": m.member_id, "allocation": 1.0}}
+            for m in sample_members
+        ]
+
+        async def run():
+            subscription = broker.subscribe(sprint_channel(sprint_id))
+            data = await asyncio.to_thread(_batch, client, operations, True)
+            messages = []
+            while (message := await subscription.get(timeout=0.05)) is not None:
+                messages.append(message)
+            subscription.close()
+            return data, messages
+
+        try:
+            data, messages = asyncio.run(run())
+        finally:
+            set_broker(None)
+
+        assert data["committed"] is True
+        assert db_session.query(SprintRoster).count() == 3
+        assert [m["action"] for m in messages] == ["added"] * 3
+
+    @pytest.mark.parametrize("path", ["/batch", "/sprints/1/events", "/availability/export"])
+    def test_unsupported_operations(self, client, db_session, path):
+        """Test: Verschachtelte Batches und Streams werden abgelehnt"""
+        response = client.post("/api/v1/batch", json={"operations": [{"method": "GET", "path": path}]})
+        assert response.status_code == 422
+
+    def test_operation_limit(self, client, db_session, monkeypatch):
+        """Test: Mehr als BATCH_MAX_OPERATIONS → 422"""
+        monkeypatch.setattr("app.api.batch.settings.BATCH_MAX_OPERATIONS", 2)
+        operations = [{"method": "GET", "path": "/members/"}] * 3
+        assert client.post("/api/v1/batch", json={"operations": operations}).status_code == 422
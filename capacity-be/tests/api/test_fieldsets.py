@@ -0,0 +1,99 @@
+"""
+Tests für Sparse Fieldsets und opt-in Statistik (fields= / include=stats)
+
+- Ohne include=stats keine Statistik-Query
+- fields= liefert genau die angefragten Felder und lädt nur deren Spalten
+- Unbekannte Felder/Includes: 422
+"""
+from app.db.models import SprintRoster
+
+
+class TestSprintFieldsets:
+    """Test Sprint-Endpoints"""
+
+    def test_statistics_only_with_include(self, client, db_session, sample_sprint, sample_members):
+        """Test: Statistik ist opt-in"""
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=sample_members[0].member_id,
+                                    allocation=0.5))
+        db_session.commit()
+        url = f"/api/v1/sprints/{sample_sprint.sprint_id}"
+
+        plain = client.get(url).json()
+        with_stats = client.get(url, params={"include": "stats"}).json()
+
+        assert plain["member_count"] is None
+        assert with_stats["member_count"] == 1
+        assert with_stats["working_days"] == 10
+        assert with_stats["total_capacity_hours"] == 40.0
+
+    def test_write_responses_with_include(self, client, db_session, sample_sprint, sample_members):
+        """Test: PATCH/POST mit include=stats liefern die Statistik (Frontend ersetzt den Listeneintrag)"""
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=sample_members[0].member_id,
+                                    allocation=0.5))
+        db_session.commit()
+
+        response = client.patch(f"/api/v1/sprints/{sample_sprint.sprint_id}", params={"include": "stats"},
+                                json={"name": "Umbenannt"})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["name"] == "Umbenannt"
+        assert (data["member_count"], data["working_days"], data["total_capacity_hours"]) == (1, 10, 40.0)
+
+        response = client.post("/api/v1/sprints/", params={"include": "stats"},
+                               json={"name": "Neu", "start_date": "2025-11-10", "end_date": "2025-11-21"})
+        assert response.status_code == 200
+        assert (response.json()["member_count"], response.json()["working_days"]) == (0, 10)
+
+        plain = client.patch(f"/api/v1/sprints/{sample_sprint.sprint_id}", json={"name": "Ohne"}).json()
+        assert plain["member_count"] is None
+
+    def test_fields_projection(self, client, sample_sprint, query_budget):
+        """Test: Nur angefragte Felder, Status aus den Daten berechnet, eine Query"""
+        with query_budget(1):
+            response = client.get(f"/api/v1/sprints/{sample_sprint.sprint_id}", params={"fields": "name,status"})
+
+        assert response.status_code == 200
+        assert response.json() == {"name": sample_sprint.name, "status": "finished"}
+
+    def test_fields_with_stats_in_list(self, client, sample_sprint):
+        """Test: fields und include=stats kombinierbar"""
+        response = client.get("/api/v1/sprints/", params={"fields": "sprint_id", "include": "stats"})
+
+        assert response.json() == [{
+            "sprint_id": sample_sprint.sprint_id,
+            "member_count": 0,
+            "total_capacity_hours": 0.0,
+            "working_days": 10,
+        }]
+
+    def test_unknown_field_or_include(self, client, sample_sprint):
+        """Test: Unbekannte Felder und Includes werden abgelehnt"""
+        url = f"/api/v1/sprints/{sample_sprint.sprint_id}"
+
+        assert client.get(url, params={"fields": "name,password"}).status_code == 422
+        assert client.get(url, params={"include": "everything"}).status_code == 422
+        assert client.get("/api/v1/sprints/999999", params={"fields": "name"}).status_code == 404
+
+
+class TestMemberFieldsets:
+    """Test Member-Endpoints"""
+
+    def test_member_fields(self, client, sample_members):
+        """Test: Projektion inkl. Decimal-Serialisierung wie im Response-Modell"""
+        alice = sample_members[0]
+        full = client.get(f"/api/v1/members/{alice.member_id}").json()
+        sparse = client.get(f"/api/v1/members/{alice.member_id}", params={"fields": "name,employment_ratio"}).json()
+
+        assert sparse == {"name": full["name"], "employment_ratio": full["employment_ratio"]}
+
+    def test_member_list_fields_respects_active(self, client, db_session, sample_members):
+        """Test: Inaktive Members nur mit include_inactive"""
+        sample_members[2].active = False
+        db_session.commit()
+
+        active = client.get("/api/v1/members/", params={"fields": "member_id"}).json()
+        everyone = client.get("/api/v1/members/", params={"fields": "member_id", "include_inactive": True}).json()
+
+        assert len(active) == 2
+        assert len(everyone) == 3
+        assert set(active[0]) == {"member_id"}
@@ -0,0 +1,117 @@
+"""
+Query-Budget Tests für List- und Bulk-Endpoints
+
+Jeder Endpoint muss unabhängig von der Zeilenanzahl mit einer festen
+Anzahl SQL-Statements auskommen (Schutz gegen N+1-Regressionen).
+"""
+import pytest
+from datetime import timedelta
+
+from app.db.models import Sprint, SprintRoster
+
+SMALL = dict(members=4, sprints=2, roster_size=2, override_rate=0.0)
+LARGE = dict(members=40, sprints=15, roster_size=25, override_rate=0.1)
+# Pflege von member_day_capacity je Schreibvorgang: Delete, Sprints, Sprint+Roster+Feiertage+PTO+Overrides, Insert
+FACT_REFRESH = 8
+
+
+def _first_sprint(db_session):
+    return db_session.query(Sprint).order_by(Sprint.sprint_id).first()
+
+
+def _roster_member_ids(db_session, sprint_id):
+    return [m for (m,) in db_session.query(SprintRoster.member_id).filter(SprintRoster.sprint_id == sprint_id)]
+
+
+def _measure(client, query_budget, budget, method, url, **kwargs):
+    """Request ausführen, Budget prüfen und Anzahl Statements liefern"""
+    with query_budget(budget) as counter:
+        response = client.request(method, url, **kwargs)
+    assert response.status_code == 200, response.text
+    return counter.count
+
+
+class TestQueryBudgets:
+    """Feste Query-Anzahl für List- und Bulk-Endpoints"""
+
+    @pytest.mark.parametrize("url, budget", [
+        ("/api/v1/members/", 1),
+        ("/api/v1/members/?include_inactive=true", 1),
+        ("/api/v1/sprints/", 1),
+        ("/api/v1/sprints/?include=stats", 2),  # Sprints, gruppierte Statistik (read-only: kein Status-UPDATE)
+        ("/api/v1/sprints/?fields=sprint_id,name&include=stats", 2),
+        ("/api/v1/members/?fields=member_id,name", 1),
+        ("/api/v1/pto/", 1),
+    ])
+    def test_list_endpoints(self, db_session, client, synthetic_dataset, query_budget, url, budget):
+        """Test: List-Endpoints brauchen bei kleinen und großen Daten gleich viele Queries"""
+        synthetic_dataset(seed=1, **SMALL)
+        small = _measure(client, query_budget, budget, "GET", url)
+
+        synthetic_dataset(seed=2, **LARGE)
+        large = _measure(client, query_budget, budget, "GET", url)
+
+        assert small == large
+
+    @pytest.mark.parametrize("path, budget", [
+        ("/roster", 1),
+        ("/availability", 5),  # Sprint, Roster+Member, Feiertage, PTO, Overrides
+    ])
+    def test_sprint_scoped_endpoints(self, db_session, client, synthetic_dataset, query_budget, path, budget):
+        """Test: Roster und Availability-Matrix unabhängig von der Roster-Größe"""
+        synthetic_dataset(seed=1, **SMALL)
+        small = _measure(client, query_budget, budget, "GET", f"/api/v1/sprints/{_first_sprint(db_session).sprint_id}{path}")
+
+        db_session.query(SprintRoster).delete()
+        db_session.query(Sprint).delete()
+        db_session.commit()
+        synthetic_dataset(seed=2, **LARGE)
+        large = _measure(client, query_budget, budget, "GET", f"/api/v1/sprints/{_first_sprint(db_session).sprint_id}{path}")
+
+        assert small == large
+
+    def test_pto_filtered_by_sprint(self, db_session, client, synthetic_dataset, query_budget):
+        """Test: PTO-Filter nach Sprint lädt den Sprint einmal, nicht je Eintrag"""
+        synthetic_dataset(seed=3, **LARGE)
+        sprint_id = _first_sprint(db_session).sprint_id
+
+        count = _measure(client, query_budget, 2, "GET", f"/api/v1/pto/?sprint_id={sprint_id}&limit=1000")
+
+        assert count == 2
+
+    def test_bulk_override_endpoint(self, db_session, client, synthetic_dataset, query_budget):
+        """Test: Bulk-Override validiert und schreibt mit fester Query-Anzahl"""
+        synthetic_dataset(seed=4, override_rate=0.0, **{k: v for k, v in LARGE.items() if k != "override_rate"})
+        sprint = _first_sprint(db_session)
+        member_ids = _roster_member_ids(db_session, sprint.sprint_id)
+        url = f"/api/v1/sprints/{sprint.sprint_id}/availability/bulk"
+
+        def items(members, days, state):
+            return [
+                {"member_id": m, "day": (sprint.start_date + timedelta(days=d)).isoformat(), "state": state}
+                for m in members for d in range(days)
+            ]
+
+        budget = 5 + FACT_REFRESH
+
+        # Neue Overrides, Updates, Löschungen - jeweils klein und groß
+        small_insert = _measure(client, query_budget, budget, "PATCH", url, json=items(member_ids[:1], 1, "half"))
+        large_insert = _measure(client, query_budget, budget, "PATCH", url, json=items(member_ids[1:], 5, "half"))
+        large_update = _measure(client, query_budget, budget, "PATCH", url, json=items(member_ids[1:], 5, "unavailable"))
+        large_delete = _measure(client, query_budget, budget, "PATCH", url, json=items(member_ids[1:], 5, None))
+
+        assert small_insert == large_insert
+        assert large_update <= budget and large_delete <= budget
+
+    def test_bulk_override_validation_errors(self, db_session, client, synthetic_dataset, query_budget):
+        """Test: Ungültige Einträge (außerhalb Sprint/Roster) kosten keine Queries pro Item"""
+        synthetic_dataset(seed=5, **SMALL)
+        sprint = _first_sprint(db_session)
+        outside = (sprint.end_date + timedelta(days=1)).isoformat()
+        payload = [{"member_id": 999_000 + i, "day": sprint.start_date.isoformat(), "state": "half"} for i in range(20)]
+        payload += [{"member_id": _roster_member_ids(db_session, sprint.sprint_id)[0], "day": outside, "state": "half"}]
+
+        with query_budget(5):
+            response = client.patch(f"/api/v1/sprints/{sprint.sprint_id}/availability/bulk", json=payload)
+
+        assert response.json()["error_count"] == 21
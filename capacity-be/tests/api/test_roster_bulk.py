@@ -0,0 +1,146 @@
+"""
+Tests für Bulk-Roster (POST /sprints/{id}/roster/bulk, PUT /sprints/{id}/roster)
+
+- Hinzufügen/Aktualisieren/Entfernen vieler Members in einer Transaktion
+- Ergebnis je Zeile; ungültige Zeilen werden übersprungen
+- Feste Query-Anzahl unabhängig von der Anzahl Einträge
+"""
+from datetime import date
+
+from app.core.config import settings
+from app.db.crud.sprints import calculate_status_from_dates
+from app.db.models import Member, MemberDayCapacity, SprintRoster
+
+
+def _roster(db_session, sprint_id):
+    db_session.expire_all()
+    return {
+        r.member_id: (float(r.allocation), r.assignment_from, r.assignment_to)
+        for r in db_session.query(SprintRoster).filter(SprintRoster.sprint_id == sprint_id)
+    }
+
+
+class TestRosterBulk:
+    """Test Bulk-Änderungen und Replace"""
+
+    def test_add_update_remove(self, client, db_session, sample_sprint, sample_members):
+        """Test: Gemischte Aktionen in einem Request"""
+        alice, bogdan, carol = (m.member_id for m in sample_members)
+        db_session.add_all([
+            SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=bogdan, allocation=1.0),
+            SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=carol, allocation=1.0),
+        ])
+        db_session.commit()
+
+        response = client.post(f"/api/v1/sprints/{sample_sprint.sprint_id}/roster/bulk", json=[
+            {"member_id": alice, "action": "add", "allocation": 0.5, "assignment_from": "2025-10-29"},
+            {"member_id": bogdan, "action": "update", "allocation": 0.25},
+            {"member_id": carol, "action": "remove"},
+        ])
+
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert [r["status"] for r in data["results"]] == ["added", "updated", "removed"]
+        assert data["success_count"] == 3 and data["error_count"] == 0
+        assert _roster(db_session, sample_sprint.sprint_id) == {
+            alice: (0.5, date(2025, 10, 29), None),
+            bogdan: (0.25, None, None),
+        }
+        # Tageskapazität für alle betroffenen Members gepflegt
+        facts = db_session.query(MemberDayCapacity.member_id).filter(
+            MemberDayCapacity.sprint_id == sample_sprint.sprint_id
+        ).distinct().all()
+        assert {m for (m,) in facts} == {alice, bogdan}
+
+    def test_invalid_rows_are_reported(self, client, db_session, sample_sprint, sample_members):
+        """Test: Fehler je Zeile, gültige Zeilen werden trotzdem geschrieben"""
+        alice, bogdan, carol = (m.member_id for m in sample_members)
+
+        response = client.post(f"/api/v1/sprints/{sample_sprint.sprint_id}/roster/bulk", json=[
+            {"member_id": alice, "allocation": 1.0},
+            {"member_id": alice, "allocation": 0.5},
+            {"member_id": bogdan, "action": "update", "allocation": 0.5},
+            {"member_id": carol, "allocation": 1.0, "assignment_to": "2025-12-01"},
+            {"member_id": 999999, "allocation": 1.0},
+        ])
+
+        results = response.json()["results"]
+        assert [r["status"] for r in results] == ["added", "error", "error", "error", "error"]
+        assert "more than once" in results[1]["error"]
+        assert "not assigned" in results[2]["error"]
+        assert "after sprint end" in results[3]["error"]
+        assert "not found" in results[4]["error"]
+        assert set(_roster(db_session, sample_sprint.sprint_id)) == {alice}
+
+    def test_updates_checked_against_stored_values(self, client, db_session, sample_sprint, sample_members):
+        """Test: allocation null und Fenster gegen gespeicherte Werte sind Zeilenfehler, kein 400"""
+        alice, bogdan, carol = (m.member_id for m in sample_members)
+        db_session.add_all([
+            SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=member_id, allocation=1.0,
+                         assignment_from=date(2025, 11, 3))
+            for member_id in (alice, bogdan, carol)
+        ])
+        db_session.commit()
+
+        response = client.post(f"/api/v1/sprints/{sample_sprint.sprint_id}/roster/bulk", json=[
+            {"member_id": alice, "action": "update", "allocation": None},
+            {"member_id": bogdan, "action": "update", "assignment_to": "2025-10-30"},
+            {"member_id": carol, "action": "update", "assignment_from": None, "assignment_to": "2025-10-30"},
+        ])
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["status"] for r in results] == ["error", "error", "updated"]
+        assert "Allocation is required" in results[0]["error"]
+        assert "Assignment end must be >=" in results[1]["error"]
+        roster = _roster(db_session, sample_sprint.sprint_id)
+        assert roster[alice] == (1.0, date(2025, 11, 3), None)
+        assert roster[bogdan] == (1.0, date(2025, 11, 3), None)
+        assert roster[carol] == (1.0, None, date(2025, 10, 30))
+
+    def test_replace_roster(self, client, db_session, sample_sprint, sample_members):
+        """Test: PUT ersetzt das Roster (inkl. Zurücksetzen des Assignment-Fensters)"""
+        alice, bogdan, carol = (m.member_id for m in sample_members)
+        db_session.add_all([
+            SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=alice, allocation=1.0,
+                         assignment_from=date(2025, 10, 28)),
+            SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=bogdan, allocation=1.0),
+        ])
+        db_session.commit()
+
+        response = client.put(f"/api/v1/sprints/{sample_sprint.sprint_id}/roster", json=[
+            {"member_id": alice, "allocation": 0.8},
+            {"member_id": carol, "allocation": 0.5},
+        ])
+
+        assert response.status_code == 200, response.text
+        statuses = {r["member_id"]: r["status"] for r in response.json()["results"]}
+        assert statuses == {alice: "updated", carol: "added", bogdan: "removed"}
+        assert _roster(db_session, sample_sprint.sprint_id) == {alice: (0.8, None, None), carol: (0.5, None, None)}
+
+    def test_unknown_sprint(self, client, sample_members):
+        """Test: 404 für unbekannten Sprint"""
+        response = client.post("/api/v1/sprints/999999/roster/bulk", json=[{"member_id": 1, "allocation": 1.0}])
+
+        assert response.status_code == 404
+
+    def test_fixed_query_count(self, client, db_session, sample_sprint, query_budget, monkeypatch):
+        """Test: 5 oder 300 Members - gleich viele Queries"""
+        # Feiertagskalender in beiden Requests laden (sonst spart nur der zweite die Query)
+        monkeypatch.setattr(settings, "HOLIDAY_CACHE_SECONDS", 0)
+        members = [Member(name=f"Member {i:03d}", employment_ratio=1.0, region_code="DE") for i in range(300)]
+        db_session.add_all(members)
+        # Status vorab angleichen, sonst schreibt nur der erste Request ein Status-UPDATE
+        sample_sprint.status = calculate_status_from_dates(sample_sprint.start_date, sample_sprint.end_date)
+        db_session.commit()
+        member_ids = [m.member_id for m in members]
+        url = f"/api/v1/sprints/{sample_sprint.sprint_id}/roster/bulk"
+
+        def measure(batch):
+            payload = [{"member_id": member_id, "allocation": 1.0} for member_id in batch]
+            with query_budget(30) as counter:
+                response = client.post(url, json=payload)
+            assert response.json()["error_count"] == 0
+            return counter.count
+
+        assert measure(member_ids[:5]) == measure(member_ids[5:])
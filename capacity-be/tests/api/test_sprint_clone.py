@@ -0,0 +1,109 @@
+"""
+Tests für Sprint-Kopien (POST /sprints/{id}/clone, POST /sprints/{id}/next)
+
+- Roster wird set-basiert (INSERT ... SELECT) übernommen
+- Assignment-Fenster und Overrides werden verschoben und auf den neuen Sprint begrenzt
+- Folgesprint: gleiche Länge, gleiche Wochentage, Name nach Kalenderwochen
+"""
+from datetime import date
+
+from app.db.models import AvailabilityOverride, AvailabilityState, MemberDayCapacity, Sprint, SprintRoster
+
+
+def _roster(db_session, sprint_id):
+    return {
+        r.member_id: (float(r.allocation), r.assignment_from, r.assignment_to)
+        for r in db_session.query(SprintRoster).filter(SprintRoster.sprint_id == sprint_id)
+    }
+
+
+def _seed_roster(db_session, sprint, members):
+    alice, bogdan, carol = members
+    db_session.add_all([
+        SprintRoster(sprint_id=sprint.sprint_id, member_id=alice.member_id, allocation=1.0),
+        SprintRoster(sprint_id=sprint.sprint_id, member_id=bogdan.member_id, allocation=0.5,
+                     assignment_from=date(2025, 10, 29), assignment_to=date(2025, 11, 5)),
+        SprintRoster(sprint_id=sprint.sprint_id, member_id=carol.member_id, allocation=0.8,
+                     assignment_to=date(2025, 11, 7)),
+        AvailabilityOverride(sprint_id=sprint.sprint_id, member_id=alice.member_id, day=date(2025, 10, 31),
+                             state=AvailabilityState.HALF, reason="Jour fixe"),
+        AvailabilityOverride(sprint_id=sprint.sprint_id, member_id=alice.member_id, day=date(2025, 11, 7),
+                             state=AvailabilityState.UNAVAILABLE),
+    ])
+    db_session.commit()
+
+
+class TestSprintClone:
+    """Test Clone und Folgesprint"""
+
+    def test_next_sprint(self, client, db_session, sample_sprint, sample_members):
+        """Test: Folgesprint mit verschobenen Fenstern und Overrides"""
+        _seed_roster(db_session, sample_sprint, sample_members)
+        alice, bogdan, carol = (m.member_id for m in sample_members)
+
+        response = client.post(f"/api/v1/sprints/{sample_sprint.sprint_id}/next", json={"copy_overrides": True})
+
+        assert response.status_code == 200, response.text
+        data = response.json()
+        assert (data["name"], data["start_date"], data["end_date"]) == ("Sprint W46-47 2025", "2025-11-10", "2025-11-21")
+        assert data["member_count"] == 3
+        assert _roster(db_session, data["sprint_id"]) == {
+            alice: (1.0, None, None),
+            bogdan: (0.5, date(2025, 11, 12), date(2025, 11, 19)),
+            carol: (0.8, None, date(2025, 11, 21)),
+        }
+        overrides = db_session.query(AvailabilityOverride).filter(
+            AvailabilityOverride.sprint_id == data["sprint_id"]
+        ).order_by(AvailabilityOverride.day).all()
+        assert [(o.day, o.state, o.reason) for o in overrides] == [
+            (date(2025, 11, 14), AvailabilityState.HALF, "Jour fixe"),
+            (date(2025, 11, 21), AvailabilityState.UNAVAILABLE, None),
+        ]
+        # Tageskapazität des neuen Sprints materialisiert
+        assert db_session.query(MemberDayCapacity).filter(MemberDayCapacity.sprint_id == data["sprint_id"]).count() == 36
+
+    def test_clone_into_shorter_sprint(self, client, db_session, sample_sprint, sample_members):
+        """Test: Fenster werden auf den neuen Zeitraum begrenzt, Overrides außerhalb entfallen"""
+        _seed_roster(db_session, sample_sprint, sample_members)
+        bogdan, carol = sample_members[1].member_id, sample_members[2].member_id
+
+        response = client.post(f"/api/v1/sprints/{sample_sprint.sprint_id}/clone", json={
+            "name": "Kurzsprint", "start_date": "2025-12-01", "end_date": "2025-12-05", "copy_overrides": True,
+        })
+
+        new_id = response.json()["sprint_id"]
+        roster = _roster(db_session, new_id)
+        assert roster[bogdan] == (0.5, date(2025, 12, 3), date(2025, 12, 5))
+        assert roster[carol] == (0.8, None, date(2025, 12, 5))
+        days = [o.day for o in db_session.query(AvailabilityOverride).filter(AvailabilityOverride.sprint_id == new_id)]
+        assert days == [date(2025, 12, 5)]
+
+    def test_clone_without_windows(self, client, db_session, sample_sprint, sample_members):
+        """Test: Ohne shift_assignment_windows gilt der ganze Sprint, ohne copy_overrides keine Overrides"""
+        _seed_roster(db_session, sample_sprint, sample_members)
+
+        response = client.post(f"/api/v1/sprints/{sample_sprint.sprint_id}/next",
+                               json={"name": "Sprint X", "shift_assignment_windows": False})
+
+        new_id = response.json()["sprint_id"]
+        assert {entry[1:] for entry in _roster(db_session, new_id).values()} == {(None, None)}
+        assert db_session.query(AvailabilityOverride).filter(AvailabilityOverride.sprint_id == new_id).count() == 0
+
+    def test_errors(self, client, sample_sprint):
+        """Test: Unbekannter Sprint und Zeitraum ohne Werktag"""
+        assert client.post("/api/v1/sprints/999999/next", json={}).status_code == 404
+        response = client.post(f"/api/v1/sprints/{sample_sprint.sprint_id}/clone", json={
+            "name": "Wochenende", "start_date": "2025-12-06", "end_date": "2025-12-07",
+        })
+        assert response.status_code == 422
+
+    def test_next_sprint_for_large_team_is_set_based(self, client, db_session, synthetic_dataset, query_budget):
+        """Test: Roster-Größe ändert die Anzahl Statements nicht"""
+        synthetic_dataset(seed=7, members=300, sprints=2, roster_size=300, override_rate=0.05)
+        sprint_ids = [s for (s,) in db_session.query(Sprint.sprint_id).order_by(Sprint.sprint_id)]
+
+        with query_budget(30):
+            response = client.post(f"/api/v1/sprints/{sprint_ids[0]}/next", json={"copy_overrides": True})
+
+        assert response.status_code == 200, response.text
+        assert response.json()["member_count"] == 300
@@ -0,0 +1,115 @@
+"""
+Tests für Sprint-Serien (POST /sprints/series)
+
+- Zeiträume im Werktagskalender, feste Kadenz oder direkt im Anschluss
+- Überschneidungen (innerhalb der Serie und mit bestehenden Sprints) werden abgelehnt
+- Roster-Template aus bestehendem Sprint oder als Liste
+"""
+from datetime import date
+
+import pytest
+
+from app.db.crud.sprints import sprint_series_dates
+from app.db.models import Sprint, SprintRoster, MemberDayCapacity
+
+
+class TestSprintSeriesDates:
+    """Test Datumsberechnung"""
+
+    def test_back_to_back(self):
+        """Test: Start am Wochenende rückt auf Montag, Folgesprints direkt im Anschluss"""
+        ranges = sprint_series_dates(date(2026, 1, 3), 3, 10)
+
+        assert ranges == [
+            (date(2026, 1, 5), date(2026, 1, 16)),
+            (date(2026, 1, 19), date(2026, 1, 30)),
+            (date(2026, 2, 2), date(2026, 2, 13)),
+        ]
+
+    def test_cadence_with_gap(self):
+        """Test: Kadenz 3 Wochen, 8 Werktage - Sprints enden mittwochs"""
+        ranges = sprint_series_dates(date(2026, 1, 5), 2, 8, cadence_weeks=3)
+
+        assert ranges == [(date(2026, 1, 5), date(2026, 1, 14)), (date(2026, 1, 26), date(2026, 2, 4))]
+
+
+class TestSprintSeriesEndpoint:
+    """Test Endpoint"""
+
+    def test_series_with_template_roster(self, client, db_session, sample_sprint, sample_members):
+        """Test: 26 Sprints mit Roster aus einem bestehenden Sprint"""
+        db_session.add_all([
+            SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=m.member_id, allocation=0.5)
+            for m in sample_members
+        ])
+        db_session.commit()
+
+        response = client.post("/api/v1/sprints/series", json={
+            "start_date": "2026-01-05", "count": 26, "cadence_weeks": 2,
+            "name_pattern": "Sprint {n:02d} ({weeks})", "roster_from_sprint_id": sample_sprint.sprint_id,
+        })
+
+        assert response.status_code == 200, response.text
+        sprints = response.json()
+        assert len(sprints) == 26
+        assert sprints[0]["name"] == "Sprint 01 (W02-03)"
+        assert (sprints[-1]["start_date"], sprints[-1]["end_date"]) == ("2026-12-21", "2027-01-01")
+        assert {s["member_count"] for s in sprints} == {3}
+        assert sprints[0]["status"] == "finished"
+        new_ids = [s["sprint_id"] for s in sprints]
+        assert db_session.query(SprintRoster).filter(SprintRoster.sprint_id.in_(new_ids)).count() == 78
+        assert db_session.query(MemberDayCapacity).filter(MemberDayCapacity.sprint_id.in_(new_ids)).count() > 0
+
+    def test_explicit_roster_and_default_names(self, client, db_session, sample_members):
+        """Test: Roster als Liste, Default-Name nach Kalenderwochen"""
+        alice = sample_members[0].member_id
+
+        response = client.post("/api/v1/sprints/series", json={
+            "start_date": "2027-03-01", "count": 2, "roster": [{"member_id": alice, "allocation": 0.8}],
+        })
+
+        sprints = response.json()
+        assert [s["name"] for s in sprints] == ["Sprint W09-10 2027", "Sprint W11-12 2027"]
+        assert [s["status"] for s in sprints] == ["planned", "planned"]
+        assert [s["total_capacity_hours"] for s in sprints] == [64.0, 64.0]
+
+    def test_overlaps_rejected(self, client, db_session, sample_sprint):
+        """Test: Überschneidung mit bestehendem Sprint und innerhalb der Serie"""
+        existing = client.post("/api/v1/sprints/series", json={"start_date": "2025-11-03", "count": 2})
+        assert existing.status_code == 422
+        assert "Sample Sprint" in existing.json()["detail"]
+
+        inner = client.post("/api/v1/sprints/series", json={
+            "start_date": "2026-01-05", "count": 2, "cadence_weeks": 1,
+        })
+        assert inner.status_code == 422
+        assert db_session.query(Sprint).count() == 1
+
+        allowed = client.post("/api/v1/sprints/series", json={
+            "start_date": "2025-11-03", "count": 2, "allow_overlap": True,
+        })
+        assert allowed.status_code == 200
+
+    @pytest.mark.parametrize("pattern", [
+        "Sprint {foo}", "Sprint {}", "Sprint {0}", "Sprint {n.real}", "Sprint {n.__class__}", "Sprint {start[0]}",
+        "Sprint {n!r}", "Sprint {n:>100000000}", "Sprint {n:,}", "Sprint {weeks:>9}", "Sprint {n:{n}}", "Sprint {",
+    ])
+    def test_invalid_name_pattern(self, client, pattern):
+        """Test: Nur bekannte Platzhalter mit kleiner Format-Auswahl, alles andere 422"""
+        response = client.post("/api/v1/sprints/series", json={
+            "start_date": "2026-01-05", "count": 1, "name_pattern": pattern,
+        })
+        assert response.status_code == 422
+        assert "Invalid name_pattern" in response.json()["detail"]
+
+    def test_invalid_input(self, client, sample_members):
+        """Test: Unbekannter Platzhalter, unbekannter Member, unbekannter Template-Sprint"""
+        assert client.post("/api/v1/sprints/series", json={
+            "start_date": "2026-01-05", "count": 1, "name_pattern": "Sprint {foo}",
+        }).status_code == 422
+        assert client.post("/api/v1/sprints/series", json={
+            "start_date": "2026-01-05", "count": 1, "roster": [{"member_id": 999999, "allocation": 1.0}],
+        }).status_code == 422
+        assert client.post("/api/v1/sprints/series", json={
+            "start_date": "2026-01-05", "count": 1, "roster_from_sprint_id": 999999,
+        }).status_code == 404
@@ -0,0 +1,29 @@
+"""
+Tests für den Baseline-Vergleich der Benchmark Suite
+"""
+from benchmarks.run import compare_to_baseline
+
+
+def _report(**medians):
+    return {"results": {name: {"median_ms": value} for name, value in medians.items()}}
+
+
+class TestBenchmarkBaseline:
+    """Test Regressionserkennung gegen gespeicherte Baseline"""
+
+    def test_regression_above_threshold(self):
+        """Test: Median über Baseline * (1 + threshold) gilt als Regression"""
+        baseline = _report(availability=10.0, bulk_override=100.0)
+        report = _report(availability=13.0, bulk_override=120.0)
+
+        rows = {row["name"]: row for row in compare_to_baseline(report, baseline, threshold=0.25)}
+
+        assert rows["availability"]["regression"] is True
+        assert rows["bulk_override"]["regression"] is False
+        assert rows["availability"]["ratio"] == 1.3
+
+    def test_unknown_benchmarks_are_skipped(self):
+        """Test: Benchmarks ohne Baseline-Eintrag werden nicht verglichen"""
+        rows = compare_to_baseline(_report(new_case=5.0), _report(availability=10.0), threshold=0.25)
+
+        assert rows == []
@@ -11,8 +11,12 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.db.base import get_db, Base
+from app.db.base import get_db, Base, current_batch_session
+from app.db.session import get_read_db, mark_read_only
 from app.db.models import Member, Sprint, SprintRoster, PTO, AvailabilityOverride, Holiday
+from app.db.synthetic import generate_dataset
+from app.services.holiday_calendar import clear_holiday_calendars
+from tests.query_budget import assert_max_queries
 
 
 # Test Database Setup (SQLite in Memory)
@@ -28,6 +32,9 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engin
 
 def override_get_db():
     """Database dependency override für Tests"""
+    if current_batch_session() is not None:
+        yield current_batch_session()
+        return
     try:
         db = TestingSessionLocal()
         yield db
@@ -35,7 +42,20 @@ def override_get_db():
         db.close()
 
 
+def override_get_read_db():
+    """Read-only Session (wie Replica-Reads) auf der Test-Datenbank"""
+    if current_batch_session() is not None:
+        yield current_batch_session()
+        return
+    try:
+        db = mark_read_only(TestingSessionLocal())
+        yield db
+    finally:
+        db.close()
+
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_read_db
 
 
 @pytest.fixture(scope="function")
@@ -52,6 +72,8 @@ def db_session():
         db.close()
         # Drop tables after test
         Base.metadata.drop_all(bind=engine)
+        # Prozess-Caches gehören zur gelöschten Datenbank
+        clear_holiday_calendars()
 
 
 @pytest.fixture(scope="function")
@@ -129,3 +151,21 @@ def sample_holidays(db_session):
     db_session.commit()
 
     return holidays
+
+
+@pytest.fixture(scope="function")
+def synthetic_dataset(db_session):
+    """Factory-Fixture für skalierbare synthetische Datensätze (siehe app/db/synthetic.py)"""
+    def _generate(**kwargs):
+        return generate_dataset(db_session, **kwargs)
+
+    return _generate
+
+
+@pytest.fixture(scope="function")
+def query_budget():
+    """Context-Manager-Fixture: query_budget(n) prüft max. n SQL-Statements gegen die Test-DB"""
+    def _budget(budget: int):
+        return assert_max_queries(engine, budget)
+
+    return _budget
@@ -0,0 +1,202 @@
+"""
+Tests für Change Events (SSE je Sprint)
+
+- Events werden erst nach dem Commit veröffentlicht, bei Rollback verworfen
+- Schreibpfade (Overrides, Roster, PTO) melden kompakte Events an betroffene Sprints
+- Volle Abonnenten-Queues führen zu einem `resync`
+- SSE-Stream: `ready`, Events, Heartbeats bis zum Disconnect
+"""
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.api.events import format_sse, sprint_event_stream
+from app.core.events import EventBroker, InProcessBroker, queue_event, set_broker, sprint_channel
+from app.db.crud.pto import create_pto, delete_pto, update_pto
+from app.db.crud.sprint_roster import add_member_to_sprint, remove_member_from_sprint
+from app.db.models import AvailabilityState, SprintRoster
+from app.schemas.schemas import AvailabilityOverridePatch, PTOCreate, SprintRosterCreate
+from app.services.availability import AvailabilityService
+
+
+@pytest.fixture
+def broker():
+    """Frischer In-Process-Broker je Test"""
+    broker = InProcessBroker(queue_size=5)
+    set_broker(broker)
+    yield broker
+    set_broker(None)
+
+
+def _collect(broker, sprint_id, write):
+    """Channel abonnieren, Schreibpfad ausführen, zugestellte Events einsammeln"""
+    async def run():
+        subscription = broker.subscribe(sprint_channel(sprint_id))
+        try:
+            write()
+            messages = []
+            while (message := await subscription.get(timeout=0.05)) is not None:
+                messages.append(message)
+            return messages
+        finally:
+            subscription.close()
+
+    return asyncio.run(run())
+
+
+class _Request:
+    """Request-Stub: nach `connected_polls` Abfragen getrennt"""
+
+    def __init__(self, connected_polls: int):
+        self.polls = connected_polls
+
+    async def is_disconnected(self) -> bool:
+        self.polls -= 1
+        return self.polls < 0
+
+
+class TestChangeEvents:
+    """Test Veröffentlichung und Fan-out"""
+
+    def test_published_after_commit_only(self, db_session, broker, sample_sprint):
+        """Test: Vor dem Commit nichts, nach dem Commit zugestellt, Rollback verwirft"""
+        def write():
+            queue_event(db_session, sample_sprint.sprint_id, "roster", action="added", member_id=1)
+            assert broker.subscriber_count(sprint_channel(sample_sprint.sprint_id)) == 1
+            db_session.rollback()
+            queue_event(db_session, sample_sprint.sprint_id, "roster", action="removed", member_id=1)
+            db_session.commit()
+
+        messages = _collect(broker, sample_sprint.sprint_id, write)
+
+        assert [m["action"] for m in messages] == ["removed"]
+        assert messages[0]["sprint_id"] == sample_sprint.sprint_id and "id" in messages[0]
+        assert broker.subscriber_count(sprint_channel(sample_sprint.sprint_id)) == 0
+
+    def test_override_and_roster_events(self, db_session, broker, sample_sprint, sample_members):
+        """Test: Einzel-/Bulk-Override und Roster-Änderungen als kompakte Events"""
+        alice = sample_members[0]
+        service = AvailabilityService(db_session)
+
+        def write():
+            add_member_to_sprint(db_session, sample_sprint.sprint_id, SprintRosterCreate(member_id=alice.member_id, allocation=1.0))
+            service.set_availability_override(sample_sprint.sprint_id, alice.member_id, date(2025, 10, 28),
+                                              AvailabilityState.HALF)
+            service.apply_availability_overrides(sample_sprint.sprint_id, [
+                AvailabilityOverridePatch(member_id=alice.member_id, day=date(2025, 10, 28), state=None),
+                AvailabilityOverridePatch(member_id=alice.member_id, day=date(2025, 10, 29), state=None),
+            ])
+            remove_member_from_sprint(db_session, sample_sprint.sprint_id, alice.member_id)
+
+        messages = _collect(broker, sample_sprint.sprint_id, write)
+
+        assert [m["type"] for m in messages] == ["roster", "overrides", "overrides", "roster"]
+        assert messages[0]["action"] == "added" and messages[0]["allocation"] == 1.0
+        assert messages[1]["changes"] == [{"member_id": alice.member_id, "day": "2025-10-28", "state": "half"}]
+        # Nur tatsächlich gelöschte Overrides
+        assert messages[2]["changes"] == [{"member_id": alice.member_id, "day": "2025-10-28", "state": None}]
+        assert messages[3]["action"] == "removed"
+
+    def test_pto_events_reach_affected_sprints(self, db_session, broker, sample_sprint, sample_members):
+        """Test: PTO erzeugt Events nur für Sprints mit dem Member im Roster"""
+        alice, bogdan = sample_members[:2]
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=alice.member_id, allocation=1.0))
+        db_session.commit()
+
+        def write():
+            pto = create_pto(db_session, PTOCreate(member_id=alice.member_id, from_date=date(2025, 11, 3),
+                                                   to_date=date(2025, 11, 4)))
+            create_pto(db_session, PTOCreate(member_id=bogdan.member_id, from_date=date(2025, 11, 3),
+                                             to_date=date(2025, 11, 4)))
+            create_pto(db_session, PTOCreate(member_id=alice.member_id, from_date=date(2025, 12, 1),
+                                             to_date=date(2025, 12, 2)))
+            delete_pto(db_session, pto.pto_id)
+
+        messages = _collect(broker, sample_sprint.sprint_id, write)
+
+        assert [(m["type"], m["action"]) for m in messages] == [("pto", "created"), ("pto", "deleted")]
+        assert messages[0]["member_id"] == alice.member_id and messages[0]["from_date"] == "2025-11-03"
+
+    def test_pto_update_within_sprint_publishes_once(self, db_session, broker, sample_sprint, sample_members):
+        """Test: PTO-Update im selben Sprint - alter und neuer Zeitraum ergeben ein Event (neuer Zeitraum)"""
+        alice = sample_members[0]
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=alice.member_id, allocation=1.0))
+        db_session.commit()
+        pto = create_pto(db_session, PTOCreate(member_id=alice.member_id, from_date=date(2025, 11, 3),
+                                               to_date=date(2025, 11, 4)))
+
+        messages = _collect(broker, sample_sprint.sprint_id, lambda: update_pto(
+            db_session, pto.pto_id, {"to_date": date(2025, 11, 5)}
+        ))
+
+        assert [(m["type"], m["action"]) for m in messages] == [("pto", "updated")]
+        assert messages[0]["to_date"] == "2025-11-05"
+
+    def test_closed_loop_subscriber_is_dropped(self, broker):
+        """Test: Abonnent mit beendetem Event Loop wird entfernt, die übrigen erhalten das Event"""
+        channel = sprint_channel(7)
+
+        async def subscribe():
+            return broker.subscribe(channel)
+
+        dead = asyncio.run(subscribe())  # Loop ist danach geschlossen
+
+        async def run():
+            alive = broker.subscribe(channel)
+            try:
+                broker.publish(channel, {"id": 1, "type": "roster", "sprint_id": 7})
+                return await alive.get(timeout=0.05)
+            finally:
+                alive.close()
+
+        assert asyncio.run(run())["id"] == 1
+        assert dead.loop.is_closed()
+        assert broker.subscriber_count(channel) == 0
+
+    def test_full_queue_resyncs(self, db_session, broker, sample_sprint):
+        """Test: Mehr Events als Queue-Plätze → Rückstand verworfen, ein `resync`"""
+        def write():
+            for i in range(6):
+                queue_event(db_session, sample_sprint.sprint_id, "roster", action="updated", member_id=i)
+            db_session.commit()
+
+        assert _collect(broker, sample_sprint.sprint_id, write) == [{"type": "resync"}]
+
+    def test_incomplete_broker_cannot_be_instantiated(self):
+        """Test: Eigener Broker ohne unsubscribe() scheitert bei der Instanziierung, nicht beim ersten Aufruf"""
+        class HalfBroker(EventBroker):
+            def publish(self, channel, message):
+                pass
+
+            def subscribe(self, channel):
+                pass
+
+        with pytest.raises(TypeError):
+            HalfBroker()
+
+
+class TestEventStream:
+    """Test SSE-Stream und Endpoint"""
+
+    def test_stream_ready_events_heartbeat(self, broker, monkeypatch):
+        """Test: `ready`, zugestellte Events, Heartbeat, Abo-Ende nach Disconnect"""
+        monkeypatch.setattr("app.api.events.settings.EVENTS_HEARTBEAT_SECONDS", 0.01)
+
+        async def run():
+            stream = sprint_event_stream(_Request(connected_polls=2), 7, broker)
+            frames = [await stream.__anext__()]
+            broker.publish(sprint_channel(7), {"id": 1, "type": "roster", "sprint_id": 7})
+            frames += [frame async for frame in stream]
+            return frames
+
+        frames = asyncio.run(run())
+
+        assert frames[0] == format_sse("ready", {"sprint_id": 7})
+        assert frames[1] == 'id: 1\nevent: roster\ndata: {"id":1,"type":"roster","sprint_id":7}\n\n'
+        assert frames[2] == ": heartbeat\n\n"
+        assert broker.subscriber_count(sprint_channel(7)) == 0
+
+    def test_unknown_sprint(self, client, db_session):
+        """Test: Events für unbekannten Sprint → 404"""
+        assert client.get("/api/v1/sprints/999/events").status_code == 404
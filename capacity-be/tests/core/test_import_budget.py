@@ -0,0 +1,37 @@
+"""
+Tests für Import-Budgets (Cold Start von App und CLI-Skripten)
+"""
+import pytest
+
+from app.core.importtime import IMPORT_BUDGETS_MS, check_budget, measure_imports, parse_importtime
+
+SAMPLE_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       300 |        450 |   encodings
+import time:      1000 |       1500 | app.main
+"""
+
+
+class TestImportTimeParser:
+    """Test Parser für -X importtime"""
+
+    def test_parse_lines(self):
+        """Test: self/kumulativ/Tiefe je Modul"""
+        entries = parse_importtime(SAMPLE_OUTPUT)
+
+        assert [(e.module, e.self_us, e.cumulative_us, e.depth) for e in entries] == [
+            ("_io", 120, 120, 2),
+            ("encodings", 300, 450, 1),
+            ("app.main", 1000, 1500, 0),
+        ]
+
+
+class TestImportBudgets:
+    """Test: Einstiegspunkte bleiben im Budget und laden keine schweren Abhängigkeiten"""
+
+    @pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+    def test_entry_point_within_budget(self, module):
+        """Test: Importzeit und verbotene Imports je Einstiegspunkt"""
+        report = measure_imports(module, repeat=2)
+
+        assert check_budget(report) == []
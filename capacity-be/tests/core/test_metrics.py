@@ -0,0 +1,108 @@
+"""
+Tests für den Prometheus /metrics Endpoint und die Metrik-Registry
+"""
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.api.routes import router as api_router
+from app.core import metrics
+from app.db.base import get_db
+from app.db.models import Member, SprintRoster
+from app.db.session import get_read_db
+from tests.conftest import engine as test_engine, override_get_db, override_get_read_db
+
+
+def _metrics_client() -> TestClient:
+    """Eigene App mit Metrics-Middleware und /metrics (in app.main standardmäßig aus)"""
+    metrics_app = FastAPI()
+    metrics_app.add_middleware(metrics.MetricsMiddleware)
+    metrics_app.include_router(api_router, prefix="/api/v1")
+    metrics_app.add_api_route(
+        "/metrics", lambda: Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE))
+    metrics_app.dependency_overrides[get_db] = override_get_db
+    metrics_app.dependency_overrides[get_read_db] = override_get_read_db
+    return TestClient(metrics_app)
+
+
+class TestMetricsRegistry:
+    """Test Registry-Ausgabe und Default-Konfiguration"""
+
+    def test_render_prometheus_text_format(self):
+        """Test: Eigene Metriken erscheinen mit Labels in der Ausgabe der Registry"""
+        metrics.HTTP_REQUESTS.labels(method="GET", route='/a"b', status="200").inc()
+        metrics.HTTP_LATENCY.labels(method="GET", route="/a").observe(0.05)
+
+        output = metrics.render().decode()
+        assert "# TYPE http_requests_total counter" in output
+        assert 'http_requests_total{method="GET",route="/a\\"b",status="200"}' in output
+        assert 'http_request_duration_seconds_bucket{le="+Inf",method="GET",route="/a"}' in output
+        assert metrics.sample_value("http_request_duration_seconds_count", method="GET", route="/a") >= 1
+        assert metrics.sample_value("http_requests_total", method="GET", route="/unknown", status="200") == 0.0
+
+    def test_metrics_disabled_by_default(self, client):
+        """Test: /metrics ist ohne METRICS_ENABLED nicht erreichbar (Endpoint hat keine Auth)"""
+        assert client.get("/metrics").status_code == 404
+
+
+class TestMetricsEndpoint:
+    """Test /metrics mit Route-Latenzen, Pool-Gauges, Engine-Phasen und Caches"""
+
+    def test_route_latency_and_status_counts(self, db_session, sample_members):
+        """Test: Requests werden je Route-Template und Status gezählt"""
+        client = _metrics_client()
+        client.get(f"/api/v1/members/{sample_members[0].member_id}")
+        client.get("/api/v1/members/999999")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert 'http_requests_total{method="GET",route="/api/v1/members/{member_id}",status="200"}' in body
+        assert 'http_requests_total{method="GET",route="/api/v1/members/{member_id}",status="404"}' in body
+        assert 'http_request_duration_seconds_bucket{le="+Inf",method="GET",route="/api/v1/members/{member_id}"}' in body
+
+    def test_availability_phase_timings(self, db_session, sample_sprint, sample_members):
+        """Test: Availability-Berechnung misst alle Phasen"""
+        client = _metrics_client()
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=sample_members[0].member_id))
+        db_session.commit()
+        phases = ("load_roster", "load_holidays", "load_pto", "load_overrides", "compute")
+        before = {phase: metrics.sample_value("availability_engine_phase_seconds_count", phase=phase) for phase in phases}
+
+        response = client.get(f"/api/v1/sprints/{sample_sprint.sprint_id}/availability")
+
+        assert response.status_code == 200
+        for phase in phases:
+            assert metrics.sample_value("availability_engine_phase_seconds_count", phase=phase) == before[phase] + 1
+        assert 'availability_engine_phase_seconds_count{phase="compute"}' in client.get("/metrics").text
+
+    def test_pool_gauges_and_checkout_wait(self, tmp_path):
+        """Test: Gauges spiegeln ausgecheckte Connections, Wartezeit wird beobachtet"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=2, max_overflow=1)
+        metrics.instrument_pool(engine, name="pool_test")
+        waits_before = metrics.sample_value("db_pool_checkout_wait_seconds_count", pool="pool_test")
+
+        with engine.connect() as first, engine.connect() as second, engine.connect() as third:
+            assert metrics.sample_value("db_pool_checked_out", pool="pool_test") == 3
+            assert metrics.sample_value("db_pool_overflow", pool="pool_test") == 1
+
+        assert metrics.sample_value("db_pool_checked_out", pool="pool_test") == 0
+        assert metrics.sample_value("db_pool_size", pool="pool_test") == 2
+        assert metrics.sample_value("db_pool_checkout_wait_seconds_count", pool="pool_test") == waits_before + 3
+        assert 'db_pool_checked_out{pool="pool_test"} 0.0' in metrics.render().decode()
+        engine.dispose()
+
+    def test_statement_cache_hit_ratio(self, db_session):
+        """Test: Wiederholte ORM-Queries treffen den SQLAlchemy Statement-Cache"""
+        metrics.instrument_statement_cache(test_engine)
+        hits_before = metrics.sample_value("cache_requests_total", cache="sqlalchemy_statement", result="hit")
+
+        db_session.query(Member).filter(Member.member_id == 1).all()
+        db_session.query(Member).filter(Member.member_id == 2).all()
+        db_session.execute(text("SELECT 1"))
+
+        assert metrics.sample_value("cache_requests_total", cache="sqlalchemy_statement", result="hit") >= hits_before + 1
+        assert 0.0 < metrics.cache_hit_ratio("sqlalchemy_statement") <= 1.0
+        assert 'cache_hit_ratio{cache="sqlalchemy_statement"}' in metrics.render().decode()
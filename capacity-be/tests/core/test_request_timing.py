@@ -0,0 +1,73 @@
+"""
+Tests für Request-Timing (Server-Timing Header, SQL-Statistik, Sampling)
+"""
+import json
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import router as api_router
+from app.core.timing import RequestTimingMiddleware, instrument_engine
+from app.db.base import get_db
+from app.db.session import get_read_db
+from tests.conftest import engine, override_get_db, override_get_read_db
+
+
+def _timed_client(**middleware_options) -> TestClient:
+    """Eigene App mit Timing-Middleware gegen die Test-Datenbank"""
+    instrument_engine(engine)
+    timed_app = FastAPI()
+    timed_app.add_middleware(RequestTimingMiddleware, **middleware_options)
+    timed_app.include_router(api_router, prefix="/api/v1")
+    timed_app.dependency_overrides[get_db] = override_get_db
+    timed_app.dependency_overrides[get_read_db] = override_get_read_db
+    return TestClient(timed_app)
+
+
+def _parse_server_timing(header: str) -> dict:
+    metrics = {}
+    for part in header.split(", "):
+        name, *params = part.split(";")
+        metrics[name] = dict(p.split("=", 1) for p in params)
+    return metrics
+
+
+class TestRequestTiming:
+    """Test Server-Timing Header und strukturierte Logs"""
+
+    def test_server_timing_header_counts_sql(self, db_session, sample_members):
+        """Test: Header enthält total/sql/app/serialize und zählt SQL-Statements"""
+        client = _timed_client()
+
+        response = client.get("/api/v1/members/")
+
+        assert response.status_code == 200
+        metrics = _parse_server_timing(response.headers["Server-Timing"])
+        assert set(metrics) == {"total", "sql", "app", "serialize"}
+        assert metrics["sql"]["desc"] == '"1 queries"'
+        assert float(metrics["total"]["dur"]) >= float(metrics["sql"]["dur"])
+
+    def test_structured_log_line(self, db_session, sample_members, caplog):
+        """Test: Pro Request wird eine JSON-Logzeile mit Route-Template geschrieben"""
+        client = _timed_client(emit_header=False)
+
+        with caplog.at_level(logging.INFO, logger="app.timing"):
+            response = client.get(f"/api/v1/members/{sample_members[0].member_id}")
+
+        assert "Server-Timing" not in response.headers
+        timing_records = [r for r in caplog.records if r.name == "app.timing"]
+        entry = json.loads(timing_records[-1].getMessage())
+        assert entry["event"] == "request_timing"
+        assert entry["route"] == "/api/v1/members/{member_id}"
+        assert entry["status"] == 200
+        assert entry["sql_count"] == 1
+
+    def test_sampling_disabled(self, db_session, sample_members):
+        """Test: sample_rate=0 misst keine Requests"""
+        client = _timed_client(sample_rate=0.0)
+
+        response = client.get("/api/v1/members/")
+
+        assert response.status_code == 200
+        assert "Server-Timing" not in response.headers
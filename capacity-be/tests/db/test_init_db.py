@@ -0,0 +1,144 @@
+"""
+Tests für den Startup-Pfad (Schema-Revision, Backoff, designierte Migration)
+"""
+import asyncio
+
+import pytest
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from app.db import init_db
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'startup.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _stamp(engine, revision):
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        connection.execute(text("DELETE FROM alembic_version"))
+        connection.execute(text("INSERT INTO alembic_version (version_num) VALUES (:v)"), {"v": revision})
+
+
+class TestSchemaRevision:
+    """Test Revision-Vergleich ohne Introspection"""
+
+    def test_head_matches_alembic(self):
+        """Test: Head aus den Skripten entspricht Alembics eigener Berechnung"""
+        script = ScriptDirectory.from_config(Config(init_db.ALEMBIC_INI_PATH))
+        assert init_db.get_head_revisions() == set(script.get_heads())
+
+    def test_status_from_stored_revision(self, sqlite_engine):
+        """Test: uninitialized → behind → current mit je einer Query"""
+        head = next(iter(init_db.get_head_revisions()))
+        assert init_db.check_schema_revision(sqlite_engine) == init_db.SCHEMA_UNINITIALIZED
+
+        _stamp(sqlite_engine, "3947a09bbc8a")
+        assert init_db.check_schema_revision(sqlite_engine) == init_db.SCHEMA_BEHIND
+
+        _stamp(sqlite_engine, head)
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(sqlite_engine, "before_cursor_execute", listener)
+        assert init_db.check_schema_revision(sqlite_engine) == init_db.SCHEMA_CURRENT
+        event.remove(sqlite_engine, "before_cursor_execute", listener)
+        assert len(statements) == 1
+
+
+class TestStartup:
+    """Test asynchroner Startup mit Backoff und designierter Migration"""
+
+    def test_retries_with_async_backoff(self, monkeypatch):
+        """Test: Verbindungsfehler werden mit verdoppelter Wartezeit wiederholt"""
+        attempts, sleeps = [], []
+
+        def flaky_check():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+            return init_db.SCHEMA_CURRENT
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        monkeypatch.setattr(init_db, "check_schema_revision", flaky_check)
+        monkeypatch.setattr(init_db.asyncio, "sleep", fake_sleep)
+
+        status = asyncio.run(init_db.ensure_database_ready_async(retries=5, backoff_seconds=0.5, migrate=False))
+
+        assert status == init_db.SCHEMA_CURRENT
+        assert sleeps == [0.5, 1.0]
+
+    def test_gives_up_after_retries(self, monkeypatch):
+        """Test: Nach allen Versuchen wird RuntimeError geworfen"""
+        def failing_check():
+            raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+        async def fake_sleep(seconds):
+            pass
+
+        monkeypatch.setattr(init_db, "check_schema_revision", failing_check)
+        monkeypatch.setattr(init_db.asyncio, "sleep", fake_sleep)
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(init_db.ensure_database_ready_async(retries=3, backoff_seconds=0.1, migrate=False))
+
+    @pytest.mark.parametrize("designated, expected_migrations", [(False, 0), (True, 1)])
+    def test_only_designated_process_migrates(self, monkeypatch, designated, expected_migrations):
+        """Test: Veraltetes Schema wird nur im designierten Prozess migriert"""
+        migrations = []
+        monkeypatch.setattr(init_db, "check_schema_revision", lambda: init_db.SCHEMA_BEHIND)
+        monkeypatch.setattr(init_db, "migrate_database", lambda: migrations.append(1) or True)
+
+        asyncio.run(init_db.ensure_database_ready_async(retries=1, migrate=designated))
+
+        assert len(migrations) == expected_migrations
+
+
+class TestMigration:
+    """Test Migration über die übergebene Engine und synchronen Pfad"""
+
+    def test_upgrade_uses_given_engine(self, monkeypatch, sqlite_engine):
+        """Test: Alembic bekommt die Verbindung der übergebenen Engine statt MYSQL_URL"""
+        from alembic import command
+
+        upgrades = []
+        monkeypatch.setattr(command, "upgrade", lambda cfg, revision: upgrades.append(cfg.attributes["connection"]))
+
+        assert init_db.migrate_database(sqlite_engine) is True
+
+        assert len(upgrades) == 1
+        assert upgrades[0].engine is sqlite_engine
+
+    def test_sync_ready_inside_running_loop(self, monkeypatch, sqlite_engine):
+        """Test: ensure_database_ready funktioniert auch aus einem laufenden Event Loop"""
+        migrated = []
+        monkeypatch.setattr(init_db, "migrate_database", lambda db_engine: migrated.append(db_engine) or True)
+
+        async def startup():
+            return init_db.ensure_database_ready(retries=1, db_engine=sqlite_engine)
+
+        assert asyncio.run(startup()) == init_db.SCHEMA_CURRENT
+        assert migrated == [sqlite_engine]
+
+    def test_sync_ready_retries_with_sleep(self, monkeypatch):
+        """Test: Synchrone Retries mit time.sleep und verdoppelter Wartezeit"""
+        attempts, sleeps = [], []
+
+        def flaky_check(db_engine=None):
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+            return init_db.SCHEMA_CURRENT
+
+        monkeypatch.setattr(init_db, "check_schema_revision", flaky_check)
+        monkeypatch.setattr(init_db.time, "sleep", sleeps.append)
+
+        assert init_db.ensure_database_ready(retries=5, backoff_seconds=0.5) == init_db.SCHEMA_CURRENT
+        assert sleeps == [0.5, 1.0]
@@ -0,0 +1,196 @@
+"""
+Tests für Read/Write-Routing mit zwei SQLite-Dateien als Primary und Replica
+"""
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.routes import router as api_router
+from app.db.base import Base, get_db
+from app.db.models import Member, Sprint, SprintStatus
+from app.db.session import (
+    READ_YOUR_WRITES_HEADER, DatabaseRouter, ReadYourWritesMiddleware, get_read_db, is_read_only
+)
+from app.main import CORS_OPTIONS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _session_factory(path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def databases(tmp_path):
+    """Primary und Replica als getrennte SQLite-Dateien"""
+    primary_engine, primary = _session_factory(tmp_path / "primary.db")
+    replica_engine, replica = _session_factory(tmp_path / "replica.db")
+    yield primary, replica
+    primary_engine.dispose()
+    replica_engine.dispose()
+
+
+FRONTEND_ORIGIN = "http://localhost:5173"
+
+
+def _routed_client(db_router: DatabaseRouter, cors: bool = False) -> TestClient:
+    routed_app = FastAPI()
+    if cors:
+        # Gleiche Reihenfolge wie app.main: CORS innen, Read-your-writes außen
+        routed_app.add_middleware(CORSMiddleware, **CORS_OPTIONS)
+    routed_app.add_middleware(ReadYourWritesMiddleware, router=db_router)
+    routed_app.include_router(api_router, prefix="/api/v1")
+
+    def primary_db():
+        db = db_router.primary()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def read_db(request: Request):
+        db = db_router.read_session(request)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    routed_app.dependency_overrides[get_db] = primary_db
+    routed_app.dependency_overrides[get_read_db] = read_db
+    return TestClient(routed_app)
+
+
+def _add_member(factory, name):
+    with factory() as db:
+        db.add(Member(name=name, employment_ratio=1.0, region_code="DE-NW", active=True))
+        db.commit()
+
+
+def _member_names(client, headers=None):
+    response = client.get("/api/v1/members/", headers=headers)
+    assert response.status_code == 200
+    return {m["name"] for m in response.json()}
+
+
+class TestReadRouting:
+    """Test Replica-Reads, Read-your-writes und Fallback"""
+
+    def test_reads_go_to_replica_writes_to_primary(self, databases):
+        """Test: GET liest vom Replica, POST schreibt in den Primary"""
+        primary, replica = databases
+        _add_member(primary, "Nur Primary")
+        _add_member(replica, "Nur Replica")
+        client = _routed_client(DatabaseRouter(primary, replica, clock=FakeClock()))
+
+        assert _member_names(client) == {"Nur Replica"}
+
+        response = client.post("/api/v1/members/", json={"name": "Neu", "employment_ratio": 1.0, "region_code": "DE-NW"})
+        assert response.status_code == 200
+        with primary() as db:
+            assert db.query(Member).filter(Member.name == "Neu").count() == 1
+        with replica() as db:
+            assert db.query(Member).filter(Member.name == "Neu").count() == 0
+
+    def test_read_your_writes_window(self, databases):
+        """Test: Nach einem Write liest der Client bis Fensterende vom Primary"""
+        primary, replica = databases
+        clock = FakeClock()
+        client = _routed_client(DatabaseRouter(primary, replica, read_your_writes_seconds=5, clock=clock))
+
+        client.post("/api/v1/members/", json={"name": "Neu", "employment_ratio": 1.0, "region_code": "DE-NW"})
+        assert _member_names(client) == {"Neu"}
+
+        clock.now += 6
+        assert _member_names(client) == set()
+
+    def test_read_your_writes_cross_origin_without_cookies(self, databases):
+        """Test: Cross-Origin-Client ohne Credentials - Header wird exponiert, zurückgeschickt und gilt"""
+        primary, replica = databases
+        clock = FakeClock()
+        client = _routed_client(DatabaseRouter(primary, replica, read_your_writes_seconds=5, clock=clock), cors=True)
+        origin = {"Origin": FRONTEND_ORIGIN}
+
+        response = client.post(
+            "/api/v1/members/", headers=origin, json={"name": "Neu", "employment_ratio": 1.0, "region_code": "DE-NW"}
+        )
+        assert response.status_code == 200
+        primary_until = response.headers[READ_YOUR_WRITES_HEADER]
+        exposed = response.headers["access-control-expose-headers"].lower()
+        assert READ_YOUR_WRITES_HEADER.lower() in exposed
+
+        # Browser ohne credentials: 'include' speichert/schickt kein Cookie
+        client.cookies.clear()
+        preflight = client.options("/api/v1/members/", headers={
+            **origin,
+            "Access-Control-Request-Method": "GET",
+            "Access-Control-Request-Headers": READ_YOUR_WRITES_HEADER,
+        })
+        assert preflight.status_code == 200
+        assert _member_names(client, origin) == set()
+        assert _member_names(client, {**origin, READ_YOUR_WRITES_HEADER: primary_until}) == {"Neu"}
+
+        # Abgelaufen oder unplausibel weit in der Zukunft → Replica
+        clock.now += 6
+        assert _member_names(client, {**origin, READ_YOUR_WRITES_HEADER: primary_until}) == set()
+        assert _member_names(client, {**origin, READ_YOUR_WRITES_HEADER: str(clock.now + 3600)}) == set()
+
+    def test_failed_write_does_not_pin_client(self, databases):
+        """Test: Fehlgeschlagene Writes öffnen kein Read-your-writes-Fenster"""
+        primary, replica = databases
+        client = _routed_client(DatabaseRouter(primary, replica, clock=FakeClock()))
+
+        response = client.put("/api/v1/members/999", json={"name": "X", "employment_ratio": 1.0})
+
+        assert response.status_code == 404
+        assert "cp_primary_until" not in response.cookies
+        assert READ_YOUR_WRITES_HEADER not in response.headers
+
+    def test_fallback_to_primary_when_replica_unavailable(self, databases, tmp_path):
+        """Test: Nicht erreichbarer Replica → Primary, erneuter Versuch nach Retry-Pause"""
+        primary, _ = databases
+        _add_member(primary, "Primary")
+        broken_engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        clock = FakeClock()
+        db_router = DatabaseRouter(primary, sessionmaker(bind=broken_engine), replica_retry_seconds=30, clock=clock)
+        client = _routed_client(db_router)
+
+        assert _member_names(client) == {"Primary"}
+        assert not db_router.replica_available()
+
+        clock.now += 31
+        assert db_router.replica_available()
+
+    def test_read_sessions_do_not_write(self, databases):
+        """Test: Sprint-Liste über Read-Session berechnet Status ohne UPDATE"""
+        primary, replica = databases
+        with replica() as db:
+            db.add(Sprint(
+                name="Vergangen",
+                start_date=date.today() - timedelta(days=30),
+                end_date=date.today() - timedelta(days=16),
+                status=SprintStatus.PLANNED,
+            ))
+            db.commit()
+        db_router = DatabaseRouter(primary, replica, clock=FakeClock())
+        client = _routed_client(db_router)
+
+        response = client.get("/api/v1/sprints/")
+
+        assert response.json()[0]["status"] == "finished"
+        with replica() as db:
+            assert db.query(Sprint).one().status == SprintStatus.PLANNED
+        with db_router.read_session() as db:
+            assert is_read_only(db)
@@ -0,0 +1,79 @@
+"""
+Tests für den synthetischen Datensatz-Generator
+"""
+from sqlalchemy import text
+
+from app.db.models import Member, Sprint, SprintRoster, PTO, Holiday, AvailabilityOverride
+
+
+def _snapshot(db_session):
+    """Vergleichbarer Inhalt aller Tabellen"""
+    return {
+        "members": db_session.query(Member.member_id, Member.name, Member.employment_ratio, Member.region_code).all(),
+        "roster": db_session.query(
+            SprintRoster.sprint_id, SprintRoster.member_id, SprintRoster.allocation,
+            SprintRoster.assignment_from, SprintRoster.assignment_to
+        ).order_by(SprintRoster.sprint_id, SprintRoster.member_id).all(),
+        "pto": db_session.query(PTO.member_id, PTO.from_date, PTO.to_date, PTO.type).order_by(PTO.pto_id).all(),
+        "overrides": db_session.query(
+            AvailabilityOverride.sprint_id, AvailabilityOverride.member_id, AvailabilityOverride.day
+        ).order_by(AvailabilityOverride.sprint_id, AvailabilityOverride.member_id, AvailabilityOverride.day).all(),
+    }
+
+
+class TestSyntheticDataset:
+    """Test Generator-Parameter, Determinismus und Datenkonsistenz"""
+
+    def test_counts_match_parameters(self, db_session, synthetic_dataset):
+        """Test: Anzahl Members/Sprints/Roster entspricht den Parametern"""
+        counts = synthetic_dataset(members=40, regions=3, sprints=6, roster_size=10, parallel_sprints=2)
+
+        assert counts["members"] == 40
+        assert counts["sprints"] == 6
+        assert counts["sprint_roster"] == 60
+        assert db_session.query(Member).count() == 40
+        assert {m.region_code for m in db_session.query(Member)} == {"DE-NW", "DE-BY", "DE-BE"}
+        assert db_session.query(Holiday).count() == counts["holidays"]
+        # Nationale Feiertage einmal unter "DE" statt je Bundesland
+        regions = [region for (region,) in db_session.query(Holiday.region_code).filter(Holiday.name == "Neujahr")]
+        assert sorted(regions) == ["DE"] * len(regions)
+
+    def test_same_seed_is_deterministic(self, db_session, synthetic_dataset):
+        """Test: Gleicher Seed erzeugt identische Daten"""
+        synthetic_dataset(members=25, sprints=4, override_rate=0.05, seed=7)
+        first = _snapshot(db_session)
+
+        for table in ("availability_overrides", "pto", "holidays", "sprint_roster", "sprints", "members"):
+            db_session.execute(text(f"DELETE FROM {table}"))
+        db_session.commit()
+
+        synthetic_dataset(members=25, sprints=4, override_rate=0.05, seed=7)
+        assert _snapshot(db_session) == first
+
+    def test_pto_entries_do_not_overlap(self, db_session, synthetic_dataset):
+        """Test: PTO je Member ist überlappungsfrei (wie von validate_pto_dates gefordert)"""
+        synthetic_dataset(members=20, sprints=8)
+
+        entries = db_session.query(PTO).order_by(PTO.member_id, PTO.from_date).all()
+        assert {e.type for e in entries} >= {"vacation", "sick"}
+        for previous, current in zip(entries, entries[1:]):
+            if previous.member_id == current.member_id:
+                assert previous.to_date < current.from_date
+
+    def test_windows_and_overrides_within_sprint(self, db_session, synthetic_dataset):
+        """Test: Assignment-Fenster und Overrides liegen im Sprint-Zeitraum"""
+        synthetic_dataset(members=30, sprints=5, assignment_window_rate=0.5, override_rate=0.2)
+        sprints = {s.sprint_id: s for s in db_session.query(Sprint)}
+
+        for entry in db_session.query(SprintRoster):
+            sprint = sprints[entry.sprint_id]
+            for day in (entry.assignment_from, entry.assignment_to):
+                assert day is None or sprint.start_date <= day <= sprint.end_date
+
+        roster_keys = {(r.sprint_id, r.member_id) for r in db_session.query(SprintRoster)}
+        overrides = db_session.query(AvailabilityOverride).all()
+        assert overrides
+        for override in overrides:
+            sprint = sprints[override.sprint_id]
+            assert (override.sprint_id, override.member_id) in roster_keys
+            assert sprint.start_date <= override.day <= sprint.end_date
@@ -0,0 +1,50 @@
+"""
+Query-Budget Utility
+
+Zählt SQL-Statements einer Engine über Engine-Events und prüft eine
+Obergrenze für einen Codeblock - damit N+1-Regressionen in Tests auffallen.
+
+    with assert_max_queries(engine, 3) as counter:
+        client.get("/api/v1/sprints/")
+    assert counter.count == 3
+"""
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """Sammelt alle ausgeführten SQL-Statements einer Engine"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._before_cursor_execute)
+
+
+@contextmanager
+def assert_max_queries(engine: Engine, budget: int):
+    """Fehlschlag, wenn der Block mehr als `budget` SQL-Statements ausführt"""
+    with QueryCounter(engine) as counter:
+        yield counter
+
+    if counter.count > budget:
+        listing = "\n".join(f"  {i + 1}. {statement}" for i, statement in enumerate(counter.statements))
+        raise AssertionError(
+            f"Query budget exceeded: {counter.count} statements (budget {budget})\n{listing}"
+        )
@@ -0,0 +1,240 @@
+"""
+Tests für den Allocation-Plan (Greedy-Solver über parallele Sprints)
+
+- Solver: Ziele je Sprint, freie Allocation je Tag, Rundung auf step
+- Service: Stunden aus Feiertagen/PTO, feste Zuweisungen, andere Sprints, erlaubte Members
+- Latenz für Hunderte Members × Dutzende Sprints
+"""
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.db.models import PTO, Holiday, Member, Sprint, SprintRoster
+from app.schemas.schemas import AllocationPlanFixed, AllocationPlanRequest, AllocationPlanSprint
+from app.services.allocation_plan import AllocationPlanService
+from app.services.allocation_solver import AllocationProblem, solve
+from app.services.validation import ValidationError
+
+
+def _problem(hours, targets, capacity=None, spans=None, allowed=None, step=0.05, days=10):
+    hours = np.asarray(hours, dtype=float)
+    return AllocationProblem(
+        hours=hours,
+        capacity=np.ones((hours.shape[0], days)) if capacity is None else np.asarray(capacity, dtype=float),
+        spans=spans or [(0, days)] * hours.shape[1],
+        targets=np.asarray(targets, dtype=float),
+        allowed=np.ones(hours.shape, dtype=bool) if allowed is None else np.asarray(allowed),
+        step=step,
+    )
+
+
+def _assert_within_capacity(problem, solution):
+    load = np.zeros_like(problem.capacity)
+    for s, (start, stop) in enumerate(problem.spans):
+        load[:, start:stop] += solution.allocation[:, s][:, None]
+    assert (load <= problem.capacity + 1e-9).all()
+
+
+def _parallel_sprint(db_session, start=date(2025, 10, 27), end=date(2025, 11, 7)):
+    sprint = Sprint(name="Parallel Sprint", start_date=start, end_date=end)
+    db_session.add(sprint)
+    db_session.commit()
+    return sprint
+
+
+class TestSolver:
+    """Test solve()"""
+
+    def test_parallel_sprints_share_capacity(self):
+        """Test: Beide Ziele erreicht, kein Member über 1.0 an einem Tag"""
+        problem = _problem([[80, 80], [40, 40]], targets=[80, 40])
+
+        solution = solve(problem)
+
+        assert solution.allocation.tolist() == [[1.0, 0.0], [0.0, 1.0]]
+        assert solution.remaining.tolist() == [0.0, 0.0]
+        _assert_within_capacity(problem, solution)
+
+    def test_allocation_rounded_up_to_step(self):
+        """Test: 30h bei 80h/Sprint → 0.375 wird auf 0.40 aufgerundet"""
+        solution = solve(_problem([[80]], targets=[30]))
+
+        assert solution.allocation[0, 0] == pytest.approx(0.40)
+        assert solution.planned_hours[0] == pytest.approx(32.0)
+
+    def test_unreachable_target_reports_remaining(self):
+        """Test: Nicht erreichbares Ziel - Rest wird gemeldet, Kapazität bleibt eingehalten"""
+        capacity = np.ones((2, 10))
+        capacity[1, 3] = 0.25  # an einem Sprinttag schon zu 75% anderweitig eingeplant
+        problem = _problem([[80], [80]], targets=[200], capacity=capacity)
+
+        solution = solve(problem)
+
+        assert solution.allocation[:, 0].tolist() == [1.0, 0.25]
+        assert solution.remaining[0] == pytest.approx(100.0)
+        _assert_within_capacity(problem, solution)
+
+    def test_allowed_and_alternatives(self):
+        """Test: Nicht erlaubte Paare bleiben leer; Member mit Alternativen werden geschont"""
+        allowed = [[True, True], [True, False]]
+        problem = _problem([[40, 40], [40, 40]], targets=[40, 40], allowed=allowed)
+
+        solution = solve(problem)
+
+        # Member 1 darf nur in Sprint 0 - Member 0 übernimmt Sprint 1
+        assert solution.allocation.tolist() == [[0.0, 1.0], [1.0, 0.0]]
+
+    def test_staggered_sprints(self):
+        """Test: Versetzte Sprints - die freie Allocation gilt an allen Tagen des Sprints"""
+        spans = [(0, 10), (5, 15)]
+        problem = _problem([[80, 80]], targets=[48, 48], spans=spans, days=15)
+
+        solution = solve(problem)
+
+        assert solution.allocation.sum() == pytest.approx(1.0)
+        _assert_within_capacity(problem, solution)
+
+
+class TestAllocationPlanService:
+    """Test AllocationPlanService gegen die Datenbank"""
+
+    def test_hours_from_holidays_and_pto(self, db_session, sample_members, sample_sprint):
+        """Test: Verfügbare Stunden wie in der Availability-Berechnung (Feiertag, PTO, employment_ratio)"""
+        alice, bogdan, carol = sample_members
+        db_session.add(Holiday(name="Brückentag", date=date(2025, 10, 31), region_code="DE-NW"))
+        db_session.add(PTO(member_id=bogdan.member_id, from_date=date(2025, 11, 3), to_date=date(2025, 11, 4)))
+        db_session.commit()
+
+        result = AllocationPlanService(db_session).plan(AllocationPlanRequest(
+            sprints=[AllocationPlanSprint(sprint_id=sample_sprint.sprint_id, target_hours=1000)],
+            step=Decimal("1.00"),
+        ))
+
+        sprint = result.sprints[0]
+        hours = {entry.member_id: entry.hours for entry in sprint.members}
+        assert hours == {alice.member_id: 72.0, bogdan.member_id: 48.0, carol.member_id: 40.0}
+        assert sprint.planned_hours == 160.0
+        assert sprint.missing_hours == 840.0
+        assert result.feasible is False
+
+    def test_fixed_allowed_and_other_sprints(self, db_session, sample_members, sample_sprint):
+        """Test: Feste Zuweisung zählt aufs Ziel, andere Sprints belegen Kapazität, allowed_member_ids gilt"""
+        alice, bogdan, carol = sample_members
+        planned = _parallel_sprint(db_session)
+        other = _parallel_sprint(db_session, date(2025, 11, 3), date(2025, 11, 14))
+        db_session.add(SprintRoster(sprint_id=other.sprint_id, member_id=carol.member_id, allocation=Decimal("0.60")))
+        # Bestehender Eintrag im geplanten Sprint wird durch den Vorschlag ersetzt
+        db_session.add(SprintRoster(sprint_id=planned.sprint_id, member_id=alice.member_id, allocation=Decimal("1.00")))
+        db_session.commit()
+
+        result = AllocationPlanService(db_session).plan(AllocationPlanRequest(
+            sprints=[
+                AllocationPlanSprint(sprint_id=sample_sprint.sprint_id, target_hours=60),
+                AllocationPlanSprint(sprint_id=planned.sprint_id, target_hours=100,
+                                     allowed_member_ids=[alice.member_id, carol.member_id]),
+            ],
+            fixed=[AllocationPlanFixed(sprint_id=sample_sprint.sprint_id, member_id=alice.member_id,
+                                       allocation=Decimal("0.50"))],
+        ))
+
+        first, second = result.sprints
+        allocations = {(s.sprint_id, e.member_id): e.allocation for s in result.sprints for e in s.members}
+        assert first.members[0].fixed and first.members[0].member_id == alice.member_id
+        assert first.planned_hours >= 60 and second.missing_hours > 0
+        assert (planned.sprint_id, bogdan.member_id) not in allocations
+        # Alice: 0.5 fest, Carol: 0.4 frei neben dem anderen Sprint
+        assert allocations[(planned.sprint_id, alice.member_id)] == 0.5
+        assert allocations.get((planned.sprint_id, carol.member_id), 0) <= 0.4
+        assert allocations.get((sample_sprint.sprint_id, carol.member_id), 0) == 0
+        # Nichts geschrieben
+        assert db_session.query(SprintRoster).filter(SprintRoster.sprint_id == sample_sprint.sprint_id).count() == 0
+
+    def test_validation_errors(self, db_session, sample_members, sample_sprint):
+        """Test: Unbekannte Sprints/Members und feste Zuweisungen über dem Maximum"""
+        alice = sample_members[0]
+        service = AllocationPlanService(db_session)
+        other = _parallel_sprint(db_session)
+        db_session.add(SprintRoster(sprint_id=other.sprint_id, member_id=alice.member_id, allocation=Decimal("0.80")))
+        db_session.commit()
+
+        with pytest.raises(ValidationError, match="Sprints not found: 999"):
+            service.plan(AllocationPlanRequest(sprints=[AllocationPlanSprint(sprint_id=999, target_hours=1)]))
+        with pytest.raises(ValidationError, match="Members not found: 999"):
+            service.plan(AllocationPlanRequest(
+                sprints=[AllocationPlanSprint(sprint_id=sample_sprint.sprint_id, target_hours=1)], member_ids=[999]
+            ))
+        with pytest.raises(ValidationError, match=f"max_total_allocation for members: {alice.member_id}"):
+            service.plan(AllocationPlanRequest(
+                sprints=[AllocationPlanSprint(sprint_id=sample_sprint.sprint_id, target_hours=1)],
+                fixed=[AllocationPlanFixed(sprint_id=sample_sprint.sprint_id, member_id=alice.member_id,
+                                           allocation=Decimal("0.50"))],
+            ))
+
+    def test_api_endpoint(self, client, db_session, sample_members, sample_sprint):
+        """Test: POST /planning/allocations liefert den Vorschlag, 422 bei ungültigen Referenzen"""
+        url = "/api/v1/planning/allocations"
+        response = client.post(url, json={"sprints": [{"sprint_id": sample_sprint.sprint_id, "target_hours": 100}]})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["feasible"] is True
+        assert data["candidate_count"] == 3
+        assert data["sprints"][0]["planned_hours"] >= 100
+
+        response = client.post(url, json={"sprints": [{"sprint_id": 999, "target_hours": 1}]})
+        assert response.status_code == 422
+
+        response = client.post(url, json={
+            "sprints": [{"sprint_id": sample_sprint.sprint_id, "target_hours": 1}],
+            "fixed": [{"sprint_id": 999, "member_id": sample_members[0].member_id, "allocation": 0.5}],
+        })
+        assert response.status_code == 422
+
+
+class TestAllocationPlanPerformance:
+    """Test Latenz für große Planungen"""
+
+    def test_solver_large_problem(self):
+        """Test: 500 Members × 40 versetzte Sprints in wenigen Sekunden, Kapazität eingehalten"""
+        rng = np.random.default_rng(7)
+        members, sprints = 500, 40
+        spans = [(7 * (s // 8), 7 * (s // 8) + 14) for s in range(sprints)]
+        days = spans[-1][1]
+        problem = _problem(
+            rng.uniform(20, 80, (members, sprints)),
+            targets=rng.uniform(200, 900, sprints),
+            capacity=np.full((members, days), 1.0),
+            spans=spans,
+            allowed=rng.random((members, sprints)) < 0.5,
+            days=days,
+        )
+
+        started = time.perf_counter()
+        solution = solve(problem)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 5.0
+        assert solution.remaining.sum() == pytest.approx(0.0)
+        _assert_within_capacity(problem, solution)
+
+    def test_service_with_synthetic_dataset(self, db_session, synthetic_dataset):
+        """Test: Service über 300 Members × 24 Sprints (inkl. PTO, Feiertage, Bestandsroster)"""
+        synthetic_dataset(members=300, sprints=48, roster_size=25, parallel_sprints=24, start_date=date(2025, 1, 6))
+        sprints = db_session.query(Sprint).order_by(Sprint.start_date, Sprint.sprint_id).limit(24).all()
+        request = AllocationPlanRequest(
+            sprints=[AllocationPlanSprint(sprint_id=s.sprint_id, target_hours=600) for s in sprints],
+            include_other_sprints=True,
+        )
+
+        started = time.perf_counter()
+        result = AllocationPlanService(db_session).plan(request)
+
+        assert time.perf_counter() - started < 10.0
+        assert result.candidate_count == db_session.query(Member).filter(Member.active.is_(True)).count()
+        totals = {}
+        for sprint in result.sprints:
+            for entry in sprint.members:
+                totals[entry.member_id] = totals.get(entry.member_id, 0) + entry.allocation
+        assert max(totals.values()) <= 1.0 + 1e-9
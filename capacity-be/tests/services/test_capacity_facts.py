@@ -0,0 +1,136 @@
+"""
+Tests für die materialisierte Tageskapazität (member_day_capacity)
+
+- Rebuild erzeugt eine Zeile je Roster-Member und Sprinttag
+- Jeder Schreibpfad hält die Tabelle inkrementell konsistent zur Live-Engine
+- Der Konsistenz-Check erkennt fehlende, überzählige und abweichende Zeilen
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.db.crud.holidays import create_holiday, delete_holiday
+from app.db.crud.members import update_member
+from app.db.crud.pto import create_pto, update_pto, delete_pto
+from app.db.crud.sprint_roster import add_member_to_sprint, update_roster_entry, remove_member_from_sprint
+from app.db.crud.sprints import update_sprint, delete_sprint
+from app.db.models import MemberDayCapacity, SprintRoster, AvailabilityState
+from app.schemas.schemas import (
+    HolidayCreate, PTOCreate, SprintRosterCreate, SprintRosterUpdate, SprintUpdate, AvailabilityOverridePatch
+)
+from app.services.availability import AvailabilityService
+from app.services.capacity_facts import check_capacity_facts, rebuild_capacity_facts
+
+
+@pytest.fixture
+def facts(db_session, sample_sprint, sample_members):
+    """Sample Sprint mit Alice und Bogdan, Faktentabelle frisch aufgebaut"""
+    for member in sample_members[:2]:
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=member.member_id, allocation=1.0))
+    db_session.commit()
+    rebuild_capacity_facts(db_session)
+    return sample_sprint
+
+
+def _fact(db_session, member_id, day):
+    return db_session.query(MemberDayCapacity).filter(
+        MemberDayCapacity.member_id == member_id, MemberDayCapacity.day == day
+    ).first()
+
+
+class TestCapacityFacts:
+    """Test Rebuild, inkrementelle Pflege und Konsistenz-Check"""
+
+    def test_rebuild_matches_engine(self, db_session, facts, sample_members):
+        """Test: Eine Zeile je Member und Tag, Summen wie in der Availability-Matrix"""
+        availability = AvailabilityService(db_session).get_sprint_availability(facts.sprint_id)
+        rows = db_session.query(MemberDayCapacity).all()
+
+        assert len(rows) == 2 * 12
+        assert float(sum(r.hours for r in rows)) == pytest.approx(availability.sum_hours_team)
+        assert check_capacity_facts(db_session) == []
+
+    def test_pto_write_paths(self, db_session, facts, sample_members):
+        """Test: PTO anlegen, verschieben, löschen aktualisiert nur den betroffenen Zeitraum"""
+        alice = sample_members[0]
+        pto = create_pto(db_session, PTOCreate(member_id=alice.member_id, from_date=date(2025, 10, 28),
+                                               to_date=date(2025, 10, 29)))
+        assert _fact(db_session, alice.member_id, date(2025, 10, 28)).auto_state == "pto"
+        assert check_capacity_facts(db_session) == []
+
+        update_pto(db_session, pto.pto_id, {"from_date": date(2025, 11, 3), "to_date": date(2025, 11, 3)})
+        assert _fact(db_session, alice.member_id, date(2025, 10, 28)).auto_state == "available"
+        assert check_capacity_facts(db_session) == []
+
+        delete_pto(db_session, pto.pto_id)
+        assert check_capacity_facts(db_session) == []
+
+    def test_roster_write_paths(self, db_session, facts, sample_members):
+        """Test: Roster hinzufügen, Allocation ändern, entfernen"""
+        carol = sample_members[2]
+        add_member_to_sprint(db_session, facts.sprint_id, SprintRosterCreate(member_id=carol.member_id, allocation=1.0))
+        assert db_session.query(MemberDayCapacity).filter(MemberDayCapacity.member_id == carol.member_id).count() == 12
+
+        update_roster_entry(db_session, facts.sprint_id, carol.member_id, SprintRosterUpdate(allocation=0.5))
+        assert _fact(db_session, carol.member_id, date(2025, 10, 27)).hours == Decimal("2")  # 8h * 0.5 * 0.5
+        assert check_capacity_facts(db_session) == []
+
+        remove_member_from_sprint(db_session, facts.sprint_id, carol.member_id)
+        assert db_session.query(MemberDayCapacity).filter(MemberDayCapacity.member_id == carol.member_id).count() == 0
+        assert check_capacity_facts(db_session) == []
+
+    def test_override_write_paths(self, db_session, facts, sample_members):
+        """Test: Einzel- und Bulk-Overrides"""
+        alice, bogdan = sample_members[:2]
+        service = AvailabilityService(db_session)
+        service.set_availability_override(facts.sprint_id, alice.member_id, date(2025, 10, 30), AvailabilityState.HALF)
+        assert _fact(db_session, alice.member_id, date(2025, 10, 30)).days == Decimal("0.5")
+
+        service.apply_availability_overrides(facts.sprint_id, [
+            AvailabilityOverridePatch(member_id=bogdan.member_id, day=date(2025, 11, 4), state=AvailabilityState.UNAVAILABLE),
+            AvailabilityOverridePatch(member_id=alice.member_id, day=date(2025, 10, 30), state=None),
+        ])
+        assert _fact(db_session, alice.member_id, date(2025, 10, 30)).days == Decimal("1.0")
+        assert check_capacity_facts(db_session) == []
+
+    def test_member_holiday_and_sprint_write_paths(self, db_session, facts, sample_members):
+        """Test: Member-Änderung, Feiertag, Sprint-Zeitraum und Sprint-Löschung"""
+        bogdan = sample_members[1]
+        update_member(db_session, bogdan.member_id, {"employment_ratio": Decimal("0.5"), "region_code": "DE-NW"})
+        assert check_capacity_facts(db_session) == []
+
+        holiday = create_holiday(db_session, HolidayCreate(date=date(2025, 10, 31), region_code="DE-NW", name="Test"))
+        assert _fact(db_session, bogdan.member_id, date(2025, 10, 31)).auto_state == "holiday"
+        delete_holiday(db_session, holiday.holiday_id)
+        assert check_capacity_facts(db_session) == []
+
+        update_sprint(db_session, facts.sprint_id, SprintUpdate(end_date=date(2025, 11, 4)))
+        assert db_session.query(MemberDayCapacity).count() == 2 * 9
+        assert check_capacity_facts(db_session) == []
+
+        db_session.query(SprintRoster).delete()
+        db_session.commit()
+        delete_sprint(db_session, facts.sprint_id)
+        assert db_session.query(MemberDayCapacity).count() == 0
+
+    def test_checker_detects_drift(self, db_session, facts, sample_members):
+        """Test: Manipulierte, fehlende und verwaiste Zeilen werden gemeldet"""
+        alice = sample_members[0]
+        _fact(db_session, alice.member_id, date(2025, 10, 27)).hours = Decimal("1")
+        db_session.delete(_fact(db_session, alice.member_id, date(2025, 10, 28)))
+        db_session.add(MemberDayCapacity(sprint_id=999, member_id=alice.member_id, day=date(2025, 10, 27),
+                                         auto_state="available", final_state=AvailabilityState.AVAILABLE,
+                                         days=1, hours=8))
+        db_session.commit()
+
+        mismatches = check_capacity_facts(db_session)
+
+        assert {(m.sprint_id, m.day) for m in mismatches} == {
+            (facts.sprint_id, date(2025, 10, 27)), (facts.sprint_id, date(2025, 10, 28)), (999, date(2025, 10, 27))
+        }
+        missing = next(m for m in mismatches if m.day == date(2025, 10, 28))
+        assert missing.actual is None
+
+        rebuild_capacity_facts(db_session)
+        assert check_capacity_facts(db_session) == []
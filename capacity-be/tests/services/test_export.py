@@ -0,0 +1,132 @@
+"""
+Tests für den CSV/XLSX-Export der Availability-Matrix
+
+- Werte stimmen mit der Availability-Matrix überein
+- Zeilen werden in Member-Batches erzeugt und als Chunks gestreamt
+- Multi-Sprint-Export über einen Zeitraum, Tage außerhalb leer
+- XLSX ist ein gültiges Workbook mit einer Zeile je Member
+"""
+import csv
+import io
+import zipfile
+from datetime import date
+
+import pytest
+
+from app.core.config import settings
+from app.db.models import Sprint, SprintRoster, SprintStatus
+from app.services.availability import AvailabilityService
+from app.services.export import FIXED_COLUMNS, AvailabilityExportService
+
+
+@pytest.fixture
+def rostered_sprint(db_session, sample_sprint, sample_members, sample_holidays):
+    """Sample Sprint mit allen drei Members"""
+    for member in sample_members:
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=member.member_id, allocation=1.0))
+    db_session.commit()
+    return sample_sprint
+
+
+def _parse_csv(content: str):
+    assert content.startswith("\ufeff")
+    return list(csv.reader(io.StringIO(content[1:])))
+
+
+class TestAvailabilityExport:
+    """Test Zeilen, CSV-Chunks und XLSX"""
+
+    def test_csv_matches_availability(self, db_session, rostered_sprint):
+        """Test: Eine Zeile je Member, Tageswerte und Summen wie in der Matrix"""
+        availability = AvailabilityService(db_session).get_sprint_availability(rostered_sprint.sprint_id)
+        service = AvailabilityExportService(db_session)
+        sprints = service.resolve_sprints([rostered_sprint.sprint_id])
+        dates = service.export_dates(sprints)
+
+        header, *rows = _parse_csv("".join(service.iter_csv(sprints, dates)))
+
+        assert header[len(FIXED_COLUMNS)] == "2025-10-27"
+        assert len(header) == len(FIXED_COLUMNS) + 12 + 2
+        by_name = {row[1]: row for row in rows}
+        assert list(by_name) == sorted(by_name)
+        for member in availability.members:
+            row = by_name[member.name]
+            assert float(row[-2]) == member.sum_days
+            assert float(row[-1]) == pytest.approx(member.sum_hours)
+
+    def test_rows_are_streamed_in_batches(self, db_session, rostered_sprint, monkeypatch):
+        """Test: Header + ein Chunk je Member-Batch, Reihenfolge unabhängig von der Batchgröße"""
+        service = AvailabilityExportService(db_session)
+        sprints = service.resolve_sprints([rostered_sprint.sprint_id])
+        dates = service.export_dates(sprints)
+        full = "".join(service.iter_csv(sprints, dates))
+
+        monkeypatch.setattr(settings, "EXPORT_BATCH_MEMBERS", 2)
+        chunks = list(service.iter_csv(sprints, dates))
+
+        assert len(chunks) == 1 + 2
+        assert "".join(chunks) == full
+
+    def test_date_range_over_multiple_sprints(self, db_session, rostered_sprint, sample_members):
+        """Test: Zeitraum beschneidet Tage, Zellen außerhalb eines Sprints bleiben leer"""
+        follow_up = Sprint(name="Sprint 2", start_date=date(2025, 11, 10), end_date=date(2025, 11, 21),
+                           status=SprintStatus.PLANNED)
+        db_session.add(follow_up)
+        db_session.flush()
+        db_session.add(SprintRoster(sprint_id=follow_up.sprint_id, member_id=sample_members[0].member_id, allocation=1.0))
+        db_session.commit()
+
+        service = AvailabilityExportService(db_session)
+        sprints = service.resolve_sprints(from_date=date(2025, 11, 3), to_date=date(2025, 11, 14))
+        dates = service.export_dates(sprints, date(2025, 11, 3), date(2025, 11, 14))
+        header, *rows = _parse_csv("".join(service.iter_csv(sprints, dates)))
+
+        assert [s.sprint_id for s in sprints] == [rostered_sprint.sprint_id, follow_up.sprint_id]
+        assert header[len(FIXED_COLUMNS)] == "2025-11-03" and header[-3] == "2025-11-14"
+        assert len(rows) == 3 + 1
+        last = rows[-1]
+        assert last[0] == "Sprint 2"
+        assert last[header.index("2025-11-07")] == ""
+        assert float(last[-2]) == 5.0  # 10.11. - 14.11.
+
+    def test_xlsx_workbook(self, db_session, rostered_sprint):
+        """Test: XLSX-Stream ist ein gültiges Workbook mit Header + 3 Zeilen"""
+        service = AvailabilityExportService(db_session)
+        sprints = service.resolve_sprints([rostered_sprint.sprint_id])
+        content = b"".join(service.iter_xlsx(sprints, service.export_dates(sprints)))
+
+        with zipfile.ZipFile(io.BytesIO(content)) as workbook:
+            sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+        assert sheet.count("<row ") == 1 + 3
+
+
+class TestExportAPI:
+    """Test Export-Endpoints"""
+
+    def test_sprint_export_csv_and_xlsx(self, client, rostered_sprint):
+        """Test: GET /sprints/{id}/availability/export als CSV und XLSX"""
+        response = client.get(f"/api/v1/sprints/{rostered_sprint.sprint_id}/availability/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "attachment" in response.headers["content-disposition"]
+        assert len(_parse_csv(response.text)) == 1 + 3
+
+        response = client.get(f"/api/v1/sprints/{rostered_sprint.sprint_id}/availability/export",
+                              params={"format": "xlsx"})
+        assert response.status_code == 200
+        assert response.content[:2] == b"PK"
+
+        assert client.get("/api/v1/sprints/999/availability/export").status_code == 404
+
+    def test_range_export_validation(self, client, rostered_sprint):
+        """Test: Zeitraum-Export und ungültige Parameter"""
+        response = client.get("/api/v1/availability/export",
+                              params={"from_date": "2025-10-01", "to_date": "2025-10-31"})
+        assert response.status_code == 200
+        assert len(_parse_csv(response.text)) == 1 + 3
+
+        assert client.get("/api/v1/availability/export").status_code == 422
+        assert client.get("/api/v1/availability/export",
+                          params={"from_date": "2025-01-01", "to_date": "2026-06-01"}).status_code == 422
+        assert client.get("/api/v1/availability/export",
+                          params={"sprint_ids": [rostered_sprint.sprint_id], "format": "pdf"}).status_code == 422
@@ -0,0 +1,92 @@
+"""
+Tests für den spaltenbasierten Export der Tageskapazität (Parquet / Arrow)
+
+- Parquet enthält alle Faktenzeilen mit States als Enum-Werten
+- Ein Row Group / Record Batch je gelesenem Batch
+- Inkrementeller Export über den Zeitraum
+- Endpoint liefert Parquet-Datei bzw. Arrow-IPC-Stream
+"""
+from datetime import date
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from app.db.models import MemberDayCapacity, SprintRoster
+from app.services import fact_export
+from app.services.capacity_facts import rebuild_capacity_facts
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture
+def facts(db_session, sample_sprint, sample_members, sample_holidays):
+    """Sample Sprint mit allen drei Members, Faktentabelle aufgebaut (3 × 12 Zeilen)"""
+    for member in sample_members:
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=member.member_id, allocation=1.0))
+    db_session.commit()
+    rebuild_capacity_facts(db_session)
+    return sample_sprint
+
+
+class TestFactExport:
+    """Test Parquet/Arrow-Export der Faktentabelle"""
+
+    def test_parquet_matches_fact_table(self, db_session, facts, tmp_path):
+        """Test: Alle Zeilen, Schema mit dictionary-encoded States, Summen wie in der Tabelle"""
+        path = str(tmp_path / "facts.parquet")
+        written = fact_export.write_parquet(db_session, path)
+
+        table = pq.read_table(path)
+        assert written == table.num_rows == 3 * 12
+        assert table.schema == fact_export.fact_schema()
+        assert set(table.column("final_state").to_pylist()) <= {"available", "unavailable", "half"}
+        assert "weekend" in table.column("auto_state").to_pylist()
+        expected = sum(float(f.hours) for f in db_session.query(MemberDayCapacity).all())
+        assert pa.compute.sum(table.column("hours")).as_py() == pytest.approx(expected)
+
+    def test_batches_and_incremental_range(self, db_session, facts, tmp_path):
+        """Test: Ein Row Group je Batch, Zeitraum filtert auf Tage"""
+        path = str(tmp_path / "facts.parquet")
+        fact_export.write_parquet(db_session, path, batch_rows=10)
+        assert pq.ParquetFile(path).num_row_groups == 4
+
+        batches = list(fact_export.iter_fact_batches(db_session, date(2025, 11, 3), date(2025, 11, 7)))
+        days = {day for batch in batches for day in batch.column("day").to_pylist()}
+        assert days == {date(2025, 11, d) for d in range(3, 8)}
+        assert sum(batch.num_rows for batch in batches) == 3 * 5
+
+    def test_arrow_stream_chunks(self, db_session, facts, monkeypatch):
+        """Test: Schema-Chunk, ein Chunk je Batch, End-of-Stream"""
+        monkeypatch.setattr(fact_export.settings, "FACT_EXPORT_BATCH_ROWS", 12)
+        chunks = list(fact_export.iter_arrow_stream(db_session))
+
+        assert len(chunks) == 1 + 3 + 1
+        table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+        assert table.num_rows == 36
+        assert table.column("region_code").to_pylist().count(None) == 12  # Carol ohne Region
+
+    def test_cli_writes_arrow_file(self, db_session, facts, tmp_path, monkeypatch, capsys):
+        """Test: CLI exportiert inkrementell als Arrow-Datei"""
+        monkeypatch.setattr("app.db.base.SessionLocal", TestingSessionLocal)
+        path = str(tmp_path / "facts.arrow")
+
+        assert fact_export.main(["-o", path, "--format", "arrow", "--from", "2025-11-01"]) == 0
+        with pa.OSFile(path) as source:
+            table = pa.ipc.open_stream(source).read_all()
+        assert min(table.column("day").to_pylist()) == date(2025, 11, 1)
+        assert "Zeilen" in capsys.readouterr().out
+
+    def test_export_endpoint(self, client, facts):
+        """Test: GET /export/capacity-facts als Parquet und Arrow"""
+        response = client.get("/api/v1/export/capacity-facts")
+        assert response.status_code == 200
+        assert response.content[:4] == b"PAR1"
+        assert pq.read_table(pa.BufferReader(response.content)).num_rows == 36
+
+        response = client.get("/api/v1/export/capacity-facts",
+                              params={"format": "arrow", "from_date": "2025-11-03", "to_date": "2025-11-03"})
+        assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+        assert pa.ipc.open_stream(response.content).read_all().num_rows == 3
+
+        assert client.get("/api/v1/export/capacity-facts",
+                          params={"from_date": "2025-11-03", "to_date": "2025-11-01"}).status_code == 422
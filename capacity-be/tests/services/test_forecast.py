@@ -0,0 +1,182 @@
+"""
+Tests für den Monte-Carlo-Kapazitäts-Forecast
+
+- Perzentile liegen unter der geplanten Kapazität
+- Ohne Historie entspricht der Forecast der Planung
+- Gleicher Seed -> gleiches Ergebnis
+- Latenz-Budget für einen großen Sprint
+"""
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.db.models import Sprint, SprintRoster
+from app.services import forecast as forecast_module
+from app.services.forecast import ForecastService
+
+
+def _assert_ordered(percentiles, planned):
+    assert percentiles.p10 <= percentiles.p50 <= percentiles.p90 <= planned + 1e-6
+
+
+class TestForecast:
+    """Test Monte-Carlo-Forecast je Sprint und Portfolio"""
+
+    def test_forecast_below_plan_with_history(self, db_session, synthetic_dataset):
+        """Test: Mit Krankheits-Historie liegen P10 <= P50 <= P90 <= geplante Kapazität"""
+        synthetic_dataset(members=20, sprints=2, roster_size=20, start_date=date.today() + timedelta(days=7))
+        sprint = db_session.query(Sprint).order_by(Sprint.start_date).first()
+
+        forecast = ForecastService(db_session).forecast_sprint(sprint.sprint_id, simulations=500, seed=7)
+
+        assert forecast.simulations == 500
+        assert len(forecast.members) == 20
+        _assert_ordered(forecast.hours_team, forecast.planned_hours_team)
+        _assert_ordered(forecast.days_team, forecast.planned_days_team)
+        assert forecast.hours_team.p50 < forecast.planned_hours_team
+        for member in forecast.members:
+            _assert_ordered(member.days, member.planned_days)
+            assert member.expected_absence_days >= 0
+
+    def test_forecast_matches_availability_plan(self, db_session, synthetic_dataset, client):
+        """Test: Geplante Werte entsprechen der Availability-Matrix"""
+        synthetic_dataset(members=10, sprints=1, roster_size=10, start_date=date.today() + timedelta(days=7))
+        sprint = db_session.query(Sprint).first()
+
+        availability = client.get(f"/api/v1/sprints/{sprint.sprint_id}/availability").json()
+        forecast = ForecastService(db_session).forecast_sprint(sprint.sprint_id, simulations=200, seed=1)
+
+        assert forecast.planned_days_team == pytest.approx(availability["sum_days_team"])
+        assert forecast.planned_hours_team == pytest.approx(availability["sum_hours_team"], abs=0.01)
+
+    def test_forecast_without_history_equals_plan(self, db_session, sample_sprint, sample_members):
+        """Test: Ohne PTO-Historie gibt es keine ungeplanten Ausfälle"""
+        for member in sample_members:
+            db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=member.member_id, allocation=1.0))
+        db_session.commit()
+
+        forecast = ForecastService(db_session).forecast_sprint(sample_sprint.sprint_id, simulations=200)
+
+        assert forecast.days_team.p10 == forecast.days_team.p90 == forecast.planned_days_team
+        assert all(member.expected_absence_days == 0 for member in forecast.members)
+
+    def test_forecast_seed_is_deterministic(self, db_session, synthetic_dataset):
+        """Test: Gleicher Seed liefert identische Perzentile"""
+        synthetic_dataset(members=15, sprints=1, roster_size=15, start_date=date.today() + timedelta(days=7))
+        sprint_id = db_session.query(Sprint.sprint_id).scalar()
+        service = ForecastService(db_session)
+
+        first = service.forecast_sprint(sprint_id, simulations=300, seed=42)
+        second = service.forecast_sprint(sprint_id, simulations=300, seed=42)
+
+        assert first.model_dump() == second.model_dump()
+
+    def test_simulations_capped_by_cell_budget(self, db_session, synthetic_dataset, monkeypatch):
+        """Test: Simulationen werden auf FORECAST_MAX_CELLS begrenzt"""
+        synthetic_dataset(members=10, sprints=1, roster_size=10)
+        sprint = db_session.query(Sprint).first()
+        days = (sprint.end_date - sprint.start_date).days + 1
+        monkeypatch.setattr(settings, "FORECAST_MAX_CELLS", 10 * days * 250)
+
+        forecast = ForecastService(db_session).forecast_sprint(sprint.sprint_id, simulations=5000, seed=1)
+
+        assert forecast.simulations == 250
+
+    def test_portfolio_uses_process_pool(self, db_session, synthetic_dataset, monkeypatch):
+        """Test: Portfolio-Forecast über den Process Pool liefert dieselben Werte wie inline"""
+        synthetic_dataset(members=12, sprints=3, roster_size=12, start_date=date.today() + timedelta(days=7))
+        service = ForecastService(db_session)
+        inline = service.forecast_portfolio(simulations=200, seed=3)
+
+        monkeypatch.setattr(settings, "FORECAST_WORKERS", 2)
+        monkeypatch.setattr(settings, "FORECAST_POOL_MIN_SPRINTS", 1)
+        try:
+            pooled = service.forecast_portfolio(simulations=200, seed=3)
+        finally:
+            forecast_module.shutdown_forecast_pool()
+
+        assert len(pooled.sprints) == 3
+        assert pooled.hours_total == inline.hours_total
+        assert [s.hours_team for s in pooled.sprints] == [s.hours_team for s in inline.sprints]
+
+    def test_forecast_latency_budget(self, db_session, synthetic_dataset):
+        """Test: 200 Members × 28 Tage × 2000 Simulationen unter 2 Sekunden"""
+        synthetic_dataset(
+            members=200, sprints=1, roster_size=200, sprint_days=28, start_date=date.today() + timedelta(days=7)
+        )
+        sprint_id = db_session.query(Sprint.sprint_id).scalar()
+
+        started = time.perf_counter()
+        forecast = ForecastService(db_session).forecast_sprint(sprint_id, simulations=2000, seed=1)
+        elapsed = time.perf_counter() - started
+
+        assert forecast.simulations == 2000
+        assert elapsed < 2.0
+
+
+class TestForecastAPI:
+    """Test Forecast-Endpoints"""
+
+    def test_sprint_forecast_endpoint(self, client, db_session, synthetic_dataset):
+        """Test: GET /sprints/{id}/forecast"""
+        synthetic_dataset(members=5, sprints=1, roster_size=5)
+        sprint_id = db_session.query(Sprint.sprint_id).scalar()
+
+        response = client.get(f"/api/v1/sprints/{sprint_id}/forecast", params={"simulations": 200, "seed": 1})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["sprint"]["sprint_id"] == sprint_id
+        assert set(data["hours_team"]) == {"p10", "p50", "p90"}
+        assert len(data["members"]) == 5
+
+    def test_sprint_forecast_not_found(self, client, db_session):
+        """Test: Unbekannter Sprint -> 404"""
+        response = client.get("/api/v1/sprints/999/forecast")
+        assert response.status_code == 404
+
+    def test_negative_seed_rejected(self, client, db_session, sample_sprint):
+        """Test: Negativer Seed -> 422 statt Fehler aus default_rng"""
+        response = client.get(f"/api/v1/sprints/{sample_sprint.sprint_id}/forecast", params={"seed": -1})
+        assert response.status_code == 422
+
+        response = client.get("/api/v1/forecast", params={"sprint_ids": [sample_sprint.sprint_id], "seed": -1})
+        assert response.status_code == 422
+
+    def test_pto_type_via_api_feeds_history(self, client, db_session, sample_sprint, sample_members):
+        """Test: Über die API angelegte sick-PTO zählt als Historie, vacation nicht"""
+        for member in sample_members:
+            db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=member.member_id, allocation=1.0))
+        db_session.commit()
+        alice, bogdan, carol = sample_members
+        past = date.today() - timedelta(days=30)
+
+        for member, pto_type in ((alice, "sick"), (bogdan, "vacation")):
+            response = client.post("/api/v1/pto/", json={
+                "member_id": member.member_id, "from_date": past.isoformat(),
+                "to_date": (past + timedelta(days=2)).isoformat(), "type": pto_type,
+            })
+            assert response.status_code == 201
+            assert response.json()["type"] == pto_type
+
+        invalid = client.post("/api/v1/pto/", json={
+            "member_id": carol.member_id, "from_date": past.isoformat(), "to_date": past.isoformat(), "type": "sabbatical",
+        })
+        assert invalid.status_code == 422
+
+        forecast = ForecastService(db_session).forecast_sprint(sample_sprint.sprint_id, simulations=200, seed=1)
+        absence = {member.member_id: member.expected_absence_days for member in forecast.members}
+        assert absence[alice.member_id] > absence[bogdan.member_id]
+        assert absence[alice.member_id] > absence[carol.member_id]
+
+    def test_portfolio_forecast_endpoint(self, client, db_session, synthetic_dataset):
+        """Test: GET /forecast?sprint_ids=..."""
+        synthetic_dataset(members=5, sprints=2, roster_size=5)
+        sprint_ids = [row[0] for row in db_session.query(Sprint.sprint_id).all()]
+
+        response = client.get("/api/v1/forecast", params={"sprint_ids": sprint_ids, "simulations": 200})
+
+        assert response.status_code == 200
+        assert [s["sprint"]["sprint_id"] for s in response.json()["sprints"]] == sorted(sprint_ids)
@@ -0,0 +1,160 @@
+"""
+Tests für die Over-Allocation-Prüfung (Sweep über Intervall-Endpunkte)
+
+- Zeiträume mit Summe > 1.0 je Member, inkl. Assignment-Fenster
+- Report über die ganze Organisation und Beschneidung auf den Zeitraum
+- Optionale Prüfung bei Roster-Writes (ROSTER_ALLOCATION_CHECK)
+"""
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.core.config import settings
+from app.db.models import Member, Sprint, SprintRoster
+from app.services.over_allocation import AllocationInterval, OverAllocationService, find_over_allocations
+
+
+def _interval(member_id, sprint_id, start, end, allocation):
+    return AllocationInterval(member_id, sprint_id, f"S{sprint_id}", start, end, Decimal(allocation))
+
+
+def _second_sprint(db_session, start=date(2025, 11, 3), end=date(2025, 11, 14)):
+    sprint = Sprint(name="Parallel Sprint", start_date=start, end_date=end)
+    db_session.add(sprint)
+    db_session.commit()
+    return sprint
+
+
+class TestSweep:
+    """Test find_over_allocations"""
+
+    def test_overlapping_intervals(self):
+        """Test: Nur der Überschneidungszeitraum über 1.0, je Member getrennt"""
+        intervals = [
+            _interval(1, 1, date(2025, 1, 6), date(2025, 1, 17), "0.60"),
+            _interval(1, 2, date(2025, 1, 13), date(2025, 1, 24), "0.50"),
+            _interval(2, 1, date(2025, 1, 6), date(2025, 1, 17), "0.50"),
+            _interval(2, 2, date(2025, 1, 13), date(2025, 1, 24), "0.50"),
+        ]
+
+        conflicts = find_over_allocations(intervals)
+
+        assert [(c.member_id, c.start, c.end, c.total) for c in conflicts] == [
+            (1, date(2025, 1, 13), date(2025, 1, 17), Decimal("1.10")),
+        ]
+        assert [i.sprint_id for i in conflicts[0].intervals] == [1, 2]
+
+    def test_adjacent_intervals_and_steps(self):
+        """Test: Lückenlos aneinander grenzende Intervalle zählen nicht, Stufen werden getrennt gemeldet"""
+        intervals = [
+            _interval(1, 1, date(2025, 1, 1), date(2025, 1, 10), "1.00"),
+            _interval(1, 2, date(2025, 1, 11), date(2025, 1, 20), "1.00"),
+            _interval(1, 3, date(2025, 1, 15), date(2025, 1, 25), "0.50"),
+            _interval(1, 4, date(2025, 1, 18), date(2025, 1, 18), "0.25"),
+        ]
+
+        conflicts = find_over_allocations(intervals)
+
+        assert [(c.start, c.end, c.total) for c in conflicts] == [
+            (date(2025, 1, 15), date(2025, 1, 17), Decimal("1.50")),
+            (date(2025, 1, 18), date(2025, 1, 18), Decimal("1.75")),
+            (date(2025, 1, 19), date(2025, 1, 20), Decimal("1.50")),
+        ]
+
+    def test_scales_n_log_n(self):
+        """Test: 200.000 Intervalle (10.000 Members × 20 Sprints) in unter 2s"""
+        rng = random.Random(1)
+        start = date(2025, 1, 6)
+        intervals = [
+            _interval(member_id, sprint, start + timedelta(days=14 * sprint + rng.randint(-3, 3)),
+                      start + timedelta(days=14 * sprint + 11), "0.50")
+            for member_id in range(10_000) for sprint in range(20)
+        ]
+
+        started = time.perf_counter()
+        find_over_allocations(intervals)
+        assert time.perf_counter() - started < 2.0
+
+
+class TestOverAllocationReport:
+    """Test Report und Endpoint"""
+
+    def test_report_endpoint(self, client, db_session, sample_sprint, sample_members):
+        """Test: Member mit 100% in zwei parallelen Sprints, Window begrenzt die Überschneidung"""
+        other = _second_sprint(db_session)
+        alice, bogdan = sample_members[0].member_id, sample_members[1].member_id
+        db_session.add_all([
+            SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=alice, allocation=1.0),
+            SprintRoster(sprint_id=other.sprint_id, member_id=alice, allocation=0.5, assignment_to=date(2025, 11, 5)),
+            SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=bogdan, allocation=0.5),
+            SprintRoster(sprint_id=other.sprint_id, member_id=bogdan, allocation=0.5),
+        ])
+        db_session.commit()
+
+        data = client.get("/api/v1/reports/over-allocation").json()
+
+        assert data["member_count"] == 1
+        assert data["checked_intervals"] == 4
+        [period] = data["periods"]
+        assert (period["member_name"], period["from_date"], period["to_date"]) == ("Alice Mueller", "2025-11-03", "2025-11-05")
+        assert period["total_allocation"] == 1.5
+        assert [s["name"] for s in period["sprints"]] == ["Sample Sprint", "Parallel Sprint"]
+
+        clipped = client.get("/api/v1/reports/over-allocation", params={"from_date": "2025-11-04"}).json()
+        assert clipped["periods"][0]["from_date"] == "2025-11-04"
+
+    def test_report_query_count(self, db_session, synthetic_dataset, query_budget):
+        """Test: Zwei Queries unabhängig von der Organisationsgröße"""
+        synthetic_dataset(seed=11, members=200, sprints=10, roster_size=150, parallel_sprints=2)
+
+        with query_budget(2):
+            OverAllocationService(db_session).report()
+
+
+class TestWriteValidation:
+    """Test optionale Prüfung bei Roster-Writes"""
+
+    def test_disabled_by_default(self, client, db_session, sample_sprint, sample_members):
+        """Test: Ohne ROSTER_ALLOCATION_CHECK bleibt das Verhalten unverändert"""
+        other = _second_sprint(db_session)
+        alice = sample_members[0].member_id
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=alice, allocation=1.0))
+        db_session.commit()
+
+        response = client.post(f"/api/v1/sprints/{other.sprint_id}/roster", json={"member_id": alice, "allocation": 1.0})
+
+        assert response.status_code == 200
+
+    def test_single_writes(self, client, db_session, sample_sprint, sample_members, monkeypatch):
+        """Test: Add/Update über 100% wird abgelehnt, Fenster ohne Überschneidung ist erlaubt"""
+        monkeypatch.setattr(settings, "ROSTER_ALLOCATION_CHECK", True)
+        other = _second_sprint(db_session)
+        alice = sample_members[0].member_id
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=alice, allocation=0.6))
+        db_session.commit()
+        url = f"/api/v1/sprints/{other.sprint_id}/roster"
+
+        rejected = client.post(url, json={"member_id": alice, "allocation": 0.5})
+        assert rejected.status_code == 422
+        assert "110%" in rejected.json()["detail"] and "Sample Sprint" in rejected.json()["detail"]
+
+        assert client.post(url, json={"member_id": alice, "allocation": 0.4}).status_code == 200
+        assert client.put(f"{url}/{alice}", json={"allocation": 1.0}).status_code == 422
+        assert client.put(f"{url}/{alice}", json={"allocation": 1.0, "assignment_from": "2025-11-10"}).status_code == 200
+
+    def test_bulk_writes(self, client, db_session, sample_sprint, sample_members, monkeypatch):
+        """Test: Bulk meldet Über-Allokation je Zeile, andere Zeilen werden geschrieben"""
+        monkeypatch.setattr(settings, "ROSTER_ALLOCATION_CHECK", True)
+        other = _second_sprint(db_session)
+        alice, bogdan = sample_members[0].member_id, sample_members[1].member_id
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=alice, allocation=1.0))
+        db_session.commit()
+
+        response = client.post(f"/api/v1/sprints/{other.sprint_id}/roster/bulk", json=[
+            {"member_id": alice, "allocation": 0.5},
+            {"member_id": bogdan, "allocation": 1.0},
+        ])
+
+        assert [r["status"] for r in response.json()["results"]] == ["error", "added"]
+        assert "Alice Mueller" in response.json()["results"][0]["error"]
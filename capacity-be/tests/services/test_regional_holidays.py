@@ -2,11 +2,36 @@
 Tests für regionale Feiertage (DE-NW vs UA)
 
 Test Case 1: Feiertage je Region
+Test Case 2: Regionen-Hierarchie ("DE-NW" erbt "DE"), Company Days und Kalender-Cache
 """
 import pytest
 from datetime import date
+from app.core import metrics
+from app.core.config import settings
+from app.db.crud.holidays import create_holiday, delete_holiday
+from app.schemas.schemas import HolidayCreate
 from app.services.availability import AvailabilityService
-from app.db.models import Member, Sprint, SprintRoster, Holiday, AvailabilityState
+from app.services.capacity_facts import rebuild_capacity_facts
+from app.services.holiday_calendar import CACHE_NAME, region_chain
+from app.db.models import Member, MemberDayCapacity, Sprint, SprintRoster, Holiday, AvailabilityState
+
+
+def _holiday_queries(counter):
+    return sum("FROM holidays" in statement for statement in counter.statements)
+
+
+def _holiday_days(availability, member_id):
+    member = next(m for m in availability.members if m.member_id == member_id)
+    return [d.date for d in member.days if d.is_holiday]
+
+
+@pytest.fixture
+def full_roster(db_session, sample_members, sample_sprint):
+    """Alle Sample-Members (DE-NW, UA, ohne Region) im Sample Sprint"""
+    for member in sample_members:
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=member.member_id, allocation=1.0))
+    db_session.commit()
+    return sample_sprint
 
 
 class TestRegionalHolidays:
@@ -173,3 +198,86 @@ class TestRegionalHolidays:
         # Alice (1.0 employment) sollte 80h haben, Bogdan (0.75 employment) sollte 60h haben
         assert alice_data.sum_hours == 80.0  # 10 days * 8h * 1.0
         assert bogdan_data.sum_hours == 60.0  # 10 days * 8h * 0.75
+
+
+class TestHolidayHierarchy:
+    """Test Vererbung von Oberregionen, Company Days und Kalender-Cache"""
+
+    def test_region_chain(self):
+        """Test: Region und Vorfahren, spezifischste zuerst"""
+        assert region_chain("DE-NW") == ("DE-NW", "DE")
+        assert region_chain("UA") == ("UA",)
+        assert region_chain(None) == ()
+
+    def test_subregion_inherits_parent(self, db_session, sample_members, full_roster):
+        """Test: Feiertag der Oberregion "DE" gilt für DE-NW, nicht für UA oder Members ohne Region"""
+        alice, bogdan, carol = sample_members
+        db_session.add(Holiday(name="Nationaler Feiertag", date=date(2025, 10, 29), region_code="DE"))
+        db_session.add(Holiday(name="Andere Region", date=date(2025, 10, 30), region_code="DE-BY"))
+        db_session.commit()
+
+        availability = AvailabilityService(db_session).get_sprint_availability(full_roster.sprint_id)
+
+        assert _holiday_days(availability, alice.member_id) == [date(2025, 10, 29)]
+        assert _holiday_days(availability, bogdan.member_id) == []
+        assert _holiday_days(availability, carol.member_id) == []
+
+    def test_company_day_applies_to_everyone(self, db_session, sample_members, full_roster):
+        """Test: is_company_day gilt für alle Members - auch ohne Region, ohne Einträge je Region"""
+        db_session.add(Holiday(name="Betriebsausflug", date=date(2025, 11, 5), region_code="DE", is_company_day=True))
+        db_session.commit()
+
+        availability = AvailabilityService(db_session).get_sprint_availability(full_roster.sprint_id)
+
+        for member in sample_members:
+            assert _holiday_days(availability, member.member_id) == [date(2025, 11, 5)]
+        assert availability.sum_days_team == 27.0  # 3 × (10 - 1) Tage
+
+    def test_resolved_calendars_are_cached(self, db_session, sample_members, full_roster, query_budget):
+        """Test: Zweiter Load ohne Feiertags-Query (Cache-Hits), Invalidierung nach Feiertags-Write"""
+        service = AvailabilityService(db_session)
+        hits_before = metrics.sample_value("cache_requests_total", cache=CACHE_NAME, result="hit")
+        with query_budget(10) as first:
+            service.get_sprint_availability(full_roster.sprint_id)
+        with query_budget(10) as second:
+            service.get_sprint_availability(full_roster.sprint_id)
+
+        assert (_holiday_queries(first), _holiday_queries(second)) == (1, 0)
+        assert metrics.sample_value("cache_requests_total", cache=CACHE_NAME, result="hit") >= hits_before + 3  # DE-NW, UA, None
+
+        holiday = create_holiday(db_session, HolidayCreate(date=date(2025, 10, 28), region_code="DE", name="Neu"))
+        alice = sample_members[0]
+        assert _holiday_days(service.get_sprint_availability(full_roster.sprint_id), alice.member_id) == [
+            date(2025, 10, 28)
+        ]
+        delete_holiday(db_session, holiday.holiday_id)
+        assert _holiday_days(service.get_sprint_availability(full_roster.sprint_id), alice.member_id) == []
+
+    def test_cache_disabled(self, db_session, sample_members, full_roster, query_budget, monkeypatch):
+        """Test: HOLIDAY_CACHE_SECONDS=0 lädt die Kalender bei jedem Load"""
+        monkeypatch.setattr(settings, "HOLIDAY_CACHE_SECONDS", 0)
+        service = AvailabilityService(db_session)
+        with query_budget(10) as first:
+            service.get_sprint_availability(full_roster.sprint_id)
+        with query_budget(10) as second:
+            service.get_sprint_availability(full_roster.sprint_id)
+
+        assert (_holiday_queries(first), _holiday_queries(second)) == (1, 1)
+
+    def test_parent_and_company_holidays_refresh_facts(self, db_session, sample_members, full_roster):
+        """Test: Feiertag der Oberregion / Company Day aktualisiert die Faktentabelle der betroffenen Members"""
+        alice, bogdan, carol = sample_members
+        rebuild_capacity_facts(db_session)
+
+        def auto_state(member, day):
+            return db_session.query(MemberDayCapacity.auto_state).filter(
+                MemberDayCapacity.member_id == member.member_id, MemberDayCapacity.day == day
+            ).scalar()
+
+        create_holiday(db_session, HolidayCreate(date=date(2025, 10, 29), region_code="DE", name="National"))
+        create_holiday(db_session, HolidayCreate(date=date(2025, 10, 30), region_code="DE", name="Firma",
+                                                 is_company_day=True))
+
+        assert auto_state(alice, date(2025, 10, 29)) == "holiday"
+        assert auto_state(bogdan, date(2025, 10, 29)) == "available"
+        assert [auto_state(m, date(2025, 10, 30)) for m in (alice, bogdan, carol)] == ["holiday"] * 3
@@ -0,0 +1,180 @@
+"""
+Tests für die SQL-Reports (Kapazität je Gruppe, Trend geplant vs. verfügbar)
+
+- Summen stimmen mit der Availability-Matrix überein
+- Gruppierung nach Region, Member und Team
+- Feste Anzahl Queries je Report
+- Ein Jahr (26 Sprints) mit 500 Members unter 200ms
+"""
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from app.db.models import Sprint, SprintRoster, Team, TeamMember
+from app.schemas.schemas import ReportGroupBy
+from app.services.availability import AvailabilityService
+from app.services.capacity_facts import rebuild_capacity_facts
+from app.services.reports import NO_GROUP_LABEL, ReportService
+
+PERIOD = {"from_date": date(2025, 10, 1), "to_date": date(2025, 10, 31)}
+
+
+@pytest.fixture
+def report_data(db_session, sample_sprint, sample_members):
+    """Sample Sprint mit allen drei Members, Alice im Team Backend, Faktentabelle aufgebaut"""
+    for member in sample_members:
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=member.member_id, allocation=1.0))
+    team = Team(name="Backend")
+    db_session.add(team)
+    db_session.flush()
+    db_session.add(TeamMember(team_id=team.team_id, member_id=sample_members[0].member_id))
+    db_session.commit()
+    rebuild_capacity_facts(db_session)
+    return sample_sprint
+
+
+def _series(report):
+    return {s.label: s for s in report.series}
+
+
+class TestCapacityReport:
+    """Test gruppierter Kapazitäts-Report"""
+
+    def test_region_report_matches_engine(self, db_session, report_data, sample_holidays):
+        """Test: Regionen-Summen = Availability-Matrix, Members ohne Region separat"""
+        availability = AvailabilityService(db_session).get_sprint_availability(report_data.sprint_id)
+        report = ReportService(db_session).capacity_report(ReportGroupBy.REGION, **PERIOD)
+
+        assert [s.sprint_id for s in report.sprints] == [report_data.sprint_id]
+        series = _series(report)
+        assert set(series) == {"DE-NW", "UA", NO_GROUP_LABEL}
+        assert series[NO_GROUP_LABEL].key is None
+        assert report.total_days[0] == availability.sum_days_team
+        assert report.total_hours[0] == pytest.approx(availability.sum_hours_team)
+
+    def test_member_and_team_grouping(self, db_session, report_data, sample_members):
+        """Test: Je Member eine Reihe; Team-Reihe nur mit zugeordneten Members"""
+        availability = AvailabilityService(db_session).get_sprint_availability(report_data.sprint_id)
+        service = ReportService(db_session)
+
+        by_member = _series(service.capacity_report(ReportGroupBy.MEMBER, **PERIOD))
+        for member in availability.members:
+            assert by_member[member.name].hours[0] == pytest.approx(member.sum_hours)
+
+        by_team = _series(service.capacity_report(ReportGroupBy.TEAM, **PERIOD))
+        alice = next(m for m in availability.members if m.name == "Alice Mueller")
+        assert by_team["Backend"].hours[0] == pytest.approx(alice.sum_hours)
+        assert NO_GROUP_LABEL in by_team
+
+    def test_sprints_without_facts_are_zero(self, db_session, report_data):
+        """Test: Zeitraum ohne Sprints -> leere Achse, Sprint ohne Roster -> Nullen"""
+        service = ReportService(db_session)
+        empty = service.capacity_report(from_date=date(2024, 1, 1), to_date=date(2024, 12, 31))
+        assert empty.sprints == [] and empty.series == []
+
+        db_session.query(SprintRoster).delete()
+        db_session.commit()
+        rebuild_capacity_facts(db_session)
+        report = service.capacity_report(**PERIOD)
+        assert report.total_days == [0.0]
+
+    def test_bounded_queries(self, db_session, report_data, query_budget):
+        """Test: 2 Queries je Report, unabhängig von der Gruppierung"""
+        service = ReportService(db_session)
+        for group_by in ReportGroupBy:
+            with query_budget(2):
+                service.capacity_report(group_by, **PERIOD)
+        with query_budget(2):
+            service.capacity_trend(**PERIOD)
+
+
+class TestCapacityTrend:
+    """Test Trend geplant vs. verfügbar mit gleitendem Durchschnitt"""
+
+    def test_planned_vs_available(self, db_session, report_data, sample_members, sample_holidays):
+        """Test: Geplant = Werktage * 8h * Ratio * Allocation, verfügbar = Matrix-Summe"""
+        availability = AvailabilityService(db_session).get_sprint_availability(report_data.sprint_id)
+        trend = ReportService(db_session).capacity_trend(**PERIOD)
+
+        expected_planned = 10 * 8 * sum(float(m.employment_ratio) for m in sample_members)
+        assert trend.planned_hours == [pytest.approx(expected_planned)]
+        assert trend.available_hours == [pytest.approx(availability.sum_hours_team)]
+        assert trend.availability_ratio[0] == pytest.approx(availability.sum_hours_team / expected_planned, abs=1e-4)
+
+    def test_rolling_average(self, db_session, synthetic_dataset):
+        """Test: Gleitender Durchschnitt über die letzten `window` Sprints"""
+        synthetic_dataset(members=10, sprints=5, roster_size=10, pto_history_days=30)
+        rebuild_capacity_facts(db_session)
+
+        trend = ReportService(db_session).capacity_trend(date(2025, 1, 1), date(2025, 12, 31), window=2)
+
+        assert len(trend.sprints) == 5
+        available = trend.available_hours
+        assert trend.available_hours_avg[0] == pytest.approx(available[0])
+        for i in range(1, 5):
+            assert trend.available_hours_avg[i] == pytest.approx((available[i - 1] + available[i]) / 2, abs=0.01)
+
+    def test_sprints_without_facts_skip_average(self, db_session, synthetic_dataset):
+        """Test: Sprint ohne Fakten zieht den Durchschnitt nicht auf 0, bleibt aber Teil des Fensters"""
+        synthetic_dataset(members=10, sprints=3, roster_size=10, pto_history_days=30)
+        rebuild_capacity_facts(db_session)
+        first, second, _ = db_session.query(Sprint).order_by(Sprint.start_date).all()
+        db_session.add(Sprint(name="Leer", start_date=first.start_date + timedelta(days=1),
+                              end_date=first.end_date + timedelta(days=1)))
+        db_session.commit()
+
+        trend = ReportService(db_session).capacity_trend(date(2025, 1, 1), date(2025, 12, 31), window=2)
+
+        assert [s.name for s in trend.sprints][1] == "Leer"
+        available, average = trend.available_hours, trend.available_hours_avg
+        assert available[1] == 0.0
+        assert average[1] == pytest.approx(available[0])
+        assert average[2] == pytest.approx(available[2])
+        assert average[3] == pytest.approx((available[2] + available[3]) / 2, abs=0.01)
+
+
+class TestReportPerformance:
+    """Test Laufzeit auf einem Jahr Daten"""
+
+    def test_year_of_data_under_200ms(self, db_session, synthetic_dataset):
+        """Test: 500 Members, 26 Sprints (ein Jahr) - jeder Report unter 200ms"""
+        start = date.today() - timedelta(days=360)
+        synthetic_dataset(members=500, sprints=26, roster_size=500, start_date=start, pto_history_days=30)
+        rebuild_capacity_facts(db_session)
+        service = ReportService(db_session)
+
+        timings = {}
+        for group_by in (ReportGroupBy.REGION, ReportGroupBy.TEAM):
+            started = time.perf_counter()
+            report = service.capacity_report(group_by)
+            timings[group_by.value] = time.perf_counter() - started
+            assert len(report.sprints) == 26
+        started = time.perf_counter()
+        service.capacity_trend()
+        timings["trend"] = time.perf_counter() - started
+
+        assert max(timings.values()) < 0.2, timings
+
+
+class TestReportsAPI:
+    """Test Reports-Endpoints"""
+
+    def test_capacity_and_trend_endpoints(self, client, report_data):
+        """Test: GET /reports/capacity und /reports/trend"""
+        params = {"from_date": "2025-10-01", "to_date": "2025-10-31"}
+        response = client.get("/api/v1/reports/capacity", params={**params, "group_by": "member"})
+        assert response.status_code == 200
+        assert response.json()["group_by"] == "member"
+        assert len(response.json()["series"]) == 3
+
+        response = client.get("/api/v1/reports/trend", params={**params, "window": 2})
+        assert response.status_code == 200
+        assert response.json()["window"] == 2
+
+    def test_invalid_parameters(self, client):
+        """Test: Ungültiger Zeitraum, Gruppierung und Fenster -> 422"""
+        assert client.get("/api/v1/reports/capacity",
+                          params={"from_date": "2025-10-31", "to_date": "2025-10-01"}).status_code == 422
+        assert client.get("/api/v1/reports/capacity", params={"group_by": "planet"}).status_code == 422
+        assert client.get("/api/v1/reports/trend", params={"window": 0}).status_code == 422
@@ -0,0 +1,206 @@
+"""
+Tests für What-if-Szenarien
+
+- Änderungen werden als Overlay ausgewertet, nie geschrieben
+- Deltas je Member und Team
+- Viele Szenarien teilen sich einen Basis-Load
+"""
+from datetime import date
+
+import pytest
+
+from app.db.models import SprintRoster, PTO, AvailabilityOverride, AvailabilityState, Member
+from app.services.scenario import ScenarioService
+from app.services.validation import ValidationError
+from app.schemas.schemas import Scenario
+
+
+@pytest.fixture
+def rostered_sprint(db_session, sample_sprint, sample_members):
+    """Sample Sprint (27.10.-07.11.2025) mit Alice und Bogdan im Roster"""
+    for member in sample_members[:2]:
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=member.member_id, allocation=1.0))
+    db_session.commit()
+    return sample_sprint
+
+
+def _scenario(name, *changes):
+    return Scenario.model_validate({"name": name, "changes": list(changes)})
+
+
+def _delta(result, member_id):
+    return next(m for m in result.members if m.member_id == member_id)
+
+
+class TestScenarioOverlay:
+    """Test Copy-on-Write-Overlay über die Availability-Basisdaten"""
+
+    def test_set_allocation_changes_hours_only(self, db_session, rostered_sprint, sample_members):
+        """Test: Allocation 50% halbiert die Stunden, Tage bleiben gleich"""
+        alice = sample_members[0]
+        response = ScenarioService(db_session).evaluate(rostered_sprint.sprint_id, [
+            _scenario("Alice 50%", {"op": "set_allocation", "member_id": alice.member_id, "allocation": 0.5})
+        ])
+
+        result = response.scenarios[0]
+        delta = _delta(result, alice.member_id)
+        assert delta.status == "changed"
+        assert delta.delta_days == 0
+        assert delta.sum_hours == pytest.approx(delta.base_sum_hours / 2)
+        assert result.delta_hours_team == pytest.approx(-delta.base_sum_hours / 2)
+        assert _delta(result, sample_members[1].member_id).status == "unchanged"
+
+    def test_add_pto_and_override(self, db_session, rostered_sprint, sample_members):
+        """Test: Hypothetische PTO und Override verändern nur die betroffenen Tage"""
+        bogdan = sample_members[1]
+        response = ScenarioService(db_session).evaluate(rostered_sprint.sprint_id, [
+            _scenario(
+                "Bogdan Urlaub",
+                {"op": "add_pto", "member_id": bogdan.member_id, "from_date": "2025-11-03", "to_date": "2025-11-04"},
+                {"op": "set_override", "member_id": bogdan.member_id, "day": "2025-11-05", "state": "half"},
+            )
+        ])
+
+        delta = _delta(response.scenarios[0], bogdan.member_id)
+        assert delta.changed_days == [date(2025, 11, 3), date(2025, 11, 4), date(2025, 11, 5)]
+        assert delta.delta_days == -2.5
+        member = next(m for m in response.scenarios[0].availability.members if m.member_id == bogdan.member_id)
+        day = next(d for d in member.days if d.date == date(2025, 11, 3))
+        assert day.auto_state == "pto" and day.is_pto
+
+    def test_override_removal_masks_existing_override(self, db_session, rostered_sprint, sample_members):
+        """Test: state=None entfernt einen bestehenden Override nur im Szenario"""
+        alice = sample_members[0]
+        db_session.add(AvailabilityOverride(
+            sprint_id=rostered_sprint.sprint_id, member_id=alice.member_id,
+            day=date(2025, 10, 28), state=AvailabilityState.UNAVAILABLE
+        ))
+        db_session.commit()
+
+        response = ScenarioService(db_session).evaluate(rostered_sprint.sprint_id, [
+            _scenario("ohne Override", {"op": "set_override", "member_id": alice.member_id, "day": "2025-10-28"})
+        ])
+
+        assert _delta(response.scenarios[0], alice.member_id).delta_days == 1.0
+        assert db_session.query(AvailabilityOverride).count() == 1
+
+    def test_add_and_remove_members(self, db_session, rostered_sprint, sample_members):
+        """Test: Hinzugefügte Members inkl. eigener PTO, entfernte Members mit negativem Delta"""
+        alice, bogdan, carol = sample_members
+        db_session.add(PTO(member_id=carol.member_id, from_date=date(2025, 10, 27), to_date=date(2025, 10, 27),
+                           type="vacation"))
+        db_session.commit()
+
+        response = ScenarioService(db_session).evaluate(rostered_sprint.sprint_id, [
+            _scenario(
+                "Carol statt Bogdan",
+                {"op": "remove_member", "member_id": bogdan.member_id},
+                {"op": "add_member", "member_id": carol.member_id, "allocation": 1.0},
+            )
+        ])
+
+        result = response.scenarios[0]
+        assert [m.member_id for m in result.availability.members] == [alice.member_id, carol.member_id]
+        assert _delta(result, bogdan.member_id).status == "removed"
+        added = _delta(result, carol.member_id)
+        assert added.status == "added"
+        assert added.sum_days == 9.0  # 10 Werktage minus 1 Tag PTO
+        assert added.sum_hours == pytest.approx(9 * 8 * 0.5)
+
+    def test_scenarios_are_independent_and_not_persisted(self, db_session, rostered_sprint, sample_members):
+        """Test: Szenarien beeinflussen sich nicht gegenseitig und schreiben nichts"""
+        alice = sample_members[0]
+        response = ScenarioService(db_session).evaluate(rostered_sprint.sprint_id, [
+            _scenario("weg", {"op": "remove_member", "member_id": alice.member_id}),
+            _scenario("Ist-Stand"),
+        ])
+
+        assert len(response.scenarios[0].availability.members) == 1
+        assert response.scenarios[1].delta_days_team == 0
+        assert response.scenarios[1].availability.sum_days_team == response.base_sum_days_team
+        assert db_session.query(SprintRoster).count() == 2
+        assert db_session.query(PTO).count() == 0
+
+    def test_set_allocation_clears_or_keeps_window(self, db_session, rostered_sprint, sample_members):
+        """Test: Fehlendes Fenster-Feld behält den Roster-Wert, explizites null entfernt ihn"""
+        alice = sample_members[0]
+        entry = db_session.query(SprintRoster).filter(SprintRoster.member_id == alice.member_id).one()
+        entry.assignment_from = date(2025, 11, 3)
+        db_session.commit()
+
+        response = ScenarioService(db_session).evaluate(rostered_sprint.sprint_id, [
+            _scenario("behalten", {"op": "set_allocation", "member_id": alice.member_id, "allocation": 1.0}),
+            _scenario("ganzer Sprint", {"op": "set_allocation", "member_id": alice.member_id, "allocation": 1.0,
+                                        "assignment_from": None}),
+        ])
+
+        kept, cleared = response.scenarios
+        assert _delta(kept, alice.member_id).delta_days == 0
+        assert _delta(cleared, alice.member_id).delta_days == 5.0
+
+    @pytest.mark.parametrize("change, message", [
+        ({"op": "add_member", "member_id": 999, "allocation": 1.0}, "not found"),
+        ({"op": "add_member", "member_id": None, "allocation": 1.0, "assignment_to": "2025-12-01"},
+         "cannot be after sprint end"),
+        ({"op": "add_member", "member_id": None, "allocation": 1.0,
+          "assignment_from": "2025-11-05", "assignment_to": "2025-11-03"}, "Assignment end must be >="),
+        ({"op": "set_allocation", "member_id": None, "allocation": 1.0, "assignment_from": "2025-10-01"},
+         "cannot be before sprint start"),
+        ({"op": "remove_member", "member_id": 999}, "not in sprint roster"),
+        ({"op": "set_override", "member_id": None, "day": "2025-12-01", "state": "half"}, "not within sprint"),
+    ])
+    def test_invalid_changes(self, db_session, rostered_sprint, sample_members, change, message):
+        """Test: Ungültige Änderungen werden abgelehnt"""
+        if change["member_id"] is None:
+            member = sample_members[2] if change["op"] == "add_member" else sample_members[0]
+            change = dict(change, member_id=member.member_id)
+
+        with pytest.raises(ValidationError) as exc_info:
+            ScenarioService(db_session).evaluate(rostered_sprint.sprint_id, [_scenario("x", change)])
+
+        assert message in exc_info.value.message
+
+
+class TestScenarioAPI:
+    """Test POST /sprints/{id}/scenarios"""
+
+    def test_evaluate_scenarios_endpoint(self, client, db_session, rostered_sprint, sample_members):
+        """Test: Matrix und Deltas je Szenario"""
+        alice = sample_members[0]
+        response = client.post(f"/api/v1/sprints/{rostered_sprint.sprint_id}/scenarios", json={"scenarios": [
+            {"name": "Alice 50%", "changes": [{"op": "set_allocation", "member_id": alice.member_id, "allocation": 0.5}]},
+        ]})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["scenarios"][0]["name"] == "Alice 50%"
+        assert data["scenarios"][0]["delta_hours_team"] < 0
+        assert len(data["scenarios"][0]["availability"]["members"]) == 2
+
+    def test_missing_fields_and_unknown_sprint(self, client, db_session, rostered_sprint, sample_members):
+        """Test: Fehlende Pflichtfelder -> 422, unbekannter Sprint -> 404"""
+        missing_allocation = {"scenarios": [{"name": "x", "changes": [{"op": "set_allocation", "member_id": 1}]}]}
+        assert client.post(f"/api/v1/sprints/{rostered_sprint.sprint_id}/scenarios",
+                           json=missing_allocation).status_code == 422
+        assert client.post("/api/v1/sprints/999/scenarios", json={"scenarios": [{"name": "x"}]}).status_code == 404
+
+    def test_many_scenarios_share_base_load(self, client, db_session, synthetic_dataset, query_budget):
+        """Test: Query-Anzahl ist unabhängig von der Anzahl Szenarien"""
+        synthetic_dataset(members=30, sprints=1, roster_size=20)
+        sprint_id = db_session.query(SprintRoster.sprint_id).first()[0]
+        roster_ids = [m for (m,) in db_session.query(SprintRoster.member_id)]
+        outside_ids = [m for (m,) in db_session.query(Member.member_id) if m not in roster_ids]
+
+        scenarios = [
+            {"name": f"S{i}", "changes": [
+                {"op": "set_allocation", "member_id": roster_ids[i], "allocation": 0.5},
+                {"op": "add_member", "member_id": outside_ids[i], "allocation": 1.0},
+            ]}
+            for i in range(10)
+        ]
+        # Basis: Sprint, Roster, Feiertage, PTO, Overrides; Nachladen: Members, Feiertage, PTO, Overrides
+        with query_budget(9):
+            response = client.post(f"/api/v1/sprints/{sprint_id}/scenarios", json={"scenarios": scenarios})
+
+        assert response.status_code == 200, response.text
+        assert len(response.json()["scenarios"]) == 10
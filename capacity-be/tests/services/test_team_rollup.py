@@ -0,0 +1,178 @@
+"""
+Tests für Team-Hierarchie und Kapazitäts-Rollups
+
+- Rollup-Werte eines Teams = eigene Members + alle Sub-Teams
+- Summen stimmen mit der Availability-Matrix überein
+- Zyklen in der Hierarchie werden verhindert
+- 1.000 Members in einem Org-Baum unter einer Sekunde
+"""
+import time
+from datetime import date
+
+import pytest
+from sqlalchemy import insert
+
+from app.db.models import Member, Sprint, SprintRoster, Team, TeamMember, SprintStatus
+from app.services.availability import AvailabilityService
+from app.services.team_rollup import TeamRollupService
+
+
+@pytest.fixture
+def org(db_session, sample_sprint, sample_members):
+    """Org: Engineering -> (Backend, Frontend); Alice+Bogdan in Backend, Carol in Frontend"""
+    engineering = Team(name="Engineering")
+    db_session.add(engineering)
+    db_session.flush()
+    backend = Team(name="Backend", parent_team_id=engineering.team_id)
+    frontend = Team(name="Frontend", parent_team_id=engineering.team_id)
+    db_session.add_all([backend, frontend])
+    db_session.flush()
+
+    alice, bogdan, carol = sample_members
+    db_session.add_all([
+        TeamMember(team_id=backend.team_id, member_id=alice.member_id),
+        TeamMember(team_id=backend.team_id, member_id=bogdan.member_id),
+        TeamMember(team_id=frontend.team_id, member_id=carol.member_id),
+    ])
+    for member in sample_members:
+        db_session.add(SprintRoster(sprint_id=sample_sprint.sprint_id, member_id=member.member_id, allocation=1.0))
+    db_session.commit()
+    return {"engineering": engineering.team_id, "backend": backend.team_id, "frontend": frontend.team_id}
+
+
+def _child(node, name):
+    return next(child for child in node.children if child.name == name)
+
+
+class TestTeamRollup:
+    """Test bottom-up Rollups über den Team-Baum"""
+
+    def test_rollup_sums_subtrees(self, db_session, org, sample_sprint):
+        """Test: Parent-Team = Summe der Sub-Teams, je Tag und je Sprint"""
+        rollup = TeamRollupService(db_session).rollup(org["engineering"], [sample_sprint.sprint_id])
+
+        root = rollup.root
+        backend, frontend = _child(root, "Backend"), _child(root, "Frontend")
+        assert root.member_count == 3
+        assert len(rollup.dates) == len(root.days) == 12
+        assert root.days == [b + f for b, f in zip(backend.days, frontend.days)]
+        assert root.sum_hours == pytest.approx(backend.sum_hours + frontend.sum_hours)
+        assert root.sprints[0].sum_days == root.sum_days
+
+    def test_rollup_matches_availability(self, db_session, org, sample_sprint):
+        """Test: Team-Summe entspricht der Availability-Matrix des Sprints"""
+        availability = AvailabilityService(db_session).get_sprint_availability(sample_sprint.sprint_id)
+        rollup = TeamRollupService(db_session).rollup(org["engineering"], [sample_sprint.sprint_id])
+
+        assert rollup.root.sum_days == availability.sum_days_team
+        assert rollup.root.sum_hours == pytest.approx(availability.sum_hours_team)
+        backend = _child(rollup.root, "Backend")
+        expected = sum(m.sum_hours for m in availability.members if m.name != "Carol Smith")
+        assert backend.sum_hours == pytest.approx(expected)
+
+    def test_subtree_rollup_ignores_other_teams(self, db_session, org, sample_sprint):
+        """Test: Rollup eines Sub-Teams enthält nur dessen Members"""
+        rollup = TeamRollupService(db_session).rollup(org["frontend"], [sample_sprint.sprint_id])
+
+        assert rollup.root.member_count == 1
+        assert rollup.root.children == []
+        assert rollup.root.sum_hours == pytest.approx(rollup.root.sum_days * 8 * 0.5)
+
+    def test_unknown_team(self, db_session):
+        """Test: Unbekanntes Team -> None"""
+        assert TeamRollupService(db_session).rollup(999) is None
+
+    def test_large_org_tree_under_one_second(self, db_session):
+        """Test: 1.000 Members in 4 Ebenen (1 + 5 + 25 + 125 Teams) unter einer Sekunde"""
+        sprint = Sprint(name="Org Sprint", start_date=date(2025, 3, 3), end_date=date(2025, 3, 16),
+                        status=SprintStatus.ACTIVE)
+        db_session.add(sprint)
+        db_session.flush()
+
+        team_rows, level, next_id = [{"team_id": 1, "name": "Org", "parent_team_id": None}], [1], 2
+        for _ in range(3):
+            children = []
+            for parent in level:
+                for _ in range(5):
+                    team_rows.append({"team_id": next_id, "name": f"Team {next_id}", "parent_team_id": parent})
+                    children.append(next_id)
+                    next_id += 1
+            level = children
+        db_session.execute(insert(Team), team_rows)
+        db_session.execute(insert(Member), [
+            {"member_id": i, "name": f"M{i}", "employment_ratio": 1.0, "region_code": None, "active": True}
+            for i in range(1, 1001)
+        ])
+        db_session.execute(insert(TeamMember), [
+            {"team_id": level[i % len(level)], "member_id": i} for i in range(1, 1001)
+        ])
+        db_session.execute(insert(SprintRoster), [
+            {"sprint_id": sprint.sprint_id, "member_id": i, "allocation": 1.0} for i in range(1, 1001)
+        ])
+        db_session.commit()
+
+        started = time.perf_counter()
+        rollup = TeamRollupService(db_session).rollup(1, [sprint.sprint_id])
+        elapsed = time.perf_counter() - started
+
+        assert rollup.root.member_count == 1000
+        assert rollup.root.sum_days == 1000 * 10
+        assert elapsed < 1.0
+
+
+class TestTeamsAPI:
+    """Test Teams-Endpoints"""
+
+    def test_team_crud_and_membership(self, client, db_session, sample_members):
+        """Test: Teams anlegen, verschachteln, Members zuordnen und verschieben"""
+        root = client.post("/api/v1/teams/", json={"name": "Org"}).json()
+        squad = client.post("/api/v1/teams/", json={"name": "Squad", "parent_team_id": root["team_id"]}).json()
+        assert squad["parent_team_id"] == root["team_id"]
+
+        alice = sample_members[0].member_id
+        assert client.post(f"/api/v1/teams/{root['team_id']}/members", json={"member_id": alice}).status_code == 200
+        response = client.post(f"/api/v1/teams/{squad['team_id']}/members", json={"member_id": alice})
+        assert response.json()["member_name"] == "Alice Mueller"
+
+        # Member wurde verschoben, nicht doppelt zugeordnet
+        assert client.get(f"/api/v1/teams/{root['team_id']}/members").json() == []
+        teams = {t["name"]: t for t in client.get("/api/v1/teams/").json()}
+        assert teams["Squad"]["member_count"] == 1
+
+        # Team mit Sub-Teams kann nicht gelöscht werden
+        assert client.delete(f"/api/v1/teams/{root['team_id']}").status_code == 409
+        assert client.delete(f"/api/v1/teams/{squad['team_id']}").status_code == 200
+
+    def test_cycle_is_rejected(self, client, db_session):
+        """Test: Team kann nicht unter eigenes Sub-Team gehängt werden"""
+        root = client.post("/api/v1/teams/", json={"name": "Org"}).json()
+        child = client.post("/api/v1/teams/", json={"name": "Child", "parent_team_id": root["team_id"]}).json()
+
+        response = client.put(f"/api/v1/teams/{root['team_id']}",
+                              json={"name": "Org", "parent_team_id": child["team_id"]})
+        assert response.status_code == 422
+        assert client.post("/api/v1/teams/", json={"name": "X", "parent_team_id": 999}).status_code == 422
+
+    def test_existing_cycle_does_not_hang(self, client, db_session):
+        """Test: Zyklus in Bestandsdaten (z.B. durch parallele Updates) -> 422 statt Endlosschleife"""
+        a = Team(name="A")
+        b = Team(name="B")
+        db_session.add_all([a, b])
+        db_session.flush()
+        a.parent_team_id, b.parent_team_id = b.team_id, a.team_id
+        db_session.commit()
+
+        response = client.post("/api/v1/teams/", json={"name": "C", "parent_team_id": a.team_id})
+        assert response.status_code == 422
+        assert "cycle" in response.text
+
+    def test_rollup_endpoint(self, client, db_session, org, sample_sprint):
+        """Test: GET /teams/{id}/rollup"""
+        response = client.get(f"/api/v1/teams/{org['engineering']}/rollup",
+                              params={"sprint_ids": [sample_sprint.sprint_id]})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [c["name"] for c in data["root"]["children"]] == ["Backend", "Frontend"]
+        assert data["sprints"][0]["sprint_id"] == sample_sprint.sprint_id
+        assert client.get("/api/v1/teams/999/rollup").status_code == 404
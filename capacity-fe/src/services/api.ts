@@ -2,8 +2,14 @@ import type { Member, Sprint, AvailabilityResponse, SprintRoster } from '@/types
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000'
 
+// Read-your-writes: nach einem Write liest das Backend bis zu diesem Zeitpunkt vom Primary
+const PRIMARY_UNTIL_HEADER = 'X-Primary-Until'
+// Toleranz für Uhrabweichung Browser/Server - danach wird der Header nicht mehr mitgeschickt
+const PRIMARY_UNTIL_GRACE_SECONDS = 30
+
 class ApiClient {
   private readonly baseURL: string
+  private primaryUntil: string | null = null
 
   constructor(baseURL: string = API_BASE_URL) {
     this.baseURL = baseURL
@@ -13,15 +19,20 @@ class ApiClient {
     const url = `${this.baseURL}${endpoint}`
 
     const config: RequestInit = {
+      ...options,
       headers: {
         'Content-Type': 'application/json',
+        ...this.readYourWritesHeaders(),
         ...options.headers,
       },
-      ...options,
     }
 
     try {
       const response = await fetch(url, config)
+      const primaryUntil = response.headers.get(PRIMARY_UNTIL_HEADER)
+      if (primaryUntil) {
+        this.primaryUntil = primaryUntil
+      }
 
       if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`)
@@ -34,6 +45,17 @@ class ApiClient {
     }
   }
 
+  private readYourWritesHeaders(): Record<string, string> {
+    if (!this.primaryUntil) {
+      return {}
+    }
+    if (Date.now() / 1000 > Number(this.primaryUntil) + PRIMARY_UNTIL_GRACE_SECONDS) {
+      this.primaryUntil = null
+      return {}
+    }
+    return { [PRIMARY_UNTIL_HEADER]: this.primaryUntil }
+  }
+
   // Health Check
   async health(): Promise<{ status: string }> {
     return this.request<{ status: string }>('/health')
@@ -71,15 +93,15 @@ class ApiClient {
 
   // Sprints API
   async getSprints(): Promise<Sprint[]> {
-    return this.request<Sprint[]>('/api/v1/sprints/')
+    return this.request<Sprint[]>('/api/v1/sprints/?include=stats')
   }
 
   async getSprint(id: number): Promise<Sprint> {
-    return this.request<Sprint>(`/api/v1/sprints/${id}`)
+    return this.request<Sprint>(`/api/v1/sprints/${id}?include=stats`)
   }
 
   async createSprint(sprint: Omit<Sprint, 'sprint_id'>): Promise<Sprint> {
-    return this.request<Sprint>('/api/v1/sprints/', {
+    return this.request<Sprint>('/api/v1/sprints/?include=stats', {
       method: 'POST',
       body: JSON.stringify(sprint),
     })
@@ -87,7 +109,7 @@ class ApiClient {
 
   async updateSprint(id: number, sprint: Partial<Sprint>): Promise<Sprint> {
     console.log('API: updating sprint', id, 'with data:', sprint)
-    const result = await this.request<Sprint>(`/api/v1/sprints/${id}`, {
+    const result = await this.request<Sprint>(`/api/v1/sprints/${id}?include=stats`, {
       method: 'PATCH',
       body: JSON.stringify(sprint),
     })